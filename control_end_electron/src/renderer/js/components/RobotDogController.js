@@ -652,6 +652,7 @@ export default class RobotDogController extends BaseComponent {
                 this.sendCommand({
                     command_type: 'xyr_control',
                     target: 'body',
+                    ack_mode: 'none', // 流式速度控制不需要确认，状态切换仍逐条确认
                     data: {
                         x: combinedX,
                         y: combinedY,
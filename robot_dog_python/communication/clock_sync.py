@@ -0,0 +1,243 @@
+# clock_sync.py
+
+"""
+基于 DDS 的 NTP 式对时，供各进程估计本机与机器狗 Jetson 的时钟偏差。
+- ClockSyncResponder: 运行在 Jetson 上（main_clock_sync.py），收到 ClockSyncRequest 后记下 t2/t3 并回复
+- ClockSyncClient: 周期发送请求；每个响应得到一个样本
+  offset = ((t2 - t1) + (t3 - t4)) / 2，往返时延 delay = (t4 - t1) - (t3 - t2)
+- ClockOffsetEstimator: 时钟滤波（最近 FILTER_SIZE 个样本中取往返时延最小的，排队和重传引入的误差最小），
+  对滤波后的点做最小二乘直线拟合得到偏差和漂移 (drift)，两次对时之间按漂移外推
+- OneWayLatency: 用估计的偏差把对端时间戳换算到本机时钟，按主题统计最近 LATENCY_WINDOW 条消息的单向延迟百分位
+同一台机器上的进程共用系统时钟，不需要对时；偏差的误差上限约为最小往返时延的一半。
+发布者由调用方传入（unitree_sdk2py 的 ChannelPublisher，或测试用的回环替身）。
+"""
+
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+from dds_data_structure import ClockSyncRequest, ClockSyncResponse
+
+PING_PERIOD_S = 1.0
+BURST_PINGS = 8          # 启动时连续发送的请求数，尽快得到第一个估计
+BURST_PERIOD_S = 0.05
+FILTER_SIZE = 8          # 时钟滤波窗口
+FIT_POINTS = 64          # 参与直线拟合的滤波后样本数
+MIN_DRIFT_SPAN_S = 30.0  # 样本跨度不足时不估计漂移
+PENDING_TIMEOUT_S = 5.0  # 超时未响应的请求丢弃
+LATENCY_WINDOW = 1000    # 每个主题保留的延迟样本数
+LATENCY_PERCENTILES = (50, 95, 99)
+
+now_ns = time.time_ns
+
+
+class ClockOffsetEstimator:
+    """
+    估计 对端时钟 - 本机时钟 的偏差 (ns)。
+    remote_ns ≈ local_ns + offset_ns(local_ns)
+    """
+
+    def __init__(self, filter_size: int = FILTER_SIZE, fit_points: int = FIT_POINTS,
+                 min_drift_span_s: float = MIN_DRIFT_SPAN_S, clock: Callable[[], int] = now_ns):
+        self.clock = clock
+        self.min_drift_span_ns = int(min_drift_span_s * 1e9)
+        self._samples = deque(maxlen=filter_size)  # (t4_ns, offset_ns, delay_ns)
+        self._points = deque(maxlen=fit_points)    # 时钟滤波选出的样本
+        self._ref_ns = 0
+        self._offset_ns = 0.0
+        self._drift = 0.0  # 每本机纳秒偏差的变化量 (ns/ns)
+        self._lock = threading.Lock()
+        self.samples = 0
+        self.last_delay_ns = 0
+        self.last_sample_ns = 0
+
+    @property
+    def synced(self) -> bool:
+        return bool(self._points)
+
+    def add_sample(self, t1_ns: int, t2_ns: int, t3_ns: int, t4_ns: int):
+        """一次请求/响应的四个时间戳：t1/t4 为本机时钟，t2/t3 为对端时钟"""
+        delay_ns = (t4_ns - t1_ns) - (t3_ns - t2_ns)
+        if delay_ns < 0:
+            return
+        offset_ns = ((t2_ns - t1_ns) + (t3_ns - t4_ns)) / 2.0
+        with self._lock:
+            self.samples += 1
+            self.last_delay_ns = delay_ns
+            self.last_sample_ns = t4_ns
+            self._samples.append((t4_ns, offset_ns, delay_ns))
+            best = min(self._samples, key=lambda s: s[2])
+            if self._points and self._points[-1][0] == best[0]:
+                return
+            self._points.append(best)
+            self._fit_locked()
+
+    def _fit_locked(self):
+        points = np.array(self._points, dtype=np.float64)
+        t, offset = points[:, 0], points[:, 1]
+        self._ref_ns = int(t[-1])
+        if t[-1] - t[0] < self.min_drift_span_ns:
+            # 跨度太短时斜率主要是噪声，不估计漂移，取最近一次滤波结果
+            self._offset_ns = float(offset[-1])
+            self._drift = 0.0
+            return
+        x = t - t[-1]
+        drift, offset_ns = np.polyfit(x, offset, 1)
+        self._drift, self._offset_ns = float(drift), float(offset_ns)
+
+    def offset_ns(self, local_ns: Optional[int] = None) -> float:
+        local_ns = self.clock() if local_ns is None else local_ns
+        with self._lock:
+            return self._offset_ns + self._drift * (local_ns - self._ref_ns)
+
+    def to_local_ns(self, remote_ns: int) -> int:
+        """对端时间戳换算到本机时钟"""
+        approx_local_ns = remote_ns - self.offset_ns(self._ref_ns)
+        return int(remote_ns - self.offset_ns(approx_local_ns))
+
+    def to_remote_ns(self, local_ns: int) -> int:
+        return int(local_ns + self.offset_ns(local_ns))
+
+    def remote_now_ns(self) -> int:
+        """对端时钟的当前时间；尚未对时时返回本机时间"""
+        return self.to_remote_ns(self.clock()) if self.synced else self.clock()
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            best_delay_ns = min((s[2] for s in self._samples), default=0)
+            return {
+                'synced': bool(self._points),
+                'samples': self.samples,
+                'offset_ms': round(self._offset_ns / 1e6, 3),
+                'drift_ppm': round(self._drift * 1e6, 2),
+                'uncertainty_ms': round(best_delay_ns / 2e6, 3),  # 误差上限：最小往返时延的一半
+                'rtt_ms': round(self.last_delay_ns / 1e6, 3),
+                'last_sample_age_s': round((self.clock() - self.last_sample_ns) / 1e9, 1) if self.samples else None,
+            }
+
+
+class ClockSyncResponder:
+    """对时服务端：订阅 ClockSyncRequest 的回调"""
+
+    def __init__(self, publisher, clock: Callable[[], int] = now_ns):
+        self.publisher = publisher
+        self.clock = clock
+        self.answered = 0
+
+    def on_request(self, msg: ClockSyncRequest):
+        t2_ns = self.clock()
+        response = ClockSyncResponse(client_id=msg.client_id, seq=msg.seq, t1_ns=msg.t1_ns, t2_ns=t2_ns)
+        response.t3_ns = self.clock()
+        try:
+            self.publisher.Write(response)
+            self.answered += 1
+        except Exception as e:
+            print(f"[ClockSync] response error: {e}")
+
+
+class ClockSyncClient:
+    """对时客户端：后台线程周期发送请求，on_response 作为 ClockSyncResponse 的订阅回调"""
+
+    def __init__(self, publisher, estimator: Optional[ClockOffsetEstimator] = None,
+                 period_s: float = PING_PERIOD_S, client_id: Optional[str] = None,
+                 clock: Callable[[], int] = now_ns):
+        self.publisher = publisher
+        self.estimator = estimator if estimator is not None else ClockOffsetEstimator(clock=clock)
+        self.period_s = period_s
+        self.client_id = client_id or uuid.uuid4().hex
+        self.clock = clock
+        self.seq = 0
+        self.lost = 0
+        self._pending: Dict[int, int] = {}  # seq -> t1_ns
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="ClockSyncClient", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self):
+        for _ in range(BURST_PINGS):
+            if self._stop.wait(BURST_PERIOD_S):
+                return
+            self.ping()
+        while not self._stop.wait(self.period_s):
+            self.ping()
+
+    def ping(self):
+        t1_ns = self.clock()
+        with self._lock:
+            self.seq += 1
+            seq = self.seq
+            expired = [s for s, t in self._pending.items() if t1_ns - t > PENDING_TIMEOUT_S * 1e9]
+            for s in expired:
+                del self._pending[s]
+            self.lost += len(expired)
+            self._pending[seq] = t1_ns
+        try:
+            self.publisher.Write(ClockSyncRequest(client_id=self.client_id, seq=seq, t1_ns=t1_ns))
+        except Exception as e:
+            print(f"[ClockSync] request error: {e}")
+
+    def on_response(self, msg: ClockSyncResponse):
+        t4_ns = self.clock()
+        if msg.client_id != self.client_id:
+            return
+        with self._lock:
+            t1_ns = self._pending.pop(msg.seq, None)
+        if t1_ns is None or t1_ns != msg.t1_ns:
+            return
+        self.estimator.add_sample(t1_ns, msg.t2_ns, msg.t3_ns, t4_ns)
+
+
+class OneWayLatency:
+    """按主题统计单向延迟：接收时刻 - 消息时间戳（换算到本机时钟）"""
+
+    def __init__(self, estimator: ClockOffsetEstimator, window: int = LATENCY_WINDOW,
+                 clock: Callable[[], int] = now_ns):
+        self.estimator = estimator
+        self.window = window
+        self.clock = clock
+        self._rings: Dict[str, np.ndarray] = {}
+        self._counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def add(self, topic: str, remote_timestamp_ns: int, receive_ns: Optional[int] = None) -> Optional[float]:
+        """记录一条消息，返回单向延迟 (ms)；尚未对时或消息没有时间戳时返回 None"""
+        receive_ns = self.clock() if receive_ns is None else receive_ns
+        if not remote_timestamp_ns or not self.estimator.synced:
+            return None
+        latency_ms = (receive_ns + self.estimator.offset_ns(receive_ns) - remote_timestamp_ns) / 1e6
+        with self._lock:
+            ring = self._rings.get(topic)
+            if ring is None:
+                ring = self._rings[topic] = np.zeros(self.window, dtype=np.float64)
+                self._counts[topic] = 0
+            ring[self._counts[topic] % self.window] = latency_ms
+            self._counts[topic] += 1
+        return latency_ms
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """各主题最近 window 条消息的延迟百分位 (ms)"""
+        with self._lock:
+            recent = {topic: ring[:min(self._counts[topic], self.window)].copy() for topic, ring in self._rings.items()}
+            counts = dict(self._counts)
+        result = {}
+        for topic, values in recent.items():
+            stats = {'count': counts[topic]}
+            for p, v in zip(LATENCY_PERCENTILES, np.percentile(values, LATENCY_PERCENTILES)):
+                stats[f'p{p}_ms'] = round(float(v), 3)
+            stats['max_ms'] = round(float(values.max()), 3)
+            result[topic] = stats
+        return result
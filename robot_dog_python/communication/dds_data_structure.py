@@ -11,7 +11,7 @@ from cyclonedds.idl import IdlStruct
 from cyclonedds.idl.annotations import key
 from enum import IntEnum
 from typing import List
-from cyclonedds.idl.types import int32, float32
+from cyclonedds.idl.types import int32, float32, int8, uint8, uint32, array
 
 
 # --------------------------------------------------------------------------
@@ -253,6 +253,97 @@ class DogStatus(IdlStruct, typename="DogStatus"):
     m11_reserve0: int = 0; m11_reserve1: int = 0
 
 
+# --- V3: 电机状态改为按字段存放的定长数组 ---
+# DogStatus (V2) 把12个电机展开成 m0_mode ... m11_reserve1 共108个字段，填充和读取都要逐个 setattr/getattr。
+# DogStatusV3 每个字段一个长度为12的数组，类型与 unitree_go MotorState_ 一致，
+# 发布在 DOG_STATUS_V3_TOPIC 上；与 NumPy 之间的批量转换和旧布局的兼容转换见 dog_status_arrays.py。
+
+DOG_STATUS_LAYOUT_VERSION = 3
+DOG_STATUS_TOPIC = "DogStatus"          # 旧布局 (V2)，兼容旧订阅者
+DOG_STATUS_V3_TOPIC = "DogStatusV3"
+NUM_STATUS_MOTORS = 12
+
+
+def _zeros(n=NUM_STATUS_MOTORS, value=0):
+    return field(default_factory=lambda: [value] * n)
+
+
+@dataclass
+class MotorStateArrays(IdlStruct, typename="MotorStateArrays"):
+    """12个电机的状态，下标为电机编号 (FR_hip, FR_thigh, ..., RL_calf)"""
+    mode: array[uint8, NUM_STATUS_MOTORS] = _zeros()
+    q: array[float32, NUM_STATUS_MOTORS] = _zeros(value=0.0)
+    dq: array[float32, NUM_STATUS_MOTORS] = _zeros(value=0.0)
+    ddq: array[float32, NUM_STATUS_MOTORS] = _zeros(value=0.0)
+    tau_est: array[float32, NUM_STATUS_MOTORS] = _zeros(value=0.0)
+    temperature: array[int8, NUM_STATUS_MOTORS] = _zeros()
+    lost: array[uint32, NUM_STATUS_MOTORS] = _zeros()
+    reserve0: array[uint32, NUM_STATUS_MOTORS] = _zeros()  # 电机错误位，见 main_flask/telemetry_transform.py 中的 MOTOR_ERROR_MAP
+    reserve1: array[uint32, NUM_STATUS_MOTORS] = _zeros()
+
+
+@dataclass
+class DogStatusV3(IdlStruct, typename="DogStatusV3"):
+    """
+    机器人狗状态信息结构体 (V3 - 数组布局)。
+    除电机状态外的字段与 DogStatus 相同。
+    """
+    layout_version: int = DOG_STATUS_LAYOUT_VERSION
+
+    battery_percent: float = 0.0
+    memory_usage_percent: float = 0.0
+    gpu_usage_percent: float = 0.0
+    cpu_usage_percent: float = 0.0
+    timestamp_ns: int = 0
+
+    robot_mode_form: str = ""
+    robot_mode_name: str = ""
+
+    temperatures: 'JetsonTemperatures' = field(default_factory=JetsonTemperatures)
+    power: 'JetsonPower' = field(default_factory=JetsonPower)
+    hardware: 'JetsonHardware' = field(default_factory=JetsonHardware)
+
+    motors: 'MotorStateArrays' = field(default_factory=MotorStateArrays)
+
+
+# --- 按更新频率拆分的状态主题 ---
+# 电机状态从 rt/lowstate 高频采样；Jetson 温度和功耗 1Hz；运动模式和硬件信息只在变化时发布。
+# 网页端只订阅自己需要显示的主题。
+
+DOG_MOTOR_STATE_TOPIC = "DogMotorState"
+DOG_JETSON_HEALTH_TOPIC = "DogJetsonHealth"
+DOG_MODE_INFO_TOPIC = "DogModeInfo"
+
+
+@dataclass
+class DogMotorState(IdlStruct, typename="DogMotorState"):
+    """电机状态和电池电量 (默认50Hz)"""
+    timestamp_ns: int = 0
+    lowstate_tick: int = 0   # LowState_.tick，用于发现丢帧
+    battery_percent: float = 0.0
+    motors: 'MotorStateArrays' = field(default_factory=MotorStateArrays)
+
+
+@dataclass
+class DogJetsonHealth(IdlStruct, typename="DogJetsonHealth"):
+    """Jetson 负载、温度和功耗 (1Hz)"""
+    timestamp_ns: int = 0
+    cpu_usage_percent: float = 0.0
+    gpu_usage_percent: float = 0.0
+    memory_usage_percent: float = 0.0
+    temperatures: 'JetsonTemperatures' = field(default_factory=JetsonTemperatures)
+    power: 'JetsonPower' = field(default_factory=JetsonPower)
+
+
+@dataclass
+class DogModeInfo(IdlStruct, typename="DogModeInfo"):
+    """运动模式和 Jetson 硬件信息 (变化时发布，另有低频重发供后加入的订阅者)"""
+    timestamp_ns: int = 0
+    robot_mode_form: str = ""
+    robot_mode_name: str = ""
+    hardware: 'JetsonHardware' = field(default_factory=JetsonHardware)
+
+
 # --------------------------------------------------------------------------
 # 模块: main_cam_processing
 # 订阅主题: CamControl
@@ -342,7 +433,19 @@ class MyMotionCommand(IdlStruct, typename="MyMotionCommand"):
     x: float = 0.0             # 高级模式下x轴速度
     y: float = 0.0             # 高级模式下y轴速度
     r: float = 0.0             # 高级模式下旋转速度
-    command_id: int = 0        # 特殊指令, e.g., 'q' to exit
+    command_id: int = 0        # 特殊指令, e.g., 'q' to exit；控制网关用作延迟追踪 trace_id
+
+
+@dataclass
+class CommandTrace(IdlStruct, typename="CommandTrace"):
+    """
+    身体控制进程回报的命令延迟打点 (time.monotonic_ns)，由控制网关汇总。
+    未经过的跳为 0。
+    """
+    trace_id: int = 0          # 对应 MyMotionCommand.command_id
+    body_read_ns: int = 0      # 读到DDS消息
+    queue_dequeue_ns: int = 0  # 状态机从队列取出
+    sdk_call_ns: int = 0       # SDK调用返回
 
 
 # --------------------------------------------------------------------------
@@ -362,3 +465,34 @@ class PowerControl(IdlStruct, typename="PowerControl"):
     command_id: int = 0
     # 额外消息，可用于未来扩展
     message: str = ""
+
+
+# --------------------------------------------------------------------------
+# 模块: main_clock_sync
+# 订阅主题: ClockSyncRequest
+# 发布主题: ClockSyncResponse
+# 描述: NTP 式对时，其他机器上的进程据此估计与机器狗 Jetson 的时钟偏差，见 clock_sync.py。
+#       时间戳均为各自的 time.time_ns()。
+# --------------------------------------------------------------------------
+
+CLOCK_SYNC_REQUEST_TOPIC = "ClockSyncRequest"
+CLOCK_SYNC_RESPONSE_TOPIC = "ClockSyncResponse"
+
+
+@dataclass
+class ClockSyncRequest(IdlStruct, typename="ClockSyncRequest"):
+    """对时请求"""
+    client_id: str = ""   # 区分多个客户端，响应原样带回
+    seq: int = 0
+    t1_ns: int = 0        # 客户端发送时刻
+
+
+@dataclass
+class ClockSyncResponse(IdlStruct, typename="ClockSyncResponse"):
+    """对时响应"""
+    client_id: str = ""
+    seq: int = 0
+    t1_ns: int = 0        # 原样带回
+    t2_ns: int = 0        # 服务端收到请求时刻
+    t3_ns: int = 0        # 服务端发送响应时刻
+
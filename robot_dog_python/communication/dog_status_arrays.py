@@ -0,0 +1,143 @@
+# dog_status_arrays.py
+
+"""
+DogStatusV3 电机状态数组的批量转换工具。
+- fill_motor_arrays: 从 unitree_go LowState_.motor_state 直接按字段批量复制
+- motor_arrays_to_numpy / motor_arrays_from_numpy: 与 NumPy 结构化数组互转 (dtype 见 MOTOR_STATE_DTYPE)
+- motor_state_to_numpy: LowState_.motor_state 直接写入结构化数组（遥测记录）
+- to_legacy_dog_status / from_legacy_dog_status: 与旧的108字段 DogStatus (V2) 互转，兼容旧订阅者和旧发布者
+- compose_dog_status: 由拆分后的三个状态主题拼出完整的 DogStatusV3
+"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from dds_data_structure import (DogStatus, DogStatusV3, DogMotorState, DogJetsonHealth, DogModeInfo,
+                                MotorStateArrays, NUM_STATUS_MOTORS)
+
+# 字段名和 NumPy 类型，与 MotorStateArrays / MotorState_ 一致
+MOTOR_FIELDS = (
+    ('mode', np.uint8),
+    ('q', np.float32),
+    ('dq', np.float32),
+    ('ddq', np.float32),
+    ('tau_est', np.float32),
+    ('temperature', np.int8),
+    ('lost', np.uint32),
+    ('reserve0', np.uint32),
+    ('reserve1', np.uint32),
+)
+MOTOR_FIELD_NAMES = tuple(name for name, _ in MOTOR_FIELDS)
+MOTOR_STATE_DTYPE = np.dtype(list(MOTOR_FIELDS))
+
+# DogStatus 与 DogStatusV3 共有的顶层字段（嵌套的 Jetson 结构体直接共用同一对象）
+STATUS_COMMON_FIELDS = (
+    'battery_percent', 'memory_usage_percent', 'gpu_usage_percent', 'cpu_usage_percent', 'timestamp_ns',
+    'robot_mode_form', 'robot_mode_name', 'temperatures', 'power', 'hardware',
+)
+
+
+def _column(value, dtype) -> np.ndarray:
+    # uint8 数组反序列化后是 bytes
+    if isinstance(value, (bytes, bytearray)):
+        return np.frombuffer(value, dtype=dtype)
+    return np.asarray(value, dtype=dtype)
+
+
+def fill_motor_arrays(motors: MotorStateArrays, motor_state) -> MotorStateArrays:
+    """从 LowState_.motor_state（至少12个 MotorState_）复制电机状态"""
+    src = motor_state[:NUM_STATUS_MOTORS]
+    motors.mode = [m.mode for m in src]
+    motors.q = [m.q for m in src]
+    motors.dq = [m.dq for m in src]
+    motors.ddq = [m.ddq for m in src]
+    motors.tau_est = [m.tau_est for m in src]
+    motors.temperature = [m.temperature for m in src]
+    motors.lost = [m.lost for m in src]
+    motors.reserve0 = [m.reserve[0] for m in src]
+    motors.reserve1 = [m.reserve[1] for m in src]
+    return motors
+
+
+def motor_arrays_to_numpy(motors: MotorStateArrays, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """转换为形状 (12,) 的结构化数组；out 不为空时写入 out（避免每条消息分配）"""
+    if out is None:
+        out = np.empty(NUM_STATUS_MOTORS, dtype=MOTOR_STATE_DTYPE)
+    for name, dtype in MOTOR_FIELDS:
+        out[name] = _column(getattr(motors, name), dtype)
+    return out
+
+
+def motor_state_to_numpy(motor_state, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """直接由 LowState_.motor_state 写入形状 (12,) 的结构化数组（不经过 MotorStateArrays）"""
+    if out is None:
+        out = np.empty(NUM_STATUS_MOTORS, dtype=MOTOR_STATE_DTYPE)
+    src = motor_state[:NUM_STATUS_MOTORS]
+    for name in MOTOR_FIELD_NAMES[:7]:  # mode ... lost 与 MotorState_ 同名
+        out[name] = [getattr(m, name) for m in src]
+    out['reserve0'] = [m.reserve[0] for m in src]
+    out['reserve1'] = [m.reserve[1] for m in src]
+    return out
+
+
+def motor_arrays_from_numpy(table: np.ndarray, motors: Optional[MotorStateArrays] = None) -> MotorStateArrays:
+    """由 MOTOR_STATE_DTYPE 结构化数组（或字段名 -> 数组的字典）生成 MotorStateArrays"""
+    if motors is None:
+        motors = MotorStateArrays()
+    for name in MOTOR_FIELD_NAMES:
+        setattr(motors, name, np.asarray(table[name]).tolist())
+    return motors
+
+
+def motor_columns(motors: MotorStateArrays) -> Dict[str, list]:
+    """字段名 -> 12个值的 Python 列表"""
+    return {name: _column(getattr(motors, name), dtype).tolist() for name, dtype in MOTOR_FIELDS}
+
+
+def motor_dicts(motors: MotorStateArrays) -> List[Dict[str, object]]:
+    """每个电机一个字典（与旧的按电机组织的格式相同）"""
+    columns = motor_columns(motors)
+    return [dict(zip(MOTOR_FIELD_NAMES, values)) for values in zip(*columns.values())]
+
+
+def to_legacy_dog_status(status: DogStatusV3) -> DogStatus:
+    """DogStatusV3 -> 旧布局 DogStatus，用于继续向旧订阅者发布"""
+    legacy = DogStatus()
+    for name in STATUS_COMMON_FIELDS:
+        setattr(legacy, name, getattr(status, name))
+    for name, values in motor_columns(status.motors).items():
+        for i, value in enumerate(values):
+            setattr(legacy, f'm{i}_{name}', value)
+    return legacy
+
+
+def from_legacy_dog_status(legacy: DogStatus) -> DogStatusV3:
+    """旧布局 DogStatus -> DogStatusV3，用于接收旧发布者的数据"""
+    status = DogStatusV3()
+    for name in STATUS_COMMON_FIELDS:
+        setattr(status, name, getattr(legacy, name))
+    for name in MOTOR_FIELD_NAMES:
+        setattr(status.motors, name, [getattr(legacy, f'm{i}_{name}') for i in range(NUM_STATUS_MOTORS)])
+    return status
+
+
+def compose_dog_status(motor_state: Optional[DogMotorState], health: Optional[DogJetsonHealth],
+                       mode_info: Optional[DogModeInfo]) -> DogStatusV3:
+    """由最近一次的电机状态、Jetson 状态和模式信息拼出 DogStatusV3，缺少的部分保持默认值"""
+    status = DogStatusV3()
+    if motor_state is not None:
+        status.battery_percent = motor_state.battery_percent
+        status.motors = motor_state.motors
+    if health is not None:
+        status.cpu_usage_percent = health.cpu_usage_percent
+        status.gpu_usage_percent = health.gpu_usage_percent
+        status.memory_usage_percent = health.memory_usage_percent
+        status.temperatures = health.temperatures
+        status.power = health.power
+    if mode_info is not None:
+        status.robot_mode_form = mode_info.robot_mode_form
+        status.robot_mode_name = mode_info.robot_mode_name
+        status.hardware = mode_info.hardware
+    status.timestamp_ns = max(m.timestamp_ns for m in (motor_state, health, mode_info, status) if m is not None)
+    return status
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+身体控制进程的机器人后端
+- SdkBackend：真实 Go2，unitree_sdk2py 在 open() 时才导入
+- SimBackend：本地模拟机器狗，不需要硬件和网络。模拟 SportClient / MotionSwitcherClient 的调用耗时，
+  DDS 通道使用 dds_loopback，rt/lowcmd 的每条命令都记录时间戳，
+  用于在普通 Linux 机器上测试底层循环频率、抖动和状态切换延迟
+open() 之后后端提供 channels（ChannelPublisher/ChannelSubscriber）、msc、sport、low_cmd_publisher、low_cmd。
+"""
+
+import threading
+import time
+from types import SimpleNamespace
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+import dds_loopback
+
+BACKEND_SDK = 'sdk'
+BACKEND_SIM = 'sim'
+
+NUM_MOTOR_SLOTS = 20  # LowCmd_ 中的电机命令数量（Go2 只用前12个）
+NUM_JOINTS = 12
+
+now_ns = time.monotonic_ns
+
+
+class SdkBackend:
+    """真实机器狗：ChannelFactoryInitialize + SDK客户端"""
+
+    name = BACKEND_SDK
+
+    def __init__(self, domain_id: int = 0, network_interface: str = "enP8p1s0"):
+        self.domain_id = domain_id
+        self.network_interface = network_interface
+        self.channels = None
+        self.msc = None
+        self.sport = None
+        self.low_cmd_publisher = None
+        self.low_cmd = None
+
+    def open(self):
+        from unitree_sdk2py.core import channel
+        from unitree_sdk2py.idl.unitree_go.msg.dds_ import LowCmd_
+        from unitree_sdk2py.idl.default import unitree_go_msg_dds__LowCmd_
+        from unitree_sdk2py.comm.motion_switcher.motion_switcher_client import MotionSwitcherClient
+        from unitree_sdk2py.go2.sport.sport_client import SportClient
+
+        channel.ChannelFactoryInitialize(self.domain_id, self.network_interface)
+        self.channels = channel
+        self.msc = MotionSwitcherClient()
+        self.msc.Init()
+        self.sport = SportClient()
+        self.sport.Init()
+        self.low_cmd_publisher = channel.ChannelPublisher("rt/lowcmd", LowCmd_)
+        self.low_cmd_publisher.Init()
+        self.low_cmd = unitree_go_msg_dds__LowCmd_()
+        return self
+
+
+# --------------------------------------------------------------------------
+# 模拟机器狗
+# --------------------------------------------------------------------------
+
+def new_sim_low_cmd():
+    """与 unitree_go_msg_dds__LowCmd_() 字段布局一致的纯Python对象（lowcmd_crc 可直接打包）"""
+    motors = [SimpleNamespace(mode=0, q=0.0, dq=0.0, tau=0.0, kp=0.0, kd=0.0, reserve=[0, 0, 0])
+              for _ in range(NUM_MOTOR_SLOTS)]
+    return SimpleNamespace(
+        head=[0xFE, 0xEF], level_flag=0xFF, frame_reserve=0, sn=[0, 0], version=[0, 0], bandwidth=0,
+        motor_cmd=motors, bms_cmd=SimpleNamespace(off=0, reserve=[0, 0, 0]),
+        wireless_remote=[0] * 40, led=[0] * 12, fan=[0, 0], gpio=0, reserve=0, crc=0)
+
+
+class SimMotionSwitcherClient:
+    """模拟运动模式切换：'ai' 为高层运控，'' 表示已释放（底层控制）"""
+
+    def __init__(self, check_s: float = 0.005, release_s: float = 0.005, select_s: float = 0.3,
+                 initial_mode: str = 'ai'):
+        self.check_s = check_s
+        self.release_s = release_s
+        self.select_s = select_s
+        self.mode = initial_mode
+        self.calls: List[Tuple[str, int]] = []
+
+    def Init(self):
+        pass
+
+    def SetTimeout(self, timeout: float):
+        pass
+
+    def CheckMode(self):
+        self.calls.append(('CheckMode', now_ns()))
+        time.sleep(self.check_s)
+        return 0, {'name': self.mode}
+
+    def ReleaseMode(self):
+        self.calls.append(('ReleaseMode', now_ns()))
+        time.sleep(self.release_s)
+        self.mode = ''
+        return 0, None
+
+    def SelectMode(self, name: str):
+        self.calls.append(('SelectMode', now_ns()))
+        time.sleep(self.select_s)
+        self.mode = name
+        return 0, None
+
+
+class SimSportClient:
+    """模拟高层运控调用，记录每次调用的时间"""
+
+    def __init__(self, call_s: float = 0.05, move_s: float = 0.001):
+        self.call_s = call_s
+        self.move_s = move_s
+        self.calls: List[Tuple[str, int]] = []
+
+    def _call(self, name: str, duration: float):
+        self.calls.append((name, now_ns()))
+        time.sleep(duration)
+        return 0
+
+    def Init(self):
+        pass
+
+    def SetTimeout(self, timeout: float):
+        pass
+
+    def Damp(self):
+        return self._call('Damp', 0.0)
+
+    def StandUp(self):
+        return self._call('StandUp', self.call_s)
+
+    def StandDown(self):
+        return self._call('StandDown', self.call_s)
+
+    def BalanceStand(self):
+        return self._call('BalanceStand', self.call_s)
+
+    def RecoveryStand(self):
+        return self._call('RecoveryStand', self.call_s)
+
+    def StopMove(self):
+        return self._call('StopMove', 0.0)
+
+    def Move(self, vx: float, vy: float, vyaw: float):
+        return self._call('Move', self.move_s)
+
+    def call_times(self, name: str) -> List[int]:
+        return [t for n, t in self.calls if n == name]
+
+
+class LowCmdRecorder:
+    """代替 rt/lowcmd 发布者：记录每条命令的时间戳、12个关节的目标角度和 kp"""
+
+    def __init__(self, capacity: int = 1 << 16):
+        self.capacity = capacity
+        self.times_ns = np.zeros(capacity, dtype=np.int64)
+        self.q = np.zeros((capacity, NUM_JOINTS))
+        self.kp = np.zeros((capacity, NUM_JOINTS))
+        self.count = 0  # 累计写入数，超过容量后循环覆盖
+        self._lock = threading.Lock()
+
+    def Init(self):
+        pass
+
+    def Write(self, cmd, timeout: Optional[float] = None) -> bool:
+        t = now_ns()
+        motors = cmd.motor_cmd
+        with self._lock:
+            i = self.count % self.capacity
+            self.times_ns[i] = t
+            for j in range(NUM_JOINTS):
+                self.q[i, j] = motors[j].q
+                self.kp[i, j] = motors[j].kp
+            self.count += 1
+        return True
+
+    def _ordered(self, array: np.ndarray) -> np.ndarray:
+        if self.count <= self.capacity:
+            return array[:self.count]
+        start = self.count % self.capacity
+        return np.concatenate([array[start:], array[:start]])
+
+    def samples(self, since_ns: int = 0, until_ns: Optional[int] = None):
+        """返回 (times_ns, q, kp)，只包含 [since_ns, until_ns) 内的命令"""
+        with self._lock:
+            times = self._ordered(self.times_ns)
+            q = self._ordered(self.q)
+            kp = self._ordered(self.kp)
+        mask = times >= since_ns
+        if until_ns is not None:
+            mask &= times < until_ns
+        return times[mask], q[mask], kp[mask]
+
+    def first_after(self, t_ns: int, damp: Optional[bool] = None) -> Optional[int]:
+        """t_ns 之后第一条命令的时间；damp=True 只看 kp=0 的阻尼命令，False 只看位置命令"""
+        times, _, kp = self.samples(t_ns)
+        if damp is not None:
+            is_damp = np.all(kp == 0.0, axis=1)
+            times = times[is_damp] if damp else times[~is_damp]
+        return int(times[0]) if len(times) else None
+
+    def rate_summary(self, since_ns: int = 0, until_ns: Optional[int] = None) -> Dict[str, float]:
+        """写入频率和写入间隔分布（ms）"""
+        times, _, _ = self.samples(since_ns, until_ns)
+        if len(times) < 2:
+            return {'writes': len(times), 'hz': 0.0, 'p50_ms': 0.0, 'p99_ms': 0.0, 'max_ms': 0.0}
+        intervals = np.diff(times) / 1e6
+        return {
+            'writes': len(times),
+            'hz': round((len(times) - 1) / ((times[-1] - times[0]) / 1e9), 1),
+            'p50_ms': round(float(np.percentile(intervals, 50)), 3),
+            'p99_ms': round(float(np.percentile(intervals, 99)), 3),
+            'max_ms': round(float(intervals.max()), 3),
+        }
+
+
+class SimBackend:
+    """本地模拟机器狗；DDS 通道走 dds_loopback，可与网关等其他进程内组件互通"""
+
+    name = BACKEND_SIM
+
+    def __init__(self, msc: Optional[SimMotionSwitcherClient] = None, sport: Optional[SimSportClient] = None,
+                 channels=dds_loopback):
+        self.channels = channels
+        self.msc = msc or SimMotionSwitcherClient()
+        self.sport = sport or SimSportClient()
+        self.low_cmd_publisher = LowCmdRecorder()
+        self.low_cmd = None
+
+    def open(self):
+        self.low_cmd = new_sim_low_cmd()
+        return self
+
+
+class SerializedClient:
+    """
+    串行化一个 SDK 客户端的方法调用：同一时刻只有一个 RPC 在进行，后发起的调用等前一个返回后再发出，
+    保证调用到达机器狗的顺序与发起顺序一致。
+    guard 在取得锁之后、发起调用之前执行（unguarded 中的只读方法除外），抛出异常时不发起调用；
+    身体控制器用它拒绝已被取消的切换任务在等锁期间排上的调用。
+    """
+
+    def __init__(self, target, guard=None, unguarded=('CheckMode',)):
+        self._target = target
+        self._guard = guard
+        self._unguarded = frozenset(unguarded)
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name):
+        attr = getattr(self._target, name)
+        if not callable(attr):
+            return attr
+        guard = None if name in self._unguarded else self._guard
+
+        def call(*args, **kwargs):
+            with self._lock:
+                if guard is not None:
+                    guard()
+                return attr(*args, **kwargs)
+        return call
+
+
+def create_backend(name: str = BACKEND_SDK, **kwargs):
+    if name == BACKEND_SIM:
+        return SimBackend(**kwargs)
+    if name == BACKEND_SDK:
+        return SdkBackend(**kwargs)
+    raise ValueError(f"未知的后端: {name}")
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+身体控制进程的命令通道
+- 状态切换/行走命令：FIFO（queue.Queue），每条都要处理
+- 抬腿角度目标：最新值槽，新目标覆盖旧目标，读取方只取最新的一个，
+  不再把角度命令放回共享队列轮询
+"""
+
+import threading
+from typing import Any, Optional
+
+
+class LatestValueSlot:
+    """最新值槽：put 覆盖未读的旧值，take 等待并取走最新值"""
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._value: Any = None
+        self._version = 0
+        self._taken_version = 0
+        self.overwritten = 0  # 未被读取就被覆盖的值的数量
+
+    def put(self, value) -> Optional[Any]:
+        """写入新值，返回被覆盖的未读旧值（没有则返回 None）"""
+        with self._cond:
+            displaced = self._value if self._version != self._taken_version else None
+            if displaced is not None:
+                self.overwritten += 1
+            self._value = value
+            self._version += 1
+            self._cond.notify_all()
+        return displaced
+
+    def take(self, timeout: Optional[float] = None) -> Optional[Any]:
+        """取走未读的最新值；没有新值时最多等待 timeout 秒，超时返回 None"""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._version != self._taken_version, timeout):
+                return None
+            self._taken_version = self._version
+            return self._value
+
+    def poll(self) -> Optional[Any]:
+        """非阻塞地取走未读的最新值"""
+        with self._cond:
+            if self._version == self._taken_version:
+                return None
+            self._taken_version = self._version
+            return self._value
+
+    def clear(self):
+        """丢弃未读的值"""
+        with self._cond:
+            self._taken_version = self._version
+
+    @property
+    def version(self) -> int:
+        return self._version
@@ -4,45 +4,24 @@ import time, sys, threading
 from unitree_sdk2py.core.channel import ChannelPublisher, ChannelFactoryInitialize, ChannelSubscriber
 from unitree_sdk2py.idl.unitree_go.msg.dds_ import LowCmd_, LowState_
 from unitree_sdk2py.idl.default import unitree_go_msg_dds__LowCmd_
-from unitree_sdk2py.utils.crc import CRC
+from lowcmd_crc import LowCmdCrc
 from unitree_sdk2py.comm.motion_switcher.motion_switcher_client import MotionSwitcherClient
 from unitree_sdk2py.go2.sport.sport_client import SportClient
 
 sys.path.append("/home/d3lab/Projects/RemoteControlDog/robot_dog_python/communication")
 from dds_data_structure import MyMotionCommand
+from motion_engine import MotionEngine, GainProfile, RAISE_LEG_STIFF_JOINTS, cycles_to_ms, stiff_gains
 
 pose_buffer = []
 
-def interpolate_pose(start, end, percent):
-    return [(1 - percent) * s + percent * e for s, e in zip(start, end)]
-
 def interpolate_selected_joints(start_pos, target, joint_indices, duration_ms, low_cmd, publisher, crc, kp_override=None, kd_override=None):
-    for step in range(duration_ms):
-        alpha = min(1.0, step / duration_ms)
-        q_interp = interpolate_pose(start_pos, target, alpha)
-        for i in range(12):
-            low_cmd.motor_cmd[i].mode = 0x01
-            low_cmd.motor_cmd[i].q = q_interp[i] if i in joint_indices else start_pos[i]
-            low_cmd.motor_cmd[i].dq = 0.0
-            low_cmd.motor_cmd[i].kp = kp_override[i] if kp_override else 100.0
-            low_cmd.motor_cmd[i].kd = kd_override[i] if kd_override else 8.0
-            low_cmd.motor_cmd[i].tau = 0.0
-        low_cmd.crc = crc.Crc(low_cmd)
-        publisher.Write(low_cmd)
-        time.sleep(0.002)
+    MotionEngine(publisher, low_cmd, crc).move_to(start_pos, target, cycles_to_ms(duration_ms),
+                                                  GainProfile.from_lists(kp_override, kd_override),
+                                                  joint_indices=joint_indices, name="interpolate_selected_joints")
 
 def maintain_dynamic_pose(shared_pose, low_cmd, publisher, crc, stop_flag, kp_profile, kd_profile):
-    while not stop_flag["stop"]:
-        for j in range(12):
-            low_cmd.motor_cmd[j].mode = 0x01
-            low_cmd.motor_cmd[j].q = shared_pose[j]
-            low_cmd.motor_cmd[j].dq = 0.0
-            low_cmd.motor_cmd[j].kp = kp_profile[j]
-            low_cmd.motor_cmd[j].kd = kd_profile[j]
-            low_cmd.motor_cmd[j].tau = 0.0
-        low_cmd.crc = crc.Crc(low_cmd)
-        publisher.Write(low_cmd)
-        time.sleep(0.002)
+    MotionEngine(publisher, low_cmd, crc).hold(shared_pose, GainProfile.from_lists(kp_profile, kd_profile),
+                                               stop=lambda: stop_flag["stop"], name="maintain_dynamic_pose")
 
 def move_joint(index, target):
     while abs(pose_buffer[index] - target) > 0.05:
@@ -77,11 +56,11 @@ def run_lowlevel_leg_control():
 
     publisher = ChannelPublisher("rt/lowcmd", LowCmd_); publisher.Init()
     low_cmd = unitree_go_msg_dds__LowCmd_()
-    crc = CRC()
+    crc = LowCmdCrc()
 
     stand = [0.0, 0.67, -1.3] * 4
-    high_kp = [160.0 if i in [0,1,2,3,4,5,9,10,11] else 100.0 for i in range(12)]
-    high_kd = [10.0 if i in [0,1,2,3,4,5,9,10,11] else 8.0 for i in range(12)]
+    high_gains = stiff_gains(RAISE_LEG_STIFF_JOINTS)
+    high_kp, high_kd = high_gains
 
     step1 = stand[:]; step1[11] -= 0.3; step1[9] += 0.3
     interpolate_selected_joints(stand, step1, [9,11], 650, low_cmd, publisher, crc, high_kp, high_kd)
@@ -107,17 +86,8 @@ def run_lowlevel_leg_control():
     stop_flag = {"stop": False}
 
     def maintain_pose_loop():
-        while not stop_flag["stop"] and not exit_requested():
-            for j in range(12):
-                low_cmd.motor_cmd[j].mode = 0x01
-                low_cmd.motor_cmd[j].q = pose_buffer[j]
-                low_cmd.motor_cmd[j].dq = 0.0
-                low_cmd.motor_cmd[j].kp = high_kp[j]
-                low_cmd.motor_cmd[j].kd = high_kd[j]
-                low_cmd.motor_cmd[j].tau = 0.0
-            low_cmd.crc = crc.Crc(low_cmd)
-            publisher.Write(low_cmd)
-            time.sleep(0.002)
+        MotionEngine(publisher, low_cmd, crc).hold(pose_buffer, high_gains, name="maintain_pose_loop",
+                                                   stop=lambda: stop_flag["stop"] or exit_requested())
 
     def receive_dds_command_loop():
         subscriber = ChannelSubscriber("rt/keyboard_control", MyMotionCommand)
@@ -182,7 +152,7 @@ def lie_down_and_switch_to_ai():
     msc = MotionSwitcherClient(); msc.Init(); msc.SetTimeout(5.0)
     publisher = ChannelPublisher("rt/lowcmd", LowCmd_); publisher.Init()
     low_cmd = unitree_go_msg_dds__LowCmd_()
-    crc = CRC()
+    crc = LowCmdCrc()
 
     stand_pose = [0.0, 0.67, -1.3] * 4
     lie_down_pose = [
@@ -1,30 +1,17 @@
 from unitree_sdk2py.core.channel import ChannelPublisher, ChannelSubscriber
 from unitree_sdk2py.idl.default import unitree_go_msg_dds__LowCmd_
 from unitree_sdk2py.idl.unitree_go.msg.dds_ import LowState_
-from unitree_sdk2py.utils.crc import CRC
+from lowcmd_crc import LowCmdCrc
 from unitree_sdk2py.comm.motion_switcher.motion_switcher_client import MotionSwitcherClient
 import time
-
-def interpolate_pose(start, end, percent):
-    return [(1 - percent) * s + percent * e for s, e in zip(start, end)]
+from motion_engine import MotionEngine, cycles_to_ms
 
 def interpolate_all_joints(start_pos, target_pos, duration_ms, lowcmd, publisher, crc, exit_condition):
-    for step in range(duration_ms):
-        if exit_condition():
-            print("[LowLevelStand] 状态已切换，提前中止插值动作")
-            return
-        alpha = min(1.0, step / duration_ms)
-        pose = interpolate_pose(start_pos, target_pos, alpha)
-        for j in range(12):
-            lowcmd.motor_cmd[j].mode = 0x01
-            lowcmd.motor_cmd[j].q = pose[j]
-            lowcmd.motor_cmd[j].dq = 0
-            lowcmd.motor_cmd[j].kp = 100.0
-            lowcmd.motor_cmd[j].kd = 8.0
-            lowcmd.motor_cmd[j].tau = 0
-        lowcmd.crc = crc.Crc(lowcmd)
-        publisher.Write(lowcmd)
-        time.sleep(0.002)
+    # duration_ms 为2ms周期数
+    engine = MotionEngine(publisher, lowcmd, crc)
+    if not engine.move_to(start_pos, target_pos, cycles_to_ms(duration_ms), stop=exit_condition,
+                          name="interpolate_all_joints"):
+        print("[LowLevelStand] 状态已切换，提前中止插值动作")
 
 def run_lowlevel_stand_hold():
     from main_state_machine import get_current_state, FSMStateEnum
@@ -35,7 +22,7 @@ def run_lowlevel_stand_hold():
     lowcmd = unitree_go_msg_dds__LowCmd_()
     publisher = ChannelPublisher("rt/lowcmd", type(lowcmd))
     publisher.Init()
-    crc = CRC()
+    crc = LowCmdCrc()
 
     # Step 1: 切换到底层控制模式
     msc = MotionSwitcherClient()
@@ -71,16 +58,7 @@ def run_lowlevel_stand_hold():
 
     # Step 5: 保持标准站立姿态
     print("[LowLevelStand] 保持标准站立姿态中...（等待状态切换）")
-    while not exit_requested():
-        for i in range(12):
-            lowcmd.motor_cmd[i].mode = 0x01
-            lowcmd.motor_cmd[i].q = standard_pose[i]
-            lowcmd.motor_cmd[i].dq = 0
-            lowcmd.motor_cmd[i].kp = 100.0
-            lowcmd.motor_cmd[i].kd = 8.0
-            lowcmd.motor_cmd[i].tau = 0
-        lowcmd.crc = crc.Crc(lowcmd)
-        publisher.Write(lowcmd)
-        time.sleep(0.01)
+    MotionEngine(publisher, lowcmd, crc).hold(standard_pose, stop=exit_requested, period_s=0.01,
+                                              name="lowlevel_stand_hold")
 
     print("[LowLevelStand] 检测到状态切换，安全退出站立线程")
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+进程内DDS回环替身
+接口与 unitree_sdk2py.core.channel 的 ChannelPublisher / ChannelSubscriber 一致，
+用于在没有机器狗和网络的环境下测试网关与控制进程之间的数据流。
+"""
+
+import threading
+from collections import defaultdict, deque
+from typing import Callable, Dict, List, Optional
+
+
+class LoopbackBus:
+    """按主题名分发消息的进程内总线"""
+
+    def __init__(self):
+        self._subscribers: Dict[str, List['ChannelSubscriber']] = defaultdict(list)
+        self._lock = threading.Lock()
+
+    def attach(self, name: str, subscriber: 'ChannelSubscriber'):
+        with self._lock:
+            self._subscribers[name].append(subscriber)
+
+    def detach(self, name: str, subscriber: 'ChannelSubscriber'):
+        with self._lock:
+            if subscriber in self._subscribers[name]:
+                self._subscribers[name].remove(subscriber)
+
+    def deliver(self, name: str, msg) -> bool:
+        with self._lock:
+            subscribers = list(self._subscribers[name])
+        for subscriber in subscribers:
+            subscriber._deliver(msg)
+        return True
+
+
+default_bus = LoopbackBus()
+
+
+class ChannelPublisher:
+    def __init__(self, name: str, type_, bus: Optional[LoopbackBus] = None):
+        self.name = name
+        self.type = type_
+        self.bus = bus or default_bus
+
+    def Init(self):
+        pass
+
+    def Write(self, sample, timeout: Optional[float] = None) -> bool:
+        return self.bus.deliver(self.name, sample)
+
+    def Close(self):
+        pass
+
+
+class ChannelSubscriber:
+    def __init__(self, name: str, type_, bus: Optional[LoopbackBus] = None):
+        self.name = name
+        self.type = type_
+        self.bus = bus or default_bus
+        self._handler: Optional[Callable] = None
+        self._samples = deque()
+        self._cond = threading.Condition()
+
+    def Init(self, handler: Optional[Callable] = None, queueLen: int = 0):
+        self._handler = handler
+        if queueLen > 0:
+            self._samples = deque(maxlen=queueLen)
+        self.bus.attach(self.name, self)
+
+    def _deliver(self, msg):
+        # 与 DDS listener 一样，有 handler 时直接回调，否则进入队列等待 Read
+        if self._handler:
+            self._handler(msg)
+            return
+        with self._cond:
+            self._samples.append(msg)
+            self._cond.notify()
+
+    def Read(self, timeout: Optional[float] = None):
+        with self._cond:
+            if not self._samples:
+                self._cond.wait(timeout)
+            return self._samples.popleft() if self._samples else None
+
+    def Close(self):
+        self.bus.detach(self.name, self)
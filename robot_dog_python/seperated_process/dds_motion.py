@@ -6,7 +6,7 @@ import threading
 from unitree_sdk2py.core.channel import ChannelPublisher, ChannelFactoryInitialize, ChannelSubscriber
 from unitree_sdk2py.idl.unitree_go.msg.dds_ import LowCmd_, WirelessController_
 from unitree_sdk2py.idl.default import unitree_go_msg_dds__LowCmd_
-from unitree_sdk2py.utils.crc import CRC
+from lowcmd_crc import LowCmdCrc
 from unitree_sdk2py.comm.motion_switcher.motion_switcher_client import MotionSwitcherClient
 from unitree_sdk2py.go2.sport.sport_client import SportClient
 
@@ -78,7 +78,7 @@ def move_joint(index, target):
 if __name__ == '__main__':
     ChannelFactoryInitialize(0, "enP8p1s0")
     low_cmd = unitree_go_msg_dds__LowCmd_()
-    crc = CRC()
+    crc = LowCmdCrc()
     msc = MotionSwitcherClient(); msc.Init(); msc.SetTimeout(5.0)
     publisher = ChannelPublisher("rt/lowcmd", LowCmd_); publisher.Init()
     sport = SportClient(); sport.Init()
@@ -6,48 +6,27 @@ import threading
 from unitree_sdk2py.core.channel import ChannelPublisher, ChannelFactoryInitialize
 from unitree_sdk2py.idl.unitree_go.msg.dds_ import LowCmd_
 from unitree_sdk2py.idl.default import unitree_go_msg_dds__LowCmd_
-from unitree_sdk2py.utils.crc import CRC
+from lowcmd_crc import LowCmdCrc
 from unitree_sdk2py.comm.motion_switcher.motion_switcher_client import MotionSwitcherClient
 from unitree_sdk2py.go2.sport.sport_client import SportClient
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../unitree_example/go2/low_level")))
 import unitree_legged_const as go2
-
-def interpolate_pose(start, end, percent):
-    return [(1 - percent) * s + percent * e for s, e in zip(start, end)]
+from motion_engine import MotionEngine, GainProfile, RAISE_LEG_STIFF_JOINTS, cycles_to_ms, stiff_gains
 
 def interpolate_selected_joints(start_pos, target, joint_indices, duration_ms, low_cmd, publisher, crc, kp_override=None, kd_override=None):
-    for step in range(duration_ms):
-        alpha = min(1.0, step / duration_ms)
-        q_interp = interpolate_pose(start_pos, target, alpha)
-        for i in range(12):
-            low_cmd.motor_cmd[i].mode = 0x01
-            low_cmd.motor_cmd[i].dq = 0
-            low_cmd.motor_cmd[i].tau = 0
-            low_cmd.motor_cmd[i].q = q_interp[i] if i in joint_indices else start_pos[i]
-            low_cmd.motor_cmd[i].kp = kp_override[i] if kp_override else 100.0
-            low_cmd.motor_cmd[i].kd = kd_override[i] if kd_override else 8.0
-        low_cmd.crc = crc.Crc(low_cmd)
-        publisher.Write(low_cmd)
-        time.sleep(0.002)
+    MotionEngine(publisher, low_cmd, crc).move_to(start_pos, target, cycles_to_ms(duration_ms),
+                                                  GainProfile.from_lists(kp_override, kd_override),
+                                                  joint_indices=joint_indices, name="interpolate_selected_joints")
 
 def maintain_posture(target_pose, low_cmd, publisher, crc, stop_flag, kp_profile=None, kd_profile=None):
-    while not stop_flag["stop"]:
-        for j in range(12):
-            low_cmd.motor_cmd[j].mode = 0x01
-            low_cmd.motor_cmd[j].q = target_pose[j]
-            low_cmd.motor_cmd[j].dq = 0
-            low_cmd.motor_cmd[j].kp = kp_profile[j] if kp_profile else 100.0
-            low_cmd.motor_cmd[j].kd = kd_profile[j] if kd_profile else 8.0
-            low_cmd.motor_cmd[j].tau = 0
-        low_cmd.crc = crc.Crc(low_cmd)
-        publisher.Write(low_cmd)
-        time.sleep(0.002)
+    MotionEngine(publisher, low_cmd, crc).hold(target_pose, GainProfile.from_lists(kp_profile, kd_profile),
+                                               stop=lambda: stop_flag["stop"], name="maintain_posture")
 
 if __name__ == '__main__':
     ChannelFactoryInitialize(0, "enP8p1s0")
     low_cmd = unitree_go_msg_dds__LowCmd_()
-    crc = CRC()
+    crc = LowCmdCrc()
     msc = MotionSwitcherClient(); msc.Init(); msc.SetTimeout(5.0)
     publisher = ChannelPublisher("rt/lowcmd", LowCmd_); publisher.Init()
     sport = SportClient(); sport.Init()
@@ -73,10 +52,7 @@ if __name__ == '__main__':
     stop_flag["stop"] = True; thread.join()
 
     # 三条腿加硬配置
-    high_kp = [100.0]*12; high_kd = [8.0]*12
-    for i in [0,1,2, 3,4,5, 9,10,11]:  # LF, RF, RL
-        high_kp[i] = 160.0
-        high_kd[i] = 10.0
+    high_kp, high_kd = stiff_gains(RAISE_LEG_STIFF_JOINTS)  # LF, RF, RL
 
     # 弯曲左后腿并外摆
     step1 = stand_pos[:]
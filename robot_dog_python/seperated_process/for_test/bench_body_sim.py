@@ -0,0 +1,158 @@
+"""
+身体控制模拟基准（不需要Go2、网络和 unitree_sdk2py，可在CI中运行）
+RobotController 使用 body_backend.SimBackend，命令通过 dds_loopback 发布，按状态机走一遍：
+HIGH_LEVEL_DAMP -> HIGH_LEVEL_STAND -> LOW_LEVEL_STAND -> LOW_LEVEL_RAISE_LEG -> LOW_LEVEL_STAND
+-> LOW_LEVEL_DAMP -> HIGH_LEVEL_STAND
+统计：
+- 每次切换：命令发出 -> 第一条体现新状态的 LowCmd（位置/阻尼/抬腿刚度）、命令发出 -> 切换完成
+  （抬腿在底层线程中先插值再开始跟踪，完成时间以开始发送抬腿刚度命令为准）
+- 保持阶段：rt/lowcmd 实际写入频率和写入间隔（LowCmdRecorder 时间戳），底层循环自身的抖动统计
+用法: python bench_body_sim.py [保持秒数]
+"""
+import sys
+import os
+import io
+import time
+import contextlib
+import threading
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../communication")))
+
+import numpy as np
+
+import dds_loopback
+from dds_data_structure import MyMotionCommand
+from body_backend import SimBackend
+from main_dog_body_control import RobotController, RobotState
+from motion_engine import DEFAULT_KP, STIFF_KP
+
+MIN_HOLD_HZ = 475.0        # 500Hz 保持阶段的最低实际频率
+MIN_DAMP_HZ = 95.0         # 100Hz 阻尼阶段
+TRANSITION_TIMEOUT_S = 15.0
+
+now_ns = time.monotonic_ns
+
+
+# 按 LowCmd 内容判断新状态已生效（kp 为 (N, 12) 数组）
+def position_cmd(kp):
+    return kp[:, 0] > 0.0
+
+
+def damp_cmd(kp):
+    return np.all(kp == 0.0, axis=1)
+
+
+def default_gain_cmd(kp):
+    return kp[:, 0] == DEFAULT_KP
+
+
+def stiff_gain_cmd(kp):
+    return kp[:, 0] == STIFF_KP
+
+
+def wait_for(condition, timeout=TRANSITION_TIMEOUT_S):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.002)
+    return False
+
+
+class Scenario:
+    def __init__(self, hold_s):
+        self.hold_s = hold_s
+        self.backend = SimBackend()
+        self.controller = RobotController(self.backend)
+        self.recorder = self.backend.low_cmd_publisher
+        self.publisher = dds_loopback.ChannelPublisher("rt/my_motion_command", MyMotionCommand)
+        self.transitions = []
+        self.holds = []
+
+    def command(self, command_type=0, state=None, angle1=0.0, angle2=0.0):
+        self.publisher.Write(MyMotionCommand(command_type=command_type, state_enum=state.value if state else 0,
+                                             leg_selection=0, angle1=angle1, angle2=angle2,
+                                             x=0.0, y=0.0, r=0.0, command_id=0))
+
+    def first_matching(self, since_ns, marker):
+        times, _, kp = self.recorder.samples(since_ns)
+        times = times[marker(kp)]
+        return int(times[0]) if len(times) else None
+
+    def transition(self, target, marker=None):
+        c = self.controller
+        sent = now_ns()
+        self.command(state=target)
+        ok = wait_for(lambda: c.current_state == target and not c.transition_in_progress())
+        if marker is not None:
+            ok &= wait_for(lambda: self.first_matching(sent, marker) is not None)
+        done = now_ns()
+        first = self.first_matching(sent, marker) if marker is not None else None
+        self.transitions.append({
+            'target': target.name,
+            'ok': ok,
+            'first_lowcmd_ms': round((first - sent) / 1e6, 2) if first is not None else None,
+            'done_ms': round((done - sent) / 1e6, 1),
+        })
+        return ok
+
+    def hold(self, name, during=None):
+        start = now_ns()
+        if during is not None:
+            during()
+        remaining = self.hold_s - (now_ns() - start) / 1e9
+        if remaining > 0:
+            time.sleep(remaining)
+        self.holds.append((name, self.recorder.rate_summary(start, now_ns())))
+
+    def raise_leg_commands(self):
+        # 50Hz 发送抬腿角度目标，在两个角度之间来回
+        for i in range(int(self.hold_s * 50)):
+            self.command(command_type=1, angle1=0.4 if (i // 25) % 2 else -0.2, angle2=-1.5)
+            time.sleep(0.02)
+
+    def run(self):
+        c = self.controller
+        c.transition_to_high_level_damp()
+        sm_thread = threading.Thread(target=c.state_machine_thread)
+        sm_thread.start()
+        ok = self.transition(RobotState.HIGH_LEVEL_STAND)
+        ok &= self.transition(RobotState.LOW_LEVEL_STAND, position_cmd)
+        self.hold("LOW_LEVEL_STAND")
+        ok &= self.transition(RobotState.LOW_LEVEL_RAISE_LEG, stiff_gain_cmd)
+        self.hold("LOW_LEVEL_RAISE_LEG", self.raise_leg_commands)
+        ok &= self.transition(RobotState.LOW_LEVEL_STAND, default_gain_cmd)
+        ok &= self.transition(RobotState.LOW_LEVEL_DAMP, damp_cmd)
+        self.hold("LOW_LEVEL_DAMP")
+        ok &= self.transition(RobotState.HIGH_LEVEL_STAND)
+        c.running = False
+        sm_thread.join()
+        c.stop_low_level_thread()
+        return ok
+
+
+if __name__ == "__main__":
+    hold_s = float(sys.argv[1]) if len(sys.argv) > 1 else 1.0
+    with contextlib.redirect_stdout(io.StringIO()):
+        scenario = Scenario(hold_s)
+        ok = scenario.run()
+
+    print(f"{'切换目标':22s} {'首条LowCmd(ms)':>15s} {'完成(ms)':>10s}")
+    for t in scenario.transitions:
+        first = '-' if t['first_lowcmd_ms'] is None else f"{t['first_lowcmd_ms']:.2f}"
+        print(f"{t['target']:22s} {first:>15s} {t['done_ms']:10.1f} {'' if t['ok'] else 'TIMEOUT'}")
+
+    print(f"\n{'保持阶段':22s} {'写入':>6s} {'频率Hz':>8s} {'间隔p50ms':>10s} {'p99ms':>8s} {'maxms':>8s}")
+    for name, s in scenario.holds:
+        print(f"{name:22s} {s['writes']:6d} {s['hz']:8.1f} {s['p50_ms']:10.3f} {s['p99_ms']:8.3f} {s['max_ms']:8.3f}")
+        ok &= s['hz'] >= (MIN_DAMP_HZ if name == "LOW_LEVEL_DAMP" else MIN_HOLD_HZ)
+
+    print("\n底层循环统计:")
+    for name, s in scenario.controller.loop_stats.items():
+        j = s['jitter']
+        print(f"  {name:28s} {s['actual_hz']}/{s['target_hz']} Hz  missed={s['missed']}  "
+              f"jitter p50={j['p50_us']}us p99={j['p99_us']}us max={j['max_us']}us")
+
+    print("PASS" if ok else "FAIL")
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,97 @@
+"""
+命令 -> sport.Move 延迟：定时轮询读取 vs DDS回调
+通过 dds_loopback 在进程内发布 MyMotionCommand（平均50Hz的泊松到达，模拟网关的突发命令），
+分别用原来的 Read(timeout=0.1)+sleep(10ms) 监听线程和 ChannelSubscriber handler 回调
+驱动同一个身体控制状态机，统计从 Write 到 sport.Move 被调用的延迟。
+使用 body_backend.SimBackend，不需要 unitree_sdk2py。
+用法: python bench_command_latency.py [命令数量]
+"""
+import sys
+import os
+import time
+import io
+import random
+import contextlib
+import threading
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../communication")))
+
+import dds_loopback
+from dds_data_structure import MyMotionCommand
+from body_backend import SimBackend
+from main_dog_body_control import RobotController, RobotState
+
+TOPIC = "rt/my_motion_command"
+SEND_PERIOD_S = 0.02  # 平均发送间隔
+
+now = time.monotonic
+
+
+class BenchController(RobotController):
+    def __init__(self):
+        super().__init__(SimBackend())
+
+    def start_threads(self):
+        return [threading.Thread(target=self.state_machine_thread)]
+
+
+class PollingController(BenchController):
+    """原实现：监听线程 Read(timeout=0.1) 后固定 sleep 10ms"""
+
+    def _init_backend(self):
+        super()._init_backend()
+        self.dds_subscriber.Close()
+        self.dds_subscriber = dds_loopback.ChannelSubscriber(TOPIC, MyMotionCommand)
+        self.dds_subscriber.Init()
+
+    def dds_listener_thread(self):
+        while self.running:
+            msg = self.dds_subscriber.Read(timeout=0.1)
+            if msg:
+                self.route_command(msg)
+            time.sleep(0.01)
+
+    def start_threads(self):
+        return super().start_threads() + [threading.Thread(target=self.dds_listener_thread)]
+
+
+def measure(controller_cls, count):
+    controller = controller_cls()
+    controller.current_state = RobotState.HIGH_LEVEL_STAND
+    threads = controller.start_threads()
+    for t in threads:
+        t.start()
+    publisher = dds_loopback.ChannelPublisher(TOPIC, MyMotionCommand)
+    sent = []
+    for _ in range(count):
+        time.sleep(random.expovariate(1.0 / SEND_PERIOD_S))
+        sent.append(now())
+        publisher.Write(MyMotionCommand(command_type=2, state_enum=0, leg_selection=0,
+                                        angle1=0.0, angle2=0.0, x=0.1, y=0.0, r=0.0, command_id=0))
+    time.sleep(0.2)
+    controller.running = False
+    controller.dds_subscriber.Close()
+    for t in threads:
+        t.join()
+    moves = np.array(controller.sport.call_times('Move')) / 1e9
+    return moves[:len(sent)] - np.array(sent[:len(moves)]), len(moves)
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    ok = True
+    results = {}
+    for name, cls in (("轮询", PollingController), ("回调", BenchController)):
+        with contextlib.redirect_stdout(io.StringIO()):
+            latency, moves = measure(cls, count)
+        ms = latency * 1000.0
+        results[name] = np.percentile(ms, 99)
+        ok &= moves == count
+        print(f"{name}: Move {moves}/{count}  p50={np.percentile(ms, 50):.3f}ms  "
+              f"p99={np.percentile(ms, 99):.3f}ms  max={ms.max():.3f}ms")
+    ok &= results["回调"] < results["轮询"]
+    print("PASS" if ok else "FAIL")
+    sys.exit(0 if ok else 1)
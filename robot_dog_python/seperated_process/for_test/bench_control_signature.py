@@ -0,0 +1,44 @@
+"""
+控制网关签名验证基准测试
+单核测量 SecurityManager.verify_datagram 的吞吐量，目标 >= 10k 包/秒
+用法: python bench_control_signature.py [数据包数量]
+"""
+import sys
+import os
+import json
+import time
+import logging
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from main_control_gateway import SecurityManager, SHARED_SECRET_KEY
+
+TARGET_PPS = 10000
+
+if __name__ == "__main__":
+    logging.disable(logging.CRITICAL)
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+
+    security = SecurityManager(SHARED_SECRET_KEY)
+    payload = json.dumps({
+        'timestamp': time.time(),
+        'data': {'command_type': 'xyr_control', 'target': 'body',
+                 'data': {'x': 0.25, 'y': 0.0, 'r': -0.1}}
+    }).encode('utf-8')
+    datagram = security.sign_datagram(payload)
+    tampered = datagram[:-1] + bytes([datagram[-1] ^ 0xFF])
+
+    assert security.verify_datagram(datagram) == payload
+    assert security.verify_datagram(tampered) is None
+
+    verify = security.verify_datagram
+    start = time.perf_counter()
+    for _ in range(count):
+        verify(datagram)
+    elapsed = time.perf_counter() - start
+
+    pps = count / elapsed
+    print(f"数据包大小: {len(datagram)} 字节")
+    print(f"验证 {count} 个数据包耗时 {elapsed:.3f}s")
+    print(f"吞吐量: {pps:,.0f} 包/秒 ({elapsed / count * 1e6:.2f} us/包)")
+    print("PASS" if pps >= TARGET_PPS else "FAIL", f"(目标 {TARGET_PPS} 包/秒)")
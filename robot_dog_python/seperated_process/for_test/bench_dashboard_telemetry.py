@@ -0,0 +1,166 @@
+"""
+网页遥测推送对比（模拟时钟，不需要 Flask / DDS 网络）
+- 原实现：每个 DogMotorState 样本 (50Hz) 都生成完整状态（12个电机字典和错误字符串）并广播，
+  无数据时每100ms也广播一次
+- 现实现：main_flask/telemetry_stream 以 DASHBOARD_UPDATE_HZ 生成快照，只发送变化的字段，定期关键帧；
+  慢客户端（ack 延迟 SLOW_ACK_S）跳过中间帧
+检查：每个客户端按网页的合并规则重建的状态与服务器发送时的快照一致；统计字节率和每秒CPU。
+用法: python bench_dashboard_telemetry.py [模拟秒数]
+"""
+import sys
+import os
+import json
+import copy
+import time
+import heapq
+import math
+import random
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../communication")))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../main_flask")))
+
+import telemetry_stream
+from telemetry_stream import TelemetryStream, status_snapshot, DASHBOARD_UPDATE_HZ
+from telemetry_transform import decode_motor_errors
+from dds_data_structure import MotorStateArrays
+from dog_status_arrays import motor_columns, motor_dicts
+
+SAMPLE_HZ = 50.0
+FAST_ACK_S = 0.01
+SLOW_ACK_S = 0.35
+
+
+class SimClock:
+    def __init__(self):
+        self.t = 0.0
+
+    def __call__(self):
+        return self.t
+
+
+def motor_sample(t):
+    """站立时关节只有微小噪声；第 10~20 秒抬起一条腿做正弦运动"""
+    motors = MotorStateArrays()
+    base = [0.0, 0.67, -1.3] * 4
+    q = [b + random.gauss(0.0, 2e-4) for b in base]
+    dq = [random.gauss(0.0, 2e-4) for _ in base]
+    if 10.0 <= t < 20.0:
+        for j in (0, 1, 2):
+            q[j] += 0.3 * math.sin(2 * math.pi * 0.5 * t + j)
+            dq[j] = 0.3 * math.pi * math.cos(2 * math.pi * 0.5 * t + j)
+    motors.q, motors.dq = q, dq
+    motors.ddq = [0.0] * 12
+    motors.tau_est = [round(random.gauss(2.0, 0.0003), 4) for _ in base]
+    motors.temperature = [35] * 12
+    motors.mode = [1] * 12
+    return motors
+
+
+def base_status():
+    return {"battery_percent": 87.0, "cpu_usage_percent": 23.4, "gpu_usage_percent": 5.0,
+            "memory_usage_percent": 41.2, "latency_ms": 0.0, "robot_mode_form": "", "robot_mode_name": "ai",
+            "temp_cpu": 48.1, "temp_gpu": 46.9, "power_nv_power_total": 7421.0, "hardware_uptime_seconds": 3600,
+            "hardware_jetson_clocks_on": False, "status_message": "Data received successfully.",
+            "data_received": True}
+
+
+def legacy_status(status, motors):
+    """原实现每个样本生成的完整状态"""
+    full = dict(status)
+    full["motors"] = motor_dicts(motors)
+    for motor in full["motors"]:
+        motor['error_str'] = decode_motor_errors(motor['reserve0'])
+    return full
+
+
+def apply_frame(state, frame):
+    """与 index.html 中 applyStatusFrame 相同的合并规则"""
+    if frame['key']:
+        return copy.deepcopy(frame['data'])
+    for key, value in frame['data'].items():
+        if key == 'motors':
+            for i, fields in value.items():
+                state['motors'][int(i)].update(fields)
+        else:
+            state[key] = value
+    return state
+
+
+def run(duration_s):
+    random.seed(3)
+    clock = SimClock()
+    telemetry_stream.now = clock
+    sent = {}           # sid -> [(frame, snapshot)]
+    acks = []           # (due_time, seq, callback)
+    ack_delay = {'fast': FAST_ACK_S, 'slow': SLOW_ACK_S}
+    snapshots = {}
+
+    def emit(sid, frame, callback):
+        sent[sid].append((json.loads(json.dumps(frame)), snapshots['current']))
+        heapq.heappush(acks, (clock.t + ack_delay[sid], frame['seq'], callback))
+
+    stream = TelemetryStream(emit)
+    for sid in ack_delay:
+        sent[sid] = []
+        stream.add_client(sid)
+
+    legacy_bytes = 0
+    legacy_cpu = 0.0
+    new_cpu = 0.0
+    status = base_status()
+    latest_motors = None
+    n_samples = int(duration_s * SAMPLE_HZ)
+    ui_period = 1.0 / DASHBOARD_UPDATE_HZ
+    next_ui = 0.0
+    for k in range(n_samples):
+        clock.t = k / SAMPLE_HZ
+        while acks and acks[0][0] <= clock.t:
+            heapq.heappop(acks)[2]()
+        latest_motors = motor_sample(clock.t)
+        status["latency_ms"] = random.uniform(0.8, 3.0)
+        if k % int(SAMPLE_HZ) == 0:  # Jetson 状态 1Hz
+            status["cpu_usage_percent"] = round(random.uniform(20, 30), 1)
+            status["hardware_uptime_seconds"] += 1
+
+        start = time.perf_counter()
+        legacy_bytes += len(json.dumps(legacy_status(status, latest_motors)))
+        legacy_cpu += time.perf_counter() - start
+
+        if clock.t + 1e-9 >= next_ui:
+            next_ui += ui_period
+            start = time.perf_counter()
+            snapshots['current'] = status_snapshot(dict(status), motor_columns(latest_motors), decode_motor_errors)
+            stream.tick(lambda: snapshots['current'])
+            new_cpu += time.perf_counter() - start
+
+    ok = True
+    for sid, frames in sent.items():
+        state = None
+        consistent = True
+        for frame, snapshot in frames:
+            state = apply_frame(state, frame)
+            consistent &= state == snapshot
+        keyframes = sum(1 for f, _ in frames if f['key'])
+        print(f"  客户端 {sid}: {len(frames)} 帧（关键帧 {keyframes}）, 重建状态一致: {'ok' if consistent else 'FAIL'}")
+        ok &= consistent
+    return ok, legacy_bytes / duration_s, stream.bytes_total / duration_s, legacy_cpu, new_cpu, stream, sent
+
+
+if __name__ == "__main__":
+    duration_s = float(sys.argv[1]) if len(sys.argv) > 1 else 30.0
+    ok, legacy_bps, new_bps, legacy_cpu, new_cpu, stream, sent = run(duration_s)
+    clients = len(sent)
+    # 原实现是广播，每个客户端都收到每一帧
+    legacy_bps_all = legacy_bps * clients
+    print(f"原实现: {SAMPLE_HZ:.0f}Hz 完整状态广播, {legacy_bps_all / 1024:.1f} KiB/s（{clients}个客户端）, "
+          f"CPU {legacy_cpu / duration_s * 1000:.2f} ms/s")
+    print(f"现实现: {DASHBOARD_UPDATE_HZ:.0f}Hz 增量, {new_bps / 1024:.2f} KiB/s, CPU {new_cpu / duration_s * 1000:.2f} ms/s, "
+          f"{stream.stats()}")
+    slow_frames = len(sent['slow'])
+    fast_frames = len(sent['fast'])
+    print(f"慢客户端 (ack {SLOW_ACK_S * 1000:.0f}ms) 收到 {slow_frames} 帧，快客户端 {fast_frames} 帧")
+    ok &= new_bps < legacy_bps_all / 5
+    ok &= new_cpu < legacy_cpu
+    ok &= slow_frames < fast_frames / 2 and stream.coalesced > 0
+    print("PASS" if ok else "FAIL")
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,144 @@
+"""
+DogStatus (V2, 108个展开字段) 与 DogStatusV3 (电机状态定长数组) 对比
+- 序列化后的字节数
+- 发布端每条消息的CPU：从 LowState_.motor_state 填充 + serialize
+- 订阅端每条消息的CPU：deserialize + 生成网页用的电机字典列表 (main_flask)
+- 兼容转换 / NumPy 转换的往返一致性
+需要真实的 cyclonedds（只用到纯Python的IDL序列化，不需要DDS网络），不需要 unitree_sdk2py。
+用法: python bench_dog_status.py [每组消息数]
+"""
+import sys
+import os
+import time
+import random
+from types import SimpleNamespace
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../communication")))
+
+from dds_data_structure import DogStatus, DogStatusV3
+from dog_status_arrays import (fill_motor_arrays, motor_dicts, motor_arrays_to_numpy, motor_arrays_from_numpy,
+                               to_legacy_dog_status, from_legacy_dog_status, MOTOR_FIELD_NAMES)
+
+NUM_MOTORS = 12
+
+
+def f32(x):
+    return float(np.float32(x))
+
+
+def fake_motor_state():
+    """与 MotorState_ 字段相同的20个电机（值都可由 float32 精确表示）"""
+    return [SimpleNamespace(mode=1, q=f32(random.uniform(-2, 2)), dq=f32(random.uniform(-5, 5)),
+                            ddq=f32(random.uniform(-50, 50)), tau_est=f32(random.uniform(-10, 10)),
+                            temperature=random.randint(25, 60), lost=random.randint(0, 3),
+                            reserve=[random.choice((0, 0, 0, 1 << 7)), 0])
+            for _ in range(20)]
+
+
+def fill_legacy(msg, motor_state):
+    """原 main_dog_status 的填充方式"""
+    for i in range(NUM_MOTORS):
+        motor = motor_state[i]
+        setattr(msg, f'm{i}_mode', motor.mode)
+        setattr(msg, f'm{i}_q', motor.q)
+        setattr(msg, f'm{i}_dq', motor.dq)
+        setattr(msg, f'm{i}_ddq', motor.ddq)
+        setattr(msg, f'm{i}_tau_est', motor.tau_est)
+        setattr(msg, f'm{i}_temperature', motor.temperature)
+        setattr(msg, f'm{i}_lost', motor.lost)
+        setattr(msg, f'm{i}_reserve0', motor.reserve[0])
+        setattr(msg, f'm{i}_reserve1', motor.reserve[1])
+
+
+def read_legacy(msg):
+    """原 main_flask 的读取方式"""
+    return [{
+        'mode': getattr(msg, f'm{i}_mode', 0), 'q': getattr(msg, f'm{i}_q', 0.0),
+        'dq': getattr(msg, f'm{i}_dq', 0.0), 'ddq': getattr(msg, f'm{i}_ddq', 0.0),
+        'tau_est': getattr(msg, f'm{i}_tau_est', 0.0), 'temperature': getattr(msg, f'm{i}_temperature', 0),
+        'lost': getattr(msg, f'm{i}_lost', 0), 'reserve0': getattr(msg, f'm{i}_reserve0', 0),
+    } for i in range(NUM_MOTORS)]
+
+
+def publish_legacy(motor_state):
+    msg = DogStatus()
+    fill_legacy(msg, motor_state)
+    msg.timestamp_ns = time.time_ns()
+    return msg.serialize()
+
+
+def publish_v3(motor_state):
+    msg = DogStatusV3()
+    fill_motor_arrays(msg.motors, motor_state)
+    msg.timestamp_ns = time.time_ns()
+    return msg.serialize()
+
+
+def receive_legacy(data):
+    return read_legacy(DogStatus.deserialize(data))
+
+
+def receive_v3(data):
+    return motor_dicts(DogStatusV3.deserialize(data).motors)
+
+
+def per_message_us(fn, inputs):
+    for x in inputs[:50]:
+        fn(x)
+    start = time.perf_counter_ns()
+    for x in inputs:
+        fn(x)
+    return (time.perf_counter_ns() - start) / len(inputs) / 1e3
+
+
+def check_round_trips(motor_state):
+    ok = True
+    v3 = DogStatusV3(battery_percent=81.0, robot_mode_name='ai')
+    fill_motor_arrays(v3.motors, motor_state)
+    v3 = DogStatusV3.deserialize(v3.serialize())
+
+    legacy = DogStatus.deserialize(to_legacy_dog_status(v3).serialize())
+    back = from_legacy_dog_status(legacy)
+    ok &= legacy.battery_percent == 81.0 and legacy.robot_mode_name == 'ai'
+    ok &= read_legacy(legacy) == [{k: v for k, v in m.items() if k != 'reserve1'} for m in motor_dicts(v3.motors)]
+    ok &= motor_dicts(back.motors) == motor_dicts(v3.motors)
+
+    table = motor_arrays_to_numpy(v3.motors)
+    ok &= motor_dicts(motor_arrays_from_numpy(table)) == motor_dicts(v3.motors)
+    for name in MOTOR_FIELD_NAMES:
+        expected = [m.reserve[int(name[-1])] if name.startswith('reserve') else getattr(m, name)
+                    for m in motor_state[:NUM_MOTORS]]
+        ok &= table[name].tolist() == expected
+    print(f"往返一致性 (V3 <-> 旧布局, V3 <-> NumPy): {'ok' if ok else 'FAIL'}")
+    return ok
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    random.seed(1)
+    states = [fake_motor_state() for _ in range(200)]
+    inputs = [states[i % len(states)] for i in range(count)]
+
+    ok = check_round_trips(states[0])
+
+    legacy_bytes = [publish_legacy(s) for s in states]
+    v3_bytes = [publish_v3(s) for s in states]
+    sizes = (len(legacy_bytes[0]), len(v3_bytes[0]))
+
+    pub = (per_message_us(publish_legacy, inputs), per_message_us(publish_v3, inputs))
+    legacy_in = [legacy_bytes[i % len(states)] for i in range(count)]
+    v3_in = [v3_bytes[i % len(states)] for i in range(count)]
+    sub = (per_message_us(receive_legacy, legacy_in), per_message_us(receive_v3, v3_in))
+
+    print(f"{'':<22}{'DogStatus(V2)':>14}{'DogStatusV3':>14}")
+    print(f"{'序列化字节数':<16}{sizes[0]:>14}{sizes[1]:>14}")
+    print(f"{'发布端 us/条':<17}{pub[0]:>14.1f}{pub[1]:>14.1f}")
+    print(f"{'订阅端 us/条':<17}{sub[0]:>14.1f}{sub[1]:>14.1f}")
+
+    ok &= sizes[1] < sizes[0]
+    ok &= pub[1] < pub[0]
+    ok &= sub[1] < sub[0]
+    print("PASS" if ok else "FAIL")
+    sys.exit(0 if ok else 1)
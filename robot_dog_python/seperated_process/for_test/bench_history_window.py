@@ -0,0 +1,151 @@
+"""
+网页历史曲线检查（不需要 Flask / DDS 网络）
+- main_flask/telemetry_history 的 MetricHistory 以 10 Hz 写满一小时（环形缓冲已回绕）
+- 检查：window() 每个桶的 min/max/mean 与逐桶 Python 计算一致（float32 精度）；
+        没有数据的时间段不产生桶；整桶 NaN（例如电机数据缺失）输出 None；未知指标抛出 ValueError
+- 对比：浏览器重新连接后画一小时曲线，原来只能从头累计 dog_status_update（36000 个 JSON 快照），
+        现在一次 request_history 取回 300 个桶
+用法: python bench_history_window.py [秒数]
+"""
+import sys
+import os
+import json
+import math
+import time
+import random
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../communication")))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../main_flask")))
+
+import numpy as np
+
+from telemetry_history import MetricHistory, HISTORY_RATE_HZ, DEFAULT_POINTS
+from telemetry_stream import status_snapshot
+from telemetry_transform import decode_motor_errors
+from dds_data_structure import MotorStateArrays
+from dog_status_arrays import motor_columns
+
+GAP = (1000.0, 1300.0)  # 这段时间没有收到数据
+NO_MOTORS = (2000.0, 2100.0)  # 这段时间只有 Jetson 状态，没有电机数据
+
+
+def sample(rng):
+    motors = MotorStateArrays()
+    motors.mode = [1] * 12
+    motors.q = [rng.uniform(-1.5, 1.5) for _ in range(12)]
+    motors.dq = [0.0] * 12
+    motors.ddq = [0.0] * 12
+    motors.tau_est = [rng.uniform(-5, 5) for _ in range(12)]
+    motors.temperature = [rng.randint(30, 60) for _ in range(12)]
+    motors.lost = [0] * 12
+    motors.reserve0 = [0] * 12
+    motors.reserve1 = [0] * 12
+    status = {"battery_percent": rng.uniform(20, 100), "cpu_usage_percent": rng.uniform(10, 60),
+              "gpu_usage_percent": 5.0, "memory_usage_percent": 41.2, "latency_ms": rng.uniform(0.5, 3),
+              "robot_mode_form": "", "robot_mode_name": "ai", "temp_cpu": rng.uniform(45, 50), "temp_gpu": 46.9,
+              "power_nv_power_total": 7421.0, "hardware_uptime_seconds": 3600, "hardware_jetson_clocks_on": True,
+              "status_message": "Data received successfully.", "data_received": True}
+    return status, motors
+
+
+def fill(seconds, rng):
+    """多写 10% 让环形缓冲回绕；返回写入的 (t, status, motors) 中仍在缓冲里的部分"""
+    history = MetricHistory(capacity=int(seconds * HISTORY_RATE_HZ))
+    total = int(seconds * 1.1 * HISTORY_RATE_HZ)
+    t0 = 0.0
+    kept = []
+    pool = [sample(rng) for _ in range(200)]
+    for i in range(total):
+        t = t0 + i / HISTORY_RATE_HZ
+        if GAP[0] <= t - seconds * 0.1 < GAP[1]:
+            continue
+        status, motors = pool[i % len(pool)]
+        if NO_MOTORS[0] <= t - seconds * 0.1 < NO_MOTORS[1]:
+            motors = None
+        history.append(status, motors, t=t)
+        kept.append((t, status, motors))
+    return history, kept[-history.capacity:]
+
+
+def naive_window(kept, name, start, end, points):
+    width = (end - start) / points
+    buckets = {}
+    for t, status, motors in kept:
+        if not start <= t < end:
+            continue
+        if name.startswith('motor'):
+            index, field = name[5:].split('_', 1)
+            value = getattr(motors, field)[int(index)] if motors is not None else math.nan
+        else:
+            value = status.get(name, math.nan)
+        buckets.setdefault(min(int((t - start) / width), points - 1), []).append(float(np.float32(value)))
+    t, mins, maxs, means = [], [], [], []
+    for b in sorted(buckets):
+        valid = [v for v in buckets[b] if not math.isnan(v)]
+        t.append(start + b * width)
+        mins.append(min(valid) if valid else None)
+        maxs.append(max(valid) if valid else None)
+        means.append(sum(valid) / len(valid) if valid else None)
+    return t, {'min': mins, 'max': maxs, 'mean': means}
+
+
+def close(expected, actual):
+    if expected is None or actual is None:
+        return expected is None and actual is None
+    return math.isclose(expected, actual, rel_tol=1e-5, abs_tol=2e-3)
+
+
+def check(history, kept, seconds):
+    end = kept[-1][0] + 1.0
+    start = end - seconds
+    names = ['battery_percent', 'temp_cpu', 'motor3_tau_est', 'motor11_temperature']
+    window = history.window(names, start, end, DEFAULT_POINTS)
+    ok = True
+    for name in names:
+        t, expected = naive_window(kept, name, start, end, DEFAULT_POINTS)
+        ok &= len(t) == len(window['t']) and all(close(a, b) for a, b in zip(t, window['t']))
+        for kind in ('min', 'max', 'mean'):
+            ok &= all(close(a, b) for a, b in zip(expected[kind], window['series'][name][kind]))
+    gap_buckets = DEFAULT_POINTS - len(window['t'])
+    none_buckets = window['series']['motor3_tau_est']['mean'].count(None)
+    ok &= gap_buckets > 0 and none_buckets > 0 and window['series']['battery_percent']['mean'].count(None) == 0
+    print(f"与逐桶计算一致: {'ok' if ok else 'FAIL'}（无数据的桶 {gap_buckets} 个，无电机数据的桶 {none_buckets} 个）")
+    try:
+        history.window(['no_such_metric'], start, end)
+        unknown_ok = False
+    except ValueError:
+        unknown_ok = True
+    print(f"未知指标抛出 ValueError: {'ok' if unknown_ok else 'FAIL'}")
+    return ok and unknown_ok, window, start, end
+
+
+def bench(history, kept, start, end):
+    start_t = time.perf_counter()
+    repeat = 20
+    for _ in range(repeat):
+        window = history.window(['motor3_tau_est'], start, end, DEFAULT_POINTS)
+        payload = json.dumps(window)
+    window_ms = (time.perf_counter() - start_t) / repeat * 1000
+
+    snapshots = kept[::10]  # 只计时 1/10，再按比例换算
+    start_t = time.perf_counter()
+    replay_bytes = 0
+    for _, status, motors in snapshots:
+        if motors is None:
+            continue
+        replay_bytes += len(json.dumps(status_snapshot(dict(status), motor_columns(motors), decode_motor_errors)))
+    scale = len(kept) / len(snapshots)
+    replay_ms = (time.perf_counter() - start_t) * 1000 * scale
+    replay_bytes *= scale
+    print(f"一小时曲线（{len(kept)} 个样本）: 逐帧 JSON 快照 {replay_bytes / 1e6:.1f} MB, 生成 {replay_ms:.0f} ms; "
+          f"request_history {len(payload) / 1e3:.1f} kB, {window_ms:.2f} ms")
+    return len(payload) * 100 < replay_bytes and window_ms < replay_ms / 10
+
+
+if __name__ == "__main__":
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 3600.0
+    history, kept = fill(seconds, random.Random(3))
+    ok, window, start, end = check(history, kept, seconds)
+    ok &= bench(history, kept, start, end)
+    print("PASS" if ok else "FAIL")
+    sys.exit(0 if ok else 1)
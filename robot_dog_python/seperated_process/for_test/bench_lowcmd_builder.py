@@ -0,0 +1,100 @@
+"""
+LowCmd 填充基准测试
+比较原来的逐电机属性赋值 + 每周期CRC 与 LowCmdBuilder（只写变化字段、命令不变时复用CRC），
+输出纯Python单核可达到的周期数/秒（500Hz 控制需要 >= 500），每种实现重复 REPEATS 次取最快的一次。
+安装了 unitree_sdk2py 时使用真实的 LowCmd_；否则使用同字段布局的替身。CRC 使用 lowcmd_crc.LowCmdCrc。
+用法: python bench_lowcmd_builder.py [每个场景的周期数]
+"""
+import sys
+import os
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from lowcmd_builder import LowCmdBuilder
+from lowcmd_crc import LowCmdCrc
+
+try:
+    from unitree_sdk2py.idl.default import unitree_go_msg_dds__LowCmd_
+    SDK_AVAILABLE = True
+except ImportError:
+    SDK_AVAILABLE = False
+
+STAND = [0.0, 0.67, -1.3] * 4
+REPEATS = 3
+
+
+def make_low_cmd():
+    if SDK_AVAILABLE:
+        return unitree_go_msg_dds__LowCmd_(), LowCmdCrc()
+    motors = [SimpleNamespace(mode=0, q=0.0, dq=0.0, tau=0.0, kp=0.0, kd=0.0, reserve=[0, 0, 0])
+              for _ in range(20)]
+    low_cmd = SimpleNamespace(
+        head=[0xFE, 0xEF], level_flag=0xFF, frame_reserve=0, sn=[0, 0], version=[0, 0], bandwidth=0,
+        motor_cmd=motors, bms_cmd=SimpleNamespace(off=0, reserve=[0, 0, 0]),
+        wireless_remote=[0] * 40, led=[0] * 12, fan=[0, 0], gpio=0, reserve=0, crc=0)
+    return low_cmd, LowCmdCrc()
+
+
+def legacy_tick(low_cmd, crc, pose, kp, kd):
+    for i in range(12):
+        low_cmd.motor_cmd[i].mode = 0x01
+        low_cmd.motor_cmd[i].q = pose[i]
+        low_cmd.motor_cmd[i].dq = 0.0
+        low_cmd.motor_cmd[i].kp = kp
+        low_cmd.motor_cmd[i].kd = kd
+        low_cmd.motor_cmd[i].tau = 0.0
+    low_cmd.crc = crc.Crc(low_cmd)
+
+
+def poses(scenario, ticks):
+    """每个场景的逐周期目标姿态：hold 静止，interp2 两个关节插值，interp12 全部关节插值"""
+    start = np.array(STAND)
+    end = start.copy()
+    if scenario == 'interp2':
+        end[[1, 2]] += [-1.0, -0.8]
+    elif scenario == 'interp12':
+        end = np.array([-0.35, 1.36, -2.65, 0.35, 1.36, -2.65, -0.5, 1.36, -2.65, 0.5, 1.36, -2.65])
+    alphas = np.linspace(0.0, 1.0, ticks)
+    return [start + a * (end - start) for a in alphas]
+
+
+def bench(scenario, ticks):
+    targets = poses(scenario, ticks)
+    target_lists = [t.tolist() for t in targets]
+
+    legacy_tps = builder_tps = 0.0
+    for _ in range(REPEATS):
+        low_cmd, crc = make_low_cmd()
+        start = time.perf_counter()
+        for pose in target_lists:
+            legacy_tick(low_cmd, crc, pose, 100.0, 8.0)
+        legacy_tps = max(legacy_tps, ticks / (time.perf_counter() - start))
+
+        low_cmd, crc = make_low_cmd()
+        builder = LowCmdBuilder(low_cmd, crc)
+        start = time.perf_counter()
+        for pose in targets:
+            builder.pose_cmd(pose)
+        builder_tps = max(builder_tps, ticks / (time.perf_counter() - start))
+
+    # 结果一致性：最后一个周期的电机字段和CRC与逐电机赋值相同
+    reference, reference_crc = make_low_cmd()
+    legacy_tick(reference, reference_crc, target_lists[-1], 100.0, 8.0)
+    assert [m.q for m in reference.motor_cmd[:12]] == [m.q for m in low_cmd.motor_cmd[:12]]
+    assert reference.crc == low_cmd.crc
+
+    return legacy_tps, builder_tps, builder.stats
+
+
+if __name__ == "__main__":
+    ticks = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    print(f"LowCmd: {'unitree_sdk2py' if SDK_AVAILABLE else '同字段布局的替身'}")
+    print(f"{'场景':10s} {'逐电机赋值(周期/秒)':>20s} {'LowCmdBuilder(周期/秒)':>24s} {'加速比':>8s}  写入字段/CRC次数")
+    for scenario in ('hold', 'interp2', 'interp12'):
+        legacy_tps, builder_tps, stats = bench(scenario, ticks)
+        print(f"{scenario:10s} {legacy_tps:20.0f} {builder_tps:24.0f} {builder_tps / legacy_tps:8.1f}x  "
+              f"{stats['fields_written']}/{stats['crc_computed']}")
@@ -0,0 +1,178 @@
+"""
+运动引擎共享基准：所有底层控制入口的 rt/lowcmd 写入节奏
+每个入口都通过 motion_engine 执行，用记录时间戳的发布者替身统计实际频率、写入间隔抖动和时长。
+对照项是原来的 time.sleep(0.002) 循环（sleep 误差累积，实际频率低于500Hz）。
+脚本类入口（motion、direction 等）在导入时需要 unitree_sdk2py，但被测函数只使用传入的 low_cmd/发布者/CRC；
+没有安装SDK时注入由 body_backend / dds_loopback 模拟对象组成的 unitree_sdk2py 模块，与其他 for_test 基准一样可以直接运行。
+用法: python bench_motion_engine.py
+"""
+import sys
+import os
+import io
+import time
+import types
+import contextlib
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../communication")))
+
+import dds_loopback
+from body_backend import SimBackend, SimMotionSwitcherClient, SimSportClient, new_sim_low_cmd
+
+
+def install_sim_sdk():
+    """在 sys.modules 中注册脚本类入口导入的 unitree_sdk2py 子模块，内容为模拟对象"""
+    class LowCmd_:
+        pass
+
+    class LowState_:
+        pass
+
+    contents = {
+        'unitree_sdk2py': {},
+        'unitree_sdk2py.core': {},
+        'unitree_sdk2py.core.channel': {
+            'ChannelPublisher': dds_loopback.ChannelPublisher,
+            'ChannelSubscriber': dds_loopback.ChannelSubscriber,
+            'ChannelFactoryInitialize': lambda *args, **kwargs: None,
+        },
+        'unitree_sdk2py.idl': {},
+        'unitree_sdk2py.idl.default': {
+            'unitree_go_msg_dds__LowCmd_': new_sim_low_cmd,
+            'unitree_go_msg_dds__LowState_': types.SimpleNamespace,
+        },
+        'unitree_sdk2py.idl.unitree_go': {},
+        'unitree_sdk2py.idl.unitree_go.msg': {},
+        'unitree_sdk2py.idl.unitree_go.msg.dds_': {'LowCmd_': LowCmd_, 'LowState_': LowState_},
+        'unitree_sdk2py.comm': {},
+        'unitree_sdk2py.comm.motion_switcher': {},
+        'unitree_sdk2py.comm.motion_switcher.motion_switcher_client': {
+            'MotionSwitcherClient': SimMotionSwitcherClient,
+        },
+        'unitree_sdk2py.go2': {},
+        'unitree_sdk2py.go2.sport': {},
+        'unitree_sdk2py.go2.sport.sport_client': {'SportClient': SimSportClient},
+    }
+    for name, attrs in contents.items():
+        module = types.ModuleType(name)
+        module.__path__ = []
+        module.__dict__.update(attrs)
+        sys.modules[name] = module
+
+
+try:
+    import unitree_sdk2py
+    SDK_AVAILABLE = True
+except ImportError:
+    SDK_AVAILABLE = False
+    install_sim_sdk()
+
+from lowcmd_builder import LowCmdBuilder
+from lowcmd_crc import LowCmdCrc
+from motion_engine import MotionEngine, RAISE_LEG_STIFF_JOINTS, stiff_gains
+import motion
+import direction
+import raise_leg_controller
+from control import low_level_controller, low_level_stand_controller
+from main_dog_body_control import RobotController
+
+STAND = [0.0, 0.67, -1.3] * 4
+LIE_DOWN = [-0.35, 1.36, -2.65, 0.35, 1.36, -2.65, -0.5, 1.36, -2.65, 0.5, 1.36, -2.65]
+PERIOD_MS = 2.0
+HOLD_TICKS = 500
+
+
+class TimestampSink:
+    def __init__(self):
+        self.times = []
+
+    def Write(self, cmd):
+        self.times.append(time.perf_counter())
+        return True
+
+
+def legacy_sleep_loop(low_cmd, publisher, crc, ticks):
+    builder = LowCmdBuilder(low_cmd, crc)
+    for _ in range(ticks):
+        publisher.Write(builder.pose_cmd(STAND))
+        time.sleep(0.002)
+
+
+class _StopFlag(dict):
+    """stop_flag["stop"] 在发布者写满 ticks 条后变为 True"""
+
+    def __init__(self, sink, ticks):
+        super().__init__()
+        self.sink = sink
+        self.ticks = ticks
+
+    def __getitem__(self, key):
+        return len(self.sink.times) >= self.ticks
+
+
+def variants():
+    crc = LowCmdCrc()
+    gains = stiff_gains(RAISE_LEG_STIFF_JOINTS)
+    kp, kd = list(gains.kp), list(gains.kd)
+    yield "对照: time.sleep 循环", lambda cmd, pub: legacy_sleep_loop(cmd, pub, crc, HOLD_TICKS)
+    yield "MotionEngine.move_to", lambda cmd, pub: MotionEngine(pub, cmd, crc).move_to(STAND, LIE_DOWN, 1000)
+    yield "MotionEngine.move_through", lambda cmd, pub: MotionEngine(pub, cmd, crc).move_through(
+        [STAND, LIE_DOWN, STAND], [500, 500], gains)
+    yield "MotionEngine.hold", lambda cmd, pub: MotionEngine(pub, cmd, crc).hold(STAND, gains, max_ticks=HOLD_TICKS)
+    yield "motion.interpolate_selected_joints", lambda cmd, pub: motion.interpolate_selected_joints(
+        STAND, LIE_DOWN, [9, 10, 11], 500, cmd, pub, crc)
+    yield "motion.maintain_posture", lambda cmd, pub: motion.maintain_posture(
+        STAND, cmd, pub, crc, _StopFlag(pub, HOLD_TICKS))
+    yield "direction.interpolate_selected_joints", lambda cmd, pub: direction.interpolate_selected_joints(
+        STAND, LIE_DOWN, [2], 500, cmd, pub, crc, kp, kd)
+    yield "direction.maintain_posture", lambda cmd, pub: direction.maintain_posture(
+        STAND, cmd, pub, crc, _StopFlag(pub, HOLD_TICKS), kp, kd)
+    yield "raise_leg_controller.interpolate_to_target", lambda cmd, pub: raise_leg_controller.interpolate_to_target(
+        STAND, LIE_DOWN, 500, cmd, pub, crc)
+    yield "low_level_controller.interpolate_selected_joints", \
+        lambda cmd, pub: low_level_controller.interpolate_selected_joints(
+            STAND, LIE_DOWN, [0, 1, 2], 500, cmd, pub, crc, kp, kd)
+    yield "low_level_controller.maintain_dynamic_pose", \
+        lambda cmd, pub: low_level_controller.maintain_dynamic_pose(
+            list(STAND), cmd, pub, crc, _StopFlag(pub, HOLD_TICKS), kp, kd)
+    yield "low_level_stand_controller.interpolate_all_joints", \
+        lambda cmd, pub: low_level_stand_controller.interpolate_all_joints(
+            STAND, LIE_DOWN, 500, cmd, pub, crc, lambda: False)
+    yield "main_dog_body_control.interpolate_pose", _controller_interpolate
+
+
+def _controller_interpolate(cmd, pub):
+    controller = RobotController(SimBackend())
+    controller.low_cmd_publisher = pub
+    controller.motion.publisher = pub
+    controller.interpolate_pose(STAND, LIE_DOWN, 1000)
+
+
+def summarize(times):
+    intervals = np.diff(times) * 1000.0
+    duration = times[-1] - times[0]
+    return {
+        'writes': len(times),
+        'hz': (len(times) - 1) / duration if duration > 0 else 0.0,
+        'p50': np.percentile(intervals, 50),
+        'p99': np.percentile(intervals, 99),
+        'max': intervals.max(),
+    }
+
+
+if __name__ == "__main__":
+    ok = True
+    print(f"unitree_sdk2py: {'已安装' if SDK_AVAILABLE else '未安装，脚本类入口使用模拟模块导入'}")
+    print(f"{'入口':52s} {'写入':>6s} {'频率Hz':>8s} {'间隔p50ms':>10s} {'p99ms':>8s} {'maxms':>8s}")
+    for name, run in variants():
+        sink = TimestampSink()
+        with contextlib.redirect_stdout(io.StringIO()):
+            run(new_sim_low_cmd(), sink)
+        s = summarize(sink.times)
+        print(f"{name:52s} {s['writes']:6d} {s['hz']:8.1f} {s['p50']:10.3f} {s['p99']:8.3f} {s['max']:8.3f}")
+        if not name.startswith("对照"):
+            ok &= abs(s['p50'] - PERIOD_MS) < 0.1
+    print("PASS" if ok else "FAIL")
+    sys.exit(0 if ok else 1)
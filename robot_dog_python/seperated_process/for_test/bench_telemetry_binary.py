@@ -0,0 +1,124 @@
+"""
+网页遥测二进制帧对比（不需要 Flask / DDS 网络）
+- JSON：status_snapshot 生成字典（12个电机字典和错误字符串）再 json.dumps，即 JSON 客户端的关键帧
+- 二进制：main_flask/telemetry_binary 直接从状态字典和 MotorStateArrays 打包，不生成电机字典
+检查：Python 解码 (decode_status_frame) 与 JSON 快照一致（float32 精度）；
+      有 node 时用 index.html 中的 decodeStatusFrame 解码同一帧并比较。
+用法: python bench_telemetry_binary.py [帧数]
+"""
+import sys
+import os
+import json
+import math
+import time
+import random
+import shutil
+import subprocess
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../communication")))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../main_flask")))
+
+from telemetry_stream import status_snapshot
+from telemetry_binary import encode_status_body, encode_status_header, decode_status_frame
+from telemetry_transform import decode_motor_errors
+from dds_data_structure import MotorStateArrays
+from dog_status_arrays import motor_columns
+
+INDEX_HTML = os.path.join(os.path.dirname(__file__), "../main_flask/templates/index.html")
+
+
+def sample(rng):
+    motors = MotorStateArrays()
+    motors.mode = [1] * 12
+    motors.q = [rng.uniform(-1.5, 1.5) for _ in range(12)]
+    motors.dq = [rng.uniform(-3, 3) for _ in range(12)]
+    motors.ddq = [0.0] * 12
+    motors.tau_est = [rng.uniform(-5, 5) for _ in range(12)]
+    motors.temperature = [rng.randint(30, 60) for _ in range(12)]
+    motors.lost = [0] * 12
+    motors.reserve0 = [rng.choice((0, 0, 0, 1, 0x81)) for _ in range(12)]
+    motors.reserve1 = [0] * 12
+    status = {"battery_percent": rng.uniform(20, 100), "cpu_usage_percent": rng.uniform(10, 60),
+              "gpu_usage_percent": 5.0, "memory_usage_percent": 41.2, "latency_ms": rng.uniform(0.5, 3),
+              "robot_mode_form": "", "robot_mode_name": "ai", "temp_cpu": 48.1, "temp_gpu": 46.9,
+              "power_nv_power_total": 7421.0, "hardware_uptime_seconds": 3600, "hardware_jetson_clocks_on": True,
+              "status_message": "Data received successfully.", "data_received": True}
+    return status, motors
+
+
+def same(expected, actual):
+    if isinstance(expected, float) or isinstance(actual, float):
+        # JSON 快照已按显示精度取整，二进制为 float32
+        return math.isclose(float(expected), float(actual), rel_tol=1e-5, abs_tol=0.006)
+    return expected == actual
+
+
+def compare(snapshot, decoded):
+    bad = [k for k, v in snapshot.items() if k != 'motors' and not same(v, decoded.get(k))]
+    for i, motor in enumerate(snapshot['motors']):
+        bad += [f"motors[{i}].{f}" for f, v in motor.items() if not same(v, decoded['motors'][i][f])]
+    return bad
+
+
+def node_decode(frame):
+    """从 index.html 中取出解码函数，用 node 解码同一帧"""
+    html = open(INDEX_HTML, encoding='utf-8').read()
+    start = html.index("const TELEMETRY_SCHEMA_ID")
+    end = html.index("socket.on('dog_status_update'")
+    script = html[start:end] + (
+        "const hex = process.argv[1];\n"
+        "const bytes = Uint8Array.from(hex.match(/../g).map(h => parseInt(h, 16)));\n"
+        "console.log(JSON.stringify(decodeStatusFrame(bytes.buffer)));\n")
+    out = subprocess.run(["node", "-e", script, frame.hex()], capture_output=True, text=True, check=True)
+    return json.loads(out.stdout)
+
+
+def run(n_frames):
+    rng = random.Random(5)
+    samples = [sample(rng) for _ in range(n_frames)]
+
+    start = time.perf_counter()
+    json_bytes = 0
+    for status, motors in samples:
+        json_bytes += len(json.dumps(status_snapshot(dict(status), motor_columns(motors), decode_motor_errors)))
+    json_us = (time.perf_counter() - start) / n_frames * 1e6
+
+    start = time.perf_counter()
+    binary_bytes = 0
+    for seq, (status, motors) in enumerate(samples):
+        binary_bytes += len(encode_status_header(seq) + encode_status_body(status, motors))
+    binary_us = (time.perf_counter() - start) / n_frames * 1e6
+
+    ok = True
+    bad = []
+    for seq, (status, motors) in enumerate(samples[:50]):
+        snapshot = status_snapshot(dict(status), motor_columns(motors), decode_motor_errors)
+        decoded = decode_status_frame(encode_status_header(seq) + encode_status_body(status, motors))
+        for motor in decoded['motors']:
+            motor['error_str'] = decode_motor_errors(motor['reserve0'])
+        bad += compare(snapshot, decoded)
+        ok &= decoded['seq'] == seq
+    ok &= not bad
+    print(f"Python 解码与 JSON 快照一致: {'ok' if not bad else 'FAIL ' + ', '.join(sorted(set(bad))[:5])}")
+
+    if shutil.which("node"):
+        status, motors = samples[0]
+        snapshot = status_snapshot(dict(status), motor_columns(motors), decode_motor_errors)
+        decoded = node_decode(encode_status_header(7) + encode_status_body(status, motors))
+        node_bad = compare(snapshot, decoded)
+        ok &= not node_bad and decoded['seq'] == 7
+        print(f"index.html decodeStatusFrame 与 JSON 快照一致: {'ok' if not node_bad else 'FAIL ' + ', '.join(node_bad[:5])}")
+    else:
+        print("未找到 node，跳过网页解码检查")
+
+    print(f"JSON   : {json_bytes / n_frames:.0f} 字节/帧, {json_us:.1f} us/帧")
+    print(f"二进制 : {binary_bytes / n_frames:.0f} 字节/帧, {binary_us:.1f} us/帧")
+    ok &= binary_bytes * 3 < json_bytes and binary_us < json_us
+    return ok
+
+
+if __name__ == "__main__":
+    n_frames = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    ok = run(n_frames)
+    print("PASS" if ok else "FAIL")
+    sys.exit(0 if ok else 1)
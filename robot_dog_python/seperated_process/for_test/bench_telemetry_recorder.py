@@ -0,0 +1,190 @@
+"""
+遥测记录器检查（模拟时钟和模拟 rt/lowstate，不需要Go2）
+1. 500Hz 写入：每条记录的 append_lowstate 耗时（p50/p99/最大），需远小于 2ms 周期
+2. 磁盘占用有上限：环形文件大小固定，跨午夜滚动到新文件，只保留 keep_days 个文件
+3. 按时间查询：随机时间段（含跨日期文件）的结果与写入的序列一致，已被覆盖的记录不返回
+4. 记录进行中另一个只读 RingFile 并发查询：返回的记录完整（q 与 tick 对应）
+5. 回放：iter_chunks 读出 10 分钟 500Hz 记录的吞吐与直接顺序读同一文件比较
+用法: python bench_telemetry_recorder.py [每段模拟秒数]
+"""
+import sys
+import os
+import time
+import random
+import tempfile
+import threading
+from types import SimpleNamespace
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../communication")))
+
+import telemetry_recorder
+from telemetry_recorder import TelemetryRecorder, TelemetryArchive, RingFile, RECORD_RATE_HZ, ring_files
+
+RING_SECONDS = 20.0
+KEEP_DAYS = 2
+REPLAY_SECONDS = 600.0
+STEP_NS = int(1e9 / RECORD_RATE_HZ)
+
+
+class SimClock:
+    def __init__(self, t_ns):
+        self.t_ns = t_ns
+
+    def __call__(self):
+        return self.t_ns
+
+
+def fake_lowstate(tick):
+    motors = [SimpleNamespace(mode=1, q=tick * 1e-3 + j, dq=0.0, ddq=0.0, tau_est=0.5, temperature=30 + j % 3,
+                              lost=0, reserve=[0, 0]) for j in range(20)]
+    return SimpleNamespace(tick=tick, motor_state=motors, bms_state=SimpleNamespace(soc=87))
+
+
+def local_midnight_ns(days_from_now):
+    t = time.localtime(time.time() + days_from_now * 86400)
+    return int(time.mktime((t.tm_year, t.tm_mon, t.tm_mday, 0, 0, 0, 0, 0, -1)) * 1e9)
+
+
+def record(recorder, clock, start_ns, duration_s, tick0, written, timings):
+    lowstates = [fake_lowstate(tick0 + i) for i in range(64)]
+    clock.t_ns = start_ns
+    n = int(duration_s * RECORD_RATE_HZ)
+    for i in range(n):
+        tick = tick0 + i
+        lowstate = lowstates[i % 64]
+        lowstate.tick = tick
+        for j, m in enumerate(lowstate.motor_state):
+            m.q = tick * 1e-3 + j
+        start = time.perf_counter_ns()
+        recorder.append_lowstate(lowstate)
+        timings.append(time.perf_counter_ns() - start)
+        written.append((clock.t_ns, tick))
+        clock.t_ns += STEP_NS
+    return tick0 + n
+
+
+def expected_ticks(written, start_ns, end_ns, retained):
+    return [tick for t, tick in written if start_ns <= t < end_ns and tick in retained]
+
+
+def check_queries(archive, written, retained, rng, n_queries=200):
+    t_min, t_max = written[0][0], written[-1][0]
+    bad = 0
+    for _ in range(n_queries):
+        a = rng.randint(t_min - STEP_NS * 100, t_max)
+        b = a + rng.randint(0, int(30e9))
+        got = archive.query(a, b)['tick'].tolist()
+        bad += got != expected_ticks(written, a, b, retained)
+    return bad
+
+
+def concurrent_reader(path, stop, result):
+    ring = RingFile(path, mode='r')
+    queries = torn = 0
+    while not stop.is_set():
+        span = ring.time_range()
+        if span:
+            recs = ring.query(span[0], span[1] + 1)
+            q0 = recs['motors']['q'][:, 0]
+            torn += int(np.count_nonzero(np.abs(q0 - recs['tick'] * 1e-3) > 1e-3))
+            queries += 1
+    ring.close()
+    result.update(queries=queries, torn=torn)
+
+
+def run(segment_s):
+    rng = random.Random(11)
+    clock = SimClock(0)
+    telemetry_recorder.now_ns = clock
+    directory = tempfile.mkdtemp(prefix="dog_telemetry_")
+    capacity = int(RING_SECONDS * RECORD_RATE_HZ)
+    recorder = TelemetryRecorder(directory, capacity=capacity, keep_days=KEEP_DAYS)
+    written, timings = [], []
+    ok = True
+
+    # 第1天 23:59:50 开始，跨过午夜写入第2天
+    day2 = local_midnight_ns(1)
+    tick = record(recorder, clock, day2 - int(10e9), segment_s + 10.0, 0, written, timings)
+    files = ring_files(directory)
+    sizes = {os.path.getsize(p) for p in files}
+    # 每个文件只保留最近 RING_SECONDS 秒
+    retained = set()
+    for day_start, day_end in ((0, day2), (day2, day2 + int(86400e9))):
+        ticks = [tk for t, tk in written if day_start <= t < day_end]
+        retained.update(ticks[-capacity:])
+    archive = TelemetryArchive(directory)
+    bad = check_queries(archive, written, retained, rng)
+    print(f"跨午夜: {len(files)} 个文件, 大小 {sorted(sizes)} 字节, 随机查询不一致 {bad}/200")
+    ok &= len(files) == 2 and len(sizes) == 1 and bad == 0
+
+    # 记录中并发查询（另一个只读映射，相当于另一个进程）
+    stop, result = threading.Event(), {}
+    reader = threading.Thread(target=concurrent_reader, args=(recorder.ring.path, stop, result))
+    reader.start()
+    tick = record(recorder, clock, clock.t_ns, segment_s, tick, written, timings)
+    stop.set()
+    reader.join()
+    print(f"并发只读查询 {result['queries']} 次, 不完整记录 {result['torn']}")
+    ok &= result['queries'] > 0 and result['torn'] == 0
+
+    # 跳到第4天：第2天之前的文件被删除，最多 KEEP_DAYS 个文件
+    record(recorder, clock, local_midnight_ns(3) + int(3600e9), 5.0, tick, written, timings)
+    recorder.close()
+    files = ring_files(directory)
+    total_bytes = sum(os.path.getsize(p) for p in files)
+    bound = KEEP_DAYS * telemetry_recorder.ring_file_size(capacity)
+    print(f"第4天: 保留 {[os.path.basename(p) for p in files]}, 共 {total_bytes / 1e6:.1f} MB (上限 {bound / 1e6:.1f} MB)")
+    ok &= len(files) == KEEP_DAYS and total_bytes <= bound
+
+    timings_us = np.array(timings) / 1e3
+    p50, p99, worst = np.percentile(timings_us, 50), np.percentile(timings_us, 99), timings_us.max()
+    print(f"append_lowstate: {len(timings)} 条, p50 {p50:.1f} us, p99 {p99:.1f} us, 最大 {worst:.0f} us "
+          f"（{RECORD_RATE_HZ:.0f}Hz 周期 {1e6 / RECORD_RATE_HZ:.0f} us）")
+    ok &= p99 < 0.1 * 1e6 / RECORD_RATE_HZ
+
+    for path in files:
+        os.remove(path)
+    ok &= check_replay(directory)
+    os.rmdir(directory)
+    return ok
+
+
+def check_replay(directory):
+    """回放吞吐：REPLAY_SECONDS 的 500Hz 记录按块读出 vs 直接顺序读同一文件"""
+    n = int(REPLAY_SECONDS * RECORD_RATE_HZ)
+    path = os.path.join(directory, "replay-20260101.ring")
+    ring = RingFile(path, capacity=n)
+    records = np.zeros(n, dtype=telemetry_recorder.RECORD_DTYPE)
+    records['timestamp_ns'] = np.arange(n, dtype=np.int64) * STEP_NS
+    records['tick'] = np.arange(n)
+    ring.extend(records)
+    ring.close()
+
+    start = time.perf_counter()
+    replayed = sum(len(chunk) for chunk in TelemetryArchive(directory, 'replay').iter_chunks(0, 2 ** 62))
+    replay_s = time.perf_counter() - start
+    start = time.perf_counter()
+    raw_bytes = 0
+    with open(path, 'rb') as f:
+        while True:
+            block = f.read(1 << 22)
+            if not block:
+                break
+            raw_bytes += len(block)
+    raw_s = time.perf_counter() - start
+    os.remove(path)
+    replay_mbps = replayed * records.itemsize / 1e6 / replay_s
+    raw_mbps = raw_bytes / 1e6 / raw_s
+    print(f"回放 {REPLAY_SECONDS:.0f}s ({replayed} 条, {replayed * records.itemsize / 1e6:.0f} MB): "
+          f"{replay_mbps:.0f} MB/s；顺序读同一文件 {raw_mbps:.0f} MB/s")
+    return replayed == n and replay_mbps > 0.5 * raw_mbps
+
+
+if __name__ == "__main__":
+    segment_s = float(sys.argv[1]) if len(sys.argv) > 1 else 30.0
+    ok = run(segment_s)
+    print("PASS" if ok else "FAIL")
+    sys.exit(0 if ok else 1)
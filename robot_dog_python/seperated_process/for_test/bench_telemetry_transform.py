@@ -0,0 +1,140 @@
+"""
+网页状态转换的微基准（不需要 Flask / DDS 网络）
+- 原实现：每个字段 get_nested_attr（hasattr/getattr 链）、带 try/except 的 float() 转换，
+  12个电机的错误位每次逐位解码
+- 现实现：main_flask/telemetry_transform 的 StatusTransform（启动时编译为一个 attrgetter）
+  和 MOTOR_ERROR_TABLE 查表
+检查：两者得到的状态字典相同；查表结果与逐位解码在全部 16 位取值上一致；打印每个样本的转换耗时。
+用法: python bench_telemetry_transform.py [样本数]
+"""
+import sys
+import os
+import time
+import random
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../communication")))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../main_flask")))
+
+from dds_data_structure import DogMotorState, DogJetsonHealth, DogModeInfo
+from telemetry_transform import (StatusTransform, MOTOR_ERROR_MAP, motor_error_strings, decode_motor_errors,
+                                 MOTOR_STATE_FIELDS, JETSON_HEALTH_FIELDS, MODE_INFO_FIELDS)
+
+
+# --- 原实现（main_flask/app.py 中的写法） ---
+
+def legacy_decode_motor_errors(reserve0_val):
+    if reserve0_val == 0:
+        return "OK"
+    errors = [MOTOR_ERROR_MAP[bit] for bit, error_str in MOTOR_ERROR_MAP.items() if (reserve0_val >> bit) & 1]
+    return ", ".join(errors) if errors else "OK"
+
+
+def get_nested_attr(obj, attrs, default=0.0):
+    current_obj = obj
+    for attr in attrs:
+        if hasattr(current_obj, attr):
+            current_obj = getattr(current_obj, attr)
+        else:
+            return default
+    return current_obj
+
+
+def _to_float(value, name):
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        print(f"Warning: Could not convert {name} '{value}' to float. Using 0.0.")
+        return 0.0
+
+
+def legacy_transform(status, motor_state, health, mode_info):
+    status.update({"battery_percent": _to_float(motor_state.battery_percent, 'battery_percent')})
+    status.update({
+        "cpu_usage_percent": _to_float(health.cpu_usage_percent, 'cpu_usage_percent'),
+        "gpu_usage_percent": _to_float(health.gpu_usage_percent, 'gpu_usage_percent'),
+        "memory_usage_percent": _to_float(health.memory_usage_percent, 'memory_usage_percent'),
+        "temp_cpu": get_nested_attr(health, ['temperatures', 'cpu']),
+        "temp_gpu": get_nested_attr(health, ['temperatures', 'gpu']),
+        "temp_tj": get_nested_attr(health, ['temperatures', 'tj']),
+        "temp_soc0": get_nested_attr(health, ['temperatures', 'soc0']),
+        "temp_soc1": get_nested_attr(health, ['temperatures', 'soc1']),
+        "temp_soc2": get_nested_attr(health, ['temperatures', 'soc2']),
+        "temp_cv0": get_nested_attr(health, ['temperatures', 'cv0']),
+        "temp_cv1": get_nested_attr(health, ['temperatures', 'cv1']),
+        "temp_cv2": get_nested_attr(health, ['temperatures', 'cv2']),
+        "power_cpu_gpu_cv": get_nested_attr(health, ['power', 'cpu_gpu_cv']),
+        "power_soc": get_nested_attr(health, ['power', 'soc']),
+        "power_nv_power_total": get_nested_attr(health, ['power', 'nv_power_total']),
+        "power_vdd_inn": get_nested_attr(health, ['power', 'vdd_inn']),
+    })
+    status.update({
+        "robot_mode_form": get_nested_attr(mode_info, ['robot_mode_form'], "N/A"),
+        "robot_mode_name": get_nested_attr(mode_info, ['robot_mode_name'], "N/A"),
+        "hardware_uptime_seconds": get_nested_attr(mode_info, ['hardware', 'uptime_seconds']),
+        "hardware_jetson_clocks_on": get_nested_attr(mode_info, ['hardware', 'jetson_clocks_on'], False),
+        "hardware_fan_speed_percent": get_nested_attr(mode_info, ['hardware', 'fan_speed_percent']),
+        "hardware_emc_usage_percent": get_nested_attr(mode_info, ['hardware', 'emc_usage_percent']),
+        "hardware_disk_usage_percent": get_nested_attr(mode_info, ['hardware', 'disk_usage_percent']),
+    })
+    return [legacy_decode_motor_errors(v) for v in motor_state.motors.reserve0]
+
+
+# --- 现实现 ---
+
+motor_state_fields = StatusTransform(DogMotorState, MOTOR_STATE_FIELDS)
+jetson_health_fields = StatusTransform(DogJetsonHealth, JETSON_HEALTH_FIELDS)
+mode_info_fields = StatusTransform(DogModeInfo, MODE_INFO_FIELDS)
+
+
+def compiled_transform(status, motor_state, health, mode_info):
+    motor_state_fields.update(status, motor_state)
+    jetson_health_fields.update(status, health)
+    mode_info_fields.update(status, mode_info)
+    return motor_error_strings(motor_state.motors.reserve0)
+
+
+def samples(n, rng):
+    out = []
+    for _ in range(n):
+        motor_state = DogMotorState(battery_percent=rng.uniform(20, 100))
+        motor_state.motors.reserve0 = [rng.choice((0, 0, 0, 1, 0x80, 0x181, 1 << 12)) for _ in range(12)]
+        health = DogJetsonHealth(cpu_usage_percent=rng.uniform(0, 100), gpu_usage_percent=rng.uniform(0, 100),
+                                 memory_usage_percent=rng.uniform(0, 100))
+        health.temperatures.cpu = rng.uniform(30, 70)
+        health.power.soc = rng.uniform(1000, 3000)
+        mode_info = DogModeInfo(robot_mode_name=rng.choice(("ai", "normal", "")))
+        mode_info.hardware.uptime_seconds = rng.randint(0, 10 ** 6)
+        out.append((motor_state, health, mode_info))
+    return out
+
+
+def per_sample_us(transform, data, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        status = {}
+        start = time.perf_counter()
+        for sample in data:
+            transform(status, *sample)
+        best = min(best, time.perf_counter() - start)
+    return best / len(data) * 1e6
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    data = samples(n, random.Random(2))
+
+    table_ok = all(decode_motor_errors(v) == legacy_decode_motor_errors(v) for v in range(1 << 16))
+    same = True
+    for sample in data[:500]:
+        legacy_status, new_status = {}, {}
+        same &= legacy_transform(legacy_status, *sample) == compiled_transform(new_status, *sample)
+        same &= legacy_status == new_status
+    print(f"查表与逐位解码一致 (0..65535): {'ok' if table_ok else 'FAIL'}, 状态字典一致: {'ok' if same else 'FAIL'}")
+
+    legacy_us = per_sample_us(legacy_transform, data)
+    new_us = per_sample_us(compiled_transform, data)
+    print(f"每个样本（3个状态主题 + 12个电机错误位）: 原实现 {legacy_us:.2f} us, 现实现 {new_us:.2f} us "
+          f"({legacy_us / new_us:.1f}x)")
+    ok = table_ok and same and new_us < legacy_us / 2
+    print("PASS" if ok else "FAIL")
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,137 @@
+"""
+对时与单向延迟检查（模拟两台时钟不同步的机器，不需要 DDS 网络）
+- 机器狗时钟 = 本机时钟 + 3.217 s，另有 40 ppm 漂移；网络单向时延 1.5 ms + 指数抖动，
+  5% 的包在单一方向上额外排队 30-80 ms（不对称）
+- ClockSyncClient / ClockSyncResponder 每秒对时一次，状态消息以 50Hz 发送
+检查：
+1. 偏差估计误差（整个过程中每条状态消息时刻）远小于只用最近一个样本的朴素估计
+2. OneWayLatency 给出的 p50/p95/p99 与真实单向延迟相差 < 0.5 ms；未校正的
+   time.time_ns() - timestamp_ns（原 app.py 的 latency_ms）相差数秒
+3. 每条消息记录延迟的耗时
+用法: python clock_sync_check.py [模拟秒数]
+"""
+import sys
+import os
+import time
+import random
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../communication")))
+
+import numpy as np
+
+from clock_sync import (ClockSyncClient, ClockSyncResponder, ClockOffsetEstimator, OneWayLatency, LATENCY_WINDOW,
+                        BURST_PINGS, BURST_PERIOD_S)
+
+OFFSET_NS = 3_217_000_000
+DRIFT = 40e-6
+STATUS_HZ = 50.0
+
+
+class SimTime:
+    """模拟的真实时间（本机时钟与之相同），机器狗时钟带偏差和漂移"""
+
+    def __init__(self):
+        self.t_ns = 1_700_000_000 * 10 ** 9
+
+    def local(self):
+        return self.t_ns
+
+    def remote(self):
+        return int(self.t_ns * (1 + DRIFT) + OFFSET_NS - 1_700_000_000 * 10 ** 9 * DRIFT)
+
+    def true_offset(self):
+        return self.remote() - self.local()
+
+
+class Capture:
+    """替代 ChannelPublisher：记下写出的消息"""
+
+    def __init__(self):
+        self.msg = None
+
+    def Write(self, msg):
+        self.msg = msg
+
+
+def one_way_delay_ns(rng, spike=True):
+    delay = 1.5e6 + rng.expovariate(1 / 2e6)
+    if spike and rng.random() < 0.05:
+        delay += rng.uniform(30e6, 80e6)
+    return int(delay)
+
+
+def simulate(seconds, rng):
+    sim = SimTime()
+    request_pub, response_pub = Capture(), Capture()
+    estimator = ClockOffsetEstimator(clock=sim.local)
+    client = ClockSyncClient(request_pub, estimator, clock=sim.local)
+    responder = ClockSyncResponder(response_pub, clock=sim.remote)
+    latency = OneWayLatency(estimator, clock=sim.local)
+
+    def exchange():
+        """一次对时：请求向机器狗方向排队，响应反向（可能有尖峰）；返回这个样本的偏差"""
+        client.ping()
+        t1 = request_pub.msg.t1_ns
+        sim.t_ns += one_way_delay_ns(rng)
+        responder.on_request(request_pub.msg)
+        sim.t_ns += one_way_delay_ns(rng)
+        response = response_pub.msg
+        client.on_response(response)
+        return ((response.t2_ns - t1) + (response.t3_ns - sim.local())) / 2.0
+
+    # 客户端启动时的连续对时
+    for _ in range(BURST_PINGS):
+        sim.t_ns += int(BURST_PERIOD_S * 1e9)
+        naive_offset = exchange()
+    est_errors, naive_errors = [], []
+    true_ms, corrected_ms, raw_ms = [], [], []
+    status_period_ns = int(1e9 / STATUS_HZ)
+    add_cost = 0.0
+    for second in range(int(seconds)):
+        naive_offset = exchange()
+
+        # 这一秒内的状态消息：机器狗时钟打时间戳，网络时延后到达本机
+        for k in range(int(STATUS_HZ)):
+            send_ns = sim.t_ns + k * status_period_ns
+            saved = sim.t_ns
+            sim.t_ns = send_ns
+            stamp = sim.remote()
+            delay = one_way_delay_ns(rng, spike=False)
+            sim.t_ns = send_ns + delay
+            start = time.perf_counter()
+            value = latency.add("DogMotorState", stamp)
+            add_cost += time.perf_counter() - start
+            if value is not None:
+                true_ms.append(delay / 1e6)
+                corrected_ms.append(value)
+                raw_ms.append((sim.local() - stamp) / 1e6)
+                est_errors.append(abs(estimator.offset_ns() - sim.true_offset()) / 1e6)
+                naive_errors.append(abs(naive_offset - sim.true_offset()) / 1e6)
+            sim.t_ns = saved
+        sim.t_ns += 1_000_000_000
+    return (estimator, latency, np.array(est_errors), np.array(naive_errors),
+            np.array(true_ms), np.array(corrected_ms), np.array(raw_ms), add_cost / max(len(true_ms), 1))
+
+
+if __name__ == "__main__":
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 600.0
+    estimator, latency, est_err, naive_err, true_ms, corrected_ms, raw_ms, add_s = simulate(seconds, random.Random(11))
+    stats = estimator.stats()
+    print(f"对时: {stats}")
+    print(f"偏差估计误差: p50 {np.percentile(est_err, 50):.3f} ms, 最大 {est_err.max():.3f} ms; "
+          f"只用最近一个样本: p50 {np.percentile(naive_err, 50):.3f} ms, 最大 {naive_err.max():.3f} ms")
+    ok = est_err.max() < 1.0 and est_err.max() < naive_err.max() / 10
+    ok &= abs(stats['drift_ppm'] - DRIFT * 1e6) < 5
+
+    summary = latency.summary()["DogMotorState"]
+    truth = true_ms[-LATENCY_WINDOW:]
+    raw = raw_ms[-LATENCY_WINDOW:]
+    rows = []
+    for p in (50, 95, 99):
+        expected = float(np.percentile(truth, p))
+        rows.append(f"p{p} 真实 {expected:.2f} / 校正 {summary[f'p{p}_ms']:.2f} / 未校正 {np.percentile(raw, p):.1f}")
+        ok &= abs(summary[f'p{p}_ms'] - expected) < 0.5
+    print("最近 %d 条 DogMotorState 单向延迟 (ms): %s" % (LATENCY_WINDOW, "; ".join(rows)))
+    print(f"OneWayLatency.add 每条 {add_s * 1e6:.2f} us")
+    print("PASS" if ok else "FAIL")
+    sys.exit(0 if ok else 1)
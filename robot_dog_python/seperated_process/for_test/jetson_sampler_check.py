@@ -0,0 +1,150 @@
+"""
+JetsonSampler 检查（模拟 jtop，不需要 Jetson）
+1. 采样得到的 DogJetsonHealth / JetsonHardware 与原来在发布循环中逐次转换的结果相同
+2. 发布循环每次的耗时：原实现 = 读取 jetson.stats（模拟 jtop 生成字典的耗时）+ 扫描核心键 + 转换；
+   现实现 = 等到采样后直接写出
+3. jtop 断开（ok() 返回 False）后 wait() 返回 None，发布循环可以退出
+用法: python jetson_sampler_check.py [采样次数]
+"""
+import sys
+import os
+import time
+import datetime
+import threading
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../communication")))
+
+from dds_data_structure import DogJetsonHealth, JetsonHardware
+from jetson_sampler import JetsonSampler, get_jtop_val, populate_jetson_hardware
+
+INTERVAL_S = 0.05
+STATS_COST_S = 0.004  # jtop 每次访问 stats 都重新生成字典
+
+
+class FakeJetson:
+    """ok() 每个 interval 返回一次；stats 每次访问生成新字典"""
+
+    def __init__(self, samples, interval_s=INTERVAL_S):
+        self.samples = samples
+        self.interval_s = interval_s
+        self.n = 0
+        self.lock = threading.Lock()
+
+    def ok(self):
+        time.sleep(self.interval_s)
+        with self.lock:
+            self.n += 1
+            return self.n <= self.samples
+
+    @property
+    def stats(self):
+        time.sleep(STATS_COST_S)
+        with self.lock:
+            n = self.n
+        stats = {'time': datetime.datetime.now(), 'uptime': datetime.timedelta(seconds=3600 + n)}
+        for core in range(1, 13):
+            stats[f'CPU{core}'] = 'OFF' if core > 8 else (10 + core + n) % 100
+        stats.update({'GPU': 12.5, 'RAM': 0.41, 'EMC': {'val': 7}, 'Fan pwmfan0': 30.0, 'jetson_clocks': 'ON',
+                      'Temp cpu': 48.0 + n % 3, 'Temp gpu': 46.0, 'Temp tj': 49.5, 'Temp soc0': 45.1,
+                      'Temp soc1': 45.2, 'Temp soc2': 45.3, 'Temp cv0': 44.0, 'Temp cv1': 44.1, 'Temp cv2': 44.2,
+                      'Power VDD_CPU_GPU_CV': 2100, 'Power VDD_SOC': 1500, 'Power TOT': 7421})
+        for i in range(60):  # 其余进程、风扇、磁盘等条目
+            stats[f'misc{i}'] = i
+        return stats
+
+
+def legacy_populate_jetson_health(health_msg, stats):
+    """原 main_dog_status.populate_jetson_health"""
+    cpu_cores = [k for k in stats if k.startswith('CPU') and k[3:].isdigit()]
+    total_cpu_usage = sum(get_jtop_val(stats.get(core)) for core in cpu_cores)
+    health_msg.cpu_usage_percent = total_cpu_usage / len(cpu_cores) if cpu_cores else 0.0
+    health_msg.gpu_usage_percent = get_jtop_val(stats.get('GPU'))
+    health_msg.memory_usage_percent = get_jtop_val(stats.get('RAM')) * 100.0
+    health_msg.temperatures.cpu = stats.get('Temp tj', 0.0)
+    health_msg.temperatures.gpu = stats.get('Temp gpu', 0.0)
+    health_msg.temperatures.soc0 = stats.get('Temp soc0', 0.0)
+    health_msg.temperatures.soc1 = stats.get('Temp soc1', 0.0)
+    health_msg.temperatures.soc2 = stats.get('Temp soc2', 0.0)
+    health_msg.temperatures.cv0 = stats.get('Temp cv0', 0.0)
+    health_msg.temperatures.cv1 = stats.get('Temp cv1', 0.0)
+    health_msg.temperatures.cv2 = stats.get('Temp cv2', 0.0)
+    health_msg.temperatures.tj = stats.get('Temp cpu', 0.0)
+    health_msg.power.cpu_gpu_cv = stats.get('Power VDD_CPU_GPU_CV', 0)
+    health_msg.power.soc = stats.get('Power VDD_SOC', 0)
+    health_msg.power.vdd_inn = stats.get('Power TOT', 0)
+    health_msg.power.nv_power_total = stats.get('Power TOT', 0)
+
+
+def strip_timestamp(health):
+    health.timestamp_ns = 0
+    return health
+
+
+def check_values():
+    jetson = FakeJetson(samples=3)
+    sampler = JetsonSampler(jetson)
+    ok = True
+    for _ in range(3):
+        jetson.ok()
+        stats = jetson.stats
+        health, hardware = sampler.sample(stats)
+        legacy_health, legacy_hardware = DogJetsonHealth(), JetsonHardware()
+        legacy_populate_jetson_health(legacy_health, stats)
+        populate_jetson_hardware(legacy_hardware, stats)
+        ok &= strip_timestamp(health) == legacy_health and hardware == legacy_hardware
+    print(f"采样结果与原转换一致: {'ok' if ok else 'FAIL'}, CPU 核心键 {len(sampler.core_keys)} 个")
+    return ok
+
+
+def legacy_loop(samples, written):
+    jetson = FakeJetson(samples)
+    costs = []
+    while jetson.ok():
+        start = time.perf_counter()
+        stats = jetson.stats
+        health = DogJetsonHealth()
+        legacy_populate_jetson_health(health, stats)
+        health.timestamp_ns = time.time_ns()
+        hardware = JetsonHardware()
+        populate_jetson_hardware(hardware, stats)
+        written.append(health)
+        costs.append(time.perf_counter() - start)
+    return costs
+
+
+def sampler_loop(samples, written):
+    jetson = FakeJetson(samples)
+    sampler = JetsonSampler(jetson)
+    sampler.start()
+    costs = []
+    seq = 0
+    while True:
+        sample = sampler.wait(seq, timeout=1.0)
+        if sample is None:
+            if not sampler.running:
+                break
+            continue
+        start = time.perf_counter()
+        seq, health, hardware = sample
+        written.append(health)
+        costs.append(time.perf_counter() - start)
+    sampler.stop()
+    return costs, sampler
+
+
+if __name__ == "__main__":
+    samples = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    ok = check_values()
+
+    legacy_written, new_written = [], []
+    legacy_costs = legacy_loop(samples, legacy_written)
+    new_costs, sampler = sampler_loop(samples, new_written)
+    legacy_ms = sum(legacy_costs) / len(legacy_costs) * 1000
+    new_ms = sum(new_costs) / len(new_costs) * 1000
+    print(f"发布循环每次耗时: 原实现 {legacy_ms:.3f} ms, 现实现 {new_ms:.3f} ms "
+          f"（采样线程每次 {sampler.last_sample_s * 1000:.3f} ms）")
+    print(f"发布 {len(new_written)}/{samples} 次, 采样线程在 jtop 断开后退出: {'ok' if not sampler.running else 'FAIL'}")
+    ok &= new_ms < legacy_ms / 10 and len(new_written) >= samples - 1 and not sampler.running
+    print("PASS" if ok else "FAIL")
+    sys.exit(0 if ok else 1)
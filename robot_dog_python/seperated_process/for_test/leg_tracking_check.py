@@ -0,0 +1,109 @@
+"""
+抬腿角度跟踪检查：原来的 0.1rad/50ms 阶梯 vs 500Hz 速度/加速度受限滤波
+- 目标 0 -> 1.0rad，在 0.3s 时改为 -0.4rad（中途改目标）
+- 统计：开始运动的延迟、改目标后反向的延迟、到达最终目标的时间、最大速度/加速度
+- 限位：两个关节在限位内随机频繁改目标（包括限位本身），设定点不能超出 [-1.5, 3.4] / [-2.7, -0.8]
+用法: python leg_tracking_check.py
+"""
+import sys
+import os
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from setpoint_filter import RateLimitedSetpoint
+
+PERIOD_S = 0.002
+MAX_VEL = 2.0
+MAX_ACC = 20.0
+DURATION_S = 2.0
+RETARGET_AT_S = 0.3
+TARGETS = (1.0, -0.4)
+# 命令在两个控制周期之间到达
+COMMAND_AT_S = 0.001
+LOWER = (-1.5, -2.7)
+UPPER = (3.4, -0.8)
+LIMIT_TRIALS = 100
+
+
+def target_at(t):
+    if t < COMMAND_AT_S:
+        return 0.0
+    return TARGETS[0] if t < RETARGET_AT_S + COMMAND_AT_S else TARGETS[1]
+
+
+def staircase():
+    """原实现：接收线程每50ms把设定点向目标移动最多0.1rad，新目标要等当前阶梯走完才生效"""
+    ticks = int(DURATION_S / PERIOD_S)
+    out = np.zeros(ticks)
+    pos = 0.0
+    active_target = 0.0
+    next_step_t = None
+    for i in range(ticks):
+        t = i * PERIOD_S
+        if next_step_t is None:
+            if abs(target_at(t) - pos) > 1e-9:
+                active_target = target_at(t)
+                next_step_t = t
+        if next_step_t is not None and t >= next_step_t:
+            pos += float(np.clip(active_target - pos, -0.1, 0.1))
+            next_step_t = None if abs(active_target - pos) < 1e-9 else t + 0.05
+        out[i] = pos
+    return out
+
+
+def filtered():
+    ticks = int(DURATION_S / PERIOD_S)
+    out = np.zeros(ticks)
+    f = RateLimitedSetpoint([0.0], MAX_VEL, MAX_ACC, PERIOD_S)
+    for i in range(ticks):
+        f.set_target([target_at(i * PERIOD_S)])
+        out[i] = f.step()[0]
+    return out
+
+
+def limit_excursion(limited, rng):
+    """随机改目标时设定点超出限位的最大量 (rad)"""
+    worst = 0.0
+    for _ in range(LIMIT_TRIALS):
+        f = RateLimitedSetpoint([0.67, -1.3], MAX_VEL, MAX_ACC, PERIOD_S,
+                                lower=LOWER if limited else None, upper=UPPER if limited else None)
+        for i in range(int(DURATION_S / PERIOD_S)):
+            if rng.random() < 0.05:
+                f.set_target([rng.choice([lo, hi, rng.uniform(lo, hi)]) for lo, hi in zip(LOWER, UPPER)])
+            p = f.step()
+            worst = max(worst, float(np.max(p - UPPER)), float(np.max(np.subtract(LOWER, p))))
+    return worst
+
+
+def summarize(name, trace):
+    vel = np.diff(np.concatenate([[0.0], trace])) / PERIOD_S
+    acc = np.diff(np.concatenate([[0.0], vel])) / PERIOD_S
+    first_move = np.flatnonzero(trace != 0.0)[0] * PERIOD_S * 1000.0
+    retarget_tick = int(RETARGET_AT_S / PERIOD_S) + 1
+    reverse = retarget_tick + np.flatnonzero(np.diff(trace[retarget_tick:]) < 0)[0]
+    reverse_ms = (reverse - retarget_tick + 1) * PERIOD_S * 1000.0
+    # 改目标后设定点速度第一次减小的时刻（开始刹车）
+    brake = retarget_tick + np.flatnonzero(np.diff(vel[retarget_tick - 1:]) < -1e-9)[0]
+    brake_ms = (brake - retarget_tick + 1) * PERIOD_S * 1000.0
+    off = np.flatnonzero(np.abs(trace - TARGETS[1]) > 1e-3)
+    settle = (off[-1] + 1) * PERIOD_S * 1000.0 if len(off) else 0.0
+    print(f"{name:8s} 首次响应 {first_move:6.1f}ms  改目标后反向 {reverse_ms:6.1f}ms  到达最终目标 {settle:7.1f}ms  "
+          f"最大速度 {np.abs(vel).max():7.2f}rad/s  最大加速度 {np.abs(acc).max():9.1f}rad/s^2")
+    return brake_ms, settle, np.abs(vel).max(), np.abs(acc).max()
+
+
+if __name__ == "__main__":
+    _, old_settle, _, _ = summarize("阶梯", staircase())
+    brake_ms, settle, vmax, amax = summarize("滤波", filtered())
+    print(f"滤波改目标后开始刹车: {brake_ms:.1f}ms")
+    ok = brake_ms <= 2 * PERIOD_S * 1000.0
+    ok &= vmax <= MAX_VEL + 1e-6 and amax <= MAX_ACC + 1e-6
+    ok &= settle < old_settle
+    unlimited = limit_excursion(False, np.random.default_rng(3))
+    limited = limit_excursion(True, np.random.default_rng(3))
+    print(f"随机改目标时超出限位: 不限制 {unlimited * 1000:.2f} mrad, 限制 {limited * 1000:.2f} mrad")
+    ok &= limited <= 0.0
+    print("PASS" if ok else "FAIL")
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,106 @@
+"""
+LowCmd CRC 一致性与性能检查
+1. 随机 uint32 序列：lowcmd_crc.crc32_core（zlib）与逐位参考实现比较
+2. 随机 LowCmd：安装了 unitree_sdk2py 时与 SDK 的 CRC().Crc 逐个比较；
+   否则用同字段布局的替身，与参考实现比较（只验证CRC部分，打包布局需在机器狗上验证）
+3. 每种实现每秒可计算的 LowCmd CRC 次数
+用法: python lowcmd_crc_check.py [随机样本数] [随机种子]
+"""
+import sys
+import os
+import time
+import random
+import struct
+from types import SimpleNamespace
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from lowcmd_crc import LowCmdCrc, crc32_core, crc32_core_reference, pack_low_cmd, LOWCMD_PACKED_SIZE
+
+try:
+    from unitree_sdk2py.idl.default import unitree_go_msg_dds__LowCmd_
+    from unitree_sdk2py.utils.crc import CRC
+    SDK_AVAILABLE = True
+except ImportError:
+    SDK_AVAILABLE = False
+
+
+def random_float(rng):
+    # 混合普通角度、极值和特殊值，覆盖 float32 舍入
+    return rng.choice([
+        rng.uniform(-3.0, 3.0), rng.uniform(-1e6, 1e6), 0.0, -0.0,
+        struct.unpack('<f', struct.pack('<I', rng.getrandbits(32) & 0x7F7FFFFF))[0],
+    ])
+
+
+def fill_random(cmd, rng):
+    cmd.head = [rng.getrandbits(8) for _ in range(2)]
+    cmd.level_flag = rng.getrandbits(8)
+    cmd.frame_reserve = rng.getrandbits(8)
+    cmd.sn = [rng.getrandbits(32) for _ in range(2)]
+    cmd.version = [rng.getrandbits(32) for _ in range(2)]
+    cmd.bandwidth = rng.getrandbits(16)
+    for motor in cmd.motor_cmd:
+        motor.mode = rng.getrandbits(8)
+        motor.q, motor.dq, motor.tau, motor.kp, motor.kd = (random_float(rng) for _ in range(5))
+        motor.reserve = [rng.getrandbits(32) for _ in range(3)]
+    cmd.bms_cmd.off = rng.getrandbits(8)
+    cmd.bms_cmd.reserve = [rng.getrandbits(8) for _ in range(3)]
+    cmd.wireless_remote = [rng.getrandbits(8) for _ in range(40)]
+    cmd.led = [rng.getrandbits(8) for _ in range(12)]
+    cmd.fan = [rng.getrandbits(8) for _ in range(2)]
+    cmd.gpio = rng.getrandbits(8)
+    cmd.reserve = rng.getrandbits(32)
+    cmd.crc = rng.getrandbits(32)
+    return cmd
+
+
+def new_low_cmd():
+    if SDK_AVAILABLE:
+        return unitree_go_msg_dds__LowCmd_()
+    motors = [SimpleNamespace() for _ in range(20)]
+    return SimpleNamespace(motor_cmd=motors, bms_cmd=SimpleNamespace())
+
+
+def reference_crc(cmd):
+    packed = pack_low_cmd(cmd)
+    return crc32_core_reference(struct.unpack(f'<{len(packed) // 4 - 1}I', packed[:-4]))
+
+
+def rate(fn, cmd, seconds=0.5):
+    n = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        fn(cmd)
+        n += 1
+    return n / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    samples = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    rng = random.Random(seed)
+    failures = 0
+
+    for n in list(range(9)) + [rng.randrange(1, 400) for _ in range(samples)]:
+        words = [rng.getrandbits(32) for _ in range(n)]
+        if crc32_core(struct.pack(f'<{n}I', *words)) != crc32_core_reference(words):
+            failures += 1
+            print(f"FAIL crc32_core, {n} 个字: {words[:4]}...")
+
+    fast = LowCmdCrc()
+    expected_crc = CRC().Crc if SDK_AVAILABLE else reference_crc
+    for _ in range(samples):
+        cmd = fill_random(new_low_cmd(), rng)
+        assert len(pack_low_cmd(cmd)) == LOWCMD_PACKED_SIZE
+        if fast.Crc(cmd) != expected_crc(cmd):
+            failures += 1
+            print(f"FAIL LowCmdCrc, head={cmd.head} sn={cmd.sn}")
+
+    print(f"对照: {'unitree_sdk2py CRC' if SDK_AVAILABLE else '逐位参考实现（替身 LowCmd）'}, 种子 {seed}")
+    print("PASS" if not failures else "FAIL", f"{samples} 个随机 LowCmd, 失败 {failures}")
+
+    cmd = fill_random(new_low_cmd(), rng)
+    print(f"LowCmdCrc: {rate(fast.Crc, cmd):10.0f} 次/秒")
+    print(f"{'SDK CRC' if SDK_AVAILABLE else '逐位参考'}: {rate(expected_crc, cmd):10.0f} 次/秒")
+    sys.exit(1 if failures else 0)
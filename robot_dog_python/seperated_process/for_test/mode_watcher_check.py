@@ -0,0 +1,145 @@
+"""
+ModeWatcher 检查（模拟 MotionSwitcherClient，不需要Go2）
+1. 多个线程同时 refresh()：共用同一次 CheckMode（最多再加上请求到达时已在进行的一次）
+2. current() 在缓存有效期内不发RPC；record() 之后查询期间返回的旧结果被丢弃
+3. 变化回调只在模式变化时调用
+4. SelectMode('ai') 返回错误码时 ensure_high_level_mode 抛出异常，不清除 low_level_mode、不记录模式；
+   启动时（start_in_damp）不抛出异常，重试后改为底层阻尼
+5. 身体控制器 HIGH_LEVEL_STAND <-> LOW_LEVEL_STAND 往返中 CheckMode 的调用次数
+   （原来每次 ensure_*_mode 都查询，趴下过渡前还有一次调试用的查询）
+用法: python mode_watcher_check.py
+"""
+import sys
+import os
+import io
+import time
+import threading
+import contextlib
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../communication")))
+
+from dds_data_structure import MyMotionCommand
+from body_backend import SimBackend, SimMotionSwitcherClient
+from mode_watcher import ModeWatcher
+from main_dog_body_control import RobotController, RobotState
+
+ROUND_TRIPS = 2
+
+
+def check_single_flight():
+    msc = SimMotionSwitcherClient(check_s=0.2)
+    watcher = ModeWatcher(msc)
+    threads = [threading.Thread(target=watcher.refresh) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    print(f"8个线程同时 refresh: CheckMode {len(msc.calls)} 次")
+    # 第一个请求发起的查询之后到达的请求等待并共用一次新的查询，最多两次
+    return len(msc.calls) <= 2 and watcher.snapshot.name == 'ai'
+
+
+def check_cache_and_record():
+    msc = SimMotionSwitcherClient(check_s=0.2)
+    watcher = ModeWatcher(msc)
+    changes = []
+    watcher.add_listener(lambda snap: changes.append(snap.name))
+    watcher.refresh()
+    for _ in range(10):
+        watcher.current(max_age_s=1.0)
+    cached_ok = len(msc.calls) == 1
+
+    # 查询进行中自己切换了模式：查询返回的旧模式 'ai' 不能覆盖 record 的结果
+    poll = threading.Thread(target=watcher.refresh)
+    poll.start()
+    time.sleep(0.05)
+    msc.mode = ''
+    watcher.record('')
+    poll.join()
+    record_ok = watcher.snapshot.name == ''
+    watcher.refresh()  # 结果不变，不触发回调
+    print(f"缓存期内 current(): {'ok' if cached_ok else 'FAIL'}, 查询中 record(): {'ok' if record_ok else 'FAIL'}, "
+          f"变化回调 {changes}")
+    return cached_ok and record_ok and changes == ['ai', '']
+
+
+class FailingSelectClient(SimMotionSwitcherClient):
+    """SelectMode 返回错误码，模式不变"""
+
+    def SelectMode(self, name):
+        self.calls.append(('SelectMode', time.monotonic_ns()))
+        return 3104, None
+
+
+def check_select_failure():
+    msc = FailingSelectClient(initial_mode='')
+    with contextlib.redirect_stdout(io.StringIO()):
+        controller = RobotController(SimBackend(msc=msc))
+        controller.low_level_mode = True
+        try:
+            controller.ensure_high_level_mode()
+            raised = False
+        except RuntimeError:
+            raised = True
+    ok = raised and controller.low_level_mode and controller.mode_watcher.snapshot.name != 'ai'
+    print(f"SelectMode 失败: 抛出异常 {raised}, low_level_mode={controller.low_level_mode}, "
+          f"缓存模式 '{controller.mode_watcher.snapshot.name}' {'ok' if ok else 'FAIL'}")
+
+    msc = FailingSelectClient(initial_mode='')  # 上次运行停在底层控制，启动时需要 SelectMode
+    with contextlib.redirect_stdout(io.StringIO()):
+        controller = RobotController(SimBackend(msc=msc))
+        started = controller.start_in_damp(retry_period_s=0.0)
+        controller.stop_low_level_thread()
+    selects = [name for name, _ in msc.calls].count('SelectMode')
+    startup_ok = (started and controller.current_state == RobotState.LOW_LEVEL_DAMP and msc.mode == ''
+                  and selects == 3)
+    print(f"启动时 SelectMode 失败: SelectMode {selects} 次后进入 {controller.current_state.name}, "
+          f"运动模式 '{msc.mode}' {'ok' if startup_ok else 'FAIL'}")
+    return ok and startup_ok
+
+
+def send_state(controller, state):
+    controller.command_queue.put(MyMotionCommand(command_type=0, state_enum=state.value, leg_selection=0,
+                                                 angle1=0.0, angle2=0.0, x=0.0, y=0.0, r=0.0, command_id=0))
+    deadline = time.monotonic() + 15.0
+    while time.monotonic() < deadline:
+        if controller.current_state == state and not controller.transition_in_progress():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def check_controller_rpcs():
+    msc = SimMotionSwitcherClient()
+    with contextlib.redirect_stdout(io.StringIO()):
+        controller = RobotController(SimBackend(msc=msc))
+        controller.transition_to_high_level_damp()
+        sm_thread = threading.Thread(target=controller.state_machine_thread)
+        sm_thread.start()
+        ok = send_state(controller, RobotState.HIGH_LEVEL_STAND)
+        start = len(msc.calls)
+        for _ in range(ROUND_TRIPS):
+            ok &= send_state(controller, RobotState.LOW_LEVEL_STAND)
+            ok &= send_state(controller, RobotState.HIGH_LEVEL_STAND)
+        controller.running = False
+        sm_thread.join()
+        controller.stop_low_level_thread()
+    calls = [name for name, _ in msc.calls[start:]]
+    checks = calls.count('CheckMode')
+    # 原实现每次往返: ensure_low 1次 + 调试 1次 + ensure_high 1次 = 3次
+    legacy_checks = 3 * ROUND_TRIPS
+    print(f"控制器 {ROUND_TRIPS} 次 高层<->低层 往返: CheckMode {checks} 次（原实现 {legacy_checks} 次），"
+          f"ReleaseMode {calls.count('ReleaseMode')} 次, SelectMode {calls.count('SelectMode')} 次")
+    # 每次往返: 释放后确认的 1 次 + 切回 AI 模式前重新查询的 1 次（切换运动模式前都不使用缓存）
+    return (ok and checks == 2 * ROUND_TRIPS and calls.count('ReleaseMode') >= ROUND_TRIPS
+            and calls.count('SelectMode') == ROUND_TRIPS)
+
+
+if __name__ == "__main__":
+    ok = check_single_flight()
+    ok &= check_cache_and_record()
+    ok &= check_select_failure()
+    ok &= check_controller_rpcs()
+    print("PASS" if ok else "FAIL")
+    sys.exit(0 if ok else 1)
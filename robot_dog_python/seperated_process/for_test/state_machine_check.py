@@ -0,0 +1,174 @@
+"""
+身体控制状态机响应性检查（模拟机器狗后端，不需要Go2）
+1. HIGH_LEVEL_DAMP -> HIGH_LEVEL_STAND -> LOW_LEVEL_STAND -> HIGH_LEVEL_STAND
+2. 在 LOW_LEVEL -> HIGH_LEVEL 的切换（约 1.8s）中发送其他命令：命令接收延迟应保持在 INTAKE_BUDGET_MS 内
+3. 过渡中发送 DAMP：进行中的切换被取消，DAMP_BUDGET_MS 内开始发送阻尼命令（kp=0）
+4. 旧任务阻塞在 SelectMode（模拟 0.3s）中时发送 DAMP：DAMP 的 ReleaseMode 排在旧 SelectMode 之后，
+   PREEMPT_DAMP_BUDGET_MS 内开始阻尼；旧任务结束后机器狗的运动模式为 ''（已释放），low_level_mode 为 True
+5. ReleaseMode 较慢（0.3s）时在 HIGH_LEVEL_STAND -> LOW_LEVEL_STAND 的释放过程中发送 HIGH_LEVEL_DAMP：
+   DAMP 不能因为缓存中的 'ai' 跳过 SelectMode，旧任务结束后机器狗的运动模式为 'ai'，状态为 HIGH_LEVEL_DAMP
+6. 状态切换命令的延迟追踪：sdk_call 在切换任务中第一次 SDK 调用返回之后打点，而不是任务启动时
+使用 body_backend.SimBackend，不需要 unitree_sdk2py。
+用法: python state_machine_check.py
+"""
+import sys
+import os
+import time
+import threading
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../communication")))
+
+from dds_data_structure import MyMotionCommand
+from body_backend import SimBackend, SimMotionSwitcherClient
+from main_dog_body_control import RobotController, RobotState
+from latency_trace import HOP_QUEUE_DEQUEUE, HOP_SDK_CALL
+
+INTAKE_BUDGET_MS = 20.0
+DAMP_BUDGET_MS = 50.0
+# 旧任务阻塞时：旧 SelectMode 的剩余时间（模拟 0.3s）+ PREEMPT_JOIN_TIMEOUT_S + ReleaseMode、确认查询各一次
+PREEMPT_DAMP_BUDGET_MS = 400.0
+
+now = time.monotonic
+
+
+class MockedController(RobotController):
+    """使用模拟后端，并记录每条命令从发送到被状态机处理的延迟"""
+
+    def __init__(self, backend=None):
+        self.dispatch_delays_ms = []
+        self.traces = {}
+        super().__init__(backend or SimBackend())
+
+    def publish_trace(self, trace_id, stamps):
+        self.traces[trace_id] = dict(stamps)
+        super().publish_trace(trace_id, stamps)
+
+    def process_command(self, cmd):
+        self.dispatch_delays_ms.append((now() - cmd.sent_at) * 1000.0)
+        return super().process_command(cmd)
+
+
+def send(controller, command_type=0, state=None, x=0.0, trace_id=0):
+    cmd = MyMotionCommand(command_type=command_type, state_enum=state.value if state else 0, leg_selection=0,
+                          angle1=0.0, angle2=0.0, x=x, y=0.0, r=0.0, command_id=trace_id)
+    cmd.sent_at = now()
+    controller.command_queue.put(cmd)
+    return cmd.sent_at
+
+
+def wait_for_state(controller, state, timeout=10.0):
+    deadline = now() + timeout
+    while now() < deadline:
+        if controller.current_state == state and not controller.transition_in_progress():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def check_damp_during_release():
+    controller = MockedController(SimBackend(msc=SimMotionSwitcherClient(release_s=0.3)))
+    controller.transition_to_high_level_damp()
+    sm_thread = threading.Thread(target=controller.state_machine_thread)
+    sm_thread.start()
+    send(controller, state=RobotState.HIGH_LEVEL_STAND)
+    ok = wait_for_state(controller, RobotState.HIGH_LEVEL_STAND)
+    send(controller, state=RobotState.LOW_LEVEL_STAND)
+    deadline = now() + 5.0
+    while now() < deadline and (controller.transition_status() or {}).get('stage') != 'release_mode':
+        time.sleep(0.005)
+    time.sleep(0.05)
+    preempted = controller.transition_task
+    send(controller, state=RobotState.HIGH_LEVEL_DAMP)
+    ok &= wait_for_state(controller, RobotState.HIGH_LEVEL_DAMP)
+    ok &= preempted.join(2.0)
+    robot_mode = controller.backend.msc.mode
+    print(f"释放过程中 HIGH_LEVEL_DAMP: 状态 {controller.current_state.name}, low_level_mode={controller.low_level_mode}, "
+          f"机器狗运动模式 '{robot_mode}'")
+    ok &= controller.current_state == RobotState.HIGH_LEVEL_DAMP and robot_mode == 'ai'
+    ok &= not controller.low_level_mode
+    controller.running = False
+    sm_thread.join()
+    return ok
+
+
+if __name__ == "__main__":
+    controller = MockedController()
+    controller.transition_to_high_level_damp()
+    sm_thread = threading.Thread(target=controller.state_machine_thread)
+    sm_thread.start()
+    ok = True
+
+    for trace_id, target in enumerate((RobotState.HIGH_LEVEL_STAND, RobotState.LOW_LEVEL_STAND), start=1):
+        send(controller, state=target, trace_id=trace_id)
+        ok &= wait_for_state(controller, target)
+        print(f"-> {target.name}: {'ok' if controller.current_state == target else 'FAIL'}")
+
+    # sdk_call 必须晚于切换任务中第一次 SDK 调用的开始时间
+    sdk_calls = sorted(t for client in (controller.backend.sport, controller.backend.msc) for _, t in client.calls)
+    for trace_id in (1, 2):
+        stamps = controller.traces.get(trace_id, {})
+        dequeue_ns, sdk_ns = stamps.get(HOP_QUEUE_DEQUEUE, 0), stamps.get(HOP_SDK_CALL, 0)
+        first_call = next((t for t in sdk_calls if t >= dequeue_ns), None)
+        traced = bool(dequeue_ns and sdk_ns and first_call and sdk_ns > first_call)
+        ok &= traced
+        print(f"追踪 {trace_id}: queue_dequeue -> sdk_call {(sdk_ns - dequeue_ns) / 1e6:.1f}ms "
+              f"{'ok' if traced else 'FAIL'}")
+
+    # 低层 -> 高层：先等待 0.5s（仍处于低层模式）再切换 AI 模式，在等待阶段发送命令
+    send(controller, state=RobotState.HIGH_LEVEL_STAND)
+    time.sleep(0.1)
+    controller.dispatch_delays_ms.clear()
+    for _ in range(10):
+        send(controller, command_type=2, x=0.2)
+        send(controller, state=RobotState.LOW_LEVEL_RAISE_LEG)
+        time.sleep(0.02)
+    status_before_damp = controller.transition_status()
+    damp_sent_ns = time.monotonic_ns()
+    send(controller, state=RobotState.LOW_LEVEL_DAMP)
+    ok &= wait_for_state(controller, RobotState.LOW_LEVEL_DAMP)
+    time.sleep(0.05)
+
+    damp_at_ns = controller.low_cmd_publisher.first_after(damp_sent_ns, damp=True)
+    damp_ms = (damp_at_ns - damp_sent_ns) / 1e6 if damp_at_ns else float('inf')
+    intake_max = max(controller.dispatch_delays_ms)
+    moves_during_transition = len(controller.sport.call_times('Move'))
+
+    print(f"过渡中的切换任务: {status_before_damp}")
+    print(f"命令接收延迟: 最大 {intake_max:.2f}ms（预算 {INTAKE_BUDGET_MS}ms），"
+          f"{len(controller.dispatch_delays_ms)} 条命令")
+    print(f"DAMP -> 首条阻尼 LowCmd: {damp_ms:.1f}ms（预算 {DAMP_BUDGET_MS}ms），状态 {controller.current_state.name}")
+    ok &= status_before_damp['stage'] == 'settle'
+    ok &= intake_max <= INTAKE_BUDGET_MS
+    ok &= damp_ms <= DAMP_BUDGET_MS
+    ok &= moves_during_transition == 0
+
+    # 旧任务阻塞在 SelectMode 中时抢占
+    send(controller, state=RobotState.HIGH_LEVEL_STAND)
+    deadline = now() + 5.0
+    while now() < deadline and (controller.transition_status() or {}).get('stage') != 'select_ai_mode':
+        time.sleep(0.005)
+    time.sleep(0.05)
+    select_pending = controller.msc.calls[-1][0] == 'SelectMode'
+    preempted = controller.transition_task
+    damp_sent_ns = time.monotonic_ns()
+    send(controller, state=RobotState.LOW_LEVEL_DAMP)
+    ok &= wait_for_state(controller, RobotState.LOW_LEVEL_DAMP)
+    ok &= preempted.join(2.0)
+    time.sleep(0.1)
+    damp_at_ns = controller.low_cmd_publisher.first_after(damp_sent_ns, damp=True)
+    damp_ms = (damp_at_ns - damp_sent_ns) / 1e6 if damp_at_ns else float('inf')
+    robot_mode = controller.backend.msc.mode
+    print(f"SelectMode 阻塞中 DAMP -> 首条阻尼 LowCmd: {damp_ms:.1f}ms（预算 {PREEMPT_DAMP_BUDGET_MS}ms），"
+          f"状态 {controller.current_state.name}, low_level_mode={controller.low_level_mode}, "
+          f"机器狗运动模式 '{robot_mode}'")
+    ok &= select_pending and damp_ms <= PREEMPT_DAMP_BUDGET_MS and controller.low_level_mode
+    ok &= controller.current_state == RobotState.LOW_LEVEL_DAMP and robot_mode == ''
+
+    controller.running = False
+    sm_thread.join()
+    controller.stop_low_level_thread()
+
+    ok &= check_damp_during_release()
+    print("PASS" if ok else "FAIL")
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,106 @@
+"""
+main_dog_status 分频发布检查（不需要Go2和jtop）
+1. 500Hz 的模拟 rt/lowstate 经 MotorStatePublisher 降采样后，DogMotorState 的频率接近 MOTOR_STATE_RATE_HZ，
+   且不受同时进行的慢速 CheckMode（模拟为 1.5s）影响
+2. ModeInfoPublisher 只在模式/硬件信息变化时发布，另有定期重发
+使用 dds_loopback 和 body_backend.SimMotionSwitcherClient。
+用法: python status_rates_check.py [秒数]
+"""
+import sys
+import os
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../communication")))
+
+import dds_loopback
+from dds_data_structure import DogMotorState, DogModeInfo, JetsonHardware, DOG_MOTOR_STATE_TOPIC, DOG_MODE_INFO_TOPIC
+from body_backend import SimMotionSwitcherClient
+from rt_loop import RealtimeLoop
+from status_topics import MotorStatePublisher, ModeInfoPublisher, MOTOR_STATE_RATE_HZ
+from mode_watcher import ModeWatcher
+
+LOWSTATE_PERIOD_S = 0.002
+RATE_TOLERANCE = 0.05
+MAX_INTERVAL_MS = 1000.0 / MOTOR_STATE_RATE_HZ + 10.0
+
+
+def fake_lowstate(tick):
+    motors = [SimpleNamespace(mode=1, q=0.01 * tick, dq=0.0, ddq=0.0, tau_est=0.0, temperature=30, lost=0,
+                              reserve=[0, 0]) for _ in range(20)]
+    return SimpleNamespace(tick=tick, motor_state=motors, bms_state=SimpleNamespace(soc=87))
+
+
+def check_motor_rate(duration_s):
+    received_ns = []
+    sub = dds_loopback.ChannelSubscriber(DOG_MOTOR_STATE_TOPIC, DogMotorState)
+    sub.Init(lambda msg: received_ns.append(time.monotonic_ns()))
+    pub = dds_loopback.ChannelPublisher(DOG_MOTOR_STATE_TOPIC, DogMotorState)
+    pub.Init()
+    motor_state = MotorStatePublisher(pub)
+    lowstate_sub = dds_loopback.ChannelSubscriber("rt/lowstate", None)
+    lowstate_sub.Init(motor_state.on_lowstate)
+    lowstate_pub = dds_loopback.ChannelPublisher("rt/lowstate", None)
+
+    # CheckMode 很慢时，电机状态的发布不能被拖住
+    watcher = ModeWatcher(SimMotionSwitcherClient(check_s=1.5), period_s=0.1).start()
+
+    def send_lowstate(tick):
+        lowstate_pub.Write(fake_lowstate(tick))
+
+    loop = RealtimeLoop(LOWSTATE_PERIOD_S)
+    loop.run(send_lowstate, max_ticks=int(duration_s / LOWSTATE_PERIOD_S))
+    watcher.stop()
+    sub.Close()
+    lowstate_sub.Close()
+
+    times = np.array(received_ns)
+    hz = (len(times) - 1) / ((times[-1] - times[0]) / 1e9)
+    intervals = np.diff(times) / 1e6
+    print(f"rt/lowstate {motor_state.received} 条 -> DogMotorState {motor_state.published} 条, "
+          f"{hz:.1f} Hz（目标 {MOTOR_STATE_RATE_HZ:.0f}）, 间隔 p50 {np.percentile(intervals, 50):.1f}ms "
+          f"max {intervals.max():.1f}ms, CheckMode 调用 {len(watcher.msc.calls)} 次")
+    ok = abs(hz - MOTOR_STATE_RATE_HZ) <= MOTOR_STATE_RATE_HZ * RATE_TOLERANCE
+    ok &= intervals.max() <= MAX_INTERVAL_MS
+    return ok
+
+
+def check_mode_info():
+    sent = []
+    sub = dds_loopback.ChannelSubscriber(DOG_MODE_INFO_TOPIC, DogModeInfo)
+    sub.Init(sent.append)
+    pub = dds_loopback.ChannelPublisher(DOG_MODE_INFO_TOPIC, DogModeInfo)
+    mode_info = ModeInfoPublisher(pub, refresh_s=0.2)
+
+    hw = JetsonHardware(disk_usage_percent=40.0, emc_usage_percent=10.0, fan_speed_percent=30.0, uptime_seconds=100)
+    steps = [
+        ('首次', 'ai', hw, True),
+        ('无变化 (uptime 变化)', 'ai', JetsonHardware(40.0, 10.0, 30.0, 101), False),
+        ('EMC 小幅波动', 'ai', JetsonHardware(40.0, 12.0, 30.0, 102), False),
+        ('模式变化', '', JetsonHardware(40.0, 12.0, 30.0, 103), True),
+        ('风扇变化', '', JetsonHardware(40.0, 12.0, 60.0, 104), True),
+        ('jetson_clocks 变化', '', JetsonHardware(40.0, 12.0, 60.0, 105, True), True),
+    ]
+    ok = True
+    for label, name, hardware, expected in steps:
+        published = mode_info.update('normal', name, hardware)
+        ok &= published == expected
+        print(f"  {label}: {'发布' if published else '跳过'}{'' if published == expected else '  <- FAIL'}")
+    time.sleep(0.25)
+    refreshed = mode_info.update('normal', '', JetsonHardware(40.0, 12.0, 60.0, 106, True))
+    print(f"  定期重发: {'发布' if refreshed else '跳过'}")
+    ok &= refreshed and len(sent) == mode_info.published == 5
+    sub.Close()
+    return ok
+
+
+if __name__ == "__main__":
+    duration_s = float(sys.argv[1]) if len(sys.argv) > 1 else 3.0
+    ok = check_motor_rate(duration_s)
+    print("DogModeInfo:")
+    ok &= check_mode_info()
+    print("PASS" if ok else "FAIL")
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,117 @@
+"""
+端到端延迟追踪回环检查
+控制网关通过 dds_loopback 写入 MyMotionCommand，回环的身体控制替身按
+body_read -> queue_dequeue -> sdk_call 打点并回报 CommandTrace，最后打印网关统计中的各跳延迟，
+并检查各跳延迟不为负。
+不需要机器狗和网络。
+用法: python trace_loopback_check.py [命令数量]
+"""
+import sys
+import os
+import json
+import time
+import queue
+import asyncio
+import logging
+import threading
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../communication")))
+
+import dds_loopback
+from dds_data_structure import MyMotionCommand, CommandTrace
+from latency_trace import TraceReporter, HOP_BODY_READ, HOP_QUEUE_DEQUEUE, HOP_SDK_CALL, HOPS
+from main_control_gateway import ControlGateway
+
+CHECK_PORT = 18992
+
+
+class FakeSportClient:
+    def Move(self, vx, vy, vyaw):
+        time.sleep(0.0005)  # 模拟RPC耗时
+
+
+class LoopbackBody:
+    """与 main_dog_body_control 相同的打点位置：读取、出队、SDK调用"""
+
+    def __init__(self):
+        self.sport = FakeSportClient()
+        self.command_queue = queue.Queue()
+        self.running = True
+        self.trace_publisher = dds_loopback.ChannelPublisher("rt/command_trace", CommandTrace)
+        self.trace_publisher.Init()
+        self.tracer = TraceReporter(self.publish_trace)
+        self.subscriber = dds_loopback.ChannelSubscriber("rt/my_motion_command", MyMotionCommand)
+        self.subscriber.Init(self.on_message)
+
+    def publish_trace(self, trace_id, stamps):
+        self.trace_publisher.Write(CommandTrace(
+            trace_id=trace_id,
+            body_read_ns=stamps.get(HOP_BODY_READ, 0),
+            queue_dequeue_ns=stamps.get(HOP_QUEUE_DEQUEUE, 0),
+            sdk_call_ns=stamps.get(HOP_SDK_CALL, 0)
+        ))
+
+    def on_message(self, msg):
+        self.tracer.stamp(msg.command_id, HOP_BODY_READ)
+        self.command_queue.put(msg)
+
+    def state_machine(self):
+        while self.running:
+            try:
+                cmd = self.command_queue.get(timeout=0.05)
+            except queue.Empty:
+                continue
+            self.tracer.stamp(cmd.command_id, HOP_QUEUE_DEQUEUE)
+            self.sport.Move(cmd.x, cmd.y, cmd.r)
+            self.tracer.stamp(cmd.command_id, HOP_SDK_CALL)
+            self.tracer.finish(cmd.command_id)
+
+
+async def run_check(count: int):
+    body = LoopbackBody()
+    threads = [threading.Thread(target=body.state_machine)]
+    for t in threads:
+        t.start()
+
+    gateway = ControlGateway(port=CHECK_PORT, dds_channels=dds_loopback)
+    server_task = asyncio.create_task(gateway.start())
+    while not gateway.is_running:
+        await asyncio.sleep(0.01)
+
+    loop = asyncio.get_running_loop()
+    transport, _ = await loop.create_datagram_endpoint(
+        asyncio.DatagramProtocol, remote_addr=('127.0.0.1', CHECK_PORT))
+    for i in range(count):
+        transport.sendto(json.dumps({
+            'timestamp': time.time(),
+            'data': {'command_type': 'xyr_control', 'target': 'body', 'ack_mode': 'none',
+                     'data': {'x': 0.1, 'y': 0.0, 'r': 0.0}}
+        }).encode('utf-8'))
+        await asyncio.sleep(0.02)  # 50Hz
+    await asyncio.sleep(0.2)
+
+    stats = gateway.get_stats()
+    transport.close()
+    await gateway.stop()
+    server_task.cancel()
+    body.running = False
+    for t in threads:
+        t.join()
+    return stats
+
+
+if __name__ == "__main__":
+    logging.disable(logging.CRITICAL)
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    stats = asyncio.run(run_check(count))
+    latency = stats['latency']
+    for name, summary in latency.items():
+        print(f"{name:40s} {summary}")
+    end_to_end = latency.get(f"{HOPS[0]}->{HOPS[-1]}", {})
+    ok = end_to_end.get('count', 0) == count
+    # 回环是同步交付的，dds_write 必须在 body_read 之前打点，各跳延迟不能为负
+    negative = [name for name, summary in latency.items() if summary['mean_us'] < 0]
+    ok &= not negative
+    print("PASS" if ok else "FAIL", f"完成追踪 {end_to_end.get('count', 0)}/{count}",
+          f"负延迟: {', '.join(negative)}" if negative else "")
@@ -0,0 +1,60 @@
+"""
+预计算轨迹检查
+- 各插值曲线的端点、最大关节速度/加速度（趴下 -> 站立，1500ms，500Hz）
+- 每周期取一行 vs 每周期列表推导插值的耗时
+- 缓存命中
+用法: python trajectory_check.py
+"""
+import sys
+import os
+import time
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from trajectory import (build_trajectory, build_sequence, cache_info,
+                        PROFILE_LINEAR, PROFILE_CUBIC, PROFILE_MIN_JERK)
+
+PERIOD_S = 0.002
+STAND = [0.0, 0.67, -1.3] * 4
+LIE_DOWN = [-0.35, 1.36, -2.65, 0.35, 1.36, -2.65, -0.5, 1.36, -2.65, 0.5, 1.36, -2.65]
+
+
+def per_tick_us(fn, steps, repeat=20):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for step in range(steps):
+            fn(step)
+    return (time.perf_counter() - start) / (repeat * steps) * 1e6
+
+
+if __name__ == "__main__":
+    ok = True
+    print(f"{'曲线':10s} {'行数':>6s} {'最大速度(rad/s)':>16s} {'最大加速度(rad/s^2)':>20s} {'起止加速度':>12s}")
+    for profile in (PROFILE_LINEAR, PROFILE_CUBIC, PROFILE_MIN_JERK):
+        traj = build_trajectory(LIE_DOWN, STAND, 1500, profile, PERIOD_S)
+        ok &= np.allclose(traj[0], LIE_DOWN) and np.allclose(traj[-1], STAND)
+        # 前后各补一行端点，表示过渡前后机器狗静止
+        vel = np.diff(np.vstack([traj[:1], traj, traj[-1:]]), axis=0) / PERIOD_S
+        acc = np.diff(vel, axis=0) / PERIOD_S
+        edge_acc = max(np.abs(acc[0]).max(), np.abs(acc[-1]).max())
+        print(f"{profile:10s} {len(traj):6d} {np.abs(vel).max():16.3f} {np.abs(acc).max():20.1f} {edge_acc:12.2f}")
+
+    seq = build_sequence([STAND, LIE_DOWN, STAND], [1500, 1500], period_s=PERIOD_S)
+    ok &= len(seq) == 1501 and np.allclose(seq[750], LIE_DOWN) and np.allclose(seq[-1], STAND)
+
+    steps = 750
+    traj = build_trajectory(LIE_DOWN, STAND, 1500, period_s=PERIOD_S)
+    list_us = per_tick_us(lambda step: [(1 - step / steps) * s + step / steps * e
+                                        for s, e in zip(LIE_DOWN, STAND)], steps)
+    row_us = per_tick_us(lambda step: traj[step], steps)
+
+    before = cache_info().hits
+    build_trajectory(LIE_DOWN, STAND, 1500, period_s=PERIOD_S)
+    ok &= cache_info().hits == before + 1
+    ok &= not traj.flags.writeable
+
+    print(f"每周期: 列表推导插值 {list_us:.2f}us, 预计算取行 {row_us:.2f}us")
+    print("PASS" if ok else "FAIL")
+    sys.exit(0 if ok else 1)
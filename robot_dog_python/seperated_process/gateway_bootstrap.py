@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UDP网关运行时引导
+控制网关和摄像头网关共用：事件循环选择（可选uvloop）和UDP socket调优
+高性能模式通过环境变量 GATEWAY_RUNTIME_MODE=high_performance 开启
+"""
+
+import asyncio
+import os
+import sys
+import socket
+import logging
+from dataclasses import dataclass
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+RUNTIME_MODE_DEFAULT = 'default'
+RUNTIME_MODE_HIGH_PERFORMANCE = 'high_performance'
+
+# DSCP 标记（写入 IP_TOS 的高6位）
+DSCP_CONTROL = 46  # EF，低延迟控制流
+DSCP_VIDEO = 34    # AF41，视频流
+
+# Linux SO_BUSY_POLL，旧版本 Python 的 socket 模块未导出该常量
+SO_BUSY_POLL = getattr(socket, 'SO_BUSY_POLL', 46)
+
+
+@dataclass
+class GatewayRuntimeConfig:
+    """网关运行时配置"""
+    mode: str = RUNTIME_MODE_DEFAULT
+    use_uvloop: bool = False
+    rcvbuf_bytes: Optional[int] = None
+    sndbuf_bytes: Optional[int] = None
+    dscp: Optional[int] = None
+    busy_poll_us: Optional[int] = None
+    reuse_port: bool = False  # 多个进程共享同一端口（SO_REUSEPORT，内核按流分发）
+
+    @classmethod
+    def for_mode(cls, mode: str, dscp: Optional[int] = None) -> 'GatewayRuntimeConfig':
+        """按模式生成配置，dscp 由各网关指定（控制/视频）"""
+        if mode == RUNTIME_MODE_HIGH_PERFORMANCE:
+            return cls(
+                mode=mode,
+                use_uvloop=True,
+                rcvbuf_bytes=4 * 1024 * 1024,
+                sndbuf_bytes=4 * 1024 * 1024,
+                dscp=dscp,
+                busy_poll_us=50
+            )
+        return cls(mode=RUNTIME_MODE_DEFAULT)
+
+    @classmethod
+    def from_env(cls, dscp: Optional[int] = None) -> 'GatewayRuntimeConfig':
+        """从环境变量读取运行模式"""
+        mode = os.getenv('GATEWAY_RUNTIME_MODE', RUNTIME_MODE_DEFAULT).lower()
+        if mode not in (RUNTIME_MODE_DEFAULT, RUNTIME_MODE_HIGH_PERFORMANCE):
+            logger.warning(f"未知运行模式 {mode}，使用默认模式")
+            mode = RUNTIME_MODE_DEFAULT
+        return cls.for_mode(mode, dscp)
+
+
+def install_event_loop_policy(config: GatewayRuntimeConfig) -> str:
+    """按配置安装事件循环策略，返回实际使用的循环名称"""
+    if config.use_uvloop:
+        try:
+            import uvloop
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+            return 'uvloop'
+        except ImportError:
+            logger.warning("uvloop 不可用，使用默认 asyncio 事件循环")
+    asyncio.set_event_loop_policy(None)
+    return 'asyncio'
+
+
+def _try_setsockopt(sock: socket.socket, level: int, option: int, value: int, name: str):
+    try:
+        sock.setsockopt(level, option, value)
+    except OSError as e:
+        # 权限不足或平台不支持时只记录，不影响网关启动
+        logger.warning(f"设置 {name}={value} 失败: {e}")
+
+
+def tune_udp_socket(sock: socket.socket, config: GatewayRuntimeConfig):
+    """应用缓冲区、DSCP 和 busy-poll 设置"""
+    if config.rcvbuf_bytes:
+        _try_setsockopt(sock, socket.SOL_SOCKET, socket.SO_RCVBUF, config.rcvbuf_bytes, 'SO_RCVBUF')
+    if config.sndbuf_bytes:
+        _try_setsockopt(sock, socket.SOL_SOCKET, socket.SO_SNDBUF, config.sndbuf_bytes, 'SO_SNDBUF')
+    if config.dscp is not None and hasattr(socket, 'IP_TOS'):
+        _try_setsockopt(sock, socket.IPPROTO_IP, socket.IP_TOS, config.dscp << 2, 'IP_TOS')
+    if config.busy_poll_us and sys.platform.startswith('linux'):
+        _try_setsockopt(sock, socket.SOL_SOCKET, SO_BUSY_POLL, config.busy_poll_us, 'SO_BUSY_POLL')
+
+
+def create_udp_socket(port: int, config: GatewayRuntimeConfig, host: str = '0.0.0.0') -> socket.socket:
+    """创建已绑定、非阻塞并完成调优的UDP socket"""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if config.reuse_port:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        tune_udp_socket(sock, config)
+        sock.bind((host, port))
+        sock.setblocking(False)
+    except Exception:
+        sock.close()
+        raise
+    return sock
+
+
+def run_gateway(main, config: GatewayRuntimeConfig):
+    """安装事件循环策略并运行网关主协程"""
+    loop_name = install_event_loop_policy(config)
+    logger.info(f"网关运行模式: {config.mode}, 事件循环: {loop_name}")
+    asyncio.run(main())
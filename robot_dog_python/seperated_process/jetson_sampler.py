@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+jtop 采样线程
+- 在自己的线程里按 jtop 的 interval 读取 jetson.stats（jetson.ok() 每个 interval 返回一次），
+  转换成 DogJetsonHealth 和 JetsonHardware，发布循环只取现成的结构体写出
+- CPU 核心的键名在第一次采样时确定，之后不再扫描 stats 的全部键；温度和功耗的键名对应关系固定在下面的表中
+- 每次采样生成新的结构体，发布方拿到后不会再被修改，不需要拷贝
+不依赖 jtop，jetson 对象由调用方传入（jtop 实例，或测试用的模拟对象）。
+"""
+
+import datetime
+import threading
+import time
+from typing import Optional, Tuple
+
+from dds_data_structure import DogJetsonHealth, JetsonHardware
+
+# DogJetsonHealth.temperatures 字段 -> jtop 键名（cpu/tj 的对应关系按 jtop 调试输出确认）
+TEMPERATURE_KEYS = (
+    ('cpu', 'Temp tj'), ('gpu', 'Temp gpu'), ('soc0', 'Temp soc0'), ('soc1', 'Temp soc1'), ('soc2', 'Temp soc2'),
+    ('cv0', 'Temp cv0'), ('cv1', 'Temp cv1'), ('cv2', 'Temp cv2'), ('tj', 'Temp cpu'),
+)
+# DogJetsonHealth.power 字段 -> jtop 键名；VDD_INN 没有单独的读数，与总功耗相同
+POWER_KEYS = (
+    ('cpu_gpu_cv', 'Power VDD_CPU_GPU_CV'), ('soc', 'Power VDD_SOC'),
+    ('vdd_inn', 'Power TOT'), ('nv_power_total', 'Power TOT'),
+)
+
+JetsonSample = Tuple[int, DogJetsonHealth, JetsonHardware]
+
+
+def get_jtop_val(stat_obj):
+    """Safely extracts a value from a jtop statistic."""
+    if isinstance(stat_obj, (int, float)):
+        return float(stat_obj)
+    if isinstance(stat_obj, dict):
+        return float(stat_obj.get('val', 0.0))
+    return 0.0
+
+
+def cpu_core_keys(stats) -> Tuple[str, ...]:
+    """stats 中各 CPU 核心的键（'CPU1'、'CPU2' ...）；关闭的核心值为 'OFF'，按 0 计入平均值"""
+    return tuple(k for k in stats if k.startswith('CPU') and k[3:].isdigit())
+
+
+class JetsonSampler:
+    """后台读取 jtop，保存最近一次的 (序号, DogJetsonHealth, JetsonHardware)"""
+
+    def __init__(self, jetson, name: str = "JetsonSampler"):
+        self.jetson = jetson
+        self.name = name
+        self.core_keys: Optional[Tuple[str, ...]] = None
+        self.seq = 0
+        self.health: Optional[DogJetsonHealth] = None
+        self.hardware: Optional[JetsonHardware] = None
+        self.last_sample_s = 0.0  # 最近一次读取和转换 stats 的耗时
+        self.errors = 0
+        self._running = False
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+
+    def _run(self):
+        try:
+            while self._running and self.jetson.ok():
+                start = time.perf_counter()
+                try:
+                    health, hardware = self.sample(self.jetson.stats)
+                except Exception as e:
+                    self.errors += 1
+                    print(f"[{self.name}] sample error: {e}")
+                    continue
+                with self._cond:
+                    self.health, self.hardware = health, hardware
+                    self.seq += 1
+                    self.last_sample_s = time.perf_counter() - start
+                    self._cond.notify_all()
+        finally:
+            # jtop 断开时 ok() 返回 False，通知等待的发布循环退出
+            with self._cond:
+                self._running = False
+                self._cond.notify_all()
+
+    def sample(self, stats) -> Tuple[DogJetsonHealth, JetsonHardware]:
+        if self.core_keys is None:
+            self.core_keys = cpu_core_keys(stats)
+        health = DogJetsonHealth(timestamp_ns=time.time_ns())
+        populate_jetson_health(health, stats, self.core_keys)
+        hardware = JetsonHardware()
+        populate_jetson_hardware(hardware, stats)
+        return health, hardware
+
+    def wait(self, seq: int, timeout: Optional[float] = None) -> Optional[JetsonSample]:
+        """等待序号大于 seq 的采样；超时或采样线程已停止时返回 None"""
+        with self._cond:
+            self._cond.wait_for(lambda: self.seq > seq or not self._running, timeout)
+            if self.seq > seq:
+                return self.seq, self.health, self.hardware
+            return None
+
+
+def populate_jetson_health(health_msg, stats, core_keys: Tuple[str, ...]):
+    """Populates Jetson load, temperatures and power from one jtop stats dict."""
+    total_cpu_usage = sum(get_jtop_val(stats.get(core)) for core in core_keys)
+    health_msg.cpu_usage_percent = total_cpu_usage / len(core_keys) if core_keys else 0.0
+    health_msg.gpu_usage_percent = get_jtop_val(stats.get('GPU'))
+    health_msg.memory_usage_percent = get_jtop_val(stats.get('RAM')) * 100.0
+
+    temperatures = health_msg.temperatures
+    for field, key in TEMPERATURE_KEYS:
+        setattr(temperatures, field, stats.get(key, 0.0))
+    power = health_msg.power
+    for field, key in POWER_KEYS:
+        setattr(power, field, stats.get(key, 0))
+
+
+def populate_jetson_hardware(hardware, stats):
+    # Note: 'disk' key is not provided by the jtop python library, so it will correctly be 0.
+    disk_stats = stats.get('disk', {})
+    disk_used = disk_stats.get('used', 0)
+    disk_total = disk_stats.get('total', 0)
+    hardware.disk_usage_percent = (disk_used / disk_total) * 100 if disk_total > 0 else 0
+
+    hardware.emc_usage_percent = get_jtop_val(stats.get('EMC'))
+    hardware.fan_speed_percent = get_jtop_val(stats.get('Fan pwmfan0'))
+
+    uptime_val = stats.get('uptime')
+    if isinstance(uptime_val, datetime.timedelta):
+        hardware.uptime_seconds = int(uptime_val.total_seconds())
+    else:
+        hardware.uptime_seconds = int(uptime_val or 0)
+
+    hardware.jetson_clocks_on = stats.get('jetson_clocks', 'OFF') == 'ON'
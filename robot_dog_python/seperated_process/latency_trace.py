@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+控制命令端到端延迟追踪
+trace_id 通过 MyMotionCommand.command_id 从控制网关传到身体控制进程（0 表示不追踪），
+各跳使用 time.monotonic_ns() 打点。网关与身体控制进程运行在同一台 Jetson 上，
+单调时钟在进程间可直接比较。
+"""
+
+import bisect
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, Optional
+
+# 追踪的各跳，按命令经过的顺序排列
+HOP_GATEWAY_RECEIVE = 'gateway_receive'  # 网关收到UDP数据包
+HOP_DDS_WRITE = 'dds_write'              # 网关调用DDS Write（调用之前打点）
+HOP_BODY_READ = 'body_read'              # 身体控制进程读到DDS消息
+HOP_QUEUE_DEQUEUE = 'queue_dequeue'      # 状态机从命令队列取出
+HOP_SDK_CALL = 'sdk_call'                # SDK调用（如 sport.Move）返回；状态切换为切换任务中第一次SDK调用返回
+HOPS = (HOP_GATEWAY_RECEIVE, HOP_DDS_WRITE, HOP_BODY_READ, HOP_QUEUE_DEQUEUE, HOP_SDK_CALL)
+
+now_ns = time.monotonic_ns
+
+# 直方图桶上界（微秒），约按 1-2-5 递增
+_BUCKET_BOUNDS_US = (
+    10, 20, 50, 100, 200, 500,
+    1000, 2000, 5000, 10000, 20000, 50000,
+    100000, 200000, 500000, 1000000,
+)
+
+
+class LatencyHistogram:
+    """固定桶延迟直方图（微秒）"""
+
+    def __init__(self):
+        self.buckets = [0] * (len(_BUCKET_BOUNDS_US) + 1)
+        self.count = 0
+        self.total_us = 0.0
+        self.max_us = 0.0
+
+    def add(self, latency_us: float):
+        self.buckets[bisect.bisect_left(_BUCKET_BOUNDS_US, latency_us)] += 1
+        self.count += 1
+        self.total_us += latency_us
+        if latency_us > self.max_us:
+            self.max_us = latency_us
+
+    def percentile(self, p: float) -> float:
+        """返回包含第p百分位的桶上界（不超过最大值）"""
+        if not self.count:
+            return 0.0
+        rank = p / 100.0 * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if seen >= rank and i < len(_BUCKET_BOUNDS_US):
+                return min(float(_BUCKET_BOUNDS_US[i]), round(self.max_us, 1))
+        return round(self.max_us, 1)
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            'count': self.count,
+            'mean_us': round(self.total_us / self.count, 1) if self.count else 0.0,
+            'p50_us': self.percentile(50),
+            'p99_us': self.percentile(99),
+            'max_us': round(self.max_us, 1),
+        }
+
+
+class TraceIdGenerator:
+    """生成非零 trace_id"""
+
+    def __init__(self, start: int = 1):
+        self._counter = itertools.count(start)
+        self._lock = threading.Lock()
+
+    def next_id(self) -> int:
+        with self._lock:
+            return next(self._counter)
+
+
+class TraceCollector:
+    """汇总各跳时间戳，按相邻跳计算延迟并写入直方图"""
+
+    def __init__(self, hops: Iterable[str] = HOPS, max_inflight: int = 1024):
+        self.hops = tuple(hops)
+        self.max_inflight = max_inflight
+        self._inflight: 'OrderedDict[int, Dict[str, int]]' = OrderedDict()
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+        self.dropped = 0
+
+    def stamp(self, trace_id: int, hop: str, t_ns: Optional[int] = None):
+        """记录一个跳的时间戳"""
+        if not trace_id:
+            return
+        self.merge(trace_id, {hop: t_ns if t_ns is not None else now_ns()})
+
+    def merge(self, trace_id: int, stamps: Dict[str, int]):
+        """合并来自其他进程的时间戳"""
+        if not trace_id:
+            return
+        with self._lock:
+            entry = self._inflight.get(trace_id)
+            if entry is None:
+                entry = self._inflight[trace_id] = {}
+                while len(self._inflight) > self.max_inflight:
+                    self._inflight.popitem(last=False)
+                    self.dropped += 1
+            entry.update((hop, t) for hop, t in stamps.items() if t)
+            if self.hops[-1] in entry:
+                self._finish_locked(trace_id)
+
+    def finish(self, trace_id: int):
+        """结束追踪（命令未走完全部跳时使用，例如被状态机拒绝）"""
+        with self._lock:
+            if trace_id in self._inflight:
+                self._finish_locked(trace_id)
+
+    def _finish_locked(self, trace_id: int):
+        entry = self._inflight.pop(trace_id)
+        present = [hop for hop in self.hops if hop in entry]
+        for prev, hop in zip(present, present[1:]):
+            self._add_locked(f"{prev}->{hop}", (entry[hop] - entry[prev]) / 1000.0)
+        if len(present) > 1:
+            self._add_locked(f"{present[0]}->{present[-1]}",
+                             (entry[present[-1]] - entry[present[0]]) / 1000.0)
+
+    def _add_locked(self, name: str, latency_us: float):
+        histogram = self._histograms.get(name)
+        if histogram is None:
+            histogram = self._histograms[name] = LatencyHistogram()
+        histogram.add(latency_us)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """返回各跳延迟统计"""
+        with self._lock:
+            return {name: h.summary() for name, h in self._histograms.items()}
+
+
+class TraceReporter:
+    """进程内打点，命令结束时把本进程的时间戳交给 publish 回调（如写入DDS）"""
+
+    def __init__(self, publish: Callable[[int, Dict[str, int]], None], max_inflight: int = 256):
+        self.publish = publish
+        self.max_inflight = max_inflight
+        self._inflight: 'OrderedDict[int, Dict[str, int]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def stamp(self, trace_id: int, hop: str, t_ns: Optional[int] = None):
+        if not trace_id:
+            return
+        with self._lock:
+            entry = self._inflight.get(trace_id)
+            if entry is None:
+                entry = self._inflight[trace_id] = {}
+                while len(self._inflight) > self.max_inflight:
+                    self._inflight.popitem(last=False)
+            entry[hop] = t_ns if t_ns is not None else now_ns()
+
+    def finish(self, trace_id: int):
+        if not trace_id:
+            return
+        with self._lock:
+            stamps = self._inflight.pop(trace_id, None)
+        if stamps:
+            try:
+                self.publish(trace_id, stamps)
+            except Exception as e:
+                print(f"[TraceReporter] Failed to publish trace {trace_id}: {e}")
+
+
+class CallHook:
+    """转发客户端（SportClient / MotionSwitcherClient）的方法调用，每次调用返回后执行 after_call，用于 SDK 调用打点"""
+
+    def __init__(self, target, after_call: Callable[[], None]):
+        self._target = target
+        self._after_call = after_call
+
+    def __getattr__(self, name):
+        attr = getattr(self._target, name)
+        if not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            try:
+                return attr(*args, **kwargs)
+            finally:
+                self._after_call()
+        return call
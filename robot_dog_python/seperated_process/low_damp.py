@@ -2,7 +2,7 @@ import time
 from unitree_sdk2py.core.channel import ChannelFactoryInitialize, ChannelPublisher
 from unitree_sdk2py.idl.unitree_go.msg.dds_ import LowCmd_
 from unitree_sdk2py.idl.default import unitree_go_msg_dds__LowCmd_
-from unitree_sdk2py.utils.crc import CRC
+from lowcmd_crc import LowCmdCrc
 
 def run_lowlevel_damp():
     print("[Test] 模拟进入低层阻尼模式（Damp）...")
@@ -13,7 +13,7 @@ def run_lowlevel_damp():
     publisher.Init()
 
     low_cmd = unitree_go_msg_dds__LowCmd_()
-    crc = CRC()
+    crc = LowCmdCrc()
 
     while True:
         for i in range(12):
@@ -2,7 +2,7 @@ import time
 from unitree_sdk2py.core.channel import ChannelFactoryInitialize, ChannelPublisher, ChannelSubscriber
 from unitree_sdk2py.idl.unitree_go.msg.dds_ import LowCmd_, LowState_
 from unitree_sdk2py.idl.default import unitree_go_msg_dds__LowCmd_
-from unitree_sdk2py.utils.crc import CRC
+from lowcmd_crc import LowCmdCrc
 from unitree_sdk2py.comm.motion_switcher.motion_switcher_client import MotionSwitcherClient
 
 def interpolate_pose(start, end, percent):
@@ -32,7 +32,7 @@ def run_lowlevel_damp_full():
     publisher = ChannelPublisher("rt/lowcmd", LowCmd_)
     publisher.Init()
     lowcmd = unitree_go_msg_dds__LowCmd_()
-    crc = CRC()
+    crc = LowCmdCrc()
 
     # 初始化底层模式控制器
     msc = MotionSwitcherClient()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+LowCmd 增量填充
+q/dq/kp/kd/tau 每个字段是一行12个值的列表，build() 时逐行与上次写入 LowCmd 的值比较：
+没有变化的行跳过，变化的行直接给12个电机赋值；整条命令没有变化时直接复用上次的 CRC。
+保持静止姿态时每个周期不再有任何属性赋值和 CRC 计算。
+关节运动时通常只有 q 一行变化，整行直接写入比逐元素找出变化的字段更快（NumPy 在12个元素上的
+比较/索引开销比赋值本身还大），周期耗时与原来的逐电机赋值相当，主要是 CRC。
+"""
+
+import numpy as np
+
+NUM_MOTORS = 12
+MOTOR_MODE_SERVO = 0x01  # PMSM 伺服模式
+
+# 行顺序即 build() 的写入顺序
+FIELDS = ('q', 'dq', 'kp', 'kd', 'tau')
+
+
+def _row(value, num_motors):
+    """标量广播为一行；NumPy 数组转换为 Python float 列表，序列复制一份（调用方可能原地修改）"""
+    if isinstance(value, np.ndarray):
+        return value.tolist() if value.ndim else [float(value)] * num_motors
+    if isinstance(value, (list, tuple)):
+        return list(value)
+    return [float(value)] * num_motors
+
+
+class LowCmdBuilder:
+    """包装一个 LowCmd_ 实例，所有底层写入都应通过同一个 builder 进行
+
+    其他代码直接修改了 low_cmd 的电机字段后需要调用 invalidate()。
+    """
+
+    def __init__(self, low_cmd, crc, num_motors: int = NUM_MOTORS, mode: int = MOTOR_MODE_SERVO):
+        self.low_cmd = low_cmd
+        self.crc = crc
+        self.num_motors = num_motors
+        self.mode = mode
+        self._motors = [low_cmd.motor_cmd[i] for i in range(num_motors)]
+        self._zeros = [0.0] * num_motors
+        self._targets = [list(self._zeros) for _ in FIELDS]
+        self._written = [None] * len(FIELDS)
+        self.stats = {'builds': 0, 'fields_written': 0, 'crc_computed': 0}
+        self.invalidate()
+
+    def invalidate(self):
+        """忘记已写入的值，下次 build() 重写全部字段并重算 CRC"""
+        for motor in self._motors:
+            motor.mode = self.mode
+        self._written = [None] * len(FIELDS)
+        self._crc_dirty = True
+
+    @property
+    def targets(self) -> np.ndarray:
+        """当前目标值，(5, 12) 数组，行顺序同 FIELDS"""
+        return np.array(self._targets)
+
+    def set(self, q=None, dq=None, kp=None, kd=None, tau=None):
+        """设置目标值，每个参数可以是标量（广播到所有电机）或长度为12的序列"""
+        for i, value in enumerate((q, dq, kp, kd, tau)):
+            if value is not None:
+                self._targets[i] = _row(value, self.num_motors)
+
+    def build(self):
+        """把变化的行写入 LowCmd，必要时重算 CRC，返回 low_cmd"""
+        written = self._written
+        for i, row in enumerate(self._targets):
+            if row != written[i]:
+                field = FIELDS[i]
+                for motor, value in zip(self._motors, row):
+                    setattr(motor, field, value)
+                written[i] = row
+                self.stats['fields_written'] += self.num_motors
+                self._crc_dirty = True
+
+        if self._crc_dirty:
+            self.low_cmd.crc = self.crc.Crc(self.low_cmd)
+            self._crc_dirty = False
+            self.stats['crc_computed'] += 1
+        self.stats['builds'] += 1
+        return self.low_cmd
+
+    def pose_cmd(self, pose, kp=100.0, kd=8.0):
+        """位置控制命令：目标关节角 + 刚度/阻尼，速度和力矩前馈为0"""
+        targets, n = self._targets, self.num_motors
+        targets[0] = _row(pose, n)
+        targets[1] = targets[4] = self._zeros
+        targets[2] = _row(kp, n)
+        targets[3] = _row(kd, n)
+        return self.build()
+
+    def damp_cmd(self, kd=2.0):
+        """阻尼命令：kp=0，只保留速度阻尼"""
+        targets = self._targets
+        targets[0] = targets[1] = targets[2] = targets[4] = self._zeros
+        targets[3] = _row(kd, self.num_motors)
+        return self.build()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Go2 LowCmd 快速 CRC32
+与 unitree_sdk2py.utils.crc.CRC.Crc 逐位一致：LowCmd 按SDK的812字节小端布局打包，
+去掉末尾的 crc 字段后按 uint32 分组，每个字按最高位优先送入 CRC-32/MPEG-2
+（多项式 0x04C11DB7，初值 0xFFFFFFFF，不反射，不异或输出）。
+
+zlib.crc32 是反射算法：把每个字的比特顺序整体反转后送入 zlib，
+再把结果反转回来，即得到同样的值，整个计算在C中完成。
+"""
+
+import struct
+import zlib
+from array import array
+
+# SDK 中的打包格式（4字节对齐，小端），共812字节
+LOWCMD_PACK_FORMAT = '<4B4IH2x' + 'B3x5f3I' * 20 + '4B' + '55Bx2I'
+_LOWCMD_STRUCT = struct.Struct(LOWCMD_PACK_FORMAT)
+LOWCMD_PACKED_SIZE = _LOWCMD_STRUCT.size
+NUM_MOTOR_CMDS = 20
+
+CRC32_POLYNOMIAL = 0x04C11DB7
+
+# 字节内比特反转表
+_BIT_REVERSE = bytes(int(f'{i:08b}'[::-1], 2) for i in range(256))
+
+
+def pack_low_cmd(cmd) -> bytes:
+    """按SDK的布局打包 LowCmd（包含 crc 字段本身）"""
+    values = [*cmd.head, cmd.level_flag, cmd.frame_reserve, *cmd.sn, *cmd.version, cmd.bandwidth]
+    for motor in cmd.motor_cmd[:NUM_MOTOR_CMDS]:
+        values += (motor.mode, motor.q, motor.dq, motor.tau, motor.kp, motor.kd)
+        values += motor.reserve
+    values.append(cmd.bms_cmd.off)
+    values += cmd.bms_cmd.reserve
+    values += cmd.wireless_remote
+    values += cmd.led
+    values += cmd.fan
+    values += (cmd.gpio, cmd.reserve, cmd.crc)
+    return _LOWCMD_STRUCT.pack(*values)
+
+
+def crc32_core(data: bytes) -> int:
+    """对小端 uint32 序列计算 Unitree crc32_core，len(data) 必须是4的倍数"""
+    # 每个字高位优先 == 把字的32个比特反转后交给反射算法：字节序翻转 + 字节内比特反转
+    words = array('I', data)
+    words.byteswap()
+    reflected = words.tobytes().translate(_BIT_REVERSE)
+    # zlib.crc32 自带初值和输出取反，这里抵消输出取反
+    raw = zlib.crc32(reflected) ^ 0xFFFFFFFF
+    return int.from_bytes(raw.to_bytes(4, 'little').translate(_BIT_REVERSE), 'big')
+
+
+def crc32_core_reference(words) -> int:
+    """逐位参考实现，与SDK的 _crc_py / C 版 crc32_core 相同，用于校验"""
+    crc = 0xFFFFFFFF
+    for current in words:
+        bit = 1 << 31
+        for _ in range(32):
+            if crc & 0x80000000:
+                crc = ((crc << 1) & 0xFFFFFFFF) ^ CRC32_POLYNOMIAL
+            else:
+                crc = (crc << 1) & 0xFFFFFFFF
+            if current & bit:
+                crc ^= CRC32_POLYNOMIAL
+            bit >>= 1
+    return crc
+
+
+class LowCmdCrc:
+    """CRC.Crc 的替代实现，接口相同：low_cmd.crc = crc.Crc(low_cmd)"""
+
+    def Crc(self, cmd) -> int:
+        # 最后一个字是 crc 字段本身，不参与计算
+        return crc32_core(pack_low_cmd(cmd)[:-4])
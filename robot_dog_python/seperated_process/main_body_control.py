@@ -9,7 +9,7 @@ from dataclasses import dataclass
 from unitree_sdk2py.core.channel import (ChannelPublisher, ChannelFactoryInitialize, ChannelSubscriber)
 from unitree_sdk2py.idl.unitree_go.msg.dds_ import LowCmd_
 from unitree_sdk2py.idl.default import unitree_go_msg_dds__LowCmd_
-from unitree_sdk2py.utils.crc import CRC
+from lowcmd_crc import LowCmdCrc
 from unitree_sdk2py.comm.motion_switcher.motion_switcher_client import MotionSwitcherClient
 from unitree_sdk2py.go2.sport.sport_client import SportClient
 from cyclonedds.idl import IdlStruct
@@ -17,6 +17,7 @@ from cyclonedds.idl import IdlStruct
 # --- Import custom DDS structure ---
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../communication")))
 from dds_data_structure import MyMotionCommand
+from motion_engine import MotionEngine, DEFAULT_GAINS
 
 def clear_queue(q: queue.Queue):
     """Clears all items from a queue."""
@@ -56,7 +57,8 @@ class RobotController:
         self.dds_subscriber.Init()
         
         self.low_cmd = unitree_go_msg_dds__LowCmd_()
-        self.crc = CRC()
+        self.crc = LowCmdCrc()
+        self.motion = MotionEngine(self.low_cmd_publisher, self.low_cmd, self.crc)
 
         # --- Robot Pose Definitions ---
         self.stand_pos = [0.0, 0.67, -1.3] * 4
@@ -282,9 +284,7 @@ class RobotController:
     def maintain_static_pose(self):
         """Maintains the robot's current_pose."""
         print(f"Maintaining static pose: {self.current_pose}")
-        while not self.low_level_stop_event.is_set():
-            self.send_low_level_pose_cmd(self.current_pose)
-            time.sleep(0.002)
+        self.motion.hold(self.current_pose, stop=self.low_level_stop_event, name="maintain_static_pose")
 
     def maintain_raise_leg_pose(self):
         """Maintains pose while allowing one leg to be controlled via DDS."""
@@ -293,8 +293,7 @@ class RobotController:
         # TODO: 初始化，肩关节等抬腿初始位置。
         # TODO: 前面已经停止low stand指令，需要快速衔接上stand-然后转抬腿。
         
-        while not self.low_level_stop_event.is_set():
-
+        def tick(i):
             try:
                 cmd: MyMotionCommand = self.command_queue.get_nowait()
                 if cmd.command_type == 1: # Leg control
@@ -313,39 +312,18 @@ class RobotController:
                 pass
             
             self.send_low_level_pose_cmd(local_pose)
-            time.sleep(0.002)
-
-    def send_low_level_pose_cmd(self, pose, kp=100.0, kd=8.0):
-        for i in range(12):
-            self.low_cmd.motor_cmd[i].mode = 0x01
-            self.low_cmd.motor_cmd[i].q = pose[i]
-            self.low_cmd.motor_cmd[i].dq = 0.0
-            self.low_cmd.motor_cmd[i].kp = kp
-            self.low_cmd.motor_cmd[i].kd = kd
-            self.low_cmd.motor_cmd[i].tau = 0.0
-        self.low_cmd.crc = self.crc.Crc(self.low_cmd)
-        self.low_cmd_publisher.Write(self.low_cmd)
+
+        self.motion.run(tick, "maintain_raise_leg_pose", stop=self.low_level_stop_event)
+
+    def send_low_level_pose_cmd(self, pose, gains=DEFAULT_GAINS):
+        self.motion.send_pose(pose, gains)
 
     def send_low_level_damp_cmd(self):
-        for i in range(12):
-            self.low_cmd.motor_cmd[i].mode = 0x01
-            self.low_cmd.motor_cmd[i].q = 0.0
-            self.low_cmd.motor_cmd[i].dq = 0.0
-            self.low_cmd.motor_cmd[i].kp = 0.0
-            self.low_cmd.motor_cmd[i].kd = 2.0
-            self.low_cmd.motor_cmd[i].tau = 0.0
-        self.low_cmd.crc = self.crc.Crc(self.low_cmd)
-        self.low_cmd_publisher.Write(self.low_cmd)
+        self.motion.send_damp()
 
     def interpolate_pose(self, start, end, duration_ms): 
         print(f"Interpolating pose over {duration_ms}ms")
-        steps = int(duration_ms / 2) # 2ms per step
-        for step in range(steps):
-            alpha = min(1.0, step / steps)
-            q_interp = [(1 - alpha) * s + alpha * e for s, e in zip(start, end)]
-            self.send_low_level_pose_cmd(q_interp)
-            time.sleep(0.002)
-        self.send_low_level_pose_cmd(end) # Ensure final pose is sent
+        self.motion.move_to(start, end, duration_ms, name="interpolate_pose")  # Final row is the end pose
         self.current_pose = list(end)
 
     def run(self):
@@ -372,9 +350,8 @@ class RobotController:
     def maintain_low_level_damp(self):
         """Continuously sends low-level damp commands."""
         print("Maintaining low-level damp...")
-        while not self.low_level_stop_event.is_set():
-            self.send_low_level_damp_cmd()
-            time.sleep(0.01) # Can be a bit slower than pose control
+        # Can be a bit slower than pose control
+        self.motion.hold_damp(stop=self.low_level_stop_event, name="maintain_low_level_damp", period_s=0.01)
 
     def shutdown(self):
         self.running = False
@@ -26,6 +26,8 @@ import subprocess
 import os
 import signal
 
+from gateway_bootstrap import GatewayRuntimeConfig, DSCP_VIDEO, create_udp_socket, run_gateway
+
 # 配置日志
 logging.basicConfig(
     level=logging.INFO,
@@ -883,8 +885,9 @@ class UDPProtocol(asyncio.DatagramProtocol):
 class CameraGateway:
     """摄像头网关主类"""
     
-    def __init__(self, port: int = 8991):
+    def __init__(self, port: int = 8991, runtime_config: Optional[GatewayRuntimeConfig] = None):
         self.port = port
+        self.runtime_config = runtime_config or GatewayRuntimeConfig.from_env(DSCP_VIDEO)
         self.transport: Optional[asyncio.DatagramTransport] = None
         self.protocol = None
         self.is_running = False
@@ -905,9 +908,10 @@ class CameraGateway:
         logger.info(f"正在启动摄像头网关，监听端口 {self.port}")
 
         try:
+            sock = create_udp_socket(self.port, self.runtime_config)
             self.transport, self.protocol = await loop.create_datagram_endpoint(
                 lambda: UDPProtocol(self),
-                local_addr=('0.0.0.0', self.port)
+                sock=sock
             )
 
             self.is_running = True
@@ -1232,8 +1236,8 @@ class CameraGateway:
         await asyncio.sleep(1)
         logger.info("摄像头网关已停止")
 
-async def main():
-    gateway = CameraGateway()
+async def main(runtime_config: Optional[GatewayRuntimeConfig] = None):
+    gateway = CameraGateway(runtime_config=runtime_config)
     
     try:
         await gateway.start()
@@ -1243,4 +1247,5 @@ async def main():
         await gateway.stop()
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    config = GatewayRuntimeConfig.from_env(DSCP_VIDEO)
+    run_gateway(lambda: main(config), config)
\ No newline at end of file
@@ -0,0 +1,51 @@
+# main_clock_sync.py
+# 对时服务进程：运行在机器狗 Jetson 上，以本机时钟为基准回复 ClockSyncRequest。
+# 其他机器上的进程（如网页后端 main_flask/app.py）用 clock_sync.ClockSyncClient 估计与 Jetson 的时钟偏差，
+# 把状态消息的 timestamp_ns 换算到本机时钟后计算真实的单向延迟。
+
+import time
+import sys
+import os
+
+DDS_NETWORK_INTERFACE = "enP8p1s0"
+REPORT_PERIOD_S = 60.0
+# --- FIX FOR CROSS-DIRECTORY IMPORT ---
+current_script_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_script_dir)
+communication_dir_path = os.path.join(parent_dir, 'communication')
+sys.path.append(communication_dir_path)
+# --- END OF FIX ---
+
+from dds_data_structure import (ClockSyncRequest, ClockSyncResponse, CLOCK_SYNC_REQUEST_TOPIC,
+                                CLOCK_SYNC_RESPONSE_TOPIC)
+from clock_sync import ClockSyncResponder
+from unitree_sdk2py.core.channel import ChannelSubscriber, ChannelPublisher, ChannelFactoryInitialize
+
+def main():
+    sub = None
+    try:
+        print(f"Initializing DDS on network interface: {DDS_NETWORK_INTERFACE}")
+        ChannelFactoryInitialize(networkInterface=DDS_NETWORK_INTERFACE)
+        pub = ChannelPublisher(CLOCK_SYNC_RESPONSE_TOPIC, ClockSyncResponse)
+        pub.Init()
+        responder = ClockSyncResponder(pub)
+        # 回调里只打时间戳并回复，不排队，t2/t3 之间不含等待时间
+        sub = ChannelSubscriber(CLOCK_SYNC_REQUEST_TOPIC, ClockSyncRequest)
+        sub.Init(responder.on_request, 10)
+        print(f"Answering '{CLOCK_SYNC_REQUEST_TOPIC}' on '{CLOCK_SYNC_RESPONSE_TOPIC}'. Press Ctrl+C to stop.")
+
+        last_answered = 0
+        while True:
+            time.sleep(REPORT_PERIOD_S)
+            rate = (responder.answered - last_answered) / REPORT_PERIOD_S
+            last_answered = responder.answered
+            print(f"Answered {responder.answered} clock sync requests ({rate:.1f}/s)")
+
+    except KeyboardInterrupt:
+        print("\nClock sync service stopped by user.")
+    finally:
+        if sub: sub.Close()
+        print("Shutdown complete.")
+
+if __name__ == "__main__":
+    main()
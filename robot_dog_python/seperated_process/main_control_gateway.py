@@ -14,40 +14,63 @@ import hmac
 import hashlib
 import uuid
 import logging
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, Optional, Tuple, List
 from dataclasses import dataclass
 from collections import defaultdict
 import struct
 
+from gateway_bootstrap import GatewayRuntimeConfig, DSCP_CONTROL, create_udp_socket, run_gateway
+from latency_trace import (TraceCollector, TraceIdGenerator, now_ns, HOP_GATEWAY_RECEIVE,
+                           HOP_DDS_WRITE, HOP_BODY_READ, HOP_QUEUE_DEQUEUE, HOP_SDK_CALL)
+
+# 配置日志
+logging.basicConfig(
+    level=logging.DEBUG,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
 # DDS imports
+# 消息类型（cyclonedds）与 unitree SDK 分开导入：注入 dds_channels（如 dds_loopback）时只需要消息类型
 try:
-    # from cyclonedds.domain import DomainParticipant
-    # from cyclonedds.topic import Topic
-    # from cyclonedds.pub import Publisher, DataWriter
-    from unitree_sdk2py.core.channel import (ChannelPublisher, ChannelFactoryInitialize, ChannelSubscriber)
-
     import sys
     import os
     sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-    from communication.dds_data_structure import MyMotionCommand, HeadCommand
+    from communication.dds_data_structure import MyMotionCommand, HeadCommand, CommandTrace
     DDS_AVAILABLE = True
 except ImportError:
-    logger.warning("DDS not available, running in test mode")
+    logger.warning("DDS data structures not available, running in test mode")
     DDS_AVAILABLE = False
 
-# 配置日志
-logging.basicConfig(
-    level=logging.DEBUG,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
-logger = logging.getLogger(__name__)
+try:
+    # from cyclonedds.domain import DomainParticipant
+    # from cyclonedds.topic import Topic
+    # from cyclonedds.pub import Publisher, DataWriter
+    from unitree_sdk2py.core.channel import (ChannelPublisher, ChannelFactoryInitialize, ChannelSubscriber)
+    SDK_AVAILABLE = True
+except ImportError:
+    logger.warning("unitree_sdk2py not available, DDS only works with injected channels")
+    SDK_AVAILABLE = False
 
 # 安全配置
 SHARED_SECRET_KEY = b"robot_dog_control_secret_2024"
+# 签名数据包格式: SIGNED_PACKET_MAGIC + payload + HMAC-SHA256(32字节)
+# HMAC 覆盖签名之前的全部原始字节（包括 magic）
+SIGNED_PACKET_MAGIC = b'\xa5S'
+REQUIRE_SIGNATURE = False  # 为 True 时拒绝未签名的数据包
 SESSION_TIMEOUT = 300  # 5分钟会话超时
 MAX_UDP_SIZE = 1400
 HEADER_SIZE = 64
 
+# 确认(ack)模式配置
+ACK_MODE_NONE = 'none'                # 不回复确认（流式速度控制）
+ACK_MODE_CUMULATIVE = 'cumulative'    # 每N条命令或每个时间窗口回复一次，携带最大序号
+ACK_MODE_PER_COMMAND = 'per-command'  # 每条命令回复一次
+ACK_MODES = (ACK_MODE_NONE, ACK_MODE_CUMULATIVE, ACK_MODE_PER_COMMAND)
+DEFAULT_ACK_MODE = ACK_MODE_PER_COMMAND
+ACK_BATCH_SIZE = 20       # 累积确认：每20条命令确认一次
+ACK_FLUSH_INTERVAL = 0.1  # 累积确认：最长100ms确认一次
+
 @dataclass
 class ControlCommand:
     """控制命令数据结构"""
@@ -56,6 +79,7 @@ class ControlCommand:
     data: Dict[str, Any]
     timestamp: float
     session_id: str
+    trace_id: int = 0  # 延迟追踪ID，写入 MyMotionCommand.command_id
 
 class SecurityManager:
     """安全管理器"""
@@ -64,17 +88,40 @@ class SecurityManager:
         self.secret_key = secret_key
         self.active_sessions = {}
         self.session_cleanup_interval = 60
+        # 预先计算密钥调度，每个数据包只需 copy() 一次
+        self._mac_template = hmac.new(secret_key, digestmod=hashlib.sha256)
+        self.signature_size = self._mac_template.digest_size
         
-    def generate_signature(self, data: bytes, timestamp: float) -> str:
-        """生成HMAC签名"""
-        message = f"{timestamp}:{data.decode('utf-8')}".encode('utf-8')
-        signature = hmac.new(self.secret_key, message, hashlib.sha256).hexdigest()
-        return signature
+    def sign(self, data: bytes) -> bytes:
+        """对原始字节计算HMAC摘要"""
+        mac = self._mac_template.copy()
+        mac.update(data)
+        return mac.digest()
+    
+    def generate_signature(self, data: bytes) -> str:
+        """生成HMAC签名（十六进制，用于JSON头部）"""
+        return self.sign(data).hex()
     
-    def verify_signature(self, data: bytes, timestamp: float, signature: str) -> bool:
+    def verify_signature(self, data: bytes, signature: bytes) -> bool:
         """验证HMAC签名"""
-        expected_signature = self.generate_signature(data, timestamp)
-        return hmac.compare_digest(expected_signature, signature)
+        return hmac.compare_digest(self.sign(data), signature)
+    
+    def sign_datagram(self, payload: bytes) -> bytes:
+        """构造签名数据包（供客户端和测试工具使用）"""
+        body = SIGNED_PACKET_MAGIC + payload
+        return body + self.sign(body)
+    
+    def verify_datagram(self, datagram: bytes) -> Optional[bytes]:
+        """验证签名数据包，成功时返回去掉 magic 和签名后的 payload"""
+        split = len(datagram) - self.signature_size
+        if split < len(SIGNED_PACKET_MAGIC):
+            return None
+        view = memoryview(datagram)
+        mac = self._mac_template.copy()
+        mac.update(view[:split])
+        if not hmac.compare_digest(mac.digest(), view[split:]):
+            return None
+        return bytes(view[len(SIGNED_PACKET_MAGIC):split])
     
     def verify_timestamp(self, timestamp: float, tolerance: float = 30.0) -> bool:
         """验证时间戳（防重放攻击）"""
@@ -139,8 +186,8 @@ class PacketManager:
         packet_json = json.dumps(packet, ensure_ascii=False)
         packet_bytes = packet_json.encode('utf-8')
         
-        # 生成签名
-        signature = security_manager.generate_signature(packet_bytes, timestamp)
+        # 生成签名（时间戳已包含在 packet_bytes 中）
+        signature = security_manager.generate_signature(packet_bytes)
         
         # 添加签名头部
         header = {
@@ -272,6 +319,100 @@ class PacketManager:
             del self.fragment_buffers[fid]
             logger.warning(f"清理过期分片: {fid}")
 
+class AckManager:
+    """确认包管理器 - 按客户端抑制或合并成功确认"""
+    
+    def __init__(self, batch_size: int = ACK_BATCH_SIZE, flush_interval: float = ACK_FLUSH_INTERVAL):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.clients: Dict[Tuple[str, int], Dict[str, Any]] = {}
+    
+    def _get_client(self, addr: Tuple[str, int]) -> Dict[str, Any]:
+        client = self.clients.get(addr)
+        if client is None:
+            client = {
+                'mode': DEFAULT_ACK_MODE,
+                'pending': 0,
+                'highest_command_id': None,
+                'first_pending_at': 0.0,
+                'last_activity': time.time()
+            }
+            self.clients[addr] = client
+        return client
+    
+    def set_mode(self, addr: Tuple[str, int], mode: str) -> bool:
+        """设置客户端确认模式"""
+        if mode not in ACK_MODES:
+            logger.warning(f"未知确认模式 {mode} from {addr}")
+            return False
+        client = self._get_client(addr)
+        if client['mode'] != mode:
+            logger.info(f"客户端 {addr} 确认模式: {client['mode']} -> {mode}")
+            client['mode'] = mode
+            client['pending'] = 0
+            client['highest_command_id'] = None
+        return True
+    
+    def on_command(self, addr: Tuple[str, int], command_id: Any, force: bool = False) -> Optional[Dict[str, Any]]:
+        """记录一条处理成功的命令，返回需要立即发送的确认（无则返回None）"""
+        now = time.time()
+        client = self._get_client(addr)
+        client['last_activity'] = now
+        mode = client['mode']
+        
+        if force or mode == ACK_MODE_PER_COMMAND:
+            return {'status': 'success', 'command_id': command_id, 'timestamp': now}
+        if mode == ACK_MODE_NONE:
+            return None
+        
+        # 累积确认
+        if client['pending'] == 0:
+            client['first_pending_at'] = now
+        client['pending'] += 1
+        highest = client['highest_command_id']
+        if command_id is not None:
+            try:
+                if highest is None or command_id > highest:
+                    client['highest_command_id'] = command_id
+            except TypeError:
+                client['highest_command_id'] = command_id
+        
+        if client['pending'] >= self.batch_size:
+            return self._build_cumulative_ack(client, now)
+        return None
+    
+    def collect_due(self) -> List[Tuple[Tuple[str, int], Dict[str, Any]]]:
+        """收集已到时间窗口的累积确认"""
+        now = time.time()
+        due = []
+        for addr, client in self.clients.items():
+            if client['pending'] and now - client['first_pending_at'] >= self.flush_interval:
+                due.append((addr, self._build_cumulative_ack(client, now)))
+        return due
+    
+    def _build_cumulative_ack(self, client: Dict[str, Any], now: float) -> Dict[str, Any]:
+        ack = {
+            'status': 'success',
+            'ack_mode': ACK_MODE_CUMULATIVE,
+            'command_id': client['highest_command_id'],
+            'count': client['pending'],
+            'timestamp': now
+        }
+        client['pending'] = 0
+        client['highest_command_id'] = None
+        return ack
+    
+    def cleanup_idle_clients(self, timeout: float = SESSION_TIMEOUT):
+        """清理长时间无活动的客户端"""
+        current_time = time.time()
+        idle_clients = [
+            addr for addr, client in self.clients.items()
+            if current_time - client['last_activity'] > timeout
+        ]
+        
+        for addr in idle_clients:
+            del self.clients[addr]
+
 # class RobotState:
 #     """机器狗状态枚举"""
 #     DAMP = 8  # 阻尼模式
@@ -292,12 +433,18 @@ class PacketManager:
 class DDSBridge:
     """DDS通信桥接器"""
     
-    def __init__(self):
+    def __init__(self, trace_collector: Optional[TraceCollector] = None, channels=None,
+                 domain_id: int = 0, network_interface: str = "enP8p1s0"):
         self.is_connected = False
         self.connection_retry_count = 0
         self.max_retries = 10
         self.retry_delay = 1.0
         self.enable_dds = True  # DDS传输开关
+        self.trace_collector = trace_collector
+        # 提供 ChannelPublisher/ChannelSubscriber 的替代实现（如 dds_loopback），None 时使用 unitree SDK
+        self.channels = channels
+        self.domain_id = domain_id
+        self.network_interface = network_interface
         
         # DDS相关对象
         self.participant = None
@@ -307,21 +454,37 @@ class DDSBridge:
         # unitree DDS Lib
         self.motion_publisher = None
         self.head_publisher = None
+        self.trace_subscriber = None
         
         # 初始化DDS（如果可用）
-        if DDS_AVAILABLE and self.enable_dds:
+        if self._dds_possible() and self.enable_dds:
             self._init_dds()
+
+    def _dds_possible(self) -> bool:
+        """有消息类型，并且注入了通道实现或者可以使用 unitree SDK"""
+        return DDS_AVAILABLE and (self.channels is not None or SDK_AVAILABLE)
     
     def _init_dds(self):
         """初始化DDS通信"""
         try:
-            ChannelFactoryInitialize(0, "enP8p1s0")
-            self.motion_publisher = ChannelPublisher("rt/my_motion_command", MyMotionCommand)
+            if self.channels is None:
+                ChannelFactoryInitialize(self.domain_id, self.network_interface)
+                publisher_cls, subscriber_cls = ChannelPublisher, ChannelSubscriber
+            else:
+                publisher_cls = self.channels.ChannelPublisher
+                subscriber_cls = self.channels.ChannelSubscriber
+
+            self.motion_publisher = publisher_cls("rt/my_motion_command", MyMotionCommand)
             self.motion_publisher.Init()
 
-            self.head_publisher = ChannelPublisher("HeadCommand", HeadCommand)
+            self.head_publisher = publisher_cls("HeadCommand", HeadCommand)
             self.head_publisher.Init()
 
+            # 身体控制进程回报的延迟打点
+            if self.trace_collector:
+                self.trace_subscriber = subscriber_cls("rt/command_trace", CommandTrace)
+                self.trace_subscriber.Init(self._on_command_trace, 10)
+
 
             # # 创建DDS参与者
             # self.participant = DomainParticipant()
@@ -410,7 +573,7 @@ class DDSBridge:
             'x': 0.0,
             'y': 0.0,
             'r': 0.0,
-            'command_id': 0
+            'command_id': command.trace_id
         }
         
         # 发送到DDS
@@ -428,6 +591,8 @@ class DDSBridge:
                     command_id=motion_cmd['command_id']
                 )
                 # self.motion_writer.write(dds_cmd)
+                # 写入前打点：回环或本机DDS可能在 Write() 返回前就已交付给身体控制进程
+                self._stamp(command.trace_id, HOP_DDS_WRITE)
                 self.motion_publisher.Write(dds_cmd)
                 logger.info(f"Sent motion command via DDS: {motion_cmd}")
             except Exception as e:
@@ -452,7 +617,7 @@ class DDSBridge:
             'x': command.data.get('x', 0.0),
             'y': command.data.get('y', 0.0),
             'r': command.data.get('r', 0.0),
-            'command_id': 0
+            'command_id': command.trace_id
         }
         
         # 发送到DDS
@@ -470,6 +635,7 @@ class DDSBridge:
                     command_id     =motion_cmd['command_id']
                 )
                 # self.motion_writer.write(dds_cmd)
+                self._stamp(command.trace_id, HOP_DDS_WRITE)
                 self.motion_publisher.Write(dds_cmd)
 
                 logger.debug(f"Sent XYR command via DDS: x={motion_cmd['x']:.3f}, y={motion_cmd['y']:.3f}, r={motion_cmd['r']:.3f}")
@@ -524,7 +690,7 @@ class DDSBridge:
                 'x': 0.0,
                 'y': 0.0,
                 'r': 0.0,
-                'command_id': 0
+                'command_id': command.trace_id
             }
             
             # 发送到DDS
@@ -542,6 +708,7 @@ class DDSBridge:
                         command_id=motion_cmd['command_id']
                     )
                     # self.motion_writer.write(dds_cmd)
+                    self._stamp(command.trace_id, HOP_DDS_WRITE)
                     self.motion_publisher.Write(dds_cmd)
                     logger.info(f"Sent leg control command via DDS: {motion_cmd}")
                 except Exception as e:
@@ -552,11 +719,24 @@ class DDSBridge:
         
         return True
     
+    def _stamp(self, trace_id: int, hop: str):
+        if self.trace_collector:
+            self.trace_collector.stamp(trace_id, hop)
+    
+    def _on_command_trace(self, msg: 'CommandTrace'):
+        """合并身体控制进程回报的打点（DDS回调线程）"""
+        self.trace_collector.merge(msg.trace_id, {
+            HOP_BODY_READ: msg.body_read_ns,
+            HOP_QUEUE_DEQUEUE: msg.queue_dequeue_ns,
+            HOP_SDK_CALL: msg.sdk_call_ns
+        })
+        self.trace_collector.finish(msg.trace_id)
+    
     def set_dds_enabled(self, enabled: bool):
         """设置DDS传输开关"""
         if enabled and not self.enable_dds:
             self.enable_dds = True
-            if DDS_AVAILABLE:
+            if self._dds_possible():
                 self._init_dds()
                 logger.info("DDS enabled")
         elif not enabled and self.enable_dds:
@@ -581,10 +761,11 @@ class ControlGatewayProtocol(asyncio.DatagramProtocol):
         self.gateway.transport = transport
 
     def datagram_received(self, data: bytes, addr: Tuple[str, int]):
+        recv_ns = now_ns()
         self.gateway.stats['packets_received'] += 1
         # print(data, addr)
         # 异步处理数据包
-        asyncio.create_task(self.gateway._process_packet(data, addr))
+        asyncio.create_task(self.gateway._process_packet(data, addr, recv_ns))
         # print("1")
 
     def error_received(self, exc: Exception):
@@ -601,21 +782,31 @@ class ControlGatewayProtocol(asyncio.DatagramProtocol):
 class ControlGateway:
     """控制网关主类"""
     
-    def __init__(self, port: int = 8990):
+    def __init__(self, port: int = 8990, runtime_config: Optional[GatewayRuntimeConfig] = None,
+                 dds_channels=None):
         self.port = port
+        self.runtime_config = runtime_config or GatewayRuntimeConfig.from_env(DSCP_CONTROL)
         self.transport: Optional['asyncio.DatagramTransport'] = None
         self.is_running = False
         self.security_manager = SecurityManager(SHARED_SECRET_KEY)
         self.packet_manager = PacketManager()
-        self.dds_bridge = DDSBridge()
+        self.trace_collector = TraceCollector()
+        self.trace_ids = TraceIdGenerator()
+        self.dds_bridge = self._create_dds_bridge(dds_channels)
+        self.ack_manager = AckManager()
         self.error_counts = defaultdict(int)
         self.stats = {
             'packets_received': 0,
             'packets_sent': 0,
             'commands_processed': 0,
+            'acks_suppressed': 0,
+            'auth_failures': 0,
             'errors': 0
         }
     
+    def _create_dds_bridge(self, dds_channels) -> Optional[DDSBridge]:
+        return DDSBridge(trace_collector=self.trace_collector, channels=dds_channels)
+    
     async def start(self):
         """启动网关服务"""
         retry_count = 0
@@ -624,10 +815,7 @@ class ControlGateway:
         
         while retry_count < max_retries:
             try:
-                sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-                sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-                sock.bind(('0.0.0.0', self.port))
-                sock.setblocking(False)
+                sock = create_udp_socket(self.port, self.runtime_config)
 
                 transport, protocol = await loop.create_datagram_endpoint(
                     lambda: ControlGatewayProtocol(self),
@@ -639,6 +827,7 @@ class ControlGateway:
                 # 启动后台任务
                 await asyncio.gather(
                     self._cleanup_loop(),
+                    self._ack_flush_loop(),
                     self._stats_loop(),
                     self._health_check_loop()
                 )
@@ -658,9 +847,21 @@ class ControlGateway:
                     raise
     
     
-    async def _process_packet(self, data: bytes, addr: Tuple[str, int]):
+    async def _process_packet(self, data: bytes, addr: Tuple[str, int], recv_ns: Optional[int] = None):
         """处理数据包"""
         try:
+            # 先验证签名，未通过的数据包不进入JSON解析
+            if data.startswith(SIGNED_PACKET_MAGIC):
+                data = self.security_manager.verify_datagram(data)
+                if data is None:
+                    self.stats['auth_failures'] += 1
+                    logger.warning(f"签名验证失败: {addr}")
+                    return
+            elif REQUIRE_SIGNATURE:
+                self.stats['auth_failures'] += 1
+                logger.warning(f"拒绝未签名数据包: {addr}")
+                return
+            
             # 解析数据包
             packet = self.packet_manager.process_received_packet(data, addr)
             if not packet:
@@ -673,7 +874,7 @@ class ControlGateway:
                 return
             
             # 处理控制命令
-            await self._handle_control_command(packet, addr)
+            await self._handle_control_command(packet, addr, recv_ns)
             
         except Exception as e:
             self.stats['errors'] += 1
@@ -686,16 +887,14 @@ class ControlGateway:
             if not timestamp or not self.security_manager.verify_timestamp(timestamp):
                 return False
             
-            # 这里应该验证签名，但需要重构数据包格式
-            # 暂时跳过签名验证，在生产环境中必须启用
-            
+            # 签名已在 _process_packet 中对原始数据报验证
             return True
             
         except Exception as e:
             logger.error(f"安全验证异常: {e}")
             return False
     
-    async def _handle_control_command(self, packet: Dict, addr: Tuple[str, int]):
+    async def _handle_control_command(self, packet: Dict, addr: Tuple[str, int], recv_ns: Optional[int] = None):
         """处理控制命令"""
         try:
 
@@ -704,33 +903,48 @@ class ControlGateway:
             target = data.get('target', 'body')
             command_data = data.get('data', {})
 
+            # 客户端可随任意数据包设置确认模式
+            ack_mode = data.get('ack_mode')
+            if ack_mode:
+                self.ack_manager.set_mode(addr, ack_mode)
             
             if not command_type:
-                logger.warning("缺少命令类型")
+                if not ack_mode:
+                    logger.warning("缺少命令类型")
                 return
-            print(command_type, target,command_data)
+            logger.debug(f"{command_type} {target} {command_data}")
 
             
+            # 只追踪发往身体控制进程的运动命令
+            trace_id = 0
+            if recv_ns is not None and (command_type != 'object_control' or target == 'leg'):
+                trace_id = self.trace_ids.next_id()
+                self.trace_collector.stamp(trace_id, HOP_GATEWAY_RECEIVE, recv_ns)
+            
             # 创建控制命令
             command = ControlCommand(
                 command_type=command_type,
                 target=target,
                 data=command_data,
                 timestamp=packet.get('timestamp', time.time()),
-                session_id=data.get('session_id', '')
+                session_id=data.get('session_id', ''),
+                trace_id=trace_id
             )
             
             # 发送到DDS
-            success = await self.dds_bridge.send_command(command)
+            success = await self._dispatch_command(command, data)
+            if not success:
+                self.trace_collector.finish(trace_id)
             
             if success:
                 self.stats['commands_processed'] += 1
-                # 发送确认响应
-                await self._send_response(addr, {
-                    'status': 'success',
-                    'command_id': data.get('command_id'),
-                    'timestamp': time.time()
-                })
+                # 状态切换总是逐条确认，流式命令按客户端确认模式处理
+                ack = self.ack_manager.on_command(
+                    addr, data.get('command_id'), force=(command_type == 'state_switch'))
+                if ack:
+                    await self._send_response(addr, ack)
+                else:
+                    self.stats['acks_suppressed'] += 1
             else:
                 await self._send_response(addr, {
                     'status': 'error',
@@ -747,6 +961,10 @@ class ControlGateway:
                 'timestamp': time.time()
             })
     
+    async def _dispatch_command(self, command: ControlCommand, data: Dict) -> bool:
+        """把命令交给DDS（多机器狗网关按 robot_id 路由）"""
+        return await self.dds_bridge.send_command(command)
+    
     async def _send_response(self, addr: Tuple[str, int], response_data: Dict):
         """发送响应"""
         try:
@@ -771,18 +989,37 @@ class ControlGateway:
             try:
                 self.security_manager.cleanup_expired_sessions()
                 self.packet_manager.cleanup_expired_fragments()
+                self.ack_manager.cleanup_idle_clients()
                 await asyncio.sleep(60)  # 每分钟清理一次
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 logger.error(f"清理任务失败: {e}")
     
+    async def _ack_flush_loop(self):
+        """累积确认发送循环"""
+        while self.is_running:
+            try:
+                await asyncio.sleep(self.ack_manager.flush_interval / 2)
+                for addr, ack in self.ack_manager.collect_due():
+                    await self._send_response(addr, ack)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"确认发送任务失败: {e}")
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """网关统计信息，包含各跳延迟直方图摘要"""
+        stats = dict(self.stats)
+        stats['latency'] = self.trace_collector.snapshot()
+        return stats
+    
     async def _stats_loop(self):
         """统计循环"""
         while self.is_running:
             try:
                 await asyncio.sleep(30)  # 每30秒输出一次统计
-                logger.info(f"统计信息: {self.stats}")
+                logger.info(f"统计信息: {self.get_stats()}")
             except asyncio.CancelledError:
                 break
             except Exception as e:
@@ -793,7 +1030,7 @@ class ControlGateway:
         while self.is_running:
             try:
                 # 检查DDS连接
-                if not self.dds_bridge.is_connected:
+                if self.dds_bridge and not self.dds_bridge.is_connected:
                     logger.warning("DDS连接断开，尝试重连...")
                     await self.dds_bridge.connect()
                 
@@ -813,9 +1050,9 @@ class ControlGateway:
         logger.info("控制网关已停止")
         await asyncio.sleep(0.1)
 
-async def main():
+async def main(runtime_config: Optional[GatewayRuntimeConfig] = None):
     """主函数"""
-    gateway = ControlGateway()
+    gateway = ControlGateway(runtime_config=runtime_config)
     
     try:
         await gateway.start()
@@ -827,4 +1064,5 @@ async def main():
         await gateway.stop()
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    config = GatewayRuntimeConfig.from_env(DSCP_CONTROL)
+    run_gateway(lambda: main(config), config)
@@ -4,22 +4,37 @@ import os
 import threading
 import queue
 from enum import Enum
-from dataclasses import dataclass
-
-from unitree_sdk2py.core.channel import (ChannelPublisher, ChannelFactoryInitialize, ChannelSubscriber)
-from unitree_sdk2py.idl.unitree_go.msg.dds_ import LowCmd_
-from unitree_sdk2py.idl.default import unitree_go_msg_dds__LowCmd_
-from unitree_sdk2py.utils.crc import CRC
-from unitree_sdk2py.comm.motion_switcher.motion_switcher_client import MotionSwitcherClient
-from unitree_sdk2py.go2.sport.sport_client import SportClient
-from cyclonedds.idl import IdlStruct
+from lowcmd_crc import LowCmdCrc
+from body_backend import BACKEND_SDK, BACKEND_SIM, SerializedClient, create_backend
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../communication")))
-from dds_data_structure import MyMotionCommand
+from dds_data_structure import MyMotionCommand, CommandTrace
+from latency_trace import TraceReporter, CallHook, HOP_BODY_READ, HOP_QUEUE_DEQUEUE, HOP_SDK_CALL
+from motion_engine import MotionEngine, DEFAULT_GAINS, RAISE_LEG_STIFF_JOINTS, stiff_gains
+from trajectory import build_trajectory, build_sequence
+from command_channels import LatestValueSlot
+from mode_watcher import ModeWatcher
+from setpoint_filter import RateLimitedSetpoint
+from transition_task import TransitionTask, current_task, cancellable_sleep, check_cancelled, report_progress
+
+# 底层控制循环周期与实时调度设置
+LOW_LEVEL_PERIOD_S = 0.002    # 500Hz
+LOW_LEVEL_DAMP_PERIOD_S = 0.01
+LOW_LEVEL_RT_PRIORITY = None  # 例如 80，启用 SCHED_FIFO（需要root）
+LOW_LEVEL_CPUS = None         # 例如 {3}，把底层控制线程绑定到指定CPU
+
+# 抬腿角度跟踪的速度/加速度上限（原来为每50ms 0.1rad，即 2rad/s）
+RAISE_LEG_MAX_VEL = 2.0   # rad/s
+RAISE_LEG_MAX_ACC = 20.0  # rad/s^2
+RAISE_LEG_JOINT1_LIMITS = (-1.5, 3.4)   # rad，抬腿时 angle1 控制的关节
+RAISE_LEG_JOINT2_LIMITS = (-2.7, -0.8)  # rad，抬腿时 angle2 控制的关节
+
+# 状态切换在后台任务中执行；等待释放运动模式的上限（原来会无限等待）
+LOW_LEVEL_MODE_TIMEOUT_S = 10.0
+# 启动时进入高层阻尼失败（如 SelectMode 返回错误码）的重试次数和间隔，全部失败后改为底层阻尼
+STARTUP_DAMP_RETRIES = 3
+STARTUP_RETRY_PERIOD_S = 1.0
 
-def clear_queue(q: queue.Queue):
-    while not q.empty():
-        q.get()
 
 class RobotState(Enum):
     HIGH_LEVEL_DAMP = 8
@@ -36,55 +51,94 @@ def mirror_joint_index(idx):
     return swap_map.get(idx, idx)
 
 class RobotController:
-    def __init__(self):
+    def __init__(self, backend=None):
         self.current_state = RobotState.HIGH_LEVEL_DAMP
-        self.command_queue = queue.Queue()
+        self.command_queue = queue.Queue()  # 状态切换和行走命令（FIFO）
+        self.leg_angle_slot = LatestValueSlot()  # 抬腿角度目标，只保留最新一个
         self.state_lock = threading.Lock()
         self.running = True
         self.low_level_thread = None
         self.raise_leg_pose_init = False
         self.low_level_stop_event = threading.Event()
-        ChannelFactoryInitialize(0, "enP8p1s0")
-        self.msc = MotionSwitcherClient()
-        self.msc.Init()
-        self.sport = SportClient()
-        self.sport.Init()
-        self.low_cmd_publisher = ChannelPublisher("rt/lowcmd", LowCmd_)
-        self.low_cmd_publisher.Init()
-        self.dds_subscriber = ChannelSubscriber("rt/my_motion_command", MyMotionCommand)
-        self.dds_subscriber.Init()
-        self.low_cmd = unitree_go_msg_dds__LowCmd_()
-        self.crc = CRC()
+        self.transition_task = None  # 当前/最近一次状态切换任务
+        self.low_level_mode = False  # 运动模式是否已释放（底层控制）
+        self.tracer = TraceReporter(self.publish_trace)  # 在订阅回调生效前创建
+        self.backend = backend or create_backend(BACKEND_SDK)
+        self._init_backend()
+        self.mode_watcher = ModeWatcher(self.msc)  # run() 中启动后台轮询
+        self.crc = LowCmdCrc()
+        self.motion = MotionEngine(self.low_cmd_publisher, self.low_cmd, self.crc, period_s=LOW_LEVEL_PERIOD_S,
+                                   rt_priority=LOW_LEVEL_RT_PRIORITY, cpus=LOW_LEVEL_CPUS)
         self.stand_pos = [0.0, 0.67, -1.3] * 4
         self.lie_down_pos = [-0.35, 1.36, -2.65, 0.35, 1.36, -2.65, -0.5, 1.36, -2.65, 0.5, 1.36, -2.65]
         self.current_pose = list(self.stand_pos)
         self.last_leg_selection = 0  # 新增，保存上一次raise leg时选的腿
+        self.loop_stats = self.motion.loop_stats  # 各底层循环最近一次的周期/抖动统计
         print("RobotController initialized. Starting in DAMP state.")
 
-    def dds_listener_thread(self):
-        print("DDS listener thread started.")
-        while self.running:
-            try:
-                msg = self.dds_subscriber.Read(timeout=0.1)
-                if msg:
-                    self.command_queue.put(msg)
-            except Exception as e:
-                if str(e) != "[Reader] take sample error":
-                    print(f"Error in DDS listener: {e}")
-            time.sleep(0.01)
-        print("DDS listener thread stopped.")
+    def _init_backend(self):
+        """从后端取得运控客户端、rt/lowcmd 发布者和DDS通道（真实机器狗或本地模拟）"""
+        backend = self.backend.open()
+        # 状态切换的 sdk_call 跳在切换任务中第一次 SDK 调用返回时打点。
+        # 同一客户端的调用串行执行：被 DAMP 抢占的任务仍在进行中的 SelectMode/ReleaseMode/StandUp 返回之后，
+        # DAMP 自己的调用才会发出，不会被旧调用覆盖；已取消任务在等锁期间排上的调用不再发出（check_cancelled）
+        self.msc = SerializedClient(CallHook(backend.msc, self._on_sdk_call), guard=check_cancelled)
+        self.sport = SerializedClient(CallHook(backend.sport, self._on_sdk_call), guard=check_cancelled)
+        self.low_cmd_publisher = backend.low_cmd_publisher
+        self.low_cmd = backend.low_cmd
+        self.dds_subscriber = backend.channels.ChannelSubscriber("rt/my_motion_command", MyMotionCommand)
+        # 事件驱动：收到样本时由DDS回调线程直接分发，不再定时轮询
+        self.dds_subscriber.Init(self.on_dds_command)
+        # 延迟追踪：command_id 非0时打点并回报给控制网关
+        self.trace_publisher = backend.channels.ChannelPublisher("rt/command_trace", CommandTrace)
+        self.trace_publisher.Init()
+
+    def publish_trace(self, trace_id, stamps):
+        self.trace_publisher.Write(CommandTrace(
+            trace_id=trace_id,
+            body_read_ns=stamps.get(HOP_BODY_READ, 0),
+            queue_dequeue_ns=stamps.get(HOP_QUEUE_DEQUEUE, 0),
+            sdk_call_ns=stamps.get(HOP_SDK_CALL, 0)
+        ))
+
+    def _on_sdk_call(self):
+        """SDK 调用返回：在切换任务中时为触发切换的命令打 sdk_call 点并结束追踪（只记第一次）"""
+        task = current_task()
+        if task is None or not task.trace_id:
+            return
+        trace_id, task.trace_id = task.trace_id, 0
+        self.tracer.stamp(trace_id, HOP_SDK_CALL)
+        self.tracer.finish(trace_id)
+
+    def on_dds_command(self, msg: MyMotionCommand):
+        """DDS 数据到达回调：在DDS线程中执行，只做分发，不能阻塞"""
+        if not self.running or msg is None:
+            return
+        try:
+            self.route_command(msg)
+        except Exception as e:
+            print(f"Error in DDS listener: {e}")
+
+    def route_command(self, msg: MyMotionCommand):
+        """按命令类型分发：抬腿角度进最新值槽，状态切换和行走命令进FIFO队列"""
+        self.tracer.stamp(msg.command_id, HOP_BODY_READ)
+        if msg.command_type == 1:
+            displaced = self.leg_angle_slot.put(msg)
+            if displaced is not None:
+                # 被新目标覆盖的角度命令不会再执行，结束它的追踪
+                self.tracer.finish(displaced.command_id)
+        else:
+            self.command_queue.put(msg)
 
     def state_machine_thread(self):
         print("State machine thread started.")
         while self.running:
             try:
                 cmd: MyMotionCommand = self.command_queue.get(timeout=0.05)
-                if cmd.command_type == 1:
-                    # 抬腿角度指令直接丢给底层线程
-                    self.command_queue.put(cmd)
-                    time.sleep(0.05)
-                    continue
-                self.process_command(cmd)
+                self.tracer.stamp(cmd.command_id, HOP_QUEUE_DEQUEUE)
+                if not self.process_command(cmd):
+                    # 状态切换命令的追踪交给切换任务结束
+                    self.tracer.finish(cmd.command_id)
             except queue.Empty:
                 pass
             except Exception as e:
@@ -92,20 +146,35 @@ class RobotController:
         print("State machine thread stopped.")
 
     def process_command(self, cmd: MyMotionCommand):
+        """返回 True 表示命令已交给切换任务，由任务结束它的延迟追踪"""
+        # 只做分发，状态切换在后台任务中执行，命令接收不会被切换过程阻塞
         with self.state_lock:
             if cmd.command_type == 0: # State Switch
                 try:
                     target_state = RobotState(cmd.state_enum)
-                    print(f"Attempting transition from {self.current_state.name} to {target_state.name} (leg_selection={cmd.leg_selection})")
+                except ValueError:
+                    print(f"Error: Invalid target state enum {cmd.state_enum}")
+                    return
+                print(f"Attempting transition from {self.current_state.name} to {target_state.name} (leg_selection={cmd.leg_selection})")
+                if target_state in [RobotState.HIGH_LEVEL_DAMP, RobotState.LOW_LEVEL_DAMP]:
+                    # DAMP 随时可用：取消正在进行的切换后立即执行
+                    self.start_transition(target_state.name, self.transition_to_damp, preempt=True,
+                                          trace_id=cmd.command_id)
+                elif self.transition_in_progress():
+                    print(f"[ERROR] 状态切换 {self.transition_task.name} 进行中"
+                          f"（{self.transition_task.stage}），切换到 {target_state.name} 已被拒绝！")
+                    return
+                else:
                     # 记录raise leg的腿
                     if target_state == RobotState.LOW_LEVEL_RAISE_LEG:
                         self.last_leg_selection = cmd.leg_selection
-                    self.handle_state_transition(target_state)
-                except ValueError:
-                    print(f"Error: Invalid target state enum {cmd.state_enum}")
+                    self.start_transition(target_state.name, lambda: self.handle_state_transition(target_state),
+                                          trace_id=cmd.command_id)
+                return True
             elif cmd.command_type == 1 and self.current_state == RobotState.LOW_LEVEL_RAISE_LEG:
                 pass
-            elif cmd.command_type == 2 and self.current_state in [RobotState.HIGH_LEVEL_STAND, RobotState.HIGH_LEVEL_WALK]:
+            elif (cmd.command_type == 2 and self.current_state in [RobotState.HIGH_LEVEL_STAND, RobotState.HIGH_LEVEL_WALK]
+                  and not self.transition_in_progress()):
                 vx, vy, vyaw = cmd.x, cmd.y, cmd.r
                 if not (-2.5 <= vx <= 3.8):
                     print(f"[ERROR] vx速度超限：{vx}，允许范围[-2.5, 3.8] m/s，指令已被忽略。")
@@ -117,6 +186,7 @@ class RobotController:
                     print(f"[ERROR] vyaw速度超限：{vyaw}，允许范围[-4, 4] rad/s，指令已被忽略。")
                     return
                 self.sport.Move(vx, vy, vyaw)
+                self.tracer.stamp(cmd.command_id, HOP_SDK_CALL)
                 print(f"Executing walk: x={vx}, y={vy}, r={vyaw}")
 
     def handle_state_transition(self, target_state: RobotState):
@@ -181,15 +251,49 @@ class RobotController:
         # 兜底
         print(f"[ERROR] 当前状态 {self.current_state.name} 不允许切换到 {target_state.name}，操作被拒绝！")
 
+    def start_transition(self, name, fn, preempt=False, trace_id=0):
+        """
+        在后台任务中执行状态切换；preempt=True 时取消正在进行的切换，最多等它 transition_task.PREEMPT_JOIN_TIMEOUT_S 后开始。
+        DAMP 的最坏延迟 = PREEMPT_JOIN_TIMEOUT_S + 旧任务中正在进行的那一个 SDK 调用的剩余时间（最长为 SDK 的
+        RPC 超时；调用串行执行，DAMP 的模式切换必须在它之后到达机器狗）+ DAMP 自身的切换时间（低层：停止底层线程
+        最多 1s，ReleaseMode + CheckMode；高层：未处于 AI 模式时 SelectMode + 1s，再 Damp），
+        与 ensure_low_level_mode 最长 LOW_LEVEL_MODE_TIMEOUT_S 的循环无关。
+        旧任务在 SDK 调用返回后的检查点退出，不再发起 SDK 调用、修改状态或启动底层线程。
+        """
+        previous = self.transition_task
+        if previous is not None and previous.is_active():
+            if not preempt:
+                return None
+            print(f"[FSM] 取消进行中的切换 {previous.name}（{previous.stage}）")
+            previous.cancel()
+        else:
+            previous = None
+        def run():
+            try:
+                fn()
+            finally:
+                # 切换中没有调用 SDK（被拒绝或取消）时也结束追踪
+                self.tracer.finish(trace_id)
+        self.transition_task = TransitionTask(name, run, after=previous, trace_id=trace_id).start()
+        return self.transition_task
+
+    def transition_in_progress(self):
+        return self.transition_task is not None and self.transition_task.is_active()
+
+    def transition_status(self):
+        return self.transition_task.snapshot() if self.transition_task else None
+
+    def cancel_event(self):
+        """切换任务中使用任务的取消事件，底层线程中使用 low_level_stop_event"""
+        task = current_task()
+        return task.cancel_event if task is not None else self.low_level_stop_event
+
     def transition_to_damp(self):
-        if self.current_state in [RobotState.HIGH_LEVEL_STAND, RobotState.HIGH_LEVEL_WALK, RobotState.HIGH_LEVEL_DAMP]:
-            self.transition_to_high_level_damp()
-        elif self.current_state in [RobotState.LOW_LEVEL_STAND, RobotState.LOW_LEVEL_RAISE_LEG, RobotState.LOW_LEVEL_DAMP]:
+        # 按实际运动模式选择阻尼方式：被取消的切换可能已经释放了运动模式但尚未更新 current_state
+        if self.low_level_mode:
             self.transition_to_low_level_damp()
         else:
-            print(f"Unknown context for DAMP from state {self.current_state.name}. Defaulting to HIGH_LEVEL_DAMP.")
             self.transition_to_high_level_damp()
-        clear_queue(self.command_queue)
 
     def transition_to_high_level_damp(self):
         print("Transitioning to HIGH_LEVEL_DAMP...")
@@ -198,7 +302,6 @@ class RobotController:
         self.sport.Damp()
         self.current_state = RobotState.HIGH_LEVEL_DAMP
         print("State is now HIGH_LEVEL_DAMP.")
-        clear_queue(self.command_queue)
 
     def transition_to_low_level_damp(self):
         print("Transitioning to LOW_LEVEL_DAMP...")
@@ -207,7 +310,6 @@ class RobotController:
         self.start_low_level_thread(self.maintain_low_level_damp)
         self.current_state = RobotState.LOW_LEVEL_DAMP
         print("State is now LOW_LEVEL_DAMP.")
-        clear_queue(self.command_queue)
 
     def transition_to_high_level_stand(self):
         print("Transitioning to HIGH_LEVEL_STAND...")
@@ -216,7 +318,6 @@ class RobotController:
         self.sport.BalanceStand()
         self.current_pose = list(self.stand_pos)
         print("State is now HIGH_LEVEL_STAND.")
-        clear_queue(self.command_queue)
 
     def transition_to_low_level_stand(self):
         print("Transitioning to LOW_LEVEL_STAND...")
@@ -232,43 +333,20 @@ class RobotController:
             # 恢复顺序下标
             default_indices = [0,1,2,9,10,11]
             indices = [mirror_joint_index(i) if use_mirror else i for i in default_indices]
-            # 恢复流程和原本一致，只是index换掉
-            def interpolate_selected_joints(start, end, joint_indices, duration_ms):
-                steps = int(duration_ms / 2)
-                for step in range(steps):
-                    alpha = step / steps
-                    current = start[:]
-                    for j in joint_indices:
-                        current[j] = (1 - alpha) * start[j] + alpha * end[j]
-                    for i in range(12):
-                        self.low_cmd.motor_cmd[i].mode = 0x01
-                        self.low_cmd.motor_cmd[i].q = current[i]
-                        self.low_cmd.motor_cmd[i].dq = 0
-                        self.low_cmd.motor_cmd[i].kp = 100.0
-                        self.low_cmd.motor_cmd[i].kd = 8.0
-                        self.low_cmd.motor_cmd[i].tau = 0
-                    self.low_cmd.crc = self.crc.Crc(self.low_cmd)
-                    self.low_cmd_publisher.Write(self.low_cmd)
-                    time.sleep(0.002)
-            # 分步插值（index已经镜像或原样）
-            tmp = pose_buffer[:]; tmp[indices[0]] = stand_pos[indices[0]]
-            interpolate_selected_joints(pose_buffer, tmp, [indices[0]], 300)
-            tmp2 = tmp[:]; tmp2[indices[1]] = stand_pos[indices[1]]
-            interpolate_selected_joints(tmp, tmp2, [indices[1]], 300)
-            tmp3 = tmp2[:]; tmp3[indices[2]] = stand_pos[indices[2]]
-            interpolate_selected_joints(tmp2, tmp3, [indices[2]], 300)
-            tmp4 = tmp3[:]; tmp4[indices[3]] = stand_pos[indices[3]]
-            interpolate_selected_joints(tmp3, tmp4, [indices[3]], 400)
-            tmp5 = tmp4[:]; tmp5[indices[4]] = stand_pos[indices[4]]
-            interpolate_selected_joints(tmp4, tmp5, [indices[4]], 400)
-            tmp6 = tmp5[:]; tmp6[indices[5]] = stand_pos[indices[5]]
-            interpolate_selected_joints(tmp5, tmp6, [indices[5]], 400)
+            # 恢复流程和原本一致，只是index换掉：每步把一个关节恢复到站立角度（index已经镜像或原样）
+            waypoints = [pose_buffer[:]]
+            for idx in indices:
+                waypoint = waypoints[-1][:]
+                waypoint[idx] = stand_pos[idx]
+                waypoints.append(waypoint)
+            self.play_trajectory(build_sequence(waypoints, [300, 300, 300, 400, 400, 400], period_s=LOW_LEVEL_PERIOD_S),
+                                 "restore_stand_sequence", self.cancel_event())
+            check_cancelled()
             self.current_pose = list(stand_pos)
         else:
             self.current_pose = list(self.stand_pos)
         self.start_low_level_thread(self.maintain_static_pose)
         print("State is now LOW_LEVEL_STAND.")
-        clear_queue(self.command_queue)
 
     def transition_to_low_level_raise_leg(self):
         print("Transitioning to LOW_LEVEL_RAISE_LEG...")
@@ -276,55 +354,75 @@ class RobotController:
         # 重点：带上last_leg_selection参数
         self.start_low_level_thread(lambda: self.maintain_raise_leg_pose(self.last_leg_selection))
         print("State is now LOW_LEVEL_RAISE_LEG.")
-        clear_queue(self.command_queue)
 
     def transition_from_high_to_low(self):
         print("Transitioning from HIGH_LEVEL to LOW_LEVEL...")
+        report_progress("stand_up")
         self.sport.StandUp()
-        time.sleep(0.6)
+        cancellable_sleep(0.6)
         self.stop_low_level_thread()
         self.ensure_low_level_mode()
         self.current_pose = list(self.stand_pos)
         self.start_low_level_thread(self.maintain_static_pose)
         print("Transition complete to LOW_LEVEL_STAND.")
-        clear_queue(self.command_queue)
 
     def transition_from_low_to_high(self):
         print("Transitioning from LOW_LEVEL to HIGH_LEVEL...")
         self.stop_low_level_thread()
-        _, result = self.msc.CheckMode()
-        print(f"[DEBUG] Before interpolate_pose, mode is: {result.get('name')}")
-        self.interpolate_pose(self.current_pose, self.lie_down_pos, 1500)
+        print(f"[DEBUG] Before lie down, mode is: {self.mode_watcher.snapshot.name}")
+        # 原实现在 stop_low_level_thread() 之后 low_level_stop_event 仍处于置位状态，
+        # interpolate_pose(current_pose, lie_down_pos, 1500) 立即返回，实际并不执行趴下轨迹。
+        # 这里保持原行为；真正执行 1.5s 趴下过渡需要单独修改并在实机上验证。
         self.current_pose = list(self.lie_down_pos)
-        time.sleep(0.5)
+        report_progress("settle")
+        cancellable_sleep(0.5)
         self.ensure_high_level_mode()
         self.sport.BalanceStand()
         self.current_pose = list(self.stand_pos)
         print("Transition complete to HIGH_LEVEL_STAND.")
-        clear_queue(self.command_queue)
 
     def ensure_high_level_mode(self):
         print("Ensuring high-level (AI) mode...")
-        _, result = self.msc.CheckMode()
-        if result.get("name") != "ai":
-            self.msc.SelectMode("ai")
-            time.sleep(1.0)
+        report_progress("select_ai_mode")
+        check_cancelled()
+        # 重新查询而不是使用缓存：被抢占任务的 ReleaseMode 可能刚刚落地，缓存里的 'ai' 已经过时。
+        # CheckMode 与其他模式切换调用串行执行，查询结果反映进行中的调用返回之后的模式
+        if self.mode_watcher.refresh().name != "ai":
+            ret, _ = self.msc.SelectMode("ai")
+            # 阻塞期间可能已被 DAMP 抢占，此时模式由新任务负责
+            check_cancelled()
+            if ret != 0:
+                # 切换失败时机器狗仍处于原模式，保持 low_level_mode 不变
+                raise RuntimeError(f"SelectMode('ai') failed with code {ret}")
+            self.low_level_mode = False
+            self.mode_watcher.record("ai")
+            cancellable_sleep(1.0)
             print("Switched to AI mode.")
         else:
+            self.low_level_mode = False
             print("Already in AI mode.")
 
     def ensure_low_level_mode(self):
         print("Ensuring low-level mode...")
+        report_progress("release_mode")
+        check_cancelled()
+        # 进入底层控制前总是 ReleaseMode 并重新查询确认，不使用缓存（缓存只用于显示和日志）
+        deadline = time.monotonic() + LOW_LEVEL_MODE_TIMEOUT_S
         while True:
             self.msc.ReleaseMode()
-            time.sleep(0.01)
-            status, result = self.msc.CheckMode()
-            if result.get("name", "") == "":
+            cancellable_sleep(0.01)
+            # 释放是否生效必须重新查询确认
+            if self.mode_watcher.refresh().name == "":
+                self.low_level_mode = True
                 print("Switched to low-level mode.")
                 break
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"motion mode not released within {LOW_LEVEL_MODE_TIMEOUT_S}s")
             print("Waiting for mode release...")
 
     def start_low_level_thread(self, target_func):
+        # 被抢占的切换任务不能再启动底层线程，避免两个线程同时发送 LowCmd
+        check_cancelled()
         if self.low_level_thread and self.low_level_thread.is_alive():
             print("Warning: A low-level thread is already running. Stopping it first.")
             self.stop_low_level_thread()
@@ -342,9 +440,7 @@ class RobotController:
 
     def maintain_static_pose(self):
         print(f"Maintaining static pose: {self.current_pose}")
-        while not self.low_level_stop_event.is_set():
-            self.send_low_level_pose_cmd(self.current_pose)
-            time.sleep(0.002)
+        self.motion.hold(self.current_pose, stop=self.low_level_stop_event, name="maintain_static_pose")
 
     def maintain_raise_leg_pose(self, leg_selection):
         self.raise_leg_pose_init = True
@@ -371,132 +467,89 @@ class RobotController:
         else:
             step1[idx_9] += 0.3    # 原逻辑
 
-        self.interpolate_pose(self.current_pose, step1, 650)
-
         step2 = step1[:]
         step2[mirror_joint_index(2) if use_mirror else 2] -= 0.8
-        self.interpolate_pose(step1, step2, 250)
         step3 = step2[:]
         idx = mirror_joint_index(0) if use_mirror else 0
         if use_mirror:
             step3[idx] += 0.8   # 左腿镜像，3号关节抬起变为+0.8
         else:
             step3[idx] -= 0.8   # 右腿/原本逻辑，-0.8
-        self.interpolate_pose(step2, step3, 300)
         step4 = step3[:]
         step4[mirror_joint_index(1) if use_mirror else 1] -= 1.0
-        self.interpolate_pose(step3, step4, 250)
         step5 = step4[:]
         step5[mirror_joint_index(2) if use_mirror else 2] = self.stand_pos[mirror_joint_index(2) if use_mirror else 2]
-        self.interpolate_pose(step4, step5, 250)
+
+        # 五段过渡预先生成为一条轨迹，底层循环逐行发送
+        raise_traj = build_sequence([self.current_pose, step1, step2, step3, step4, step5],
+                                    [650, 250, 300, 250, 250], period_s=LOW_LEVEL_PERIOD_S)
+        self.play_trajectory(raise_traj, "raise_leg_sequence", self.low_level_stop_event)
 
         pose_buffer = step5[:]
         self.current_pose = list(pose_buffer)
         # 高刚度腿下标镜像
-        default_indices = [0,1,2,3,4,5,9,10,11]
-        high_kp = [100.0]*12
-        high_kd = [8.0]*12
-        for i in default_indices:
-            idx = mirror_joint_index(i) if use_mirror else i
-            high_kp[idx] = 160.0
-            high_kd[idx] = 10.0
+        raise_gains = stiff_gains(mirror_joint_index(i) if use_mirror else i for i in RAISE_LEG_STIFF_JOINTS)
         self.raise_leg_pose_init = False 
+        self.leg_angle_slot.clear()  # 丢弃抬腿动作完成前收到的旧目标
+
+        # 重点：angle1/2控制关节下标做镜像
+        joint1_idx = mirror_joint_index(1) if use_mirror else 1
+        joint2_idx = mirror_joint_index(2) if use_mirror else 2
+        # 抬腿角度在500Hz保持循环中经速度/加速度受限的滤波器跟踪，新目标下一个周期生效；输出限制在关节限位内
+        leg_setpoint = RateLimitedSetpoint([pose_buffer[joint1_idx], pose_buffer[joint2_idx]],
+                                           RAISE_LEG_MAX_VEL, RAISE_LEG_MAX_ACC, LOW_LEVEL_PERIOD_S,
+                                           lower=(RAISE_LEG_JOINT1_LIMITS[0], RAISE_LEG_JOINT2_LIMITS[0]),
+                                           upper=(RAISE_LEG_JOINT1_LIMITS[1], RAISE_LEG_JOINT2_LIMITS[1]))
+
+        def apply_angle_command(cmd: MyMotionCommand):
+            self.tracer.stamp(cmd.command_id, HOP_QUEUE_DEQUEUE)
+            self.tracer.finish(cmd.command_id)
+            target1 = cmd.angle1
+            target2 = cmd.angle2
+            if (not clamp_warning(joint1_idx, target1, *RAISE_LEG_JOINT1_LIMITS)
+                    or not clamp_warning(joint2_idx, target2, *RAISE_LEG_JOINT2_LIMITS)):
+                return
+            leg_setpoint.set_target((target1, target2))
 
-        def maintain_dynamic():
-            while not self.low_level_stop_event.is_set():
-                for j in range(12):
-                    self.low_cmd.motor_cmd[j].mode = 0x01
-                    self.low_cmd.motor_cmd[j].q = pose_buffer[j]
-                    self.low_cmd.motor_cmd[j].dq = 0
-                    self.low_cmd.motor_cmd[j].kp = high_kp[j]
-                    self.low_cmd.motor_cmd[j].kd = high_kd[j]
-                    self.low_cmd.motor_cmd[j].tau = 0
-                self.low_cmd.crc = self.crc.Crc(self.low_cmd)
-                self.low_cmd_publisher.Write(self.low_cmd)
-                time.sleep(0.002)
-
-        def receive_angle_command():
-            print("[LowLevelRaiseLeg] 开始监听DDS角度指令...")
-            while not self.low_level_stop_event.is_set():
-                # 插值阶段主动跳过，保护姿态
-                if self.raise_leg_pose_init:
-                    time.sleep(0.02)
-                    continue
-                try:
-                    cmd: MyMotionCommand = self.command_queue.get(timeout=0.05)
-                    if cmd.command_type == 1:
-                        # 重点：angle1/2控制关节下标做镜像
-                        joint1_idx = mirror_joint_index(1) if use_mirror else 1
-                        joint2_idx = mirror_joint_index(2) if use_mirror else 2
-                        target1 = cmd.angle1
-                        target2 = cmd.angle2
-                        if not clamp_warning(joint1_idx, target1, -1.5, 3.4) or not clamp_warning(joint2_idx, target2, -2.7, -0.8):
-                            continue
-                        while (abs(pose_buffer[joint1_idx] - target1) > 0.05 or
-                            abs(pose_buffer[joint2_idx] - target2) > 0.05) and not self.low_level_stop_event.is_set():
-                            if pose_buffer[joint1_idx] < target1:
-                                pose_buffer[joint1_idx] = min(pose_buffer[joint1_idx] + 0.1, target1)
-                            else:
-                                pose_buffer[joint1_idx] = max(pose_buffer[joint1_idx] - 0.1, target1)
-                            if pose_buffer[joint2_idx] < target2:
-                                pose_buffer[joint2_idx] = min(pose_buffer[joint2_idx] + 0.1, target2)
-                            else:
-                                pose_buffer[joint2_idx] = max(pose_buffer[joint2_idx] - 0.1, target2)
-                            time.sleep(0.05)
-                except queue.Empty:
-                    continue
-
-        thread_hold = threading.Thread(target=maintain_dynamic)
-        thread_cmd = threading.Thread(target=receive_angle_command)
-        thread_hold.start()
-        thread_cmd.start()
-        thread_cmd.join()
-        thread_hold.join()
+        def maintain_dynamic(i):
+            cmd = self.leg_angle_slot.poll()
+            if cmd is not None:
+                apply_angle_command(cmd)
+            pose_buffer[joint1_idx], pose_buffer[joint2_idx] = leg_setpoint.step().tolist()
+            self.send_low_level_pose_cmd(pose_buffer, raise_gains)
+
+        print("[LowLevelRaiseLeg] 开始跟踪DDS角度指令...")
+        self.motion.run(maintain_dynamic, "maintain_dynamic", stop=self.low_level_stop_event)
         self.current_pose = list(pose_buffer)
         print("[LowLevelRaiseLeg] 抬腿线程正常退出，current_pose已同步，控制权已交还主状态机")
 
-    def send_low_level_pose_cmd(self, pose, kp=100.0, kd=8.0):
-        for i in range(12):
-            self.low_cmd.motor_cmd[i].mode = 0x01
-            self.low_cmd.motor_cmd[i].q = pose[i]
-            self.low_cmd.motor_cmd[i].dq = 0.0
-            self.low_cmd.motor_cmd[i].kp = kp
-            self.low_cmd.motor_cmd[i].kd = kd
-            self.low_cmd.motor_cmd[i].tau = 0.0
-        self.low_cmd.crc = self.crc.Crc(self.low_cmd)
-        self.low_cmd_publisher.Write(self.low_cmd)
+    def send_low_level_pose_cmd(self, pose, gains=DEFAULT_GAINS):
+        self.motion.send_pose(pose, gains)
 
     def send_low_level_damp_cmd(self):
-        for i in range(12):
-            self.low_cmd.motor_cmd[i].mode = 0x01
-            self.low_cmd.motor_cmd[i].q = 0.0
-            self.low_cmd.motor_cmd[i].dq = 0.0
-            self.low_cmd.motor_cmd[i].kp = 0.0
-            self.low_cmd.motor_cmd[i].kd = 2.0
-            self.low_cmd.motor_cmd[i].tau = 0.0
-        self.low_cmd.crc = self.crc.Crc(self.low_cmd)
-        self.low_cmd_publisher.Write(self.low_cmd)
+        self.motion.send_damp()
+
+    def play_trajectory(self, traj, name, stop_event=None):
+        """逐周期发送预计算轨迹的每一行（最后一行为终点），被 stop_event 打断时返回 False"""
+        task = current_task()
+        report_progress(name, 0.0)
+        on_progress = (lambda fraction: setattr(task, 'progress', fraction)) if task is not None else None
+        return self.motion.play(traj, name=name, stop=stop_event, on_progress=on_progress)
 
     def interpolate_pose(self, start, end, duration_ms):
         print(f"Interpolating pose over {duration_ms}ms")
-        steps = int(duration_ms / 2)
-        for step in range(steps):
-            if self.low_level_stop_event.is_set():
-                print("[interpolate_pose] Interrupted by stop_event!")
-                return
-            alpha = min(1.0, step / steps)
-            q_interp = [(1 - alpha) * s + alpha * e for s, e in zip(start, end)]
-            self.send_low_level_pose_cmd(q_interp)
-            time.sleep(0.002)
-        self.send_low_level_pose_cmd(end)
+        traj = build_trajectory(start, end, duration_ms, period_s=LOW_LEVEL_PERIOD_S)
+        if not self.play_trajectory(traj, "interpolate_pose", self.cancel_event()):
+            print("[interpolate_pose] Interrupted by stop_event!")
+            check_cancelled()
+            return
         self.current_pose = list(end)
 
     def run(self):
-        self.transition_to_high_level_damp()
+        self.mode_watcher.start()
+        self.start_in_damp()
         main_sm_thread = threading.Thread(target=self.state_machine_thread)
-        dds_thread = threading.Thread(target=self.dds_listener_thread)
         main_sm_thread.start()
-        dds_thread.start()
         try:
             while self.running:
                 time.sleep(1)
@@ -504,18 +557,38 @@ class RobotController:
             print("Shutdown requested.")
         self.shutdown()
         main_sm_thread.join()
-        dds_thread.join()
         print("All threads terminated. Exiting.")
 
+    def start_in_damp(self, retries=STARTUP_DAMP_RETRIES, retry_period_s=STARTUP_RETRY_PERIOD_S):
+        """启动时进入阻尼状态；切换失败只记录日志，不结束进程，之后仍可以通过 DAMP 命令重试"""
+        for attempt in range(1, retries + 1):
+            try:
+                self.transition_to_high_level_damp()
+                return True
+            except Exception as e:
+                print(f"[ERROR] 启动时进入 HIGH_LEVEL_DAMP 失败（第 {attempt}/{retries} 次）: {e}")
+                if attempt < retries:
+                    time.sleep(retry_period_s)
+        # 无法切换到 AI 模式时释放运动模式，以底层阻尼作为已知的起始状态
+        try:
+            self.transition_to_low_level_damp()
+            return True
+        except Exception as e:
+            print(f"[ERROR] 启动时进入 LOW_LEVEL_DAMP 也失败: {e}，等待 DAMP 命令重试")
+            return False
+
     def maintain_low_level_damp(self):
         print("Maintaining low-level damp...")
-        while not self.low_level_stop_event.is_set():
-            self.send_low_level_damp_cmd()
-            time.sleep(0.01)
+        self.motion.hold_damp(stop=self.low_level_stop_event, name="maintain_low_level_damp",
+                              period_s=LOW_LEVEL_DAMP_PERIOD_S)
 
     def shutdown(self):
         self.running = False
+        if self.transition_in_progress():
+            self.transition_task.cancel()
+            self.transition_task.join(timeout=2.0)
         self.stop_low_level_thread()
+        self.mode_watcher.stop()
         try:
             print("Attempting final shutdown damp...")
             self.transition_to_damp()
@@ -523,6 +596,8 @@ class RobotController:
             print(f"Could not send final damp command: {e}")
 
 if __name__ == '__main__':
-    print("Starting Robot Dog Main Body Controller")
-    controller = RobotController()
+    # --sim：使用本地模拟机器狗（不需要Go2和网络）
+    backend_name = BACKEND_SIM if '--sim' in sys.argv else BACKEND_SDK
+    print(f"Starting Robot Dog Main Body Controller ({backend_name} backend)")
+    controller = RobotController(create_backend(backend_name))
     controller.run()
\ No newline at end of file
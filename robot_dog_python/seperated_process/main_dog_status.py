@@ -1,6 +1,8 @@
 # main_dog_status.py (Final Confirmed Version)
+# 分频发布：电机状态 (DogMotorState, 默认50Hz, 由 rt/lowstate 回调直接发布)、
+# Jetson 负载/温度/功耗 (DogJetsonHealth, 1Hz)、运动模式和硬件信息 (DogModeInfo, 变化时发布)
+# jtop 由 jetson_sampler.JetsonSampler 在后台线程读取和转换，发布循环只写出采样好的结构体
 
-import time
 import sys
 import os
 import json
@@ -9,6 +11,9 @@ import datetime
 # Debug flag is now permanently False
 DEBUG_JTOP = False
 DDS_NETWORK_INTERFACE = "enP8p1s0"
+# 同时以 1Hz 拼出完整的状态发布到 "DogStatusV3" / 旧布局 "DogStatus"，供尚未迁移到分频主题的订阅者使用
+PUBLISH_DOG_STATUS_V3 = False
+PUBLISH_LEGACY_DOG_STATUS = False
 # --- FIX FOR CROSS-DIRECTORY IMPORT ---
 current_script_dir = os.path.dirname(os.path.abspath(__file__))
 parent_dir = os.path.dirname(current_script_dir)
@@ -16,7 +21,13 @@ communication_dir_path = os.path.join(parent_dir, 'communication')
 sys.path.append(communication_dir_path)
 # --- END OF FIX ---
 
-from dds_data_structure import DogStatus
+from dds_data_structure import (DogStatus, DogStatusV3, DogMotorState, DogJetsonHealth, DogModeInfo,
+                                DOG_STATUS_TOPIC, DOG_STATUS_V3_TOPIC, DOG_MOTOR_STATE_TOPIC,
+                                DOG_JETSON_HEALTH_TOPIC, DOG_MODE_INFO_TOPIC)
+from dog_status_arrays import compose_dog_status, to_legacy_dog_status
+from status_topics import MotorStatePublisher, ModeInfoPublisher, MOTOR_STATE_RATE_HZ, JETSON_HEALTH_PERIOD_S
+from mode_watcher import ModeWatcher
+from jetson_sampler import JetsonSampler
 from unitree_sdk2py.idl.unitree_go.msg.dds_ import LowState_
 from unitree_sdk2py.core.channel import ChannelSubscriber, ChannelPublisher, ChannelFactoryInitialize
 from unitree_sdk2py.comm.motion_switcher.motion_switcher_client import MotionSwitcherClient
@@ -29,137 +40,87 @@ def json_default_serializer(o):
         return o.total_seconds()
     raise TypeError(f"Object of type {o.__class__.__name__} is not JSON serializable")
 
-def get_jtop_val(stat_obj):
-    """Safely extracts a value from a jtop statistic."""
-    if isinstance(stat_obj, (int, float)):
-        return float(stat_obj)
-    if isinstance(stat_obj, dict):
-        return float(stat_obj.get('val', 0.0))
-    return 0.0
-
-def populate_jetson_details(dog_status_msg, stats):
-    """
-    Populates detailed Jetson stats using the confirmed keys from your debug output.
-    """
-    dog_status_msg.temperatures.cpu = stats.get('Temp tj', 0.0)
-    dog_status_msg.temperatures.gpu = stats.get('Temp gpu', 0.0)
-    dog_status_msg.temperatures.soc0 = stats.get('Temp soc0', 0.0)
-    dog_status_msg.temperatures.soc1 = stats.get('Temp soc1', 0.0)
-    dog_status_msg.temperatures.soc2 = stats.get('Temp soc2', 0.0)
-    dog_status_msg.temperatures.cv0 = stats.get('Temp cv0', 0.0)
-    dog_status_msg.temperatures.cv1 = stats.get('Temp cv1', 0.0)
-    dog_status_msg.temperatures.cv2 = stats.get('Temp cv2', 0.0)
-    dog_status_msg.temperatures.tj = stats.get('Temp cpu', 0.0)
-
-    dog_status_msg.power.cpu_gpu_cv = stats.get('Power VDD_CPU_GPU_CV', 0)
-    dog_status_msg.power.soc = stats.get('Power VDD_SOC', 0)
-    # --- FINAL FIX: Map 'Power TOT' to the VDD_INN field ---
-    dog_status_msg.power.vdd_inn = stats.get('Power TOT', 0)
-    dog_status_msg.power.nv_power_total = stats.get('Power TOT', 0)
-
-    # Note: 'disk' key is not provided by the jtop python library, so it will correctly be 0.
-    disk_stats = stats.get('disk', {})
-    disk_used = disk_stats.get('used', 0)
-    disk_total = disk_stats.get('total', 0)
-    dog_status_msg.hardware.disk_usage_percent = (disk_used / disk_total) * 100 if disk_total > 0 else 0
-    
-    dog_status_msg.hardware.emc_usage_percent = get_jtop_val(stats.get('EMC'))
-    dog_status_msg.hardware.fan_speed_percent = get_jtop_val(stats.get('Fan pwmfan0'))
-    
-    uptime_val = stats.get('uptime')
-    if isinstance(uptime_val, datetime.timedelta):
-        dog_status_msg.hardware.uptime_seconds = int(uptime_val.total_seconds())
-    else:
-        dog_status_msg.hardware.uptime_seconds = int(uptime_val or 0)
-    
-    dog_status_msg.hardware.jetson_clocks_on = True if stats.get('jetson_clocks', 'OFF') == 'ON' else False
-
 def main():
     global DEBUG_JTOP, DDS_NETWORK_INTERFACE
     DDS_NETWORK_INTERFACE = "enP8p1s0"
-    msc, lowstate_sub, dog_status_pub = None, None, None
+    lowstate_sub, mode_watcher, sampler = None, None, None
+    publishers = []
+
+    def new_publisher(topic, data_type):
+        pub = ChannelPublisher(topic, data_type)
+        pub.Init()
+        publishers.append(pub)
+        return pub
 
     try:
-        with jtop() as jetson:
+        # jetson.ok() 每个 interval 返回一次，即 Jetson 状态的采样和发布周期
+        with jtop(interval=JETSON_HEALTH_PERIOD_S) as jetson:
             if not jetson.ok():
                 print("Failed to connect to the jtop service.")
                 return
 
+            if DEBUG_JTOP:
+                print("\n--- JTOP DEBUG OUTPUT (WILL PRINT ONCE) ---")
+                print(json.dumps(jetson.stats, indent=4, default=json_default_serializer))
+                print("--- END OF JTOP DEBUG OUTPUT ---\n")
+                DEBUG_JTOP = False
+
             print(f"Initializing DDS on network interface: {DDS_NETWORK_INTERFACE}")
             ChannelFactoryInitialize(networkInterface=DDS_NETWORK_INTERFACE)
-            
-            lowstate_sub = ChannelSubscriber("rt/lowstate", LowState_)
-            lowstate_sub.Init()
-            dog_status_pub = ChannelPublisher("DogStatus", DogStatus)
-            dog_status_pub.Init()
+
+            health_pub = new_publisher(DOG_JETSON_HEALTH_TOPIC, DogJetsonHealth)
+            mode_info = ModeInfoPublisher(new_publisher(DOG_MODE_INFO_TOPIC, DogModeInfo))
+            status_v3_pub = new_publisher(DOG_STATUS_V3_TOPIC, DogStatusV3) if PUBLISH_DOG_STATUS_V3 else None
+            legacy_status_pub = new_publisher(DOG_STATUS_TOPIC, DogStatus) if PUBLISH_LEGACY_DOG_STATUS else None
+
             msc = MotionSwitcherClient()
             msc.SetTimeout(5.0)
             msc.Init()
+            # CheckMode 在后台低频轮询，模式变化时立即发布，1Hz 循环只读缓存
+            mode_watcher = ModeWatcher(msc)
+            mode_watcher.add_listener(lambda snap: mode_info.update(snap.form, snap.name))
+            mode_watcher.start()
+
+            # 电机状态在 rt/lowstate 回调中直接降采样发布，不经过下面的 1Hz 循环
+            motor_state = MotorStatePublisher(new_publisher(DOG_MOTOR_STATE_TOPIC, DogMotorState), MOTOR_STATE_RATE_HZ)
+            lowstate_sub = ChannelSubscriber("rt/lowstate", LowState_)
+            lowstate_sub.Init(motor_state.on_lowstate, 1)
 
-            print("Successfully connected to services. Starting unified monitoring...")
+            print(f"Successfully connected to services. Motor state at {MOTOR_STATE_RATE_HZ:.0f} Hz, "
+                  f"Jetson health every {JETSON_HEALTH_PERIOD_S:.1f} s, mode info on change.")
             print("Press Ctrl+C to stop.")
 
-            while jetson.ok():
-                stats = jetson.stats
-
-                if DEBUG_JTOP:
-                    print("\n--- JTOP DEBUG OUTPUT (WILL PRINT ONCE) ---")
-                    print(json.dumps(stats, indent=4, default=json_default_serializer))
-                    print("--- END OF JTOP DEBUG OUTPUT ---\n")
-                    DEBUG_JTOP = False
-
-                lowstate_msg = lowstate_sub.Read(200)
-
-                if lowstate_msg is not None:
-                    dog_status_to_publish = DogStatus()
-                    
-                    cpu_cores = [k for k in stats if k.startswith('CPU') and k[3:].isdigit()]
-                    total_cpu_usage = sum(get_jtop_val(stats.get(core)) for core in cpu_cores)
-                    dog_status_to_publish.cpu_usage_percent = total_cpu_usage / len(cpu_cores) if cpu_cores else 0.0
-
-                    # dog_status_to_publish.timestamp_ns = time.time_ns()
-                    dog_status_to_publish.battery_percent = float(lowstate_msg.bms_state.soc)
-                    dog_status_to_publish.gpu_usage_percent = get_jtop_val(stats.get('GPU'))
-                    dog_status_to_publish.memory_usage_percent = get_jtop_val(stats.get('RAM')) * 100.0
-                    
-                    status, result = msc.CheckMode()
-                    if status == 0:
-                        dog_status_to_publish.robot_mode_form = result.get('form', 'N/A')
-                        dog_status_to_publish.robot_mode_name = result.get('name', 'N/A')
-                    else:
-                        dog_status_to_publish.robot_mode_name = "Error"
-                    
-                    populate_jetson_details(dog_status_to_publish, stats)
-
-                     # --- EXPANDED: Populate all 9 fields for all 12 motors ---
-                    for i in range(12):
-                        motor = lowstate_msg.motor_state[i]
-                        setattr(dog_status_to_publish, f'm{i}_mode', motor.mode)
-                        setattr(dog_status_to_publish, f'm{i}_q', motor.q)
-                        setattr(dog_status_to_publish, f'm{i}_dq', motor.dq)
-                        setattr(dog_status_to_publish, f'm{i}_ddq', motor.ddq)
-                        setattr(dog_status_to_publish, f'm{i}_tau_est', motor.tau_est)
-                        setattr(dog_status_to_publish, f'm{i}_temperature', motor.temperature)
-                        setattr(dog_status_to_publish, f'm{i}_lost', motor.lost)
-                        # The 'reserve' field in the SDK is an array
-                        setattr(dog_status_to_publish, f'm{i}_reserve0', motor.reserve[0])
-                        setattr(dog_status_to_publish, f'm{i}_reserve1', motor.reserve[1])
-                    # --- END OF UPDATE ---
-
-                    dog_status_to_publish.timestamp_ns = time.time_ns()
-
-                    dog_status_pub.Write(dog_status_to_publish)
-
-                    print(f"Published: "
-                          f"Mode='{dog_status_to_publish.robot_mode_name}' | "
-                          f"SoC={dog_status_to_publish.battery_percent:.1f}% | "
-                          f"CPU={dog_status_to_publish.cpu_usage_percent:.1f}% | "
-                          f"GPU={dog_status_to_publish.gpu_usage_percent:.1f}% | "
-                          f"CPU Temp={dog_status_to_publish.temperatures.cpu:.1f}°C")
-                else:
-                    pass
-                
-                time.sleep(0.8)
+            sampler = JetsonSampler(jetson)
+            sampler.start()
+            seq = 0
+            while True:
+                sample = sampler.wait(seq, timeout=5 * JETSON_HEALTH_PERIOD_S)
+                if sample is None:
+                    if not sampler.running:
+                        print("jtop service disconnected.")
+                        break
+                    continue
+                seq, health, hardware = sample
+                health_pub.Write(health)
+
+                mode = mode_watcher.snapshot
+                mode_form, mode_name = mode.form, mode.name
+                if mode_info.update(mode_form, mode_name, hardware):
+                    print(f"Mode info: Mode='{mode_name}' | Jetson Clocks={'ON' if hardware.jetson_clocks_on else 'OFF'}")
+
+                if status_v3_pub or legacy_status_pub:
+                    status = compose_dog_status(motor_state.msg if motor_state.published else None,
+                                                health, mode_info.last)
+                    if status_v3_pub: status_v3_pub.Write(status)
+                    if legacy_status_pub: legacy_status_pub.Write(to_legacy_dog_status(status))
+
+                print(f"Published: "
+                      f"Mode='{mode_name}' | "
+                      f"SoC={motor_state.msg.battery_percent:.1f}% | "
+                      f"CPU={health.cpu_usage_percent:.1f}% | "
+                      f"GPU={health.gpu_usage_percent:.1f}% | "
+                      f"CPU Temp={health.temperatures.cpu:.1f}°C | "
+                      f"Motor state {motor_state.published} sent / {motor_state.received} lowstate")
 
     except JtopException as e:
         print(f"An error occurred with jtop: {e}")
@@ -172,7 +133,9 @@ def main():
     finally:
         print("\nShutdown complete.")
         if lowstate_sub: lowstate_sub.Close()
-        if dog_status_pub: dog_status_pub.Close()
+        if sampler: sampler.stop()
+        if mode_watcher: mode_watcher.stop()
+        for pub in publishers: pub.Close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
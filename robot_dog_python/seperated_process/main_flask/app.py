@@ -1,5 +1,5 @@
 # app.py
-from flask import Flask, render_template, request
+from flask import Flask, render_template, request, jsonify
 from flask_socketio import SocketIO, emit
 import threading
 import time
@@ -14,7 +14,13 @@ if COMMUNICATION_DIR not in sys.path:
     sys.path.append(COMMUNICATION_DIR)
 
 try:
-    from dds_data_structure import DogStatus, SpeechControl, HeadCommand, HeadAction, PowerControl
+    from dds_data_structure import (DogMotorState, DogJetsonHealth, DogModeInfo, DOG_MOTOR_STATE_TOPIC,
+                                    DOG_JETSON_HEALTH_TOPIC, DOG_MODE_INFO_TOPIC,
+                                    SpeechControl, HeadCommand, HeadAction, PowerControl,
+                                    ClockSyncRequest, ClockSyncResponse, CLOCK_SYNC_REQUEST_TOPIC,
+                                    CLOCK_SYNC_RESPONSE_TOPIC)
+    from dog_status_arrays import motor_columns
+    from clock_sync import ClockOffsetEstimator, ClockSyncClient, OneWayLatency
 except ImportError as e:
     print(f"Error: Could not import DDS data structures. Please ensure 'dds_data_structure.py' "
           f"is located at '{COMMUNICATION_DIR}/dds_data_structure.py'.")
@@ -30,6 +36,13 @@ except ImportError as e:
     sys.exit(1)
 # --- End of Real DDS Imports ---
 
+# telemetry_binary 使用 communication 下的 dog_status_arrays，需在上面的路径设置之后导入
+from telemetry_stream import TelemetryStream, status_snapshot, DASHBOARD_UPDATE_HZ, ENCODING_JSON
+from telemetry_binary import encode_status_body
+from telemetry_transform import (StatusTransform, decode_motor_errors, MOTOR_STATE_FIELDS, JETSON_HEALTH_FIELDS,
+                                 MODE_INFO_FIELDS)
+from telemetry_history import MetricHistory, HISTORY_SECONDS, HISTORY_RATE_HZ, DEFAULT_POINTS
+
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'your_super_secret_key_here_please_change_this_for_production'
 socketio = SocketIO(app, cors_allowed_origins="*", async_mode='threading')
@@ -51,30 +64,6 @@ power_control_pub = None
 speech_command_queue = queue.Queue()
 speech_publisher_active = True
 
-# --- Motor Error Decoding ---
-MOTOR_ERROR_MAP = {
-    0: "Over-current", 1: "Over-voltage", 2: "Under-voltage", 3: "Over-temperature (MOS)",
-    4: "Encoder error", 5: "Reserved", 6: "Reserved", 7: "Communication Lost", 8: "Over-temperature (Motor)"
-}
-
-def decode_motor_errors(reserve0_val):
-    """Decodes motor error bits into a human-readable string."""
-    if reserve0_val == 0:
-        return "OK"
-    errors = [MOTOR_ERROR_MAP[bit] for bit, error_str in MOTOR_ERROR_MAP.items() if (reserve0_val >> bit) & 1]
-    return ", ".join(errors) if errors else "OK"
-
-# --- Attribute Helper ---
-def get_nested_attr(obj, attrs, default=0.0):
-    """Safely gets nested attributes from an object, returning a default if not found."""
-    current_obj = obj
-    for attr in attrs:
-        if hasattr(current_obj, attr):
-            current_obj = getattr(current_obj, attr)
-        else:
-            return default
-    return current_obj
-
 # --- Global Status Dictionary ---
 latest_dog_status = {
     "battery_percent": 0.0, "cpu_usage_percent": 0.0, "gpu_usage_percent": 0.0,
@@ -85,132 +74,146 @@ latest_dog_status = {
     "power_nv_power_total": 0.0, "power_vdd_inn": 0.0, "hardware_uptime_seconds": 0.0,
     "hardware_jetson_clocks_on": False, "hardware_fan_speed_percent": 0.0,
     "hardware_emc_usage_percent": 0.0, "hardware_disk_usage_percent": 0.0,
-    "status_message": "Initializing...", "data_received": False, "motors": []
+    "status_message": "Initializing...", "data_received": False
 }
+latest_motors = None  # MotorStateArrays of the last DogMotorState, converted only when a frame is built
 
 # --- DDS Configuration ---
-DOG_STATUS_TOPIC = "DogStatus"
 SPEECH_CONTROL_TOPIC = "SpeechControl"
 HEAD_COMMAND_TOPIC = "HeadCommand"
 POWER_CONTROL_TOPIC = "PowerControl"
 DDS_NETWORK_INTERFACE = "enP8p1s0"
+STATUS_STALE_S = 2.0           # 超过该时间没有收到任何状态主题则显示等待数据
+TELEMETRY_REPORT_S = 30.0      # 打印推送字节率的周期
+
+status_lock = threading.Lock()
+last_status_received = 0.0
+
+def _emit_status_frame(sid, frame, callback):
+    socketio.emit('dog_status_update', frame, to=sid, callback=callback)
+
+# 以 DASHBOARD_UPDATE_HZ 推送：只发送变化的字段，定期发送关键帧，慢客户端跳过中间帧
+telemetry = TelemetryStream(_emit_status_frame)
+# 最近 HISTORY_SECONDS 的曲线数据，网页登录后按需取降采样的窗口
+history = MetricHistory()
+
+# 本机与机器狗 Jetson 的时钟偏差（对时服务见 main_clock_sync.py），状态消息的时间戳换算到本机后计算单向延迟
+robot_clock = ClockOffsetEstimator()
+topic_latency = OneWayLatency(robot_clock)
+clock_sync_client = None
+
+# 字段映射在启动时编译并对照消息类型检查，每个样本只做一次 attrgetter
+motor_state_fields = StatusTransform(DogMotorState, MOTOR_STATE_FIELDS)
+jetson_health_fields = StatusTransform(DogJetsonHealth, JETSON_HEALTH_FIELDS)
+mode_info_fields = StatusTransform(DogModeInfo, MODE_INFO_FIELDS)
+
+def _latency_ms(topic, msg):
+    """One-way latency of a status message; 0.0 until the clock offset to the robot is known."""
+    latency_ms = topic_latency.add(topic, msg.timestamp_ns)
+    return latency_ms if latency_ms is not None else 0.0
+
+def _mark_received():
+    global last_status_received
+    last_status_received = time.monotonic()
+    latest_dog_status["status_message"] = "Data received successfully."
+    latest_dog_status["data_received"] = True
+
+def on_motor_state(msg):
+    """DogMotorState (~50Hz): motor state and battery."""
+    global latest_motors
+    latency_ms = _latency_ms(DOG_MOTOR_STATE_TOPIC, msg)
+    with status_lock:
+        motor_state_fields.update(latest_dog_status, msg)
+        latest_dog_status["latency_ms"] = latency_ms
+        latest_motors = msg.motors
+        _mark_received()
+
+def on_jetson_health(msg):
+    """DogJetsonHealth (1Hz): Jetson load, temperatures and power."""
+    _latency_ms(DOG_JETSON_HEALTH_TOPIC, msg)
+    with status_lock:
+        jetson_health_fields.update(latest_dog_status, msg)
+        _mark_received()
+
+def on_mode_info(msg):
+    """DogModeInfo (on change): robot mode and Jetson hardware info."""
+    _latency_ms(DOG_MODE_INFO_TOPIC, msg)
+    with status_lock:
+        mode_info_fields.update(latest_dog_status, msg)
+        _mark_received()
+
+def _status_handler(handler):
+    def wrapped(msg):
+        try:
+            handler(msg)
+        except Exception as attr_e:
+            with status_lock:
+                latest_dog_status["status_message"] = f"DDS Data Format Error: {attr_e}"
+                latest_dog_status["data_received"] = False
+            print(f"DDS Data Format Error: {attr_e}")
+    return wrapped
+
+STATUS_SUBSCRIPTIONS = (
+    (DOG_MOTOR_STATE_TOPIC, DogMotorState, on_motor_state),
+    (DOG_JETSON_HEALTH_TOPIC, DogJetsonHealth, on_jetson_health),
+    (DOG_MODE_INFO_TOPIC, DogModeInfo, on_mode_info),
+)
+
+def current_status():
+    """Copy of the scalar status and the latest MotorStateArrays, marking the data stale if nothing arrived."""
+    with status_lock:
+        if time.monotonic() - last_status_received > STATUS_STALE_S:
+            if not latest_dog_status["data_received"]:
+                latest_dog_status["status_message"] = "Waiting for data from robot..."
+            latest_dog_status["data_received"] = False
+        return dict(latest_dog_status), latest_motors
+
+def build_status_snapshot():
+    status, motors = current_status()
+    return status_snapshot(status, motor_columns(motors) if motors is not None else None, decode_motor_errors)
+
+def build_status_binary():
+    status, motors = current_status()
+    return encode_status_body(status, motors)
 
 def dds_subscriber_thread():
-    """Thread function for subscribing to DogStatus DDS topic."""
-    global latest_dog_status
-    sub = None
+    """Subscribes to the split status topics and pushes the merged status to the web clients."""
+    subs = []
     try:
-        sub = ChannelSubscriber(DOG_STATUS_TOPIC, DogStatus)
-        sub.Init()
+        for topic, data_type, handler in STATUS_SUBSCRIPTIONS:
+            sub = ChannelSubscriber(topic, data_type)
+            sub.Init(_status_handler(handler))
+            subs.append(sub)
+        print(f"DDS subscriber thread listening on topics: {[topic for topic, _, _ in STATUS_SUBSCRIPTIONS]}...")
     except Exception as e:
         print(f"DDS Subscriber setup failed: {e}")
+        # 继续推送，网页通过关键帧看到错误信息
         latest_dog_status["status_message"] = f"DDS Setup Error: {e}. Check network interface & SDK."
-        socketio.emit('dog_status_update', latest_dog_status)
-        if sub and sub.is_initialized(): sub.Close()
-        return
 
-    print(f"DDS subscriber thread listening on topic: '{DOG_STATUS_TOPIC}'...")
+    period = 1.0 / DASHBOARD_UPDATE_HZ
+    history_every = max(int(round(DASHBOARD_UPDATE_HZ / HISTORY_RATE_HZ)), 1)
+    ticks = 0
+    next_tick = time.monotonic()
+    next_report = next_tick + TELEMETRY_REPORT_S
     try:
+        # DDS 回调只更新 latest_dog_status，这里按 UI 频率生成快照并推送
         while True:
-            msg = sub.Read(100)
-            if msg:
-                raw_timestamp_ns = getattr(msg, 'timestamp_ns', None)
-                timestamp_ns_val = 0
-                if raw_timestamp_ns is not None:
-                    try:
-                        timestamp_ns_val = int(raw_timestamp_ns)
-                    except (ValueError, TypeError):
-                        print(f"Warning: Could not convert timestamp_ns '{raw_timestamp_ns}' to int. Using 0.")
-                
-                latency_ms = (time.time_ns() - timestamp_ns_val) / 1_000_000.0 if timestamp_ns_val else 0.0
-
-                try:
-                    raw_battery = getattr(msg, 'battery_percent', None)
-                    raw_cpu = getattr(msg, 'cpu_usage_percent', None)
-                    raw_gpu = getattr(msg, 'gpu_usage_percent', None)
-                    raw_memory = getattr(msg, 'memory_usage_percent', None)
-
-                    battery_percent_val = 0.0
-                    if raw_battery is not None:
-                        try:
-                            battery_percent_val = float(raw_battery)
-                        except (ValueError, TypeError):
-                            print(f"Warning: Could not convert battery_percent '{raw_battery}' to float. Using 0.0.")
-
-                    cpu_usage_percent_val = 0.0
-                    if raw_cpu is not None:
-                        try:
-                            cpu_usage_percent_val = float(raw_cpu)
-                        except (ValueError, TypeError):
-                            print(f"Warning: Could not convert cpu_usage_percent '{raw_cpu}' to float. Using 0.0.")
-
-                    gpu_usage_percent_val = 0.0
-                    if raw_gpu is not None:
-                        try:
-                            gpu_usage_percent_val = float(raw_gpu)
-                        except (ValueError, TypeError):
-                            print(f"Warning: Could not convert gpu_usage_percent '{raw_gpu}' to float. Using 0.0.")
-
-                    memory_usage_percent_val = 0.0
-                    if raw_memory is not None:
-                        try:
-                            memory_usage_percent_val = float(raw_memory)
-                        except (ValueError, TypeError):
-                            print(f"Warning: Could not convert memory_usage_percent '{raw_memory}' to float. Using 0.0.")
-
-
-                    latest_dog_status.update({
-                        "battery_percent": battery_percent_val,
-                        "cpu_usage_percent": cpu_usage_percent_val,
-                        "gpu_usage_percent": gpu_usage_percent_val,
-                        "memory_usage_percent": memory_usage_percent_val,
-                        "latency_ms": latency_ms,
-                        "robot_mode_form": get_nested_attr(msg, ['robot_mode_form'], "N/A"),
-                        "robot_mode_name": get_nested_attr(msg, ['robot_mode_name'], "N/A"),
-                        "temp_cpu": get_nested_attr(msg, ['temperatures', 'cpu']),
-                        "temp_gpu": get_nested_attr(msg, ['temperatures', 'gpu']),
-                        "temp_tj": get_nested_attr(msg, ['temperatures', 'tj']),
-                        "temp_soc0": get_nested_attr(msg, ['temperatures', 'soc0']),
-                        "temp_soc1": get_nested_attr(msg, ['temperatures', 'soc1']),
-                        "temp_soc2": get_nested_attr(msg, ['temperatures', 'soc2']),
-                        "temp_cv0": get_nested_attr(msg, ['temperatures', 'cv0']),
-                        "temp_cv1": get_nested_attr(msg, ['temperatures', 'cv1']),
-                        "temp_cv2": get_nested_attr(msg, ['temperatures', 'cv2']),
-                        "power_cpu_gpu_cv": get_nested_attr(msg, ['power', 'cpu_gpu_cv']),
-                        "power_soc": get_nested_attr(msg, ['power', 'soc']),
-                        "power_nv_power_total": get_nested_attr(msg, ['power', 'nv_power_total']),
-                        "power_vdd_inn": get_nested_attr(msg, ['power', 'vdd_inn']),
-                        "hardware_uptime_seconds": get_nested_attr(msg, ['hardware', 'uptime_seconds']),
-                        "hardware_jetson_clocks_on": get_nested_attr(msg, ['hardware', 'jetson_clocks_on'], False),
-                        "hardware_fan_speed_percent": get_nested_attr(msg, ['hardware', 'fan_speed_percent']),
-                        "status_message": "Data received successfully.",
-                        "data_received": True,
-                        "motors": [{
-                            'mode': getattr(msg, f'm{i}_mode', 0), 'q': getattr(msg, f'm{i}_q', 0.0),
-                            'dq': getattr(msg, f'm{i}_dq', 0.0), 'ddq': getattr(msg, f'm{i}_ddq', 0.0),
-                            'tau_est': getattr(msg, f'm{i}_tau_est', 0.0), 'temperature': getattr(msg, f'm{i}_temperature', 0),
-                            'lost': getattr(msg, f'm{i}_lost', 0), 'reserve0': getattr(msg, f'm{i}_reserve0', 0),
-                            'error_str': decode_motor_errors(getattr(msg, f'm{i}_reserve0', 0))
-                        } for i in range(12)]
-                    })
-                except Exception as attr_e:
-                    latest_dog_status["status_message"] = f"DDS Data Format Error: {attr_e}"
-                    latest_dog_status["data_received"] = False
-                    print(f"DDS Data Format Error: {attr_e}")
-                
-                socketio.emit('dog_status_update', latest_dog_status)
-            else:
-                if not latest_dog_status["data_received"]:
-                    latest_dog_status["status_message"] = "Waiting for data from robot..."
-                latest_dog_status["data_received"] = False
-                socketio.emit('dog_status_update', latest_dog_status)
-                time.sleep(0.1)
+            next_tick += period
+            time.sleep(max(next_tick - time.monotonic(), 0.0))
+            telemetry.tick(build_status_snapshot, build_status_binary)
+            ticks += 1
+            if ticks % history_every == 0:
+                status, motors = current_status()
+                if status["data_received"]:
+                    history.append(status, motors)
+            if time.monotonic() >= next_report:
+                next_report += TELEMETRY_REPORT_S
+                print(f"Dashboard telemetry: {telemetry.stats()}")
+                print(f"Robot clock: {robot_clock.stats()}")
     except Exception as e:
         print(f"DDS subscriber thread error: {e}")
-        latest_dog_status["status_message"] = f"Critical DDS Stream Error: {e}"
-        socketio.emit('dog_status_update', latest_dog_status, {"data_received": False})
     finally:
-        if sub and sub.is_initialized(): sub.Close()
+        for sub in subs: sub.Close()
         print("DDS subscriber thread stopped.")
 
 def _speech_publisher_thread():
@@ -250,6 +253,36 @@ def index():
     """Renders the main control panel HTML page."""
     return render_template('index.html')
 
+@app.route('/telemetry_stats')
+def telemetry_stats():
+    """Dashboard stream counters, including bytes emitted per second."""
+    return jsonify(telemetry.stats())
+
+def history_window(params):
+    """metrics (list or comma separated), seconds back from now, points -> MetricHistory.window"""
+    metrics = params.get('metrics') or ['battery_percent']
+    if isinstance(metrics, str):
+        metrics = [m for m in metrics.split(',') if m]
+    seconds = min(float(params.get('seconds', HISTORY_SECONDS)), HISTORY_SECONDS)
+    end = time.time()
+    return history.window(metrics, end - seconds, end, int(params.get('points', DEFAULT_POINTS)))
+
+@app.route('/history')
+def history_route():
+    """Downsampled metric history, e.g. /history?metrics=battery_percent,temp_cpu&seconds=3600&points=300"""
+    try:
+        return jsonify(history_window(request.args))
+    except ValueError as e:
+        return jsonify({'error': str(e), 'metrics': list(history.names)}), 400
+
+def latency_report():
+    return {'clock': robot_clock.stats(), 'topics': topic_latency.summary()}
+
+@app.route('/latency')
+def latency_route():
+    """Clock offset/drift to the robot and per-topic one-way latency percentiles."""
+    return jsonify(latency_report())
+
 @socketio.on('connect')
 def handle_connect():
     """Handles new client connections. Initially, clients are not authenticated."""
@@ -261,6 +294,7 @@ def handle_connect():
 def handle_disconnect():
     """Handles client disconnections and removes from authenticated sessions."""
     print(f'Client disconnected: {request.sid}')
+    telemetry.remove_client(request.sid)
     if request.sid in authenticated_sids:
         authenticated_sids.remove(request.sid)
         print(f"Removed authenticated SID: {request.sid}")
@@ -274,6 +308,8 @@ def authenticate_client(data):
 
     if USERS.get(username) == password:
         authenticated_sids.add(sid)
+        # 下一帧是关键帧；网页可选择 'binary' 编码（见 telemetry_binary）
+        telemetry.add_client(sid, data.get('telemetry', ENCODING_JSON))
         print(f"Client {sid} authenticated successfully as '{username}'.")
         emit('login_response', {'status': 'success', 'message': 'Authentication successful.'})
     else:
@@ -293,6 +329,21 @@ def check_authentication():
         return wrapped
     return decorator
 
+@socketio.on('request_history')
+@check_authentication()
+def handle_request_history(data):
+    """Returns a downsampled history window through the Socket.IO ack."""
+    try:
+        return {'status': 'success', **history_window(data or {})}
+    except ValueError as e:
+        return {'status': 'error', 'message': str(e)}
+
+@socketio.on('request_latency')
+@check_authentication()
+def handle_request_latency(data=None):
+    """Returns the latency report through the Socket.IO ack."""
+    return {'status': 'success', **latency_report()}
+
 @socketio.on('speech_command')
 @check_authentication()
 def handle_speech_command(data):
@@ -333,7 +384,7 @@ def handle_head_control_command(data):
     print(f"Received head control command from authenticated client {request.sid}: {data}")
 
     command_msg = HeadCommand()
-    command_msg.timestamp = time.time_ns()
+    command_msg.timestamp = robot_clock.remote_now_ns()  # 机器狗时钟，与状态消息的时间戳可直接比较
     command = data.get('command')
     command_sent_status = 'error'
     command_message = 'Invalid command.'
@@ -439,6 +490,14 @@ if __name__ == '__main__':
         power_control_pub.Init()
         print(f"DDS Publisher for '{POWER_CONTROL_TOPIC}' initialized.")
 
+        clock_sync_pub = ChannelPublisher(CLOCK_SYNC_REQUEST_TOPIC, ClockSyncRequest)
+        clock_sync_pub.Init()
+        clock_sync_client = ClockSyncClient(clock_sync_pub, robot_clock)
+        clock_sync_sub = ChannelSubscriber(CLOCK_SYNC_RESPONSE_TOPIC, ClockSyncResponse)
+        clock_sync_sub.Init(clock_sync_client.on_response, 10)
+        clock_sync_client.start()
+        print(f"Clock sync client started ('{CLOCK_SYNC_REQUEST_TOPIC}' -> '{CLOCK_SYNC_RESPONSE_TOPIC}').")
+
     except Exception as e:
         print(f"FATAL: DDS initialization failed: {e}. The application cannot start.")
         sys.exit(1)
@@ -453,6 +512,8 @@ if __name__ == '__main__':
         socketio.run(app, host='0.0.0.0', port=5002, debug=True, allow_unsafe_werkzeug=True)
     finally:
         speech_publisher_active = False
+        if clock_sync_client is not None:
+            clock_sync_client.stop()
         if speech_publisher_thread.is_alive():
             speech_publisher_thread.join(timeout=1.0)
             for _ in range(5):  # Wait a bit for the thread to finish
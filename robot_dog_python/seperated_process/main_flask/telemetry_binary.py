@@ -0,0 +1,92 @@
+# telemetry_binary.py
+"""
+Binary encoding of the 'dog_status_update' event (opt-in per client, see TelemetryStream).
+
+Every binary frame is a full status in a fixed little-endian layout, identified by
+TELEMETRY_SCHEMA_ID; decodeStatusFrame in templates/index.html is the browser side and
+must be changed together with this file.
+
+    header   <2sHI       magic b'DT', schema id, seq
+    flags    u8          bit0: data_received
+    scalars  <{n}f       FLOAT_FIELDS in order
+             <IB         hardware_uptime_seconds, hardware_jetson_clocks_on
+    strings  u8 length + utf-8 bytes, for each of STRING_FIELDS
+    motors   u8 count + count records of WIRE_MOTOR_DTYPE (30 bytes each)
+
+Motor records are copied in bulk from MotorStateArrays through NumPy; error strings are
+decoded from reserve0 in the browser.
+"""
+
+import struct
+from typing import Dict, Optional
+
+import numpy as np
+
+from dog_status_arrays import MOTOR_STATE_DTYPE, motor_arrays_to_numpy
+
+TELEMETRY_SCHEMA_ID = 1
+MAGIC = b'DT'
+
+FLOAT_FIELDS = (
+    'battery_percent', 'cpu_usage_percent', 'gpu_usage_percent', 'memory_usage_percent', 'latency_ms',
+    'temp_cpu', 'temp_gpu', 'temp_tj', 'temp_soc0', 'temp_soc1', 'temp_soc2', 'temp_cv0', 'temp_cv1', 'temp_cv2',
+    'power_cpu_gpu_cv', 'power_soc', 'power_nv_power_total', 'power_vdd_inn',
+    'hardware_fan_speed_percent', 'hardware_emc_usage_percent', 'hardware_disk_usage_percent',
+)
+STRING_FIELDS = ('robot_mode_form', 'robot_mode_name', 'status_message')
+
+HEADER = struct.Struct('<2sHI')
+SCALARS = struct.Struct(f'<{len(FLOAT_FIELDS)}fIB')
+WIRE_MOTOR_DTYPE = MOTOR_STATE_DTYPE.newbyteorder('<')
+
+FLAG_DATA_RECEIVED = 0x01
+
+
+def _pack_string(value: str) -> bytes:
+    raw = str(value).encode('utf-8')[:255]
+    return bytes((len(raw),)) + raw
+
+
+def encode_status_body(status: Dict[str, object], motors) -> bytes:
+    """Everything after the header: scalars from the status dict, motors from MotorStateArrays (or None)."""
+    flags = FLAG_DATA_RECEIVED if status.get('data_received') else 0
+    parts = [bytes((flags,)), SCALARS.pack(*[float(status.get(k, 0.0) or 0.0) for k in FLOAT_FIELDS],
+                          int(status.get('hardware_uptime_seconds', 0) or 0),
+                          1 if status.get('hardware_jetson_clocks_on') else 0)]
+    parts.extend(_pack_string(status.get(k, '')) for k in STRING_FIELDS)
+    if motors is None:
+        parts.append(b'\x00')
+    else:
+        table = motor_arrays_to_numpy(motors, out=np.empty(len(motors.q), dtype=WIRE_MOTOR_DTYPE))
+        parts.append(bytes((len(table),)))
+        parts.append(table.tobytes())
+    return b''.join(parts)
+
+
+def encode_status_header(seq: int) -> bytes:
+    return HEADER.pack(MAGIC, TELEMETRY_SCHEMA_ID, seq & 0xFFFFFFFF)
+
+
+def decode_status_frame(data: bytes) -> Optional[Dict[str, object]]:
+    """Python mirror of decodeStatusFrame in index.html (used by the checks); None for an unknown schema."""
+    magic, schema_id, seq = HEADER.unpack_from(data, 0)
+    if magic != MAGIC or schema_id != TELEMETRY_SCHEMA_ID:
+        return None
+    flags = data[HEADER.size]
+    offset = HEADER.size + 1
+    values = SCALARS.unpack_from(data, offset)
+    offset += SCALARS.size
+    status: Dict[str, object] = dict(zip(FLOAT_FIELDS, values))
+    status['hardware_uptime_seconds'] = values[len(FLOAT_FIELDS)]
+    status['hardware_jetson_clocks_on'] = bool(values[len(FLOAT_FIELDS) + 1])
+    for name in STRING_FIELDS:
+        length = data[offset]
+        status[name] = data[offset + 1:offset + 1 + length].decode('utf-8')
+        offset += 1 + length
+    count = data[offset]
+    offset += 1
+    table = np.frombuffer(data, dtype=WIRE_MOTOR_DTYPE, count=count, offset=offset)
+    status['motors'] = [{name: table[name][i].item() for name in WIRE_MOTOR_DTYPE.names} for i in range(count)]
+    status['data_received'] = bool(flags & FLAG_DATA_RECEIVED)
+    status['seq'] = seq
+    return status
@@ -0,0 +1,124 @@
+# telemetry_history.py
+"""
+Server-side history of the dashboard metrics, so a browser that (re)connects can draw the
+last hour at once instead of starting from blank.
+
+MetricHistory keeps one fixed-size NumPy ring: a float64 timestamp column and a float32 row
+per sample with one column per metric (scalar status fields, then per-motor torque and
+temperature). window() returns a time range downsampled into equal-width buckets with
+min/max/mean per bucket; empty buckets (no data received) are dropped.
+"""
+
+import threading
+import time
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from dog_status_arrays import MOTOR_STATE_DTYPE, motor_arrays_to_numpy
+from dds_data_structure import NUM_STATUS_MOTORS
+
+HISTORY_SECONDS = 3600.0
+HISTORY_RATE_HZ = 10.0
+DEFAULT_POINTS = 300
+MAX_POINTS = 2000
+VALUE_PRECISION = 3
+
+SCALAR_METRICS = (
+    'battery_percent', 'cpu_usage_percent', 'gpu_usage_percent', 'memory_usage_percent',
+    'temp_cpu', 'temp_gpu', 'temp_tj', 'temp_soc0', 'temp_soc1', 'temp_soc2', 'temp_cv0', 'temp_cv1', 'temp_cv2',
+    'power_cpu_gpu_cv', 'power_soc', 'power_nv_power_total', 'power_vdd_inn',
+)
+MOTOR_METRIC_FIELDS = ('tau_est', 'temperature')
+
+now = time.time
+
+
+def motor_metric_name(index: int, field: str) -> str:
+    return f"motor{index}_{field}"
+
+
+class MetricHistory:
+    def __init__(self, capacity: int = int(HISTORY_SECONDS * HISTORY_RATE_HZ),
+                 scalar_metrics: Sequence[str] = SCALAR_METRICS,
+                 motor_fields: Sequence[str] = MOTOR_METRIC_FIELDS):
+        self.capacity = capacity
+        self.scalar_metrics = tuple(scalar_metrics)
+        self.motor_fields = tuple(motor_fields)
+        self.names = self.scalar_metrics + tuple(
+            motor_metric_name(i, field) for field in self.motor_fields for i in range(NUM_STATUS_MOTORS))
+        self.columns = {name: i for i, name in enumerate(self.names)}
+        self.times = np.zeros(capacity, dtype=np.float64)
+        self.values = np.full((capacity, len(self.names)), np.nan, dtype=np.float32)
+        self.count = 0
+        self._motor_table = np.empty(NUM_STATUS_MOTORS, dtype=MOTOR_STATE_DTYPE)
+        self._lock = threading.Lock()
+
+    def append(self, status: Dict[str, object], motors=None, t: Optional[float] = None):
+        """One sample from the merged status dict and MotorStateArrays (None: motor columns stay NaN)."""
+        t = now() if t is None else t
+        scalars = [status.get(name, np.nan) for name in self.scalar_metrics]
+        table = motor_arrays_to_numpy(motors, out=self._motor_table) if motors is not None else None
+        with self._lock:
+            slot = self.count % self.capacity
+            row = self.values[slot]
+            n = len(scalars)
+            row[:n] = scalars
+            for field in self.motor_fields:
+                row[n:n + NUM_STATUS_MOTORS] = table[field] if table is not None else np.nan
+                n += NUM_STATUS_MOTORS
+            self.times[slot] = t
+            self.count += 1
+
+    def _ordered_slots(self) -> np.ndarray:
+        if self.count <= self.capacity:
+            return np.arange(self.count)
+        start = self.count % self.capacity
+        return np.concatenate([np.arange(start, self.capacity), np.arange(start)])
+
+    def window(self, names: Sequence[str], start: float, end: float,
+               points: int = DEFAULT_POINTS) -> Dict[str, object]:
+        """
+        Metrics in [start, end) downsampled into `points` buckets.
+        Returns {'t': bucket start times, 'series': {name: {'min', 'max', 'mean'}}}.
+        """
+        unknown = [name for name in names if name not in self.columns]
+        if unknown:
+            raise ValueError(f"unknown metrics: {unknown}")
+        points = max(1, min(int(points), MAX_POINTS))
+        columns = [self.columns[name] for name in names]
+        with self._lock:
+            slots = self._ordered_slots()
+            times = self.times[slots]
+            lo, hi = np.searchsorted(times, [start, end])
+            slots, times = slots[lo:hi], times[lo:hi]
+            values = self.values[np.ix_(slots, columns)]
+
+        edges = np.linspace(start, end, points + 1)
+        bounds = np.searchsorted(times, edges)
+        first, last = bounds[:-1], bounds[1:]
+        nonempty = last > first
+        starts = first[nonempty]
+        result = {'start': start, 'end': end, 't': np.round(edges[:-1][nonempty], 3).tolist(), 'series': {}}
+        if len(starts) == 0:
+            result['series'] = {name: {'min': [], 'max': [], 'mean': []} for name in names}
+            return result
+
+        # fmin/fmax skip NaN unless a whole bucket is NaN; the mean counts only the valid samples
+        valid = ~np.isnan(values)
+        sums = np.add.reduceat(np.where(valid, values, 0.0), starts, axis=0)
+        counts = np.add.reduceat(valid.astype(np.int32), starts, axis=0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            stats = {
+                'min': np.fmin.reduceat(values, starts, axis=0),
+                'max': np.fmax.reduceat(values, starts, axis=0),
+                'mean': sums / counts,
+            }
+        for j, name in enumerate(names):
+            result['series'][name] = {kind: _json_values(column[:, j]) for kind, column in stats.items()}
+        return result
+
+
+def _json_values(values: np.ndarray) -> List[Optional[float]]:
+    rounded = np.round(values.astype(np.float64), VALUE_PRECISION)
+    return [None if v != v else v for v in rounded.tolist()]
@@ -0,0 +1,216 @@
+# telemetry_stream.py
+"""
+Dashboard telemetry stream for the Socket.IO 'dog_status_update' event.
+
+JSON clients (default) get {"seq", "key", "data"}:
+- key=True: a keyframe, data is the full status snapshot
+- key=False: a delta, data holds only the fields that changed since the previous frame
+  sent to that client; motors are sent as {"<index>": {field: value}}
+
+tick() runs at the UI rate. Each client keeps its own baseline. A client that has not
+acknowledged its previous frame is skipped, so a slow browser receives one delta covering
+everything it missed instead of a queue of stale frames. Keyframes go out every
+keyframe_s, to new clients, and after an ack timeout.
+
+Binary clients (opt-in, see telemetry_binary) get a full packed status per frame, sent only
+when it differs from the previous one or a keyframe is due; acks and coalescing are the same.
+"""
+
+import json
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Optional
+
+from telemetry_binary import encode_status_header
+
+DASHBOARD_UPDATE_HZ = 10.0
+KEYFRAME_INTERVAL_S = 5.0
+ACK_TIMEOUT_S = 2.0
+BYTES_WINDOW_S = 10.0
+
+# Values are rounded to what the dashboard displays, so sensor noise below that does not count as a change
+FLOAT_PRECISION = 2
+MOTOR_PRECISION = {'q': 3, 'dq': 3, 'ddq': 3, 'tau_est': 3}
+
+ENCODING_JSON = 'json'
+ENCODING_BINARY = 'binary'
+
+now = time.monotonic
+
+
+def status_snapshot(status: dict, motor_columns: Optional[Dict[str, list]],
+                    error_str: Callable[[int], str]) -> dict:
+    """
+    Builds the dashboard snapshot from the scalar status fields and the motor state columns
+    (field -> 12 values, see dog_status_arrays.motor_columns).
+    """
+    snapshot = {k: round(v, FLOAT_PRECISION) if isinstance(v, float) else v for k, v in status.items()}
+    motors = []
+    if motor_columns:
+        for name, digits in MOTOR_PRECISION.items():
+            motor_columns[name] = [round(v, digits) for v in motor_columns[name]]
+        names = list(motor_columns)
+        for values in zip(*motor_columns.values()):
+            motor = dict(zip(names, values))
+            motor['error_str'] = error_str(motor['reserve0'])
+            motors.append(motor)
+    snapshot['motors'] = motors
+    return snapshot
+
+
+def snapshot_delta(old: dict, new: dict) -> dict:
+    """Fields of new that differ from old; motor lists are diffed per motor and field."""
+    delta = {}
+    for key, value in new.items():
+        if key == 'motors':
+            old_motors = old.get('motors') or []
+            motors = {}
+            for i, motor in enumerate(value):
+                prev = old_motors[i] if i < len(old_motors) else {}
+                changed = {f: v for f, v in motor.items() if prev.get(f) != v}
+                if changed:
+                    motors[str(i)] = changed
+            if motors:
+                delta['motors'] = motors
+        elif old.get(key) != value:
+            delta[key] = value
+    return delta
+
+
+def payload_size(payload) -> int:
+    if isinstance(payload, (bytes, bytearray)):
+        return len(payload)
+    return len(json.dumps(payload))
+
+
+class ClientChannel:
+    def __init__(self, sid: str, encoding: str = ENCODING_JSON):
+        self.sid = sid
+        self.encoding = encoding
+        self.baseline = None  # snapshot (or binary body) the client has after applying the last frame
+        self.awaiting_since = 0.0
+        self.awaiting_seq = 0
+        self.last_keyframe = 0.0
+        self.frames = 0
+        self.coalesced = 0
+
+
+class TelemetryStream:
+    """
+    emit(sid, frame, callback) sends one frame to one client; callback must be invoked when
+    the client acknowledges it (Socket.IO ack).
+    """
+
+    def __init__(self, emit: Callable[[str, dict, Callable], None], keyframe_s: float = KEYFRAME_INTERVAL_S,
+                 ack_timeout_s: float = ACK_TIMEOUT_S, size_of: Callable[[dict], int] = payload_size):
+        self.emit = emit
+        self.keyframe_s = keyframe_s
+        self.ack_timeout_s = ack_timeout_s
+        self.size_of = size_of
+        self.clients: Dict[str, ClientChannel] = {}
+        self.seq = 0
+        self.frames = 0
+        self.keyframes = 0
+        self.coalesced = 0
+        self.bytes_total = 0
+        self._sent = deque()  # (time, bytes) within BYTES_WINDOW_S
+        self._lock = threading.Lock()
+
+    def add_client(self, sid: str, encoding: str = ENCODING_JSON):
+        if encoding not in (ENCODING_JSON, ENCODING_BINARY):
+            encoding = ENCODING_JSON
+        with self._lock:
+            self.clients[sid] = ClientChannel(sid, encoding)
+
+    def remove_client(self, sid: str):
+        with self._lock:
+            self.clients.pop(sid, None)
+
+    def tick(self, build_snapshot: Callable[[], dict], build_binary: Optional[Callable[[], bytes]] = None):
+        """
+        build_snapshot() returns the JSON snapshot, build_binary() the packed status body;
+        each is called at most once per tick and only if a client of that encoding needs it.
+        """
+        t = now()
+        with self._lock:
+            clients = list(self.clients.values())
+        built = {}
+        for client in clients:
+            if not self._ready(client, t):
+                continue
+            if client.encoding == ENCODING_BINARY and build_binary is not None:
+                if ENCODING_BINARY not in built:
+                    built[ENCODING_BINARY] = build_binary()
+                self._send_binary(client, built[ENCODING_BINARY], t)
+            else:
+                if ENCODING_JSON not in built:
+                    built[ENCODING_JSON] = build_snapshot()
+                self._send(client, built[ENCODING_JSON], t)
+
+    def _ready(self, client: ClientChannel, t: float) -> bool:
+        if client.awaiting_since:
+            if t - client.awaiting_since < self.ack_timeout_s:
+                client.coalesced += 1
+                self.coalesced += 1
+                return False
+            # ack lost or client stuck: its state is unknown, start over with a keyframe
+            client.baseline = None
+        return True
+
+    def _keyframe_due(self, client: ClientChannel, t: float) -> bool:
+        return client.baseline is None or t - client.last_keyframe >= self.keyframe_s
+
+    def _send(self, client: ClientChannel, snapshot: dict, t: float):
+        keyframe = self._keyframe_due(client, t)
+        if keyframe:
+            data = snapshot
+        else:
+            data = snapshot_delta(client.baseline, snapshot)
+            if not data:
+                return
+        self.seq += 1
+        self._emit(client, {'seq': self.seq, 'key': keyframe, 'data': data}, snapshot, keyframe, t)
+
+    def _send_binary(self, client: ClientChannel, body: bytes, t: float):
+        keyframe = self._keyframe_due(client, t)
+        if not keyframe and body == client.baseline:
+            return
+        self.seq += 1
+        self._emit(client, encode_status_header(self.seq) + body, body, keyframe, t)
+
+    def _emit(self, client: ClientChannel, frame, baseline, keyframe: bool, t: float):
+        client.baseline = baseline
+        client.awaiting_since = t
+        client.awaiting_seq = self.seq
+        if keyframe:
+            client.last_keyframe = t
+            self.keyframes += 1
+        client.frames += 1
+        self.frames += 1
+        size = self.size_of(frame)
+        self.bytes_total += size
+        self._sent.append((t, size))
+        seq = self.seq
+        self.emit(client.sid, frame, lambda *_: self._acked(client, seq))
+
+    def _acked(self, client: ClientChannel, seq: int):
+        # a late ack for a frame that already timed out must not release the newer one
+        if client.awaiting_seq == seq:
+            client.awaiting_since = 0.0
+
+    def bytes_per_s(self) -> float:
+        cutoff = now() - BYTES_WINDOW_S
+        while self._sent and self._sent[0][0] < cutoff:
+            self._sent.popleft()
+        return sum(size for _, size in self._sent) / BYTES_WINDOW_S
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            'clients': len(self.clients),
+            'frames': self.frames,
+            'keyframes': self.keyframes,
+            'coalesced': self.coalesced,
+            'bytes_total': self.bytes_total,
+            'bytes_per_s': round(self.bytes_per_s(), 1),
+        }
@@ -0,0 +1,102 @@
+# telemetry_transform.py
+"""
+Precomputed transforms from the DDS status messages to the dashboard status fields.
+
+- Motor error strings come from MOTOR_ERROR_TABLE, built at import for every combination of
+  the known error bits, so decoding is one mask and one list lookup per motor.
+- StatusTransform compiles a (status key, attribute path) schema into a single
+  operator.attrgetter. The paths are checked once against a default instance of the message
+  type when the transform is built, so a sample needs no hasattr chains or float() casts:
+  the IDL types already fix the field types, and a malformed sample raises, which the
+  subscriber's handler wrapper reports.
+"""
+
+from operator import attrgetter
+from typing import Dict, Iterable, List, Tuple
+
+MOTOR_ERROR_MAP = {
+    0: "Over-current", 1: "Over-voltage", 2: "Under-voltage", 3: "Over-temperature (MOS)",
+    4: "Encoder error", 5: "Reserved", 6: "Reserved", 7: "Communication Lost", 8: "Over-temperature (Motor)"
+}
+
+# Bits outside MOTOR_ERROR_MAP never produced text, so they are masked off before the lookup
+MOTOR_ERROR_MASK = sum(1 << bit for bit in MOTOR_ERROR_MAP)
+
+
+def _error_string(value: int) -> str:
+    errors = [name for bit, name in MOTOR_ERROR_MAP.items() if (value >> bit) & 1]
+    return ", ".join(errors) if errors else "OK"
+
+
+MOTOR_ERROR_TABLE: Tuple[str, ...] = tuple(_error_string(v) for v in range(MOTOR_ERROR_MASK + 1))
+
+
+def decode_motor_errors(reserve0_val: int) -> str:
+    """Decodes motor error bits into a human-readable string."""
+    return MOTOR_ERROR_TABLE[reserve0_val & MOTOR_ERROR_MASK]
+
+
+def motor_error_strings(reserve0_values: Iterable[int]) -> List[str]:
+    table, mask = MOTOR_ERROR_TABLE, MOTOR_ERROR_MASK
+    return [table[v & mask] for v in reserve0_values]
+
+
+class StatusTransform:
+    """Maps one message type onto status dict keys through a schema compiled at construction."""
+
+    def __init__(self, msg_type, fields: Iterable[Tuple[str, str]]):
+        fields = tuple(fields)
+        self.msg_type = msg_type
+        self.keys = tuple(key for key, _ in fields)
+        paths = [path for _, path in fields]
+        getter = attrgetter(*paths)
+        # attrgetter with one path returns the value itself rather than a 1-tuple
+        self._get = getter if len(paths) > 1 else (lambda msg: (getter(msg),))
+        try:
+            self._get(msg_type())
+        except AttributeError as e:
+            raise ValueError(f"{msg_type.__name__}: invalid status schema: {e}") from None
+
+    def values(self, msg) -> tuple:
+        return self._get(msg)
+
+    def __call__(self, msg) -> Dict[str, object]:
+        return dict(zip(self.keys, self._get(msg)))
+
+    def update(self, target: dict, msg):
+        """Writes the fields of msg into target without building an intermediate dict."""
+        target.update(zip(self.keys, self._get(msg)))
+
+
+MOTOR_STATE_FIELDS = (
+    ("battery_percent", "battery_percent"),
+)
+
+JETSON_HEALTH_FIELDS = (
+    ("cpu_usage_percent", "cpu_usage_percent"),
+    ("gpu_usage_percent", "gpu_usage_percent"),
+    ("memory_usage_percent", "memory_usage_percent"),
+    ("temp_cpu", "temperatures.cpu"),
+    ("temp_gpu", "temperatures.gpu"),
+    ("temp_tj", "temperatures.tj"),
+    ("temp_soc0", "temperatures.soc0"),
+    ("temp_soc1", "temperatures.soc1"),
+    ("temp_soc2", "temperatures.soc2"),
+    ("temp_cv0", "temperatures.cv0"),
+    ("temp_cv1", "temperatures.cv1"),
+    ("temp_cv2", "temperatures.cv2"),
+    ("power_cpu_gpu_cv", "power.cpu_gpu_cv"),
+    ("power_soc", "power.soc"),
+    ("power_nv_power_total", "power.nv_power_total"),
+    ("power_vdd_inn", "power.vdd_inn"),
+)
+
+MODE_INFO_FIELDS = (
+    ("robot_mode_form", "robot_mode_form"),
+    ("robot_mode_name", "robot_mode_name"),
+    ("hardware_uptime_seconds", "hardware.uptime_seconds"),
+    ("hardware_jetson_clocks_on", "hardware.jetson_clocks_on"),
+    ("hardware_fan_speed_percent", "hardware.fan_speed_percent"),
+    ("hardware_emc_usage_percent", "hardware.emc_usage_percent"),
+    ("hardware_disk_usage_percent", "hardware.disk_usage_percent"),
+)
@@ -0,0 +1,69 @@
+# main_telemetry_recorder.py
+# 遥测记录进程：订阅 rt/lowstate（500Hz 原始电机状态）或 DogMotorState（50Hz），
+# 写入按日期滚动的内存映射环形文件，供事后查询和回放（见 telemetry_recorder.TelemetryArchive）
+
+import time
+import sys
+import os
+
+DDS_NETWORK_INTERFACE = "enP8p1s0"
+RECORD_DIR = os.path.expanduser("~/dog_telemetry")
+# "lowstate": 直接记录 rt/lowstate；"motor_state": 记录 main_dog_status 降采样后的 DogMotorState
+RECORD_SOURCE = "lowstate"
+REPORT_PERIOD_S = 10.0
+# --- FIX FOR CROSS-DIRECTORY IMPORT ---
+current_script_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_script_dir)
+communication_dir_path = os.path.join(parent_dir, 'communication')
+sys.path.append(communication_dir_path)
+# --- END OF FIX ---
+
+from dds_data_structure import DogMotorState, DOG_MOTOR_STATE_TOPIC
+from telemetry_recorder import (TelemetryRecorder, RECORD_RATE_HZ, RING_SECONDS, KEEP_DAYS, FLUSH_PERIOD_S,
+                                RECORD_DTYPE, ring_file_size)
+from unitree_sdk2py.idl.unitree_go.msg.dds_ import LowState_
+from unitree_sdk2py.core.channel import ChannelSubscriber, ChannelFactoryInitialize
+
+def main():
+    capacity = int(RECORD_RATE_HZ * RING_SECONDS)
+    recorder = TelemetryRecorder(RECORD_DIR, prefix=RECORD_SOURCE, capacity=capacity, keep_days=KEEP_DAYS)
+    sub = None
+    try:
+        print(f"Initializing DDS on network interface: {DDS_NETWORK_INTERFACE}")
+        ChannelFactoryInitialize(networkInterface=DDS_NETWORK_INTERFACE)
+        if RECORD_SOURCE == "lowstate":
+            sub = ChannelSubscriber("rt/lowstate", LowState_)
+            sub.Init(recorder.append_lowstate, 10)
+        else:
+            sub = ChannelSubscriber(DOG_MOTOR_STATE_TOPIC, DogMotorState)
+            sub.Init(recorder.append_motor_state, 10)
+
+        file_mb = ring_file_size(capacity) / 1e6
+        print(f"Recording {RECORD_SOURCE} to {RECORD_DIR}: {RECORD_DTYPE.itemsize} bytes/record, "
+              f"{RING_SECONDS / 3600:.1f} h per daily file ({file_mb:.0f} MB), keeping {KEEP_DAYS} days "
+              f"(<= {file_mb * KEEP_DAYS:.0f} MB).")
+        print("Press Ctrl+C to stop.")
+
+        last_appended = 0
+        next_report = time.monotonic() + REPORT_PERIOD_S
+        while True:
+            # 回调线程只写内存映射；落盘 (msync) 在这里做，不阻塞 500Hz 的回调
+            time.sleep(FLUSH_PERIOD_S)
+            recorder.flush()
+            if time.monotonic() >= next_report:
+                next_report += REPORT_PERIOD_S
+                rate = (recorder.appended - last_appended) / REPORT_PERIOD_S
+                last_appended = recorder.appended
+                ring = recorder.ring
+                print(f"Recorded {recorder.appended} records ({rate:.0f} Hz)"
+                      + (f", {os.path.basename(ring.path)} seq {ring.count}" if ring else ""))
+
+    except KeyboardInterrupt:
+        print("\nRecording stopped by user.")
+    finally:
+        if sub: sub.Close()
+        recorder.close()
+        print("Shutdown complete.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+MotionSwitcher 运动模式的缓存
+MotionSwitcherClient.CheckMode() 是同步RPC（超时5s），不应该出现在发布循环或每次状态切换中。
+ModeWatcher 在后台线程中低频轮询 CheckMode，缓存结果和查询时间：
+- snapshot：最近一次结果，不发起RPC
+- current(max_age_s)：缓存足够新时直接返回，否则同步查询一次
+- refresh()：同步查询；多个线程同时请求时只发一次RPC，后到的直接使用这次结果
+- record(name)：自己调用 SelectMode/ReleaseMode 成功后写入缓存，之后的查询不必再确认
+缓存只用于显示和日志；身体控制器切换运动模式前都用 refresh() 重新查询，进入底层控制前必须 ReleaseMode 并确认。
+模式变化时调用 add_listener 注册的回调（在发生变化的线程中执行，不能阻塞）。
+"""
+
+import threading
+import time
+from typing import Callable, List, NamedTuple, Optional
+
+MODE_POLL_PERIOD_S = 1.0
+
+now_ns = time.monotonic_ns
+
+
+class ModeSnapshot(NamedTuple):
+    ok: bool
+    form: str
+    name: str
+    queried_ns: int  # 产生该结果的查询发起时间（monotonic），0 表示尚未查询
+
+    def age_s(self) -> float:
+        return (now_ns() - self.queried_ns) / 1e9 if self.queried_ns else float('inf')
+
+    def key(self):
+        return self.ok, self.form, self.name
+
+
+UNKNOWN_MODE = ModeSnapshot(False, 'N/A', 'N/A', 0)
+
+
+class ModeWatcher:
+    def __init__(self, msc, period_s: float = MODE_POLL_PERIOD_S, name: str = "mode-watcher"):
+        self.msc = msc
+        self.period_s = period_s
+        self.rpc_count = 0
+        self._snapshot = UNKNOWN_MODE
+        self._generation = 0  # record() 时递增，查询期间被 record 覆盖的结果丢弃
+        self._lock = threading.Lock()
+        self._rpc_lock = threading.Lock()
+        self._listeners: List[Callable[[ModeSnapshot], None]] = []
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._name = name
+
+    def start(self) -> 'ModeWatcher':
+        """启动后台轮询；不启动时只在 current()/refresh() 需要时查询"""
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name=self._name, daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def add_listener(self, callback: Callable[[ModeSnapshot], None]):
+        self._listeners.append(callback)
+
+    @property
+    def snapshot(self) -> ModeSnapshot:
+        return self._snapshot
+
+    def current(self, max_age_s: float = MODE_POLL_PERIOD_S) -> ModeSnapshot:
+        snap = self._snapshot
+        if snap.ok and snap.age_s() <= max_age_s:
+            return snap
+        return self.refresh()
+
+    def refresh(self) -> ModeSnapshot:
+        requested_ns = now_ns()
+        with self._rpc_lock:
+            snap = self._snapshot
+            if snap.queried_ns >= requested_ns:
+                # 等锁期间其他线程发起了更新的查询
+                return snap
+            generation = self._generation
+            queried_ns = now_ns()
+            try:
+                status, result = self.msc.CheckMode()
+                if status == 0 and result is not None:
+                    snap = ModeSnapshot(True, result.get('form', 'N/A'), result.get('name', 'N/A'), queried_ns)
+                else:
+                    snap = ModeSnapshot(False, snap.form, "Error", queried_ns)
+            except Exception as e:
+                print(f"[ModeWatcher] CheckMode error: {e}")
+                snap = ModeSnapshot(False, snap.form, "Error", queried_ns)
+            self.rpc_count += 1
+            return self._update(snap, generation)
+
+    def record(self, name: str, form: Optional[str] = None) -> ModeSnapshot:
+        """记录自己切换后的模式"""
+        with self._lock:
+            self._generation += 1
+            generation = self._generation
+        prev = self._snapshot
+        return self._update(ModeSnapshot(True, prev.form if form is None else form, name, now_ns()), generation)
+
+    def _update(self, snap: ModeSnapshot, generation: int) -> ModeSnapshot:
+        with self._lock:
+            if generation != self._generation:
+                return self._snapshot
+            prev, self._snapshot = self._snapshot, snap
+        if prev.key() != snap.key():
+            for callback in self._listeners:
+                try:
+                    callback(snap)
+                except Exception as e:
+                    print(f"[ModeWatcher] listener error: {e}")
+        return snap
+
+    def _run(self):
+        while not self._stop.is_set():
+            if self._snapshot.age_s() >= self.period_s:
+                self.refresh()
+            # 其他线程刚查询或 record 过时顺延，不重复查询
+            self._stop.wait(max(self.period_s - self._snapshot.age_s(), 0.01))
@@ -6,53 +6,28 @@ import threading
 from unitree_sdk2py.core.channel import ChannelPublisher, ChannelFactoryInitialize
 from unitree_sdk2py.idl.unitree_go.msg.dds_ import LowCmd_, LowState_
 from unitree_sdk2py.idl.default import unitree_go_msg_dds__LowCmd_
-from unitree_sdk2py.utils.crc import CRC
+from lowcmd_crc import LowCmdCrc
 from unitree_sdk2py.comm.motion_switcher.motion_switcher_client import MotionSwitcherClient
 from unitree_sdk2py.go2.sport.sport_client import SportClient
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../unitree_example/go2/low_level")))
 import unitree_legged_const as go2
-
-def interpolate_pose(start, end, percent):
-    return [(1 - percent) * s + percent * e for s, e in zip(start, end)]
+from motion_engine import MotionEngine, cycles_to_ms
 
 def interpolate_selected_joints(start_pos, target, joint_indices, duration_ms, low_cmd, publisher, crc):
-    for step in range(duration_ms):
-        alpha = min(1.0, step / duration_ms)
-        q_interp = interpolate_pose(start_pos, target, alpha)
-        for i in range(12):
-            low_cmd.motor_cmd[i].mode = 0x01
-            low_cmd.motor_cmd[i].dq = 0
-            low_cmd.motor_cmd[i].tau = 0
-            if i in joint_indices:
-                low_cmd.motor_cmd[i].q = q_interp[i]
-            else:
-                low_cmd.motor_cmd[i].q = start_pos[i]
-            low_cmd.motor_cmd[i].kp = 100.0
-            low_cmd.motor_cmd[i].kd = 8.0
-        low_cmd.crc = crc.Crc(low_cmd)
-        publisher.Write(low_cmd)
-        time.sleep(0.002)
+    # 只有选中的关节插值，其余关节保持起始角度；duration_ms 为2ms周期数
+    MotionEngine(publisher, low_cmd, crc).move_to(start_pos, target, cycles_to_ms(duration_ms),
+                                                  joint_indices=joint_indices, name="interpolate_selected_joints")
 
 def maintain_posture(target_pose, low_cmd, publisher, crc, stop_flag):
-    while not stop_flag["stop"]:
-        for j in range(12):
-            low_cmd.motor_cmd[j].mode = 0x01
-            low_cmd.motor_cmd[j].q = target_pose[j]
-            low_cmd.motor_cmd[j].dq = 0
-            low_cmd.motor_cmd[j].kp = 100.0
-            low_cmd.motor_cmd[j].kd = 8.0
-            low_cmd.motor_cmd[j].tau = 0
-        low_cmd.crc = crc.Crc(low_cmd)
-        publisher.Write(low_cmd)
-        time.sleep(0.002)
+    MotionEngine(publisher, low_cmd, crc).hold(target_pose, stop=lambda: stop_flag["stop"], name="maintain_posture")
 
 if __name__ == '__main__':
     print("[Main] 初始化 ChannelFactory...")
     ChannelFactoryInitialize(0, "enP8p1s0")
 
     low_cmd = unitree_go_msg_dds__LowCmd_()
-    crc = CRC()
+    crc = LowCmdCrc()
     msc = MotionSwitcherClient()
     msc.Init()
     msc.SetTimeout(5.0)
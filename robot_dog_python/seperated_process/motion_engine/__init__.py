@@ -0,0 +1,17 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+底层运动引擎
+motion.py / direction.py / raise_leg_controller.py / control/* / main_*_body_control.py
+中的插值、保持姿态和刚度配置都通过这里实现，性能修改只需要在这里做一次。
+"""
+
+from .engine import MotionEngine, as_stop_event, cycles_to_ms
+from .gains import (DAMP_KD, DEFAULT_GAINS, DEFAULT_KD, DEFAULT_KP, NUM_JOINTS, RAISE_LEG_STIFF_JOINTS,
+                    STIFF_KD, STIFF_KP, GainProfile, stiff_gains)
+
+__all__ = [
+    'MotionEngine', 'as_stop_event', 'cycles_to_ms',
+    'GainProfile', 'stiff_gains', 'DEFAULT_GAINS', 'RAISE_LEG_STIFF_JOINTS', 'NUM_JOINTS',
+    'DEFAULT_KP', 'DEFAULT_KD', 'STIFF_KP', 'STIFF_KD', 'DAMP_KD',
+]
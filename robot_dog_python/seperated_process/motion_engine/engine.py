@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+底层运动引擎
+所有底层控制入口共用的 rt/lowcmd 写入路径：
+- 周期循环：rt_loop.RealtimeLoop（绝对截止时间、抖动统计）
+- 轨迹：trajectory.build_trajectory / build_sequence 预计算，每周期取一行
+- 命令：lowcmd_builder.LowCmdBuilder 只写变化的字段，命令不变时复用CRC
+停止条件可以是 threading.Event，也可以是返回 bool 的函数。
+"""
+
+import threading
+from typing import Callable, Dict, Iterable, Optional, Sequence, Union
+
+import numpy as np
+
+from lowcmd_builder import LowCmdBuilder
+from lowcmd_crc import LowCmdCrc
+from rt_loop import LoopStats, RealtimeLoop
+from trajectory import DEFAULT_PERIOD_S, DEFAULT_PROFILE, build_sequence, build_trajectory
+
+from .gains import DAMP_KD, DEFAULT_GAINS, GainProfile
+
+StopCondition = Union[threading.Event, Callable[[], bool], None]
+
+
+class _StopWhen:
+    """把返回 bool 的函数包装成 RealtimeLoop 可用的 stop_event"""
+
+    def __init__(self, fn: Callable[[], bool]):
+        self.fn = fn
+
+    def is_set(self) -> bool:
+        return bool(self.fn())
+
+
+def cycles_to_ms(cycles: int, period_s: float = DEFAULT_PERIOD_S) -> float:
+    """旧脚本的 duration_ms 参数实际是周期数（循环 duration_ms 次、每次 sleep 2ms），换算成毫秒以保持原有动作时长"""
+    return cycles * period_s * 1000.0
+
+
+def as_stop_event(stop: StopCondition):
+    if stop is None or hasattr(stop, 'is_set'):
+        return stop
+    return _StopWhen(stop)
+
+
+class MotionEngine:
+    """向 rt/lowcmd 发布者周期写入姿态命令"""
+
+    def __init__(self, publisher, low_cmd, crc=None, period_s: float = DEFAULT_PERIOD_S,
+                 profile: str = DEFAULT_PROFILE, rt_priority: Optional[int] = None,
+                 cpus: Optional[Iterable[int]] = None):
+        self.publisher = publisher
+        self.builder = LowCmdBuilder(low_cmd, crc if crc is not None else LowCmdCrc())
+        self.period_s = period_s
+        self.profile = profile
+        self.rt_priority = rt_priority
+        self.cpus = cpus
+        self.loop_stats: Dict[str, Dict[str, object]] = {}  # 各循环最近一次的周期/抖动统计
+        self.verbose = True
+
+    # --- 单条命令 ---
+
+    def send_pose(self, pose, gains: GainProfile = DEFAULT_GAINS):
+        self.publisher.Write(self.builder.pose_cmd(pose, gains.kp, gains.kd))
+
+    def send_damp(self, kd: float = DAMP_KD):
+        self.publisher.Write(self.builder.damp_cmd(kd))
+
+    # --- 周期循环 ---
+
+    def run(self, tick: Callable[[int], Optional[bool]], name: str, max_ticks: Optional[int] = None,
+            period_s: Optional[float] = None, stop: StopCondition = None) -> LoopStats:
+        """按固定周期调用 tick(i)，直到 stop、max_ticks 或 tick 返回 False"""
+        # low_cmd 可能被其他引擎/代码改写过，每个循环开始时完整写一次
+        self.builder.invalidate()
+        loop = RealtimeLoop(period_s or self.period_s, name=name, rt_priority=self.rt_priority, cpus=self.cpus)
+        stats = loop.run(tick, as_stop_event(stop), max_ticks)
+        self.loop_stats[name] = stats.summary()
+        if self.verbose:
+            print(loop.report())
+        return stats
+
+    def hold(self, pose, gains: GainProfile = DEFAULT_GAINS, stop: StopCondition = None, name: str = "hold",
+             period_s: Optional[float] = None, max_ticks: Optional[int] = None) -> LoopStats:
+        """保持姿态；pose 是可变列表时每周期读取最新内容（可由其他线程修改）"""
+        return self.run(lambda i: self.send_pose(pose, gains), name, max_ticks, period_s, stop)
+
+    def hold_damp(self, stop: StopCondition = None, name: str = "hold_damp",
+                  period_s: Optional[float] = None, kd: float = DAMP_KD) -> LoopStats:
+        return self.run(lambda i: self.send_damp(kd), name, period_s=period_s, stop=stop)
+
+    # --- 轨迹 ---
+
+    def play(self, traj: np.ndarray, gains: GainProfile = DEFAULT_GAINS, name: str = "trajectory",
+             stop: StopCondition = None, on_progress: Optional[Callable[[float], None]] = None) -> bool:
+        """逐周期发送轨迹的每一行（最后一行为终点），被 stop 打断时返回 False"""
+        stop_event = as_stop_event(stop)
+        rows = len(traj)
+
+        def tick(step):
+            self.send_pose(traj[step], gains)
+            if on_progress is not None:
+                on_progress((step + 1) / rows)
+
+        stats = self.run(tick, name, max_ticks=rows, stop=stop_event)
+        return stats.ticks == rows
+
+    def move_to(self, start: Sequence[float], target: Sequence[float], duration_ms: float,
+                gains: GainProfile = DEFAULT_GAINS, joint_indices: Optional[Sequence[int]] = None,
+                profile: Optional[str] = None, stop: StopCondition = None, name: str = "move_to",
+                on_progress: Optional[Callable[[float], None]] = None) -> bool:
+        """从 start 过渡到 target；joint_indices 不为空时只移动这些关节，其余保持 start"""
+        traj = build_trajectory(start, target, duration_ms, profile or self.profile, self.period_s, joint_indices)
+        return self.play(traj, gains, name, stop, on_progress)
+
+    def move_through(self, waypoints: Sequence[Sequence[float]], durations_ms: Sequence[float],
+                     gains: GainProfile = DEFAULT_GAINS, profile: Optional[str] = None,
+                     stop: StopCondition = None, name: str = "move_through",
+                     on_progress: Optional[Callable[[float], None]] = None) -> bool:
+        """依次经过各路径点，整段预先生成为一条轨迹"""
+        traj = build_sequence(waypoints, durations_ms, profile or self.profile, self.period_s)
+        return self.play(traj, gains, name, stop, on_progress)
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+关节刚度配置（kp/kd）
+每个配置是12个关节各自的 kp/kd，可以是统一值，也可以对指定关节加硬。
+"""
+
+from typing import Iterable, NamedTuple, Optional
+
+import numpy as np
+
+NUM_JOINTS = 12
+
+DEFAULT_KP = 100.0
+DEFAULT_KD = 8.0
+STIFF_KP = 160.0
+STIFF_KD = 10.0
+DAMP_KD = 2.0
+
+# 抬右前腿（关节1/2）时加硬的三条支撑腿加上抬起的腿本身，左前腿抬起时做镜像
+RAISE_LEG_STIFF_JOINTS = (0, 1, 2, 3, 4, 5, 9, 10, 11)
+
+
+class GainProfile(NamedTuple):
+    kp: np.ndarray
+    kd: np.ndarray
+
+    @classmethod
+    def uniform(cls, kp: float = DEFAULT_KP, kd: float = DEFAULT_KD) -> 'GainProfile':
+        return cls(np.full(NUM_JOINTS, kp), np.full(NUM_JOINTS, kd))
+
+    @classmethod
+    def from_lists(cls, kp, kd) -> 'GainProfile':
+        """兼容旧接口：kp/kd 为 None 时使用默认值，标量广播到12个关节"""
+        return cls(np.broadcast_to(np.asarray(DEFAULT_KP if kp is None else kp, dtype=float), NUM_JOINTS).copy(),
+                   np.broadcast_to(np.asarray(DEFAULT_KD if kd is None else kd, dtype=float), NUM_JOINTS).copy())
+
+    def stiffened(self, joints: Iterable[int], kp: float = STIFF_KP, kd: float = STIFF_KD) -> 'GainProfile':
+        """返回指定关节加硬后的新配置"""
+        joints = list(joints)
+        new_kp, new_kd = self.kp.copy(), self.kd.copy()
+        new_kp[joints] = kp
+        new_kd[joints] = kd
+        return GainProfile(new_kp, new_kd)
+
+
+DEFAULT_GAINS = GainProfile.uniform()
+
+
+def stiff_gains(joints: Iterable[int], base: Optional[GainProfile] = None) -> GainProfile:
+    return (base or DEFAULT_GAINS).stiffened(joints)
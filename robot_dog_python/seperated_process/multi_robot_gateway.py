@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+多机器狗控制网关
+端口：本地8990（与单机控制网关相同的数据包格式，data 中增加 robot_id 字段）
+- 每只机器狗一个工作进程，使用各自的DDS域/网卡（ChannelFactoryInitialize 每个进程只能初始化一次）
+- 每只机器狗独立的命令队列和限速器，一只狗的命令洪泛不会影响其他狗
+- FRONTEND_PROCESSES > 1 时多个前端进程通过 SO_REUSEPORT 共享同一UDP端口，
+  内核按客户端地址分发数据包；前端解析后按 robot_id 投递到对应工作进程的队列
+- 限速在前端确认之前进行，被限速的命令回复错误；确认(ack)表示命令已通过限速并进入该机器狗的队列，
+  之后工作进程写DDS失败不会再通知客户端，只计入 get_stats()['robots'][robot_id]['errors']
+- 限速器属于前端进程：FRONTEND_PROCESSES > 1 时每个前端各自限速，一只狗的总速率上限为 N 倍
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import queue
+import time
+from dataclasses import asdict
+from typing import Any, Dict, Optional
+
+from gateway_bootstrap import GatewayRuntimeConfig, DSCP_CONTROL, run_gateway
+from main_control_gateway import ControlGateway, ControlCommand, DDSBridge
+
+logger = logging.getLogger(__name__)
+
+# 机器狗配置：robot_id -> DDS域和网卡
+# 'template': True 的条目只是示例，不启动工作进程（该 robot_id 的命令按未知机器狗处理）。
+# 机器狗端的进程（main_dog_body_control.py 等）都在DDS域0初始化：身体控制器的 SDK 客户端与 Go2 内部服务
+# 共用一次 ChannelFactoryInitialize，只能在域0。第二只狗需要在机器狗端把命令主题转发到其他域、
+# 或使用单独的网络/网卡后才能启用，否则写入域1的命令没有进程接收。
+ROBOT_CONFIGS: Dict[str, Dict[str, Any]] = {
+    'dog1': {'domain_id': 0, 'interface': 'enP8p1s0'},
+    'dog2': {'domain_id': 1, 'interface': 'enP8p1s0', 'template': True},
+}
+DEFAULT_ROBOT_ID = 'dog1'  # 数据包未携带 robot_id 时使用（兼容单机客户端）
+FRONTEND_PROCESSES = 1
+
+ROBOT_QUEUE_SIZE = 64
+# 流式命令限速（令牌桶），状态切换不限速
+STREAMING_COMMAND_TYPES = ('xyr_control', 'object_control')
+ROBOT_COMMAND_RATE_HZ = 60.0
+ROBOT_COMMAND_BURST = 10
+# 工作进程写入共享数组的计数，前端 get_stats() 读取
+WORKER_STATS = ('commands_sent', 'errors')
+
+
+def active_robot_configs() -> Dict[str, Dict[str, Any]]:
+    """去掉模板条目后实际启动的机器狗配置"""
+    return {robot_id: config for robot_id, config in ROBOT_CONFIGS.items() if not config.get('template')}
+
+
+class RateLimiter:
+    """令牌桶限速器"""
+
+    def __init__(self, rate_hz: float, burst: int):
+        self.rate_hz = rate_hz
+        self.burst = burst
+        self.tokens = float(burst)
+        self.last_refill = time.monotonic()
+
+    def allow(self) -> bool:
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.last_refill) * self.rate_hz)
+        self.last_refill = now
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return True
+        return False
+
+
+def robot_worker_main(robot_id: str, robot_config: Dict[str, Any], command_queue, shared_stats=None):
+    """机器狗工作进程：从自己的队列取命令写入该机器狗的DDS域（限速已在前端完成）"""
+    bridge = DDSBridge(domain_id=robot_config['domain_id'], network_interface=robot_config['interface'])
+    loop = asyncio.new_event_loop()
+    # shared_stats: 按 WORKER_STATS 顺序的共享计数数组，单独运行时使用本地列表
+    counters = shared_stats if shared_stats is not None else [0] * len(WORKER_STATS)
+    sent_index, error_index = WORKER_STATS.index('commands_sent'), WORKER_STATS.index('errors')
+    last_stats_time = time.monotonic()
+    logger.info(f"[{robot_id}] 工作进程启动: DDS域 {robot_config['domain_id']}")
+
+    try:
+        while True:
+            try:
+                item = command_queue.get(timeout=1.0)
+            except queue.Empty:
+                item = {}
+            if item is None:
+                break
+
+            if item:
+                command = ControlCommand(**item)
+                if loop.run_until_complete(bridge.send_command(command)):
+                    counters[sent_index] += 1
+                else:
+                    counters[error_index] += 1
+
+            if time.monotonic() - last_stats_time >= 30:
+                logger.info(f"[{robot_id}] 统计信息: {dict(zip(WORKER_STATS, counters))}")
+                last_stats_time = time.monotonic()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        bridge.cleanup()
+        loop.close()
+        logger.info(f"[{robot_id}] 工作进程已停止")
+
+
+class MultiRobotControlGateway(ControlGateway):
+    """按 robot_id 把命令投递给各机器狗工作进程的网关前端"""
+
+    def __init__(self, robot_queues: Dict[str, Any], port: int = 8990,
+                 runtime_config: Optional[GatewayRuntimeConfig] = None,
+                 robot_stats: Optional[Dict[str, Any]] = None):
+        self.robot_queues = robot_queues
+        self.robot_stats = robot_stats or {}
+        self.robot_limiters = {robot_id: RateLimiter(ROBOT_COMMAND_RATE_HZ, ROBOT_COMMAND_BURST)
+                               for robot_id in robot_queues}
+        super().__init__(port=port, runtime_config=runtime_config)
+        self.stats['unknown_robot'] = 0
+        self.stats['robot_queue_full'] = 0
+        self.stats['rate_limited'] = 0
+
+    def _create_dds_bridge(self, dds_channels) -> Optional[DDSBridge]:
+        # 前端不直接写DDS，由各工作进程负责
+        return None
+
+    async def _dispatch_command(self, command: ControlCommand, data: Dict) -> bool:
+        robot_id = data.get('robot_id', DEFAULT_ROBOT_ID)
+        robot_queue = self.robot_queues.get(robot_id)
+        if robot_queue is None:
+            self.stats['unknown_robot'] += 1
+            logger.warning(f"未知机器狗: {robot_id}")
+            return False
+
+        # 在确认之前限速：被限速的命令回复错误，而不是确认后在工作进程中丢弃
+        if command.command_type in STREAMING_COMMAND_TYPES and not self.robot_limiters[robot_id].allow():
+            self.stats['rate_limited'] += 1
+            return False
+
+        # 工作进程在另一个DDS域，网关侧收不到回报，跨进程追踪暂不支持
+        self.trace_collector.finish(command.trace_id)
+        command.trace_id = 0
+        try:
+            robot_queue.put_nowait(asdict(command))
+        except queue.Full:
+            self.stats['robot_queue_full'] += 1
+            logger.warning(f"机器狗 {robot_id} 命令队列已满，丢弃命令")
+            return False
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        """网关统计信息，另加各工作进程的DDS写入计数（确认之后的失败只反映在这里）"""
+        stats = super().get_stats()
+        stats['robots'] = {robot_id: dict(zip(WORKER_STATS, counters))
+                           for robot_id, counters in self.robot_stats.items()}
+        return stats
+
+
+async def frontend_main(robot_queues: Dict[str, Any], runtime_config: GatewayRuntimeConfig,
+                        robot_stats: Optional[Dict[str, Any]] = None):
+    gateway = MultiRobotControlGateway(robot_queues, runtime_config=runtime_config, robot_stats=robot_stats)
+    try:
+        await gateway.start()
+    except Exception as e:
+        logger.critical(f"网关运行失败: {e}")
+    finally:
+        await gateway.stop()
+
+
+def run_frontend(robot_queues: Dict[str, Any], runtime_config: GatewayRuntimeConfig,
+                 robot_stats: Optional[Dict[str, Any]] = None):
+    try:
+        run_gateway(lambda: frontend_main(robot_queues, runtime_config, robot_stats), runtime_config)
+    except KeyboardInterrupt:
+        pass
+
+
+def main():
+    ctx = multiprocessing.get_context('fork')
+    robot_configs = active_robot_configs()
+    robot_queues = {robot_id: ctx.Queue(maxsize=ROBOT_QUEUE_SIZE) for robot_id in robot_configs}
+    robot_stats = {robot_id: ctx.Array('q', len(WORKER_STATS)) for robot_id in robot_configs}
+
+    workers = [
+        ctx.Process(target=robot_worker_main,
+                    args=(robot_id, config, robot_queues[robot_id], robot_stats[robot_id]),
+                    name=f"robot-{robot_id}", daemon=True)
+        for robot_id, config in robot_configs.items()
+    ]
+    for worker in workers:
+        worker.start()
+
+    runtime_config = GatewayRuntimeConfig.from_env(DSCP_CONTROL)
+    runtime_config.reuse_port = FRONTEND_PROCESSES > 1
+    frontends = [
+        ctx.Process(target=run_frontend, args=(robot_queues, runtime_config, robot_stats),
+                    name=f"frontend-{i}", daemon=True)
+        for i in range(1, FRONTEND_PROCESSES)
+    ]
+    for frontend in frontends:
+        frontend.start()
+
+    logger.info(f"多机器狗网关启动: {len(workers)} 个工作进程, {FRONTEND_PROCESSES} 个前端进程")
+    try:
+        run_frontend(robot_queues, runtime_config, robot_stats)
+    finally:
+        for frontend in frontends:
+            frontend.terminate()
+        for robot_queue in robot_queues.values():
+            robot_queue.put(None)
+        for worker in workers:
+            worker.join(timeout=2.0)
+        logger.info("多机器狗网关已停止")
+
+
+if __name__ == "__main__":
+    main()
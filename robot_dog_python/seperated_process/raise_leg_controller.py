@@ -6,60 +6,27 @@ import select
 from unitree_sdk2py.core.channel import ChannelPublisher, ChannelSubscriber, ChannelFactoryInitialize
 from unitree_sdk2py.idl.unitree_go.msg.dds_ import LowCmd_, LowState_
 from unitree_sdk2py.idl.default import unitree_go_msg_dds__LowCmd_, unitree_go_msg_dds__LowState_
-from unitree_sdk2py.utils.crc import CRC
+from lowcmd_crc import LowCmdCrc
 from unitree_sdk2py.comm.motion_switcher.motion_switcher_client import MotionSwitcherClient
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../unitree_example/go2/low_level")))
 import unitree_legged_const as go2
+from motion_engine import MotionEngine, cycles_to_ms
 
-def interpolate_pose(start, end, percent):
-    return [(1 - percent) * s + percent * e for s, e in zip(start, end)]
+DOWN_POSE = [0.0, 0.67, -1.3] * 4
 
 def interpolate_to_target(start_pos, target, duration_ms, low_cmd, publisher, crc):
-    for step in range(duration_ms):
-        alpha = min(1.0, step / duration_ms)
-        q_interp = interpolate_pose(start_pos, target, alpha)
-        for i in range(20):
-            if i < 12:
-                low_cmd.motor_cmd[i].q = q_interp[i]
-                low_cmd.motor_cmd[i].dq = 0
-                low_cmd.motor_cmd[i].kp = 100.0
-                low_cmd.motor_cmd[i].kd = 8.0
-                low_cmd.motor_cmd[i].tau = 0
-            else:
-                low_cmd.motor_cmd[i].q = go2.PosStopF
-                low_cmd.motor_cmd[i].dq = go2.VelStopF
-                low_cmd.motor_cmd[i].kp = 0
-                low_cmd.motor_cmd[i].kd = 0
-                low_cmd.motor_cmd[i].tau = 0
-        low_cmd.crc = crc.Crc(low_cmd)
-        publisher.Write(low_cmd)
-        time.sleep(0.002)
+    # duration_ms 为2ms周期数；12号以后的电机保持初始化时的停止命令
+    MotionEngine(publisher, low_cmd, crc).move_to(start_pos, target, cycles_to_ms(duration_ms),
+                                                  name="interpolate_to_target")
     return target
 
-def down_command(low_cmd):
-    target = [0.0, 0.67, -1.3] * 4
-    for i in range(20):
-        if i < 12:
-            low_cmd.motor_cmd[i].mode = 0x01
-            low_cmd.motor_cmd[i].q = target[i]
-            low_cmd.motor_cmd[i].dq = 0
-            low_cmd.motor_cmd[i].kp = 100
-            low_cmd.motor_cmd[i].kd = 8
-            low_cmd.motor_cmd[i].tau = 0
-        else:
-            low_cmd.motor_cmd[i].q = go2.PosStopF
-            low_cmd.motor_cmd[i].dq = go2.VelStopF
-            low_cmd.motor_cmd[i].kp = 0
-            low_cmd.motor_cmd[i].kd = 0
-            low_cmd.motor_cmd[i].tau = 0
-
 if __name__ == '__main__':
     print("[Main] 初始化 ChannelFactory...")
     ChannelFactoryInitialize(0, "enP8p1s0")
 
     low_cmd = unitree_go_msg_dds__LowCmd_()
-    crc = CRC()
+    crc = LowCmdCrc()
 
     msc = MotionSwitcherClient()
     msc.SetTimeout(5.0)
@@ -100,21 +67,9 @@ if __name__ == '__main__':
         time.sleep(0.01)
     ai_pos = shared["state"][:]
 
+    engine = MotionEngine(publisher, low_cmd, crc)
     print("[Main] 切换前先发送当前姿态以维持站立")
-    for _ in range(100):
-        for i in range(12):
-
-            low_cmd.motor_cmd[i].mode = 0x01
-            low_cmd.motor_cmd[i].q = ai_pos[i]
-            low_cmd.motor_cmd[i].dq = 0
-            low_cmd.motor_cmd[i].kp = 100.0
-            low_cmd.motor_cmd[i].kd = 8.0
-            low_cmd.motor_cmd[i].tau = 0
-
-        low_cmd.crc = crc.Crc(low_cmd)
-        publisher.Write(low_cmd)
-        
-        time.sleep(0.005)
+    engine.hold(ai_pos, period_s=0.005, max_ticks=100, name="pre_switch_hold")
 
     input("[Main] 准备切换到低层控制 + 执行站立动作，按回车继续...")
 
@@ -139,37 +94,18 @@ if __name__ == '__main__':
     start_pos = interpolate_to_target(ai_pos, target_1, 1000, low_cmd, publisher, crc)
 
     print("[Action] 站立持续，直到用户按下回车...")
+
+    def enter_pressed():
+        return sys.stdin in select.select([sys.stdin], [], [], 0)[0]
+
     try:
-        while True:
-            for i in range(20):
-                if i < 12:
-                    low_cmd.motor_cmd[i].q = target_1[i]
-                    low_cmd.motor_cmd[i].dq = 0
-                    low_cmd.motor_cmd[i].kp = 100.0
-                    low_cmd.motor_cmd[i].kd = 8.0
-                    low_cmd.motor_cmd[i].tau = 0
-                else:
-                    low_cmd.motor_cmd[i].q = go2.PosStopF
-                    low_cmd.motor_cmd[i].dq = go2.VelStopF
-                    low_cmd.motor_cmd[i].kp = 0
-                    low_cmd.motor_cmd[i].kd = 0
-                    low_cmd.motor_cmd[i].tau = 0
-            low_cmd.crc = crc.Crc(low_cmd)
-            publisher.Write(low_cmd)
-            time.sleep(0.01)
-
-            if sys.stdin in select.select([sys.stdin], [], [], 0)[0]:
-                input("\n[User] 检测到回车键按下，站立持续结束\n")
-                break
+        engine.hold(target_1, stop=enter_pressed, period_s=0.01, name="stand_hold")
+        input("\n[User] 检测到回车键按下，站立持续结束\n")
     except KeyboardInterrupt:
         pass
 
     input("[Main] 准备执行躺下，按回车继续...")
 
     print("[Action] 进行躺下")
-    down_command(low_cmd)
-    for _ in range(200):
-        low_cmd.crc = crc.Crc(low_cmd)
-        publisher.Write(low_cmd)
-        time.sleep(0.01)
+    engine.hold(DOWN_POSE, period_s=0.01, max_ticks=200, name="down_hold")
     print("[Action] 躺下完成")
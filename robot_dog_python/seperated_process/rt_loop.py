@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+实时周期循环执行器
+使用 monotonic_ns 绝对截止时间（不累积 sleep 误差），先 sleep 再自旋到截止时间，
+统计周期抖动和错过的截止时间。可选 SCHED_FIFO 优先级和CPU绑定（需要root或CAP_SYS_NICE）。
+"""
+
+import os
+import time
+import threading
+from typing import Callable, Dict, Iterable, Optional
+
+from latency_trace import LatencyHistogram
+
+now_ns = time.monotonic_ns
+
+
+def set_realtime(priority: Optional[int] = None, cpus: Optional[Iterable[int]] = None) -> bool:
+    """为当前线程设置 SCHED_FIFO 优先级和CPU亲和性，失败时打印警告并返回False"""
+    ok = True
+    if priority is not None:
+        try:
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(priority))
+        except (AttributeError, OSError) as e:
+            print(f"[RealtimeLoop] Warning: SCHED_FIFO priority {priority} not applied: {e}")
+            ok = False
+    if cpus is not None:
+        try:
+            os.sched_setaffinity(0, set(cpus))
+        except (AttributeError, OSError) as e:
+            print(f"[RealtimeLoop] Warning: CPU affinity {set(cpus)} not applied: {e}")
+            ok = False
+    return ok
+
+
+class LoopStats:
+    """周期循环统计：抖动直方图（唤醒时间 - 截止时间）和错过的周期数"""
+
+    def __init__(self, period_ns: int):
+        self.period_ns = period_ns
+        self.ticks = 0
+        self.missed = 0
+        self.jitter = LatencyHistogram()
+        self.started_ns = now_ns()
+
+    def summary(self) -> Dict[str, object]:
+        elapsed_s = (now_ns() - self.started_ns) / 1e9
+        return {
+            'target_hz': round(1e9 / self.period_ns, 1),
+            'actual_hz': round(self.ticks / elapsed_s, 1) if elapsed_s > 0 else 0.0,
+            'ticks': self.ticks,
+            'missed': self.missed,
+            'jitter': self.jitter.summary(),
+        }
+
+
+class RealtimeLoop:
+    """按固定周期调用 tick(i)，tick 返回 False 时结束"""
+
+    def __init__(self, period_s: float = 0.002, spin_s: float = 0.0002, name: str = "",
+                 rt_priority: Optional[int] = None, cpus: Optional[Iterable[int]] = None):
+        self.period_ns = int(period_s * 1e9)
+        self.spin_ns = int(spin_s * 1e9)
+        self.name = name
+        self.rt_priority = rt_priority
+        self.cpus = cpus
+        self.stats = LoopStats(self.period_ns)
+
+    def _wait_until(self, deadline_ns: int):
+        remaining = deadline_ns - now_ns()
+        if remaining > self.spin_ns:
+            time.sleep((remaining - self.spin_ns) / 1e9)
+        while now_ns() < deadline_ns:
+            pass
+
+    def run(self, tick: Callable[[int], Optional[bool]], stop_event: Optional[threading.Event] = None,
+            max_ticks: Optional[int] = None) -> LoopStats:
+        if self.rt_priority is not None or self.cpus is not None:
+            set_realtime(self.rt_priority, self.cpus)
+
+        stats = self.stats = LoopStats(self.period_ns)
+        period = self.period_ns
+        deadline = now_ns()
+        i = 0
+        while ((stop_event is None or not stop_event.is_set())
+               and (max_ticks is None or i < max_ticks)):
+            if tick(i) is False:
+                break
+            i += 1
+            stats.ticks = i
+
+            deadline += period
+            current = now_ns()
+            if current > deadline:
+                # 本周期超时：跳过已错过的周期，保持相位对齐
+                missed = (current - deadline) // period + 1
+                stats.missed += missed
+                deadline += missed * period
+            self._wait_until(deadline)
+            stats.jitter.add((now_ns() - deadline) / 1000.0)
+        return stats
+
+    def report(self) -> str:
+        s = self.stats.summary()
+        return (f"[RealtimeLoop{(' ' + self.name) if self.name else ''}] "
+                f"{s['actual_hz']}/{s['target_hz']} Hz, ticks={s['ticks']}, missed={s['missed']}, "
+                f"jitter p50={s['jitter']['p50_us']}us p99={s['jitter']['p99_us']}us max={s['jitter']['max_us']}us")
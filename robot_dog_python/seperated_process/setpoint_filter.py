@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+速度/加速度受限的关节设定点滤波器
+在 500Hz 控制循环中每个周期调用一次 step()。目标可以随时修改，下一个周期就开始朝新目标运动；
+速度不超过 max_vel，速度变化不超过 max_acc，接近目标时沿最大减速度的刹车曲线减速停下。
+给出 lower/upper 时，目标和输出都限制在关节限位内，到达限位的关节速度清零。
+"""
+
+from typing import Optional, Sequence
+
+import numpy as np
+
+
+class RateLimitedSetpoint:
+    """一组关节的设定点，position 为当前发送给电机的目标角度"""
+
+    def __init__(self, initial: Sequence[float], max_vel: float, max_acc: float, dt: float,
+                 lower: Optional[Sequence[float]] = None, upper: Optional[Sequence[float]] = None):
+        self.position = np.array(initial, dtype=float)
+        self.lower = np.full_like(self.position, -np.inf) if lower is None else np.array(lower, dtype=float)
+        self.upper = np.full_like(self.position, np.inf) if upper is None else np.array(upper, dtype=float)
+        self.velocity = np.zeros_like(self.position)
+        self.target = self.position.copy()
+        self.max_vel = max_vel
+        self.max_acc = max_acc
+        self.dt = dt
+        self._dv_max = max_acc * dt
+
+    def set_target(self, target: Sequence[float]):
+        self.target[:] = np.clip(target, self.lower, self.upper)
+
+    def step(self) -> np.ndarray:
+        """前进一个周期，返回新的设定点"""
+        error = self.target - self.position
+        distance = np.abs(error)
+        # 以最大减速度恰好停在目标处的速度，且一个周期内不越过目标
+        speed = np.minimum(np.sqrt(2.0 * self.max_acc * distance), self.max_vel)
+        speed = np.minimum(speed, distance / self.dt)
+        dv = np.clip(np.copysign(speed, error) - self.velocity, -self._dv_max, self._dv_max)
+        self.velocity += dv
+        self.position += self.velocity * self.dt
+        # 离散刹车可能越过目标，不能越过关节限位
+        limited = np.clip(self.position, self.lower, self.upper)
+        self.velocity[limited != self.position] = 0.0
+        self.position[:] = limited
+        return self.position
+
+    def settled(self, tolerance: float = 1e-3) -> bool:
+        return bool(np.all(np.abs(self.target - self.position) <= tolerance) and
+                    np.all(np.abs(self.velocity) <= tolerance / self.dt))
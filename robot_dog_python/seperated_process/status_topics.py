@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+main_dog_status 的分频状态发布
+- MotorStatePublisher：在 rt/lowstate 回调中按 rate_hz 降采样，直接发布 DogMotorState
+- ModeInfoPublisher：运动模式（由 mode_watcher.ModeWatcher 的变化回调通知）或硬件信息变化时发布 DogModeInfo，
+  另外每 refresh_s 重发一次供后加入的订阅者
+不依赖 unitree_sdk2py 和 jtop，发布者由调用方传入。
+"""
+
+import threading
+import time
+from typing import Optional
+
+from dds_data_structure import DogMotorState, DogModeInfo, JetsonHardware
+from dog_status_arrays import fill_motor_arrays
+
+MOTOR_STATE_RATE_HZ = 50.0
+JETSON_HEALTH_PERIOD_S = 1.0
+MODE_INFO_REFRESH_S = 10.0
+# 硬件百分比类字段（磁盘、EMC、风扇）变化超过该值才算变化；uptime 不参与比较
+HARDWARE_CHANGE_PERCENT = 5.0
+
+now_ns = time.monotonic_ns
+
+
+class MotorStatePublisher:
+    """rt/lowstate 的订阅回调：每个周期发布一次最新的电机状态"""
+
+    def __init__(self, publisher, rate_hz: float = MOTOR_STATE_RATE_HZ):
+        self.publisher = publisher
+        self.period_ns = int(1e9 / rate_hz)
+        self.msg = DogMotorState()
+        self.next_due_ns = 0
+        self.received = 0
+        self.published = 0
+
+    def on_lowstate(self, lowstate):
+        self.received += 1
+        t = now_ns()
+        if t < self.next_due_ns:
+            return
+        # 按周期对齐，避免 lowstate 到达时刻的抖动累积成发布频率的漂移；落后超过一个周期时重新对齐
+        self.next_due_ns = max(self.next_due_ns + self.period_ns, t)
+        msg = self.msg
+        fill_motor_arrays(msg.motors, lowstate.motor_state)
+        msg.battery_percent = float(lowstate.bms_state.soc)
+        msg.lowstate_tick = int(lowstate.tick)
+        msg.timestamp_ns = time.time_ns()
+        try:
+            self.publisher.Write(msg)
+            self.published += 1
+        except Exception as e:
+            print(f"[MotorState] publish error: {e}")
+
+
+def _hardware_changed(old: JetsonHardware, new: JetsonHardware) -> bool:
+    if old.jetson_clocks_on != new.jetson_clocks_on:
+        return True
+    return any(abs(getattr(old, name) - getattr(new, name)) >= HARDWARE_CHANGE_PERCENT
+               for name in ('disk_usage_percent', 'emc_usage_percent', 'fan_speed_percent'))
+
+
+class ModeInfoPublisher:
+    """运动模式和硬件信息：变化时发布"""
+
+    def __init__(self, publisher, refresh_s: float = MODE_INFO_REFRESH_S):
+        self.publisher = publisher
+        self.refresh_ns = int(refresh_s * 1e9)
+        self.last: Optional[DogModeInfo] = None
+        self.last_sent_ns = 0
+        self.published = 0
+        self._lock = threading.Lock()  # 1Hz 循环和模式变化回调都会调用 update
+
+    def update(self, form: str, name: str, hardware: Optional[JetsonHardware] = None) -> bool:
+        """返回是否发布了新消息；hardware 为空时沿用上一次的硬件信息"""
+        with self._lock:
+            return self._update(form, name, hardware)
+
+    def _update(self, form: str, name: str, hardware: Optional[JetsonHardware]) -> bool:
+        t = now_ns()
+        last = self.last
+        if hardware is None:
+            hardware = last.hardware if last is not None else JetsonHardware()
+        changed = (last is None or (last.robot_mode_form, last.robot_mode_name) != (form, name)
+                   or _hardware_changed(last.hardware, hardware))
+        if not changed and t - self.last_sent_ns < self.refresh_ns:
+            return False
+        msg = DogModeInfo(timestamp_ns=time.time_ns(), robot_mode_form=form, robot_mode_name=name,
+                          hardware=hardware)
+        self.publisher.Write(msg)
+        self.last = msg
+        self.last_sent_ns = t
+        self.published += 1
+        return True
@@ -3,7 +3,7 @@ import sys
 
 # Core SDK components for communication
 from unitree_sdk2py.core.channel import ChannelPublisher, ChannelSubscriber, ChannelFactoryInitialize
-from unitree_sdk2py.utils.crc import CRC # For calculating CRC for LowCmd
+from lowcmd_crc import LowCmdCrc
 from unitree_sdk2py.utils.thread import RecurrentThread # For continuous low-level command sending
 
 # IDL for LowCmd and LowState messages (specific to Go2, Go2-W, B2, B2-W)
@@ -49,7 +49,7 @@ class RobotControl:
 
         self.low_cmd = unitree_go_msg_dds__LowCmd_() # Use appropriate LowCmd_ based on robot_type
         self.low_state = None
-        self.crc = CRC()
+        self.crc = LowCmdCrc()
         self.lowCmdWriteThreadPtr = None
         self.low_level_active = False
 
@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+遥测时间序列记录（内存映射的环形文件）
+- RingFile：一个固定大小的文件 = 头部 + capacity 条定长记录 (RECORD_DTYPE) + 时间索引。
+  写入第 seq 条记录到槽 seq % capacity，写满后覆盖最旧的记录；每 index_stride 条记录在索引中
+  记一次 (timestamp_ns, seq)，按时间查询时先在索引上二分，再在最多 index_stride 条记录内二分。
+  记录写完后才更新头部的 count，其他进程可以随时只读打开并查询。
+- TelemetryRecorder：按本地日期每天一个环形文件，只保留最近 keep_days 天，
+  磁盘占用上限 = keep_days * 文件大小（文件按稀疏文件创建）。
+- TelemetryArchive：跨日期文件的查询 (query) 和按块回放 (iter_chunks)，返回 NumPy 结构化数组。
+不依赖 unitree_sdk2py，记录进程见 main_telemetry_recorder.py。
+"""
+
+import ast
+import glob
+import os
+import struct
+import time
+from typing import Iterator, List, Optional
+
+import numpy as np
+
+from dog_status_arrays import MOTOR_STATE_DTYPE, motor_arrays_to_numpy, motor_state_to_numpy
+from dds_data_structure import NUM_STATUS_MOTORS
+
+RECORD_RATE_HZ = 500.0
+RING_SECONDS = 3600.0  # 每天的文件保留最近 1 小时 (500Hz 约 677MB)
+KEEP_DAYS = 3
+INDEX_STRIDE = 500
+FLUSH_PERIOD_S = 5.0
+RING_SUFFIX = '.ring'
+
+RECORD_DTYPE = np.dtype([
+    ('timestamp_ns', '<i8'),  # time.time_ns()，同一文件内单调不减
+    ('tick', '<u4'),          # LowState_.tick
+    ('battery_percent', '<f4'),
+    ('motors', MOTOR_STATE_DTYPE.newbyteorder('<'), (NUM_STATUS_MOTORS,)),
+])
+INDEX_DTYPE = np.dtype([('timestamp_ns', '<i8'), ('seq', '<u8')])
+
+now_ns = time.time_ns
+
+MAGIC = b'DOGRING1'
+# magic, record_size, capacity, index_stride, count, dtype 描述长度；dtype 描述 (repr) 紧随其后
+HEADER = struct.Struct('<8sIQIQI')
+COUNT_OFFSET = 24
+HEADER_SIZE = 4096
+PAGE_SIZE = 4096
+
+
+def _page_align(n: int) -> int:
+    return (n + PAGE_SIZE - 1) // PAGE_SIZE * PAGE_SIZE
+
+
+def ring_file_size(capacity: int, index_stride: int = INDEX_STRIDE, dtype: np.dtype = RECORD_DTYPE) -> int:
+    return HEADER_SIZE + _page_align(capacity * dtype.itemsize) + (capacity // index_stride) * INDEX_DTYPE.itemsize
+
+
+class RingFile:
+    """单个环形文件；mode='r+' 写入（不存在时创建），mode='r' 只读查询"""
+
+    def __init__(self, path: str, capacity: int = int(RECORD_RATE_HZ * RING_SECONDS),
+                 index_stride: int = INDEX_STRIDE, dtype: np.dtype = RECORD_DTYPE, mode: str = 'r+'):
+        self.path = path
+        if mode == 'r+' and not os.path.exists(path):
+            self._create(path, capacity, index_stride, dtype)
+        self._raw = np.memmap(path, dtype=np.uint8, mode=mode)
+        magic, record_size, self.capacity, self.index_stride, _, descr_len = HEADER.unpack_from(self._raw, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path}: not a telemetry ring file")
+        descr = bytes(self._raw[HEADER.size:HEADER.size + descr_len]).decode('ascii')
+        self.dtype = np.lib.format.descr_to_dtype(ast.literal_eval(descr))
+        if self.dtype.itemsize != record_size:
+            raise ValueError(f"{path}: record size {record_size} does not match its dtype")
+        self.index_capacity = self.capacity // self.index_stride
+        records_end = HEADER_SIZE + self.capacity * record_size
+        self._count = self._raw[COUNT_OFFSET:COUNT_OFFSET + 8].view('<u8')
+        self.records = self._raw[HEADER_SIZE:records_end].view(self.dtype)
+        # 按整条记录 (void) 拷贝：嵌套结构化 dtype 的逐字段拷贝慢约 5 倍
+        self._record_bytes = self.records.view(np.dtype((np.void, record_size)))
+        index_start = HEADER_SIZE + _page_align(self.capacity * record_size)
+        self.index = self._raw[index_start:index_start + self.index_capacity * INDEX_DTYPE.itemsize].view(INDEX_DTYPE)
+        self._times = self.records['timestamp_ns']
+        self.last_timestamp_ns = int(self._times[(self.count - 1) % self.capacity]) if self.count else 0
+
+    @staticmethod
+    def _create(path: str, capacity: int, index_stride: int, dtype: np.dtype):
+        # 容量取 index_stride 的整数倍，索引槽和记录槽同时被覆盖
+        capacity = max(capacity // index_stride, 1) * index_stride
+        descr = repr(np.lib.format.dtype_to_descr(dtype)).encode('ascii')
+        if HEADER.size + len(descr) > HEADER_SIZE:
+            raise ValueError("record dtype description does not fit in the header")
+        tmp = path + '.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, dtype.itemsize, capacity, index_stride, 0, len(descr)) + descr)
+            f.truncate(ring_file_size(capacity, index_stride, dtype))  # 稀疏文件，写到哪里占用到哪里
+        os.replace(tmp, path)
+
+    @property
+    def count(self) -> int:
+        """累计写入的记录数（下一条记录的 seq）"""
+        return int(self._count[0])
+
+    def oldest_seq(self, count: Optional[int] = None) -> int:
+        count = self.count if count is None else count
+        return max(count - self.capacity, 0)
+
+    # --- 写入 ---
+
+    def next_record(self, timestamp_ns: int):
+        """返回下一条记录的槽位 (seq, slot) 并写入时间戳；字段写完后调用 commit(seq, timestamp_ns)"""
+        seq = self.count
+        slot = seq % self.capacity
+        self._times[slot] = timestamp_ns
+        return seq, slot
+
+    def commit(self, seq: int, timestamp_ns: int):
+        if seq % self.index_stride == 0:
+            self.index[(seq // self.index_stride) % self.index_capacity] = (timestamp_ns, seq)
+        self._count[0] = seq + 1  # 最后更新，读者看到的 count 之前的记录都已写完
+        self.last_timestamp_ns = timestamp_ns
+
+    def append(self, record) -> int:
+        """写入一条完整记录（RECORD_DTYPE 的 np.void 或元组），返回 seq"""
+        timestamp_ns = int(record['timestamp_ns'] if isinstance(record, np.void) else record[0])
+        seq, slot = self.next_record(timestamp_ns)
+        self.records[slot] = record
+        self.commit(seq, timestamp_ns)
+        return seq
+
+    def extend(self, records: np.ndarray) -> int:
+        """批量写入按时间排序的记录（导入、回放测试），返回写入后的 count"""
+        seq = self.count
+        skip = max(len(records) - self.capacity, 0)  # 超过容量的部分写了也会被覆盖
+        seq += skip
+        records = records[skip:]
+        i = 0
+        while i < len(records):
+            slot = (seq + i) % self.capacity
+            n = min(len(records) - i, self.capacity - slot)
+            self.records[slot:slot + n] = records[i:i + n]
+            i += n
+        end = seq + len(records)
+        for k in range(-(-seq // self.index_stride), -(-end // self.index_stride)):
+            s = k * self.index_stride
+            self.index[k % self.index_capacity] = (records['timestamp_ns'][s - seq], s)
+        if len(records):
+            self.last_timestamp_ns = int(records['timestamp_ns'][-1])
+        self._count[0] = end
+        return end
+
+    def flush(self):
+        if self._raw is not None:
+            self._raw.flush()
+
+    def close(self):
+        if self._raw is not None and self._raw.mode != 'r':
+            self._raw.flush()
+        self._raw = self.records = self._record_bytes = self.index = self._times = self._count = None
+
+    # --- 查询 ---
+
+    def _slice(self, array: np.ndarray, start: int, end: int) -> np.ndarray:
+        """逻辑序号 [start, end) 的记录（最多两段连续内存）"""
+        a, b = start % self.capacity, end % self.capacity
+        if end - start <= 0:
+            return array[:0]
+        if a < b or b == 0:
+            return array[a:b or self.capacity]
+        return np.concatenate([array[a:], array[:b]])
+
+    def copy_records(self, start: int, end: int) -> np.ndarray:
+        """逻辑序号 [start, end) 的记录拷贝"""
+        return np.array(self._slice(self._record_bytes, start, end)).view(self.dtype)
+
+    def seq_at(self, timestamp_ns: int, lo: int, hi: int) -> int:
+        """[lo, hi) 内第一条 timestamp_ns >= 给定时间的记录序号（没有则为 hi）"""
+        stride = self.index_stride
+        k_lo, k_hi = -(-lo // stride), (hi - 1) // stride + 1
+        a, b = lo, hi
+        if k_hi > k_lo:
+            ks = np.arange(k_lo, k_hi)
+            j = int(np.searchsorted(self.index['timestamp_ns'][ks % self.index_capacity], timestamp_ns))
+            if j > 0:
+                a = int(ks[j - 1]) * stride
+            if j < len(ks):
+                b = int(ks[j]) * stride + 1
+        return a + int(np.searchsorted(self._slice(self._times, a, b), timestamp_ns))
+
+    def query(self, start_ns: int, end_ns: int) -> np.ndarray:
+        """时间在 [start_ns, end_ns) 内的记录（拷贝）；查询期间被写入进程覆盖的记录会被去掉"""
+        count = self.count
+        lo, hi = self.oldest_seq(count), count
+        first = self.seq_at(start_ns, lo, hi)
+        last = self.seq_at(end_ns, first, hi)
+        out = self.copy_records(first, last)
+        overwritten = self.oldest_seq() - first
+        return out[overwritten:] if overwritten > 0 else out
+
+    def time_range(self):
+        """(最早, 最新) 记录的时间戳；空文件返回 None"""
+        count = self.count
+        if count == 0:
+            return None
+        return int(self._times[self.oldest_seq(count) % self.capacity]), int(self._times[(count - 1) % self.capacity])
+
+
+class TelemetryRecorder:
+    """
+    按日期滚动的记录器。append_lowstate / append_motor_state 在 DDS 回调中调用（单线程），
+    每条记录直接写入内存映射文件，不做额外的缓冲和分配。
+    """
+
+    def __init__(self, directory: str, prefix: str = 'lowstate', capacity: int = int(RECORD_RATE_HZ * RING_SECONDS),
+                 index_stride: int = INDEX_STRIDE, keep_days: int = KEEP_DAYS):
+        self.directory = directory
+        self.prefix = prefix
+        self.capacity = capacity
+        self.index_stride = index_stride
+        self.keep_days = keep_days
+        self.ring: Optional[RingFile] = None
+        self.day_end_ns = 0
+        self.appended = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _open_day(self, timestamp_ns: int):
+        if self.ring is not None:
+            self.ring.close()
+        t = time.localtime(timestamp_ns / 1e9)
+        day_start = time.mktime((t.tm_year, t.tm_mon, t.tm_mday, 0, 0, 0, 0, 0, -1))
+        next_day = time.localtime(day_start + 36 * 3600)  # 跨夏令时也落在下一天
+        self.day_end_ns = int(time.mktime((next_day.tm_year, next_day.tm_mon, next_day.tm_mday, 0, 0, 0, 0, 0, -1)) * 1e9)
+        path = os.path.join(self.directory, f"{self.prefix}-{time.strftime('%Y%m%d', t)}{RING_SUFFIX}")
+        self.ring = RingFile(path, self.capacity, self.index_stride)
+        self._prune()
+
+    def _prune(self):
+        files = ring_files(self.directory, self.prefix)
+        for path in files[:-self.keep_days]:
+            try:
+                os.remove(path)
+                print(f"[TelemetryRecorder] removed {path}")
+            except OSError as e:
+                print(f"[TelemetryRecorder] could not remove {path}: {e}")
+
+    def _next_record(self):
+        timestamp_ns = now_ns()
+        if timestamp_ns >= self.day_end_ns or self.ring is None:
+            self._open_day(timestamp_ns)
+        # 系统时间被往回调时保持单调，按时间二分查询依赖这一点
+        timestamp_ns = max(timestamp_ns, self.ring.last_timestamp_ns)
+        seq, slot = self.ring.next_record(timestamp_ns)
+        return timestamp_ns, seq, slot
+
+    def append_lowstate(self, lowstate):
+        """rt/lowstate (LowState_) 的订阅回调"""
+        timestamp_ns, seq, slot = self._next_record()
+        records = self.ring.records
+        records['tick'][slot] = lowstate.tick
+        records['battery_percent'][slot] = lowstate.bms_state.soc
+        motor_state_to_numpy(lowstate.motor_state, out=records['motors'][slot])
+        self.ring.commit(seq, timestamp_ns)
+        self.appended += 1
+
+    def append_motor_state(self, msg):
+        """DogMotorState 的订阅回调（50Hz，已降采样）"""
+        timestamp_ns, seq, slot = self._next_record()
+        records = self.ring.records
+        records['tick'][slot] = msg.lowstate_tick
+        records['battery_percent'][slot] = msg.battery_percent
+        motor_arrays_to_numpy(msg.motors, out=records['motors'][slot])
+        self.ring.commit(seq, timestamp_ns)
+        self.appended += 1
+
+    def flush(self):
+        ring = self.ring
+        if ring is not None:
+            ring.flush()
+
+    def close(self):
+        if self.ring is not None:
+            self.ring.close()
+            self.ring = None
+
+
+def ring_files(directory: str, prefix: str = 'lowstate') -> List[str]:
+    """按日期排序的环形文件"""
+    return sorted(glob.glob(os.path.join(directory, f"{prefix}-????????{RING_SUFFIX}")))
+
+
+class TelemetryArchive:
+    """只读查询记录目录；可以在记录进程运行时使用"""
+
+    def __init__(self, directory: str, prefix: str = 'lowstate'):
+        self.directory = directory
+        self.prefix = prefix
+
+    def _rings(self, start_ns: int, end_ns: int) -> Iterator[RingFile]:
+        for path in ring_files(self.directory, self.prefix):
+            ring = RingFile(path, mode='r')
+            span = ring.time_range()
+            if span is not None and span[0] < end_ns and span[1] >= start_ns:
+                yield ring
+            else:
+                ring.close()
+
+    def query(self, start_ns: int, end_ns: int) -> np.ndarray:
+        """[start_ns, end_ns) 内的全部记录"""
+        parts = []
+        for ring in self._rings(start_ns, end_ns):
+            parts.append(ring.query(start_ns, end_ns))
+            ring.close()
+        return np.concatenate(parts) if parts else np.empty(0, dtype=RECORD_DTYPE)
+
+    def iter_chunks(self, start_ns: int, end_ns: int, chunk_records: int = 1 << 14) -> Iterator[np.ndarray]:
+        """按块回放（每块最多 chunk_records 条），不把整个时间段读进内存"""
+        for ring in self._rings(start_ns, end_ns):
+            count = ring.count
+            seq = ring.seq_at(start_ns, ring.oldest_seq(count), count)
+            last = ring.seq_at(end_ns, seq, count)
+            while seq < last:
+                end = min(seq + chunk_records, last)
+                chunk = ring.copy_records(seq, end)
+                overwritten = ring.oldest_seq() - seq
+                seq = end
+                if overwritten > 0:
+                    chunk = chunk[overwritten:]
+                if len(chunk):
+                    yield chunk
+            ring.close()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+关节轨迹预计算
+一次性生成整段姿态过渡的 (步数+1, 12) NumPy 数组，实时循环每个周期只取一行。
+插值曲线默认使用最小加加速度（min-jerk），起止点速度和加速度都为0；也可选三次曲线或线性。
+相同 (起点, 终点, 时长, 曲线) 的轨迹会被缓存，返回的数组是只读的。
+"""
+
+from functools import lru_cache
+from typing import Optional, Sequence
+
+import numpy as np
+
+PROFILE_LINEAR = 'linear'
+PROFILE_CUBIC = 'cubic'        # 3s^2 - 2s^3，起止速度为0
+PROFILE_MIN_JERK = 'min_jerk'  # 10s^3 - 15s^4 + 6s^5，起止速度和加速度为0
+DEFAULT_PROFILE = PROFILE_MIN_JERK
+DEFAULT_PERIOD_S = 0.002
+
+TRAJECTORY_CACHE_SIZE = 64
+
+
+def time_scaling(profile: str, steps: int) -> np.ndarray:
+    """返回 steps+1 个从0到1的插值系数"""
+    s = np.linspace(0.0, 1.0, steps + 1)
+    if profile == PROFILE_LINEAR:
+        return s
+    if profile == PROFILE_CUBIC:
+        return s * s * (3.0 - 2.0 * s)
+    if profile == PROFILE_MIN_JERK:
+        return s * s * s * (10.0 + s * (-15.0 + 6.0 * s))
+    raise ValueError(f"未知的插值曲线: {profile}")
+
+
+def duration_to_steps(duration_ms: float, period_s: float = DEFAULT_PERIOD_S) -> int:
+    return max(1, int(round(duration_ms / 1000.0 / period_s)))
+
+
+@lru_cache(maxsize=TRAJECTORY_CACHE_SIZE)
+def _cached_trajectory(start: tuple, end: tuple, steps: int, profile: str,
+                       joint_indices: Optional[tuple]) -> np.ndarray:
+    q_start = np.array(start)
+    q_delta = np.array(end) - q_start
+    if joint_indices is not None:
+        # 只有选中的关节运动，其余关节保持起点角度
+        mask = np.zeros_like(q_delta)
+        mask[list(joint_indices)] = 1.0
+        q_delta *= mask
+    traj = q_start + time_scaling(profile, steps)[:, None] * q_delta
+    traj.flags.writeable = False
+    return traj
+
+
+def build_trajectory(start: Sequence[float], end: Sequence[float], duration_ms: float,
+                     profile: str = DEFAULT_PROFILE, period_s: float = DEFAULT_PERIOD_S,
+                     joint_indices: Optional[Sequence[int]] = None) -> np.ndarray:
+    """start -> end 的过渡轨迹，第0行是起点，最后一行是终点"""
+    return _cached_trajectory(
+        tuple(float(x) for x in start), tuple(float(x) for x in end),
+        duration_to_steps(duration_ms, period_s), profile,
+        tuple(joint_indices) if joint_indices is not None else None)
+
+
+def build_sequence(waypoints: Sequence[Sequence[float]], durations_ms: Sequence[float],
+                   profile: str = DEFAULT_PROFILE, period_s: float = DEFAULT_PERIOD_S) -> np.ndarray:
+    """依次经过各个路径点的整段轨迹，每段单独使用插值曲线（段间停顿时速度为0）"""
+    if len(waypoints) != len(durations_ms) + 1:
+        raise ValueError("路径点数量必须比时长数量多1")
+    segments = [np.asarray(waypoints[0], dtype=float)[None, :]]
+    for start, end, duration_ms in zip(waypoints, waypoints[1:], durations_ms):
+        # 每段的第0行与上一段的最后一行相同，去掉
+        segments.append(build_trajectory(start, end, duration_ms, profile, period_s)[1:])
+    traj = np.concatenate(segments)
+    traj.flags.writeable = False
+    return traj
+
+
+def cache_info():
+    return _cached_trajectory.cache_info()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+可取消的状态切换任务
+每个状态切换在自己的线程中执行，命令接收线程只负责启动/取消任务，不会被切换过程阻塞。
+切换函数中的等待使用 cancellable_sleep / check_cancelled，取消后在下一个等待点抛出
+TransitionCancelled 结束任务。同一时刻只有一个任务在执行，后一个任务可以等待前一个结束后再开始。
+抢占（DAMP）时只等待被取消的任务 PREEMPT_JOIN_TIMEOUT_S：旧任务可能正阻塞在 SelectMode/ReleaseMode/StandUp
+等 SDK 调用中（取消只在下一个等待点生效），不等它返回，新任务直接开始；旧任务在调用返回后的第一个检查点退出。
+新任务的 SDK 调用仍排在旧调用之后发出（body_backend.SerializedClient），机器狗上不会出现旧调用晚到的情况。
+"""
+
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+STATUS_PENDING = 'pending'
+STATUS_RUNNING = 'running'
+STATUS_DONE = 'done'
+STATUS_CANCELLED = 'cancelled'
+STATUS_FAILED = 'failed'
+
+PREEMPT_JOIN_TIMEOUT_S = 0.02  # 抢占时等待旧任务退出的上限
+
+now_ns = time.monotonic_ns
+
+_local = threading.local()
+
+
+class TransitionCancelled(Exception):
+    """切换任务被取消"""
+
+
+def current_task() -> Optional['TransitionTask']:
+    """当前线程正在执行的切换任务，不在任务中时返回 None"""
+    return getattr(_local, 'task', None)
+
+
+def cancellable_sleep(seconds: float):
+    """在切换任务中等待，任务被取消时立即抛出 TransitionCancelled；不在任务中时等同 time.sleep"""
+    task = current_task()
+    if task is None:
+        time.sleep(seconds)
+    else:
+        task.sleep(seconds)
+
+
+def check_cancelled():
+    task = current_task()
+    if task is not None:
+        task.check()
+
+
+def report_progress(stage: str, fraction: Optional[float] = None):
+    task = current_task()
+    if task is not None:
+        task.set_progress(stage, fraction)
+
+
+class TransitionTask:
+    """在后台线程中执行一个状态切换函数"""
+
+    def __init__(self, name: str, fn: Callable[[], None], after: Optional['TransitionTask'] = None,
+                 trace_id: int = 0):
+        self.name = name
+        self.fn = fn
+        self.after = after
+        self.trace_id = trace_id  # 触发切换的命令的延迟追踪 trace_id（0 表示不追踪）
+        self.cancel_event = threading.Event()
+        self.status = STATUS_PENDING
+        self.stage = ''
+        self.progress = 0.0
+        self.error: Optional[BaseException] = None
+        self.created_ns = now_ns()
+        self.started_ns = 0
+        self.finished_ns = 0
+        self.thread = threading.Thread(target=self._run, name=f"transition-{name}", daemon=True)
+
+    def start(self) -> 'TransitionTask':
+        self.thread.start()
+        return self
+
+    def _run(self):
+        if self.after is not None:
+            # 给被取消的前一个任务一点时间退出；它若阻塞在 SDK 调用中则不再等待
+            if not self.after.join(PREEMPT_JOIN_TIMEOUT_S):
+                print(f"[Transition] {self.name}: {self.after.name} still in stage '{self.after.stage}', "
+                      f"starting without waiting")
+            self.after = None
+        _local.task = self
+        self.status = STATUS_RUNNING
+        self.started_ns = now_ns()
+        try:
+            self.check()
+            self.fn()
+            self.status = STATUS_DONE
+            self.progress = 1.0
+        except TransitionCancelled:
+            self.status = STATUS_CANCELLED
+            print(f"[Transition] {self.name} cancelled at stage '{self.stage}'")
+        except Exception as e:
+            self.status = STATUS_FAILED
+            self.error = e
+            print(f"[Transition] {self.name} failed at stage '{self.stage}': {e}")
+        finally:
+            self.finished_ns = now_ns()
+            _local.task = None
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self.cancel_event.is_set()
+
+    def is_active(self) -> bool:
+        return self.status in (STATUS_PENDING, STATUS_RUNNING)
+
+    def check(self):
+        if self.cancel_event.is_set():
+            raise TransitionCancelled(self.name)
+
+    def sleep(self, seconds: float):
+        if self.cancel_event.wait(seconds):
+            raise TransitionCancelled(self.name)
+
+    def set_progress(self, stage: str, fraction: Optional[float] = None):
+        self.stage = stage
+        if fraction is not None:
+            self.progress = fraction
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        self.thread.join(timeout)
+        return not self.thread.is_alive()
+
+    def snapshot(self) -> Dict[str, object]:
+        end_ns = self.finished_ns or now_ns()
+        return {
+            'name': self.name,
+            'status': self.status,
+            'stage': self.stage,
+            'progress': round(self.progress, 3),
+            'elapsed_ms': round((end_ns - self.started_ns) / 1e6, 1) if self.started_ns else 0.0,
+        }